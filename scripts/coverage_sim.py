@@ -0,0 +1,88 @@
+"""Check the analytic constellation size by flying a Walker constellation over a grid of threat points.
+
+Inputs come from the app's defaults, a shared scenario URL/query string (``--query``) and ``--set`` overrides, as in
+``optimize_design.py``. By default the constellation has the analytic size; ``--satellites`` simulates other sizes
+(for example to find the size that reaches a target availability).
+
+    python scripts/coverage_sim.py --query "?salvoSize=10&maxLatitudeCoverageDeg=60" --points 100000 --steps 96
+    python scripts/coverage_sim.py --satellites 1000 1500 2000 --json coverage.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from optimize_design import build_inputs
+from sbi_model.coverage import (
+    DEFAULT_DURATION_HOURS,
+    DEFAULT_GROUND_POINTS,
+    DEFAULT_TIMESTEPS,
+    INDEXES,
+    CoverageResult,
+    simulate_coverage,
+)
+
+
+def describe(result: CoverageResult) -> str:
+    walker = result.walker
+    lines = [
+        f"{walker.satellites:,} interceptors ({walker.planes} planes x {walker.per_plane}, phasing {walker.phasing}, "
+        f"{walker.inclination_deg:g}° at {walker.altitude_km:g} km; analytic size {result.analytic_size:,.0f})",
+        f"  need {result.required} in range of {result.flyout_range_km:,.0f} km; "
+        f"{result.ground_points:,} points x {result.timesteps} steps in {result.seconds:.1f}s ({result.index})",
+        f"  availability: average {result.average_availability:.1%}, worst step {result.worst_step_availability:.1%}, "
+        f"worst point {result.worst_point_availability:.1%}",
+        f"  in range: mean {result.mean_in_range:.2f}, min {result.min_in_range}",
+        "  by latitude: " + ", ".join(f"{latitude:g}° {value:.0%}" for latitude, value in result.latitude_profile),
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate constellation coverage for an SBI scenario.")
+    parser.add_argument("--query", default="", help="scenario URL or query string")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="override an input")
+    parser.add_argument("--satellites", type=int, nargs="*", default=[], help="constellation sizes to simulate")
+    parser.add_argument("--planes", type=int, help="orbital planes (default about the square root of the size)")
+    parser.add_argument("--phasing", type=int, default=1, help="Walker phasing factor F (default 1)")
+    parser.add_argument("--inclination", type=float, help="orbit inclination in degrees (default: covered latitude)")
+    parser.add_argument("--points", type=int, default=DEFAULT_GROUND_POINTS, help="threat grid points")
+    parser.add_argument("--steps", type=int, default=DEFAULT_TIMESTEPS, help="timesteps")
+    parser.add_argument("--hours", type=float, default=DEFAULT_DURATION_HOURS, help="simulated time span")
+    parser.add_argument("--workers", type=int, help="processes for the timestep chunks (default: CPU count)")
+    parser.add_argument("--index", choices=INDEXES, default="auto", help="in-range counter (default: k-d tree)")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    inputs = build_inputs(args.query, args.set)
+    results = []
+    for satellites in args.satellites or [None]:
+        try:
+            result = simulate_coverage(
+                inputs,
+                satellites=satellites,
+                planes=args.planes,
+                phasing=args.phasing,
+                inclination_deg=args.inclination,
+                ground_points=args.points,
+                timesteps=args.steps,
+                duration_hours=args.hours,
+                workers=args.workers,
+                index=args.index,
+            )
+        except ValueError as error:
+            raise SystemExit(str(error)) from None
+        print(describe(result))
+        results.append(result)
+
+    if args.json:
+        payload = [{**asdict(result), "satellites": result.walker.satellites} for result in results]
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
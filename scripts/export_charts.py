@@ -1,19 +1,39 @@
 ﻿"""Utilities to export chart datasets from Microsoft SQL Server into JSON files for the static site."""
 from __future__ import annotations
 
+import argparse
 import json
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from datetime import date, datetime, time, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Iterable
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Sequence
 
-import pyodbc
+from columnar import ColumnarWriter, write_compressed
+from launch_materialization import EXPORT_QUERY as LAUNCH_EXPORT_QUERY, MATERIALIZED_TABLE
+from rollups import Measure, Rollup, RollupBuilder, check_rollups
+from run_report import TRACE_MEMORY, bind, current, instrument, run as report_run, span
+from scenario_tiles import update_tile_metadata, write_scenario_tiles
+from source_fetch import file_sha256
+from table_sync import source_signature
+
+if TYPE_CHECKING:
+    import pyodbc
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT / "src" / "data"
 ENV_FILE = ROOT / ".env.local"
+FETCH_BATCH_ROWS = int(os.environ.get("EXPORT_FETCH_ROWS", "5000"))
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "4"))
+
+Converter = Callable[[Any], Any]
+OUTPUT_FORMATS = ("rows", "columnar")
 
 
 @dataclass
@@ -21,117 +41,72 @@ class ExportTask:
     name: str
     query: str
     output: str
+    # "rows" writes ``output`` as an array of objects; "columnar" writes ``<output stem>.columnar.json``
+    formats: tuple[str, ...] = ("rows",)
+    # Precompressed siblings written next to every output: "gzip" and/or "br"
+    compress: tuple[str, ...] = ()
+    # Tables the query reads; when none of them changed since the last export the query is not run at all
+    sources: tuple[str, ...] = ()
+    # Grouped summaries written as ``<output stem>.<rollup name>.columnar.json`` from the same query result
+    rollups: tuple[Rollup, ...] = ()
+
+    def output_path(self, fmt: str) -> Path:
+        path = DATA_DIR / self.output
+        if fmt == "columnar":
+            return path.with_name(f"{path.stem}.columnar{path.suffix}")
+        return path
+
+    def rollup_path(self, rollup: Rollup) -> Path:
+        path = DATA_DIR / self.output
+        return path.with_name(f"{path.stem}.{rollup.name}.columnar{path.suffix}")
+
+    def output_paths(self) -> dict[str, Path]:
+        """Every file the task writes, keyed by format or ``rollup:<name>``; the detail output comes first."""
+        paths = {fmt: self.output_path(fmt) for fmt in self.formats}
+        paths.update({f"rollup:{rollup.name}": self.rollup_path(rollup) for rollup in self.rollups})
+        return paths
+
+
+LAUNCH_TONS = Measure("LEO_Metric_Tons", "sum", "LEO_Metric_Tons")
+LAUNCH_ROLLUPS: tuple[Rollup, ...] = (
+    Rollup(
+        "by_year_group",
+        ("Launch_Year", "Country_Groups", "Launch_Category"),
+        (Measure("Launches", "count"), LAUNCH_TONS),
+    ),
+    Rollup("by_year_category", ("Launch_Year", "Launch_Category", "Launch_Success"), (Measure("Launches", "count"),)),
+    Rollup("by_year_lv_size", ("Launch_Year", "LV_Size"), (Measure("Launches", "count"), LAUNCH_TONS)),
+    # Starlink_Mission is 1 or null, so counting it gives the Starlink launches of each year
+    Rollup(
+        "by_year_starlink",
+        ("Launch_Year", "Country_Groups"),
+        (Measure("Launches", "count"), Measure("Starlink_Launches", "count", "Starlink_Mission")),
+    ),
+)
 
 
 # Update this mapping with the SQL views/queries that feed each chart.
 EXPORT_TASKS: tuple[ExportTask, ...] = (
-    # Launch Data View
+    # Launch Data View: a plain scan of the table materialized by scripts/launch_materialization.py
     ExportTask(
         name="Launch_Data",
-        query="""
-        select left(Launch_Date,4) as Launch_Year,
-	
-        cast((case when Launch_Date not like '%Q%' and substring(Launch_Date, 10, 2) <> '' and substring(Launch_Date, 6, 3) <> '' then substring(Launch_Date, 10, 2) + '-' + substring(Launch_Date, 6, 3) + '-' + substring(Launch_Date, 1,4)
-            when substring(Launch_Date, 10, 2) = '' and Launch_Date not like '%Q%' and substring(Launch_Date, 6, 3) <> '' then '01-' + substring(Launch_Date, 6, 3) + '-' + substring(Launch_Date, 1,4)
-            else '01-01-' + substring(Launch_Date, 1,4) end) as date) as Formated_Date,
-        
-        Launch_Date, Launch_Tag, L.LV_Type, PL.Image_URL, PL.Image_File, L.Variant, LS.StateCode,
-        
-        case when PL.Parent_Name is null then L.LV_Type
-        else PL.Parent_Name end as Parent_Name, 
-        
-        case when P.Latitude is not NULL then P.Latitude
-        else LS.Latitude end as Latitude,
-        
-        case when P.Longitude is not NULL then P.Longitude
-        else LS.Longitude end as Longitude,
-        
-        case when P.Parent_Name is not NULL then P.Parent_Name
-        when LS2.Name is not NULL then LS2.Name
-        else LS.Name end as Launch_Site_Name,
-        
-        case when LS.StateCode = 'SU' or LS.StateCode = 'RU' then 'Russia/Soviet Union'
-        when LS.StateCode = 'TTPI' then 'United States'
-        when LS.StateCode = 'PCZ' then 'United States'
-        when LS.StateCode = 'AAT' then 'Australia'
-        when LS.StateCode = 'DR' then 'Germany'
-        when LS.StateCode = 'NZRD' then 'New Zealand'
-        when LS.StateCode = 'UM67' then 'United States'
-        when LS.StateCode in ('GUF', 'DZ') then 'France'
-        when LS.StateCode = 'ESCN' then 'Spain'
-        when LS.StateCode = 'PR' then 'United States'
-        when LS.StateCode = 'GU' then 'United States'
-        when LS.StateCode = 'BAT' then 'United Kingdom'
-        when LS.StateCode = 'DD' then 'Germany'
-        else C.Country_Name end as Country,
-        
-        case when left(L.Launch_Code,1) = 'M' then 'Military Missile'
-        when left(L.Launch_Code,1) = 'O' then 'Orbital'
-        when left(L.Launch_Code,1) = 'T' then 'Test Rocket'
-        when left(L.Launch_Code,1) = 'A' then 'Atmospheric Rocket'
-        when left(L.Launch_Code,1) = 'S' then 'Suborbital Rocket'
-        when left(L.Launch_Code,1) = 'H' then 'Sounding Rocket'
-        when left(L.Launch_Code,1) = 'R' then 'Reentry Test'
-        when left(L.Launch_Code,1) = 'X' then 'Non-Earth Launch'
-        when left(L.Launch_Code,1) = 'Y' then 'Suborbital Spaceplane'
-        when left(L.Launch_Code,1) = 'D' then 'Deep Space'
-        else left(L.Launch_Code,1) end as Launch_Category,
-        
-        case when substring(L.Launch_Code,2,1) = 'S' then 'Success'
-        when substring(L.Launch_Code,2,1) = 'F' then 'Failure'
-        when substring(L.Launch_Code,2,1) = 'U' then 'Unknown'
-        when substring(L.Launch_Code,2,1) = 'E' then 'Pad Explosion'
-        else substring(L.Launch_Code,2,1) end as Launch_Success,
-        
-        case when LS.StateCode in ('US', 'TTPI', 'GU', 'PR', 'UM67', 'PCZ') then 'United States'
-        when LS.StateCode = 'SU' or LS.StateCode = 'RU' then 'Russia/Soviet Union'
-        when LS.StateCode = 'CN' then 'China'
-        when C.Relationship = 'NATO Ally' or (C.Relationship is null and LS.StateCode in ('DZ', 'DD', 'FR', 'UK', 'ESCN', 'GUF', 'DR', 'BAT')) then 'NATO Ally'
-        when C.Relationship = 'Major Non-NATO Ally' then C.Relationship
-        else 'Other' end as Country_Groups,
-        
-        case when C.COCOM_AOR is null and LS.StateCode in ('SU', 'RU', 'DD', 'FR', 'UK', 'ESCN', 'GUF', 'DR', 'BAT', 'DZ') then 'EUCOM'
-        when C.COCOM_AOR is null and LS.StateCode in ('US', 'TTPI', 'GU', 'PR', 'UM67', 'PCZ') then 'NORTHCOM'
-        when C.COCOM_AOR is null and LS.StateCode in ('AAT', 'NZRD') then 'INDOPACOM'
-        else C.COCOM_AOR end as COCOM_AOR,
-        LC.LEO_Mass/1000 as LEO_Metric_Tons, LC.SSO_Mass/1000 as SSO_Metric_Tons, --converts masses to be in metric tons
-        
-        case when LEO_Mass < 2000 then 'Small'
-        when LEO_Mass >=2000 and LEO_Mass < 20000 then 'Medium'
-        when LEO_Mass >=20000 and LEO_Mass < 50000 then 'Heavy'
-        when LEO_Mass >=50000 then 'Super Heavy'
-        else 'Undetermined' end as LV_Size,
-        case when SL.Starlink is not null then 1 else NULL end as Starlink_Mission
-
-        from McDowell_Launch_List as L
-        left join McDowell_Launch_Sites as LS
-        on LS.Site_Code = 
-            case when right(L.Launch_Site,1) = '?' then left(L.Launch_Site,len(L.Launch_Site)-1)
-            else L.Launch_Site end
-        left join Global_Data.dbo.Countries as C
-        on LS.StateCode = C.SatCatAbv
-        left join (	select UCode, max(Name) as Name
-                    from McDowell_Launch_Sites
-                    where TStop in ('*', '-') or TStop is null
-                    group by UCode) as LS2
-        on LS.UCode = LS2.UCode
-        left join Launcher_Capabilities as LC
-        on L.LV_Type = LC.LV_Type and isnull(L.Variant, '') = isnull(LC.Variant, '')
-        left join Parent_Launch_Sites as P
-        on P.Site_Code = LS.Site_Code
-        left join Parent_Launchers as PL
-        on PL.LV_Type = L.LV_Type
-        left join (select distinct left(OBJECT_ID,8) as Starlink
-                    from Celestrak_SATCAT
-                    where OBJECT_NAME like 'Starlink%') as SL
-        on SL.Starlink = Launch_Tag
-        where Launch_Date is not NULL
-""",
+        query=LAUNCH_EXPORT_QUERY,
         output="launch_data.json",
+        formats=("rows", "columnar"),
+        compress=("gzip", "br"),
+        sources=(MATERIALIZED_TABLE,),
+        rollups=LAUNCH_ROLLUPS,
     ),
 )
 
 
+@dataclass
+class ExportResult:
+    name: str
+    status: str  # "written", "unchanged" (queried, identical output) or "skipped" (sources unchanged)
+    stats: dict[str, Any]
+
+
 def load_env() -> None:
     """Populate environment variables from .env.local if they are not set."""
     if not ENV_FILE.exists():
@@ -150,6 +125,13 @@ def ensure_tasks_defined() -> None:
         raise SystemExit(
             "No export tasks configured. Update EXPORT_TASKS in scripts/export_charts.py with your SQL views."
         )
+    for task in EXPORT_TASKS:
+        unknown = [fmt for fmt in task.formats if fmt not in OUTPUT_FORMATS]
+        if unknown or not task.formats:
+            raise SystemExit(f"Export task {task.name} has invalid formats {task.formats}; use {OUTPUT_FORMATS}.")
+        problems = check_rollups(task.rollups)
+        if problems:
+            raise SystemExit(f"Export task {task.name} has invalid rollups: {'; '.join(problems)}.")
 
 
 def serialize_value(value: Any) -> Any:
@@ -162,43 +144,333 @@ def serialize_value(value: Any) -> Any:
     return value
 
 
-def rows_to_dicts(rows: Iterable[pyodbc.Row], columns: list[str]) -> list[dict[str, Any]]:
-    records: list[dict[str, Any]] = []
-    for row in rows:
-        record = {}
-        for column, value in zip(columns, row):
-            record[column] = serialize_value(value)
-        records.append(record)
-    return records
+def _utc_isoformat(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+def column_converter(type_code: Any) -> Converter | None:
+    """Pick the JSON converter for a result column from its ``cursor.description`` type code.
+
+    Returns ``None`` for columns that ``json`` can write as-is. Drivers that do not report a type (``type_code`` is
+    ``None``) fall back to the per-value :func:`serialize_value`.
+    """
+    if type_code in (str, int, float, bool):
+        return None
+    if type_code is datetime:
+        return _utc_isoformat
+    if type_code in (date, time):
+        return type_code.isoformat
+    if type_code is Decimal:
+        return float
+    return serialize_value
+
+
+def column_converters(description: Sequence[Sequence[Any]]) -> list[tuple[int, Converter]]:
+    converters = [(index, column_converter(column[1])) for index, column in enumerate(description)]
+    return [(index, converter) for index, converter in converters if converter is not None]
+
+
+class ConnectionPool:
+    """A bounded pool of pyodbc connections; connections are opened lazily and never shared between threads."""
+
+    def __init__(self, connection_string: str, size: int) -> None:
+        self.connection_string = connection_string
+        self.size = max(1, size)
+        self.idle: queue.LifoQueue[pyodbc.Connection] = queue.LifoQueue()
+        self.opened: list[pyodbc.Connection] = []
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(self.size)
+
+    @contextmanager
+    def connection(self) -> Iterator[pyodbc.Connection]:
+        with self.slots:
+            try:
+                connection = self.idle.get_nowait()
+            except queue.Empty:
+                import pyodbc
+
+                connection = instrument(pyodbc.connect(self.connection_string))
+                with self.lock:
+                    self.opened.append(connection)
+            try:
+                yield connection
+            finally:
+                self.idle.put(connection)
+
+    def close(self) -> None:
+        with self.lock:
+            for connection in self.opened:
+                connection.close()
+            self.opened.clear()
+
+
+def iter_batches(
+    cursor: pyodbc.Cursor, converters: list[tuple[int, Converter]], timing: dict[str, float] | None = None
+) -> Iterator[list[list[Any]]]:
+    """Yield the result set in ``fetchmany`` batches with every value already converted for JSON.
+
+    Time spent waiting on the driver is added to ``timing["sql_seconds"]`` when ``timing`` is given.
+    """
+    while True:
+        started = perf_counter()
+        batch = cursor.fetchmany(FETCH_BATCH_ROWS)
+        if timing is not None:
+            timing["sql_seconds"] += perf_counter() - started
+        if not batch:
+            return
+        converted = []
+        for row in batch:
+            values = list(row)
+            for index, convert in converters:
+                value = values[index]
+                if value is not None:
+                    values[index] = convert(value)
+            converted.append(values)
+        yield converted
+
+
+class JsonRowsWriter:
+    """Streams converted batches to ``fh`` as a JSON array of objects, one object per line."""
 
+    def __init__(self, columns: list[str], fh) -> None:
+        self.columns = columns
+        self.fh = fh
+        self.rows = 0
+        self.encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        fh.write("[")
 
-def export_task(cursor: pyodbc.Cursor, task: ExportTask) -> dict[str, Any]:
-    cursor.execute(task.query)
+    def add_batch(self, batch: list[list[Any]]) -> None:
+        lines = ",\n".join(self.encode(dict(zip(self.columns, values))) for values in batch)
+        self.fh.write(("\n" if self.rows == 0 else ",\n") + lines)
+        self.rows += len(batch)
+
+    def close(self) -> None:
+        self.fh.write("\n]\n")
+
+
+@contextmanager
+def atomic_output(path: Path, hashes: dict[str, str] | None = None) -> Iterator[Any]:
+    """Write next to ``path`` and swap it in on success, so the site never picks up a half-written file.
+
+    The new content's SHA-256 is stored in ``hashes[path.name]``; a file identical to the existing one is discarded
+    instead of replacing it, leaving its modification time and the git tree untouched.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            yield fh
+        digest = file_sha256(tmp_path)
+        if hashes is not None:
+            hashes[path.name] = digest
+        if not path.exists() or file_sha256(path) != digest:
+            os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def outputs_match(paths: Sequence[Path], hashes: dict[str, str]) -> bool:
+    return all(path.exists() and hashes.get(path.name) == file_sha256(path) for path in paths)
+
+
+def export_task(
+    cursor: pyodbc.Cursor, task: ExportTask, previous: dict[str, Any] | None = None, *, force: bool = False
+) -> ExportResult:
+    """Export one task unless its sources are unchanged since ``previous`` (its last metadata entry)."""
+    started = perf_counter()
+    stage = current()
+    previous = previous or {}
+    paths = task.output_paths()
+    with stage.phase("signature"):
+        signature = source_signature(cursor, task.sources) if task.sources else None
+    if (
+        not force
+        and signature is not None
+        and signature == previous.get("sources")
+        and outputs_match(list(paths.values()), previous.get("hashes") or {})
+    ):
+        stage.set(status="skipped")
+        return ExportResult(task.name, "skipped", previous)
+
+    # SQL time covers only execute and fetchmany, not the signature check or setup
+    query_started = perf_counter()
+    with stage.phase("query"):
+        cursor.execute(task.query)
+    timing = {"sql_seconds": perf_counter() - query_started}
     columns = [column[0] for column in cursor.description]
-    data = rows_to_dicts(cursor.fetchall(), columns)
+    converters = column_converters(cursor.description)
+    hashes: dict[str, str] = {}
+    existing = {fmt: path.exists() and file_sha256(path) for fmt, path in paths.items()}
+
+    with ExitStack() as stack:
+        row_writer = None
+        if "rows" in paths:
+            row_writer = JsonRowsWriter(columns, stack.enter_context(atomic_output(paths["rows"], hashes)))
+        columnar = ColumnarWriter(cursor.description) if "columnar" in paths else None
+        rollups = [RollupBuilder(rollup, columns, cursor.description) for rollup in task.rollups]
+        rows = 0
+        for batch in stage.timed(iter_batches(cursor, converters, timing), "fetch"):
+            with stage.phase("write"):
+                if row_writer is not None:
+                    row_writer.add_batch(batch)
+                # The columnar output and the rollups read the batch column by column; transpose it once for both
+                batch_columns = list(zip(*batch)) if columnar is not None or rollups else None
+                if columnar is not None:
+                    columnar.add_columns(batch_columns)
+            if rollups:
+                with stage.phase("rollup"):
+                    for builder in rollups:
+                        builder.add_columns(batch_columns)
+            rows += len(batch)
+        with stage.phase("write"):
+            if row_writer is not None:
+                row_writer.close()
+            if columnar is not None:
+                columnar.write(stack.enter_context(atomic_output(paths["columnar"], hashes)))
+        groups = {}
+        with stage.phase("rollup"):
+            for builder in rollups:
+                name = builder.rollup.name
+                with atomic_output(paths[f"rollup:{name}"], hashes) as fh:
+                    groups[name] = builder.write(fh)
+
+    changed = {fmt for fmt, path in paths.items() if existing[fmt] != hashes[path.name]}
+    files = {path.name: path.stat().st_size for path in paths.values()}
+    with stage.phase("compress"):
+        for fmt, path in paths.items():
+            files.update(write_compressed(path, task.compress, only_missing=fmt not in changed))
+    stage.set(rows=rows, bytes=sum(files.values()))
+
+    if not changed and previous.get("hashes") == hashes:
+        stats = dict(previous)
+        if signature is not None:
+            stats["sources"] = signature
+        return ExportResult(task.name, "unchanged", stats)
+
+    stats = {
+        "rows": rows,
+        "file": next(iter(paths.values())).name,
+        "files": files,
+        "hashes": hashes,
+        "bytes": sum(files.values()),
+        "seconds": round(perf_counter() - started, 3),
+        "sqlSeconds": round(timing["sql_seconds"], 3),
+    }
+    if groups:
+        stats["rollups"] = groups
+    if signature is not None:
+        stats["sources"] = signature
+    return ExportResult(task.name, "written", stats)
 
-    output_path = DATA_DIR / task.output
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2, ensure_ascii=False)
-        fh.write("\n")
 
-    return {"rows": len(data), "file": output_path.name}
+def describe_result(result: ExportResult) -> str:
+    stats = result.stats
+    if result.status == "skipped":
+        return "sources unchanged, skipped"
+    if result.status == "unchanged":
+        return "output unchanged"
+    return (
+        f"{stats['rows']} rows, {stats['bytes']} bytes in {stats['seconds']:.1f}s (SQL {stats['sqlSeconds']:.1f}s)"
+    )
 
 
-def update_metadata(stats: dict[str, dict[str, Any]]) -> None:
+def run_exports(
+    connection_string: str,
+    tasks: Sequence[ExportTask],
+    workers: int = EXPORT_WORKERS,
+    previous: dict[str, dict[str, Any]] | None = None,
+    *,
+    force: bool = False,
+) -> tuple[dict[str, ExportResult], dict[str, BaseException]]:
+    """Run ``tasks`` concurrently on a bounded connection pool; pyodbc releases the GIL while SQL Server works.
+
+    ``previous`` holds the last metadata entry of each export, used to skip tasks whose sources are unchanged.
+    Returns the results of the exports that succeeded and the errors of those that failed, so one broken view does
+    not discard the others.
+    """
+    pool = ConnectionPool(connection_string, min(workers, len(tasks)))
+    previous = previous or {}
+
+    def run(task: ExportTask) -> ExportResult:
+        with span(f"export {task.name}"), pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                return export_task(cursor, task, previous.get(task.name), force=force)
+            finally:
+                cursor.close()
+
+    results: dict[str, ExportResult] = {}
+    errors: dict[str, BaseException] = {}
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            futures = {executor.submit(bind(run), task): task for task in tasks}
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    result = results[task.name] = future.result()
+                except Exception as error:
+                    errors[task.name] = error
+                    print(f"{task.name}: export failed - {error}")
+                    continue
+                print(f"{task.name}: {describe_result(result)}")
+    finally:
+        pool.close()
+    # Keep the configured task order in the metadata regardless of completion order
+    return {task.name: results[task.name] for task in tasks if task.name in results}, errors
+
+
+def read_metadata() -> dict[str, Any]:
+    meta_path = DATA_DIR / "last-updated.json"
+    if not meta_path.exists():
+        return {}
+    return json.loads(meta_path.read_text(encoding="utf-8-sig"))
+
+
+def update_metadata(stats: dict[str, dict[str, Any]], seconds: float | None = None, *, changed: bool = True) -> bool:
+    """Merge ``stats`` into ``last-updated.json``; returns whether the file was rewritten.
+
+    ``lastUpdated`` only moves when an export's content ``changed``, and a run that changed nothing leaves the file
+    untouched so it does not produce a commit.
+    """
+    previous = read_metadata()
+    # Exports that failed this run keep their previous entry
+    exports = {**(previous.get("exports") or {}), **stats}
+    if not changed and exports == previous.get("exports"):
+        return False
     metadata = {
-        "charts": len(stats),
-        "lastUpdated": datetime.now(timezone.utc).isoformat(),
-        "exports": stats,
+        "charts": len(exports),
+        "lastUpdated": datetime.now(timezone.utc).isoformat() if changed else previous.get("lastUpdated"),
+        "exportSeconds": seconds if changed else previous.get("exportSeconds"),
+        "exports": exports,
     }
+    # Written by scenario_tiles.update_tile_metadata
+    if previous.get("scenarioTiles"):
+        metadata["scenarioTiles"] = previous["scenarioTiles"]
     meta_path = DATA_DIR / "last-updated.json"
     with meta_path.open("w", encoding="utf-8") as fh:
         json.dump(metadata, fh, indent=2)
         fh.write("\n")
+    return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="re-run every query even if its sources are unchanged")
+    parser.add_argument("--skip-tiles", action="store_true", help="do not regenerate the precomputed scenario tiles")
+    parser.add_argument("--report", type=Path, help="write the JSON run report here (default .cache/reports/)")
+    parser.add_argument("--trace", type=Path, help="also write a Chrome trace of the run")
+    parser.add_argument(
+        "--trace-memory", action="store_true", default=TRACE_MEMORY, help="record tracemalloc peaks per stage (slow)"
+    )
+    args = parser.parse_args(argv)
 
+    with report_run("export_charts", report=args.report, trace=args.trace, memory=args.trace_memory):
+        run_export_charts(args)
 
-def main() -> None:
+
+def run_export_charts(args: argparse.Namespace) -> None:
     load_env()
     ensure_tasks_defined()
 
@@ -211,14 +483,30 @@ def main() -> None:
 
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-    with pyodbc.connect(connection_string) as connection:
-        cursor = connection.cursor()
-        results: dict[str, dict[str, Any]] = {}
-        for task in EXPORT_TASKS:
-            results[task.name] = export_task(cursor, task)
+    started = perf_counter()
+    previous = read_metadata().get("exports") or {}
+    results, errors = run_exports(connection_string, EXPORT_TASKS, previous=previous, force=args.force)
+    seconds = round(perf_counter() - started, 3)
+
+    written = [name for name, result in results.items() if result.status == "written"]
+    if results:
+        update_metadata({name: result.stats for name, result in results.items()}, seconds, changed=bool(written))
+    print(
+        f"Exported {len(results)} chart dataset(s) to {DATA_DIR} in {seconds:.1f}s; "
+        f"{len(written)} changed, {len(results) - len(written)} unchanged"
+    )
 
-    update_metadata(results)
-    print(f"Exported {len(results)} chart dataset(s) to {DATA_DIR}")
+    if not args.skip_tiles:
+        with span("tiles") as stage:
+            tiles = write_scenario_tiles()
+            update_tile_metadata(tiles)
+            stage.set(tiles=tiles["tiles"], bytes=tiles["bytes"], changed=tiles["changed"])
+        print(
+            f"Scenario tiles: {tiles['tiles']} tiles, {tiles['bytes']} bytes, grid computed in "
+            f"{tiles['gridSeconds']:.2f}s ({'changed' if tiles['changed'] else 'unchanged'})"
+        )
+    if errors:
+        raise SystemExit(f"{len(errors)} export(s) failed: {', '.join(errors)}")
 
 
 if __name__ == "__main__":
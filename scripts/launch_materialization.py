@@ -0,0 +1,336 @@
+"""Persisted, indexed materialization of the enriched launch list behind the Launch_Data export.
+
+The date parsing, site/vehicle joins and category mappings used to run inside the export query on every refresh. They
+now live in the ``Launch_Data_Enriched_Source`` view and are materialized into the ``Launch_Data_Enriched`` table
+(clustered on ``Launch_Tag``, indexed on ``Formated_Date``) as part of the load, so the export is a plain scan.
+
+The hard-coded ``StateCode``/``Launch_Code`` CASE mappings are replaced by three lookup tables kept in sync with the
+constants below. The refresh is incremental: it is skipped when no source table moved since the last build (see
+``table_sync.source_signature``), and otherwise a MERGE keyed on a SHA-256 of each enriched row only writes launches
+that changed. The view must yield one row per ``Launch_Tag``; a join that fans out stops the refresh before the MERGE.
+"""
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Sequence
+
+from table_sync import (
+    GenerationCheckError,
+    SyncResult,
+    current_generation,
+    ensure_generation_table,
+    quote_name,
+    record_generation,
+    source_signature,
+    table_exists,
+)
+
+if TYPE_CHECKING:
+    import pyodbc
+
+MATERIALIZED_TABLE = "Launch_Data_Enriched"
+SOURCE_VIEW = "Launch_Data_Enriched_Source"
+STATE_TABLE = "Materialization_State"
+
+STATE_CODE_TABLE = "State_Code_Mappings"
+LAUNCH_CATEGORY_TABLE = "Launch_Category_Codes"
+LAUNCH_OUTCOME_TABLE = "Launch_Outcome_Codes"
+
+SOURCE_TABLES: tuple[str, ...] = (
+    "McDowell_Launch_List",
+    "McDowell_Launch_Sites",
+    "Global_Data.dbo.Countries",
+    "Launcher_Capabilities",
+    "Parent_Launch_Sites",
+    "Parent_Launchers",
+    "Celestrak_SATCAT",
+)
+
+# StateCode, Country (overrides Countries.Country_Name), Country_Group (always applies),
+# Fallback_Group and Fallback_COCOM_AOR (only used when Countries has no Relationship / COCOM_AOR for the state)
+STATE_CODE_MAPPINGS: tuple[tuple[str, str | None, str | None, str | None, str | None], ...] = (
+    ("US", None, "United States", None, "NORTHCOM"),
+    ("TTPI", "United States", "United States", None, "NORTHCOM"),
+    ("PCZ", "United States", "United States", None, "NORTHCOM"),
+    ("UM67", "United States", "United States", None, "NORTHCOM"),
+    ("PR", "United States", "United States", None, "NORTHCOM"),
+    ("GU", "United States", "United States", None, "NORTHCOM"),
+    ("SU", "Russia/Soviet Union", "Russia/Soviet Union", None, "EUCOM"),
+    ("RU", "Russia/Soviet Union", "Russia/Soviet Union", None, "EUCOM"),
+    ("CN", None, "China", None, None),
+    ("AAT", "Australia", None, None, "INDOPACOM"),
+    ("NZRD", "New Zealand", None, None, "INDOPACOM"),
+    ("DR", "Germany", None, "NATO Ally", "EUCOM"),
+    ("DD", "Germany", None, "NATO Ally", "EUCOM"),
+    ("GUF", "France", None, "NATO Ally", "EUCOM"),
+    ("DZ", "France", None, "NATO Ally", "EUCOM"),
+    ("ESCN", "Spain", None, "NATO Ally", "EUCOM"),
+    ("BAT", "United Kingdom", None, "NATO Ally", "EUCOM"),
+    ("FR", None, None, "NATO Ally", "EUCOM"),
+    ("UK", None, None, "NATO Ally", "EUCOM"),
+)
+
+# First character of Launch_Code
+LAUNCH_CATEGORY_CODES: tuple[tuple[str, str], ...] = (
+    ("M", "Military Missile"),
+    ("O", "Orbital"),
+    ("T", "Test Rocket"),
+    ("A", "Atmospheric Rocket"),
+    ("S", "Suborbital Rocket"),
+    ("H", "Sounding Rocket"),
+    ("R", "Reentry Test"),
+    ("X", "Non-Earth Launch"),
+    ("Y", "Suborbital Spaceplane"),
+    ("D", "Deep Space"),
+)
+
+# Second character of Launch_Code
+LAUNCH_OUTCOME_CODES: tuple[tuple[str, str], ...] = (
+    ("S", "Success"),
+    ("F", "Failure"),
+    ("U", "Unknown"),
+    ("E", "Pad Explosion"),
+)
+
+LOOKUP_TABLES: tuple[tuple[str, str, Sequence[tuple]], ...] = (
+    (
+        STATE_CODE_TABLE,
+        "StateCode nvarchar(16) not null primary key, Country nvarchar(128) null, Country_Group nvarchar(64) null, "
+        "Fallback_Group nvarchar(64) null, Fallback_COCOM_AOR nvarchar(32) null",
+        STATE_CODE_MAPPINGS,
+    ),
+    (
+        LAUNCH_CATEGORY_TABLE,
+        "Code nchar(1) not null primary key, Category nvarchar(64) not null",
+        LAUNCH_CATEGORY_CODES,
+    ),
+    (
+        LAUNCH_OUTCOME_TABLE,
+        "Code nchar(1) not null primary key, Outcome nvarchar(64) not null",
+        LAUNCH_OUTCOME_CODES,
+    ),
+)
+
+ENRICHED_COLUMNS: tuple[str, ...] = (
+    "Launch_Year", "Formated_Date", "Launch_Date", "Launch_Tag", "LV_Type", "Image_URL", "Image_File", "Variant",
+    "StateCode", "Parent_Name", "Latitude", "Longitude", "Launch_Site_Name", "Country", "Launch_Category",
+    "Launch_Success", "Country_Groups", "COCOM_AOR", "LEO_Metric_Tons", "SSO_Metric_Tons", "LV_Size",
+    "Starlink_Mission",
+)
+
+SOURCE_VIEW_SQL = f"""
+create or alter view {SOURCE_VIEW} as
+select left(Launch_Date,4) as Launch_Year,
+
+cast((case when Launch_Date not like '%Q%' and substring(Launch_Date, 10, 2) <> '' and substring(Launch_Date, 6, 3) <> '' then substring(Launch_Date, 10, 2) + '-' + substring(Launch_Date, 6, 3) + '-' + substring(Launch_Date, 1,4)
+    when substring(Launch_Date, 10, 2) = '' and Launch_Date not like '%Q%' and substring(Launch_Date, 6, 3) <> '' then '01-' + substring(Launch_Date, 6, 3) + '-' + substring(Launch_Date, 1,4)
+    else '01-01-' + substring(Launch_Date, 1,4) end) as date) as Formated_Date,
+
+Launch_Date, Launch_Tag, L.LV_Type, PL.Image_URL, PL.Image_File, L.Variant, LS.StateCode,
+
+case when PL.Parent_Name is null then L.LV_Type
+else PL.Parent_Name end as Parent_Name,
+
+case when P.Latitude is not NULL then P.Latitude
+else LS.Latitude end as Latitude,
+
+case when P.Longitude is not NULL then P.Longitude
+else LS.Longitude end as Longitude,
+
+case when P.Parent_Name is not NULL then P.Parent_Name
+when LS2.Name is not NULL then LS2.Name
+else LS.Name end as Launch_Site_Name,
+
+coalesce(SC.Country, C.Country_Name) as Country,
+coalesce(LCat.Category, left(L.Launch_Code,1)) as Launch_Category,
+coalesce(LOut.Outcome, substring(L.Launch_Code,2,1)) as Launch_Success,
+
+coalesce(SC.Country_Group,
+    case when C.Relationship in ('NATO Ally', 'Major Non-NATO Ally') then C.Relationship
+    when C.Relationship is null then coalesce(SC.Fallback_Group, 'Other')
+    else 'Other' end) as Country_Groups,
+
+coalesce(C.COCOM_AOR, SC.Fallback_COCOM_AOR) as COCOM_AOR,
+LC.LEO_Mass/1000 as LEO_Metric_Tons, LC.SSO_Mass/1000 as SSO_Metric_Tons, --converts masses to be in metric tons
+
+case when LEO_Mass < 2000 then 'Small'
+when LEO_Mass >=2000 and LEO_Mass < 20000 then 'Medium'
+when LEO_Mass >=20000 and LEO_Mass < 50000 then 'Heavy'
+when LEO_Mass >=50000 then 'Super Heavy'
+else 'Undetermined' end as LV_Size,
+case when SL.Starlink is not null then 1 else NULL end as Starlink_Mission
+
+from McDowell_Launch_List as L
+left join McDowell_Launch_Sites as LS
+on LS.Site_Code =
+    case when right(L.Launch_Site,1) = '?' then left(L.Launch_Site,len(L.Launch_Site)-1)
+    else L.Launch_Site end
+left join Global_Data.dbo.Countries as C
+on LS.StateCode = C.SatCatAbv
+left join {STATE_CODE_TABLE} as SC
+on SC.StateCode = LS.StateCode
+left join {LAUNCH_CATEGORY_TABLE} as LCat
+on LCat.Code = left(L.Launch_Code,1)
+left join {LAUNCH_OUTCOME_TABLE} as LOut
+on LOut.Code = substring(L.Launch_Code,2,1)
+left join (	select UCode, max(Name) as Name
+            from McDowell_Launch_Sites
+            where TStop in ('*', '-') or TStop is null
+            group by UCode) as LS2
+on LS.UCode = LS2.UCode
+left join Launcher_Capabilities as LC
+on L.LV_Type = LC.LV_Type and isnull(L.Variant, '') = isnull(LC.Variant, '')
+left join Parent_Launch_Sites as P
+on P.Site_Code = LS.Site_Code
+left join Parent_Launchers as PL
+on PL.LV_Type = L.LV_Type
+left join (select distinct left(OBJECT_ID,8) as Starlink
+            from Celestrak_SATCAT
+            where OBJECT_NAME like 'Starlink%') as SL
+on SL.Starlink = Launch_Tag
+where Launch_Date is not NULL
+"""
+
+# Plain scan of the materialized table, in the column order the export has always had
+EXPORT_QUERY = f"select {', '.join(ENRICHED_COLUMNS)} from {MATERIALIZED_TABLE}"
+
+
+def sync_lookup(cursor: pyodbc.Cursor, table: str, columns_sql: str, rows: Sequence[tuple]) -> bool:
+    """Create ``table`` if needed and make its rows match ``rows``; returns whether anything changed."""
+    cursor.execute(f"if object_id(?, 'U') is null create table {quote_name(table)} ({columns_sql})", table)
+    cursor.execute(f"select * from {quote_name(table)}")
+    if {tuple(row) for row in cursor.fetchall()} == set(rows):
+        return False
+    cursor.execute(f"delete from {quote_name(table)}")
+    placeholders = ", ".join("?" for _ in rows[0])
+    cursor.executemany(f"insert into {quote_name(table)} values ({placeholders})", list(rows))
+    return True
+
+
+def ensure_materialized_table(cursor: pyodbc.Cursor) -> None:
+    if table_exists(cursor, MATERIALIZED_TABLE):
+        return
+    target = quote_name(MATERIALIZED_TABLE)
+    cursor.execute(f"select top 0 *, cast(null as binary(32)) as Row_Hash into {target} from {SOURCE_VIEW}")
+    cursor.execute(f"alter table {target} alter column Launch_Tag nvarchar(64) not null")
+    cursor.execute(f"alter table {target} add constraint PK_{MATERIALIZED_TABLE} primary key clustered (Launch_Tag)")
+    cursor.execute(f"create index IX_{MATERIALIZED_TABLE}_Formated_Date on {target} (Formated_Date)")
+
+
+def read_state(cursor: pyodbc.Cursor) -> str | None:
+    cursor.execute(
+        f"""
+        if object_id('{STATE_TABLE}', 'U') is null
+        create table {STATE_TABLE} (
+            Name nvarchar(128) not null primary key,
+            Signature nvarchar(max) not null,
+            Built_At datetime2 not null default sysutcdatetime()
+        )
+        """
+    )
+    cursor.execute(f"select Signature from {STATE_TABLE} where Name = ?", MATERIALIZED_TABLE)
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def write_state(cursor: pyodbc.Cursor, signature: str) -> None:
+    cursor.execute(
+        f"""
+        merge {STATE_TABLE} as T
+        using (select ? as Name, ? as Signature) as S on T.Name = S.Name
+        when matched then update set Signature = S.Signature, Built_At = sysutcdatetime()
+        when not matched then insert (Name, Signature) values (S.Name, S.Signature);
+        """,
+        MATERIALIZED_TABLE,
+        signature,
+    )
+
+
+def check_unique_launches(cursor: pyodbc.Cursor) -> None:
+    """Fail before the MERGE when a join in the view yields more than one row for a launch."""
+    cursor.execute(
+        f"select top 5 Launch_Tag, count_big(*) from {SOURCE_VIEW} group by Launch_Tag having count_big(*) > 1 "
+        "order by count_big(*) desc, Launch_Tag"
+    )
+    duplicates = cursor.fetchall()
+    if duplicates:
+        listed = ", ".join(f"{tag} ({count} rows)" for tag, count in duplicates)
+        raise GenerationCheckError(
+            f"{SOURCE_VIEW} returns more than one row for some launches, e.g. {listed}; check the joins against "
+            f"its source tables. {MATERIALIZED_TABLE} was left untouched."
+        )
+
+
+def row_hash_expression(alias: str) -> str:
+    """SHA-256 of the row as JSON: every type is written at full precision and nulls are kept by name, so values
+    that a plain concatenation or ``binary_checksum`` would confuse (reordered, shifted, re-cased) hash differently."""
+    fields = ", ".join(f"{alias}.{column} as {column}" for column in ENRICHED_COLUMNS)
+    return f"hashbytes('SHA2_256', (select {fields} for json path, without_array_wrapper, include_null_values))"
+
+
+def merge_statement() -> str:
+    """MERGE the view into the materialized table, writing only rows whose ``Row_Hash`` changed."""
+    columns = ", ".join(ENRICHED_COLUMNS)
+    values = ", ".join(f"S.{column}" for column in ENRICHED_COLUMNS)
+    updates = ", ".join(f"{column} = S.{column}" for column in ENRICHED_COLUMNS if column != "Launch_Tag")
+    return f"""
+        set nocount on;
+        declare @changes table (Change nvarchar(10));
+        merge {MATERIALIZED_TABLE} with (holdlock) as T
+        using (select {columns}, {row_hash_expression("V")} as Row_Hash from {SOURCE_VIEW} as V) as S
+        on T.Launch_Tag = S.Launch_Tag
+        when matched and (T.Row_Hash is null or T.Row_Hash <> S.Row_Hash)
+            then update set {updates}, Row_Hash = S.Row_Hash
+        when not matched by target then insert ({columns}, Row_Hash) values ({values}, S.Row_Hash)
+        when not matched by source then delete
+        output $action into @changes;
+        select
+            sum(case when Change = 'INSERT' then 1 else 0 end),
+            sum(case when Change = 'UPDATE' then 1 else 0 end),
+            sum(case when Change = 'DELETE' then 1 else 0 end)
+        from @changes;
+    """
+
+
+def refresh_launch_data(cnxn: pyodbc.Connection, *, force: bool = False) -> SyncResult | None:
+    """Bring ``Launch_Data_Enriched`` up to date; returns ``None`` when no source changed since the last build.
+
+    Lookup sync, MERGE and the generation record commit as one transaction, so the export never sees a half-applied
+    refresh. A build that changed rows records a new ``Load_Generations`` entry, which the export uses to skip itself.
+    """
+    cursor = cnxn.cursor()
+    try:
+        ensure_generation_table(cursor)
+        lookups_changed = False
+        for table, columns_sql, rows in LOOKUP_TABLES:
+            lookups_changed |= sync_lookup(cursor, table, columns_sql, rows)
+        cursor.execute(SOURCE_VIEW_SQL)
+        ensure_materialized_table(cursor)
+
+        signature = json.dumps(source_signature(cursor, SOURCE_TABLES), sort_keys=True)
+        if not force and not lookups_changed and read_state(cursor) == signature:
+            cnxn.commit()
+            return None
+
+        check_unique_launches(cursor)
+        cursor.execute(merge_statement())
+        inserted, updated, deleted = (int(count or 0) for count in cursor.fetchone())
+        rows = int(cursor.execute(f"select count_big(*) from {MATERIALIZED_TABLE}").fetchone()[0])
+        if inserted or updated or deleted:
+            generation = record_generation(cursor, MATERIALIZED_TABLE, "materialize", rows)
+        else:
+            generation = current_generation(cursor, MATERIALIZED_TABLE)
+        write_state(cursor, signature)
+        cnxn.commit()
+    except Exception:
+        cnxn.rollback()
+        raise
+    return SyncResult(
+        table=MATERIALIZED_TABLE,
+        mode="materialize",
+        inserted=inserted,
+        updated=updated,
+        deleted=deleted,
+        unchanged=rows - inserted - updated,
+        generation=generation,
+    )
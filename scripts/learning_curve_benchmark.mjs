@@ -0,0 +1,90 @@
+// Accuracy and speed of computeLearningCurveCost (src/model/learningCurve.js) against the per-unit loop it replaced.
+//
+//   node scripts/learning_curve_benchmark.mjs [maxUnits]
+//
+// Accuracy: relative error of the loop and of the new evaluation against a compensated (Neumaier) summation, over a
+// grid of learning percents and unit counts up to maxUnits (default 1e6). Speed: time per call for each unit count,
+// and a 3000-point sweep with unit counts spread across the same range, as buildChartState would evaluate.
+import { performance } from 'node:perf_hooks';
+import { EXACT_UNIT_LIMIT, computeLearningCurveCost } from '../src/model/learningCurve.js';
+
+const FIRST_UNIT_COST = 70;
+const LEARNING_PERCENTS = [70, 75, 80, 85, 90, 95, 99, 99.9, 100];
+const SWEEP_POINTS = 3000;
+
+const maxUnits = Number(process.argv[2] ?? 1e6);
+const unitCounts = [1, 10, 100, EXACT_UNIT_LIMIT, EXACT_UNIT_LIMIT + 1, 1e4, 1e5, 1e6, 1e7].filter((units) => units <= maxUnits);
+
+const loopCost = (first, learningPercent, units) => {
+  const exponent = Math.log(learningPercent / 100) / Math.log(2);
+  let total = 0;
+  for (let unitNumber = 1; unitNumber <= units; unitNumber += 1) {
+    total += first * Math.pow(unitNumber, exponent);
+  }
+  return total;
+};
+
+const compensatedCost = (first, learningPercent, units) => {
+  const exponent = Math.log(learningPercent / 100) / Math.log(2);
+  let sum = 0;
+  let compensation = 0;
+  for (let unitNumber = 1; unitNumber <= units; unitNumber += 1) {
+    const term = Math.pow(unitNumber, exponent);
+    const next = sum + term;
+    compensation += Math.abs(sum) >= Math.abs(term) ? (sum - next) + term : (term - next) + sum;
+    sum = next;
+  }
+  return first * (sum + compensation);
+};
+
+const timePerCall = (fn, args, minMs = 200) => {
+  let calls = 0;
+  const start = performance.now();
+  let elapsed = 0;
+  while (elapsed < minMs) {
+    fn(...args);
+    calls += 1;
+    elapsed = performance.now() - start;
+  }
+  return elapsed / calls;
+};
+
+const formatMs = (ms) => (ms < 0.01 ? `${(ms * 1000).toFixed(2)} µs` : `${ms.toFixed(2)} ms`);
+
+console.log('Accuracy (max relative error vs compensated sum over learning percents)');
+console.log('units'.padStart(10), 'loop'.padStart(12), 'closed form'.padStart(12));
+for (const units of unitCounts) {
+  let loopError = 0;
+  let newError = 0;
+  for (const percent of LEARNING_PERCENTS) {
+    const reference = compensatedCost(FIRST_UNIT_COST, percent, units);
+    loopError = Math.max(loopError, Math.abs(loopCost(FIRST_UNIT_COST, percent, units) - reference) / reference);
+    newError = Math.max(newError, Math.abs(computeLearningCurveCost(FIRST_UNIT_COST, percent, units) - reference) / reference);
+  }
+  console.log(String(units).padStart(10), loopError.toExponential(2).padStart(12), newError.toExponential(2).padStart(12));
+}
+
+console.log('\nTime per call at 85%');
+console.log('units'.padStart(10), 'loop'.padStart(12), 'closed form'.padStart(12));
+for (const units of unitCounts) {
+  const loopMs = timePerCall(loopCost, [FIRST_UNIT_COST, 85, units]);
+  const newMs = timePerCall(computeLearningCurveCost, [FIRST_UNIT_COST, 85, units]);
+  console.log(String(units).padStart(10), formatMs(loopMs).padStart(12), formatMs(newMs).padStart(12));
+}
+
+const sweepUnits = Array.from({ length: SWEEP_POINTS }, (_, index) =>
+  Math.round(Math.pow(maxUnits, index / (SWEEP_POINTS - 1)))
+);
+const sweep = (fn) => {
+  const start = performance.now();
+  let total = 0;
+  for (const units of sweepUnits) {
+    total += fn(FIRST_UNIT_COST, 85, units);
+  }
+  return { ms: performance.now() - start, total };
+};
+const loopSweep = sweep(loopCost);
+const newSweep = sweep(computeLearningCurveCost);
+console.log(
+  `\n${SWEEP_POINTS}-point sweep, 1..${maxUnits} units: loop ${formatMs(loopSweep.ms)}, closed form ${formatMs(newSweep.ms)}`
+);
@@ -0,0 +1,80 @@
+// Golden runner for model_golden.py: evaluates scenarios with the app's own model (src/model).
+//
+// Reads {"scenarios": [{"query": "?a=1", "inputs": {...}}, ...]} on stdin and writes one result per scenario:
+// the raw inputs are the defaults, overridden by URL query parameters the same way the app reads its URL, then by
+// "inputs". Non-finite numbers are written as null. The valid scenarios are also run as one batch through
+// evaluateBatch (batch.js), and every batch metric that differs from computeScenario is listed in "batchMismatches".
+import { BATCH_METRICS, evaluateBatch, toColumns } from '../src/model/batch.js';
+import { DEFAULT_INPUTS, FIELD_NAMES, FORM_SECTIONS, prepareInputs } from '../src/model/inputs.js';
+import { computeScenario } from '../src/model/scenario.js';
+
+const readStdin = async () => {
+  const chunks = [];
+  for await (const chunk of process.stdin) {
+    chunks.push(chunk);
+  }
+  return Buffer.concat(chunks).toString('utf8');
+};
+
+const inputsFromQuery = (query) => {
+  const params = new URLSearchParams(query ?? '');
+  const collected = {};
+  for (const name of FIELD_NAMES) {
+    const raw = params.get(name);
+    if (raw !== null && raw !== '') {
+      collected[name] = raw;
+    }
+  }
+  return collected;
+};
+
+const finiteOrNull = (value) => (typeof value === 'number' && !Number.isFinite(value) ? null : value);
+
+const evaluate = (scenario) => {
+  const raw = { ...DEFAULT_INPUTS, ...inputsFromQuery(scenario.query), ...(scenario.inputs ?? {}) };
+  const { numbers, errors } = prepareInputs(raw);
+  if (errors.length) {
+    return { errors, metrics: null, numbers: null, computed: null };
+  }
+  const { metrics } = computeScenario(numbers);
+  const serialised = {};
+  for (const [key, value] of Object.entries(metrics)) {
+    serialised[key] = finiteOrNull(value);
+  }
+  return { errors, metrics: serialised, numbers, computed: metrics };
+};
+
+// The batch kernel must reproduce computeScenario bit for bit (NaN where it gives NaN) on every valid scenario.
+const compareBatch = (scenarios, evaluated) => {
+  const indexes = evaluated.flatMap((result, index) => (result.numbers ? [index] : []));
+  const values = {};
+  for (const name of FIELD_NAMES) {
+    values[name] = Float64Array.from(indexes, (index) => evaluated[index].numbers[name]);
+  }
+  const batch = evaluateBatch(toColumns(values, indexes.length), indexes.length);
+  const mismatches = [];
+  indexes.forEach((index, row) => {
+    if (!batch.valid[row]) {
+      mismatches.push(`#${index} ${JSON.stringify(scenarios[index])}: batch marks a valid scenario invalid`);
+    }
+    for (const key of BATCH_METRICS) {
+      const want = evaluated[index].computed[key];
+      if (!Object.is(batch[key][row], want)) {
+        mismatches.push(`#${index} ${JSON.stringify(scenarios[index])}: batch ${key} ${batch[key][row]} != ${want}`);
+      }
+    }
+  });
+  return mismatches;
+};
+
+const request = JSON.parse(await readStdin());
+const evaluated = request.scenarios.map(evaluate);
+const fields = FORM_SECTIONS.flatMap((section) =>
+  section.fields.map(({ name, defaultValue, min, max, step }) => ({ name, defaultValue, min, max, step }))
+);
+
+process.stdout.write(JSON.stringify({
+  fields,
+  results: evaluated.map(({ errors, metrics }) => ({ errors, metrics })),
+  batchMismatches: compareBatch(request.scenarios, evaluated)
+}));
@@ -0,0 +1,175 @@
+"""Golden check of the vectorized model (``sbi_model``) against the JavaScript model the app runs.
+
+Builds a scenario set (the defaults, shared-URL style query strings and a seeded random fuzz across every field's
+range, including out-of-range and formatted values), evaluates it once through ``model_golden.mjs`` with Node and once
+as a single batch through :func:`sbi_model.evaluate`, and compares validation messages and every metric. The runner
+also checks the app's own batch kernel (``src/model/batch.js``) against ``computeScenario`` on the valid scenarios.
+Exits non-zero on any mismatch.
+
+    python scripts/model_golden.py --fuzz 5000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+from urllib.parse import parse_qsl
+
+import numpy as np
+
+from sbi_model import DEFAULT_INPUTS, FIELD_NAMES, FIELDS, FLYOUT_MESSAGES, evaluate, prepare_inputs
+from sbi_model.inputs import to_number
+
+RUNNER = Path(__file__).with_name("model_golden.mjs")
+RELATIVE_TOLERANCE = 1e-9
+ABSOLUTE_TOLERANCE = 1e-9
+
+QUERY_SCENARIOS = (
+    "",
+    "?salvoSize=10&killProbabilityPercent=60",
+    "?sbiOrbitAltitudeKm=1000&interceptAltitudeKm=100&flyoutTimeSeconds=300",
+    "?averageAccelerationG=2&maxDeltaVKmPerS=10",
+    "?interceptorLearningPercent=100&launchLearningPercent=70",
+    "?costEstimatePeriodYears=3&sbiLifeExpectancyYears=7",
+    "?maxLatitudeCoverageDeg=30&compositeKillProbabilityPercent=99.9",
+    "?payloadCapacityPerVehicleKg=15000&thrusterIspSeconds=100",
+    "?killVehicleDryMassKg=1%2C000",
+    "?divertVelocityKmPerS=7&maxDeltaVKmPerS=6",
+    "?salvoSize=&interceptAltitudeKm=400",
+    "?nonRecurringDevCostMillion=abc",
+)
+
+
+def scenario_inputs(scenario: dict[str, Any]) -> dict[str, Any]:
+    """Raw inputs for one scenario, built the way the runner (and the app's URL handling) builds them."""
+    raw: dict[str, Any] = dict(DEFAULT_INPUTS)
+    from_query: dict[str, str] = {}
+    for name, value in parse_qsl(scenario.get("query", "").lstrip("?"), keep_blank_values=True):
+        if name in DEFAULT_INPUTS and name not in from_query:
+            from_query[name] = value
+    raw.update({name: value for name, value in from_query.items() if value != ""})
+    raw.update(scenario.get("inputs", {}))
+    return raw
+
+
+def fuzz_scenarios(count: int, seed: int) -> list[dict[str, Any]]:
+    rng = np.random.default_rng(seed)
+    scenarios = []
+    for _ in range(count):
+        inputs: dict[str, Any] = {}
+        for spec in FIELDS:
+            low = spec.minimum if spec.minimum is not None else 0.0
+            high = spec.maximum if spec.maximum is not None else 4 * float(spec.default)
+            draw = rng.random()
+            if draw < 0.02:
+                value: float = low - (high - low) * rng.random() * 0.2
+            elif draw < 0.04:
+                value = high + (high - low) * rng.random() * 0.2
+            else:
+                value = low + (high - low) * rng.random()
+            step = float(spec.step)
+            value = round(round(value / step) * step, 6)
+            draw = rng.random()
+            if draw < 0.05:
+                inputs[spec.name] = value
+            elif draw < 0.07:
+                inputs[spec.name] = f" {value:,} "
+            else:
+                inputs[spec.name] = repr(value)
+        scenarios.append({"inputs": inputs})
+    return scenarios
+
+
+def run_node(scenarios: list[dict[str, Any]]) -> dict[str, Any]:
+    completed = subprocess.run(
+        ["node", str(RUNNER)],
+        input=json.dumps({"scenarios": scenarios}),
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"model_golden.mjs failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def check_fields(js_fields: list[dict[str, Any]]) -> list[str]:
+    problems = []
+    js = [(f["name"], f["defaultValue"], f.get("min"), f.get("max"), f["step"]) for f in js_fields]
+    py = [(spec.name, spec.default, spec.minimum, spec.maximum, spec.step) for spec in FIELDS]
+    for js_field, py_field in zip(js, py):
+        if js_field != py_field:
+            problems.append(f"field mismatch: js {js_field} vs python {py_field}")
+    if len(js) != len(py):
+        problems.append(f"field count mismatch: js {len(js)} vs python {len(py)}")
+    return problems
+
+
+def compare(scenarios: list[dict[str, Any]], js_results: list[dict[str, Any]], metrics, prepared) -> list[str]:
+    problems = []
+    messages = list(prepared.errors)
+    for index, (scenario, expected) in enumerate(zip(scenarios, js_results)):
+        errors = [message for message in messages if prepared.errors[message][index]]
+        if errors != expected["errors"]:
+            problems.append(f"#{index} {scenario}: errors {errors} != {expected['errors']}")
+            continue
+        if expected["metrics"] is None:
+            continue
+        for key, value in expected["metrics"].items():
+            if key == "interceptorFlyoutRangeMessage":
+                got = FLYOUT_MESSAGES[int(metrics["flyoutMessageCode"][index])]
+                if got != value:
+                    problems.append(f"#{index} {key}: {got!r} != {value!r}")
+                continue
+            got = float(metrics[key][index])
+            want = math.nan if value is None else float(value)
+            if math.isnan(want) and math.isnan(got):
+                continue
+            if not math.isclose(got, want, rel_tol=RELATIVE_TOLERANCE, abs_tol=ABSOLUTE_TOLERANCE):
+                problems.append(f"#{index} {scenario}: {key} {got!r} != {want!r}")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare the vectorized SBI model with the JavaScript model.")
+    parser.add_argument("--fuzz", type=int, default=2000, help="number of random scenarios (default 2000)")
+    parser.add_argument("--seed", type=int, default=20240601, help="seed for the random scenarios")
+    args = parser.parse_args(argv)
+
+    scenarios = [{"query": query} for query in QUERY_SCENARIOS] + fuzz_scenarios(args.fuzz, args.seed)
+
+    start = perf_counter()
+    golden = run_node(scenarios)
+    node_seconds = perf_counter() - start
+
+    start = perf_counter()
+    raws = [scenario_inputs(scenario) for scenario in scenarios]
+    columns = {name: np.array([to_number(raw[name]) for raw in raws]) for name in FIELD_NAMES}
+    prepared = prepare_inputs(columns)
+    metrics = evaluate(prepared.numbers)
+    python_seconds = perf_counter() - start
+
+    problems = check_fields(golden["fields"]) + compare(scenarios, golden["results"], metrics, prepared)
+    problems += golden["batchMismatches"]
+    valid = int(np.count_nonzero(prepared.valid))
+    print(
+        f"{len(scenarios)} scenarios ({valid} valid): node {node_seconds:.2f}s, "
+        f"numpy batch {python_seconds:.2f}s"
+    )
+    for problem in problems[:50]:
+        print(problem)
+    if problems:
+        print(f"{len(problems)} mismatches.")
+        return 1
+    print("Python and JavaScript models agree, and batch.js matches computeScenario.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
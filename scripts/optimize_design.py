@@ -0,0 +1,125 @@
+"""Find the cheapest SBI design that meets the fixed threat and requirement inputs.
+
+Non-design inputs come from the app's defaults, a shared scenario URL/query string (``--query``) and ``--set``
+overrides; the design variables are searched inside their default bounds unless ``--bounds`` or ``--hold`` change
+them. Prints the best design and the cost frontier across ``--salvo`` sizes.
+
+    python scripts/optimize_design.py --query "?killProbabilityPercent=70&flyoutTimeSeconds=200" \\
+        --salvo 1 2 5 10 20 --bounds sbiOrbitAltitudeKm=300:1200 --hold thrusterIspSeconds --json frontier.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+from sbi_model import DEFAULT_INPUTS, DESIGN_BOUNDS, DESIGN_VARIABLES, optimize_design
+
+
+def parse_assignment(text: str) -> tuple[str, str]:
+    name, separator, value = text.partition("=")
+    if not separator or not name:
+        raise SystemExit(f"Expected NAME=VALUE, got {text!r}.")
+    return name.strip(), value.strip()
+
+
+def parse_bounds(text: str) -> tuple[str, tuple[float, float]]:
+    name, value = parse_assignment(text)
+    low, separator, high = value.partition(":")
+    try:
+        return name, (float(low), float(high))
+    except ValueError:
+        raise SystemExit(f"Expected NAME=LOW:HIGH, got {text!r}.") from None
+
+
+def build_inputs(query: str, assignments: list[str]) -> dict[str, str]:
+    raw = dict(DEFAULT_INPUTS)
+    seen: set[str] = set()
+    for name, value in parse_qsl(urlsplit(query).query or query.lstrip("?"), keep_blank_values=True):
+        if name in DEFAULT_INPUTS and name not in seen and value != "":
+            raw[name] = value
+            seen.add(name)
+    for text in assignments:
+        name, value = parse_assignment(text)
+        if name not in DEFAULT_INPUTS:
+            raise SystemExit(f"Unknown input {name!r}.")
+        raw[name] = value
+    return raw
+
+
+def describe(design) -> str:
+    variables = ", ".join(f"{name}={design.inputs[name]:g}" for name in DESIGN_VARIABLES)
+    metrics = design.metrics
+    return (
+        f"salvo {design.salvo_size:g}: ${metrics['totalSystemCostMillion'] / 1000:,.1f}B, "
+        f"{metrics['constellationSize']:,.0f} interceptors, {metrics['launchCount']:,.0f} launches "
+        f"({metrics['interceptorsPerLaunch']:g}/launch, {metrics['interceptorMassKg']:,.0f} kg)\n    {variables}"
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Search the SBI design space for the minimum-cost design.")
+    parser.add_argument("--query", default="", help="scenario URL or query string with the fixed inputs")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="override a fixed input")
+    parser.add_argument(
+        "--bounds", action="append", default=[], metavar="NAME=LOW:HIGH", help="search range for a design variable"
+    )
+    parser.add_argument("--hold", action="append", default=[], metavar="NAME", help="keep a design variable fixed")
+    parser.add_argument("--salvo", type=float, nargs="*", default=[], help="salvo sizes for the cost frontier")
+    parser.add_argument("--points", type=int, default=24, help="grid points per variable and pass (default 24)")
+    parser.add_argument("--refinements", type=int, default=4, help="narrowing passes after the first grid")
+    parser.add_argument("--max-constellation", type=float, help="largest acceptable constellation")
+    parser.add_argument("--max-launches", type=float, help="largest acceptable number of launches per generation")
+    parser.add_argument("--workers", type=int, help="processes for the ΔV slices (default: CPU count)")
+    parser.add_argument("--json", type=Path, help="write the best design and frontier to this file")
+    args = parser.parse_args(argv)
+
+    bounds = dict(DESIGN_BOUNDS)
+    bounds.update(parse_bounds(text) for text in args.bounds)
+    for name in args.hold:
+        bounds.pop(name, None)
+
+    try:
+        result = optimize_design(
+            build_inputs(args.query, args.set),
+            bounds=bounds,
+            salvo_sizes=args.salvo,
+            grid_points=args.points,
+            refinements=args.refinements,
+            max_constellation=args.max_constellation,
+            max_launches=args.max_launches,
+            workers=args.workers,
+        )
+    except ValueError as error:
+        raise SystemExit(str(error)) from None
+
+    print(
+        f"Searched {result.candidates:,} candidate designs over {', '.join(result.free_variables) or 'no variables'} "
+        f"in {result.seconds:.2f}s."
+    )
+    if result.best is None:
+        print("No design inside the bounds meets the requirements.")
+    else:
+        print("Best design at the input salvo size:")
+        print("  " + describe(result.best))
+    if len(result.frontier) > 1:
+        print("Cost frontier:")
+        for design in result.frontier:
+            print("  " + describe(design))
+
+    if args.json:
+        payload = {
+            "freeVariables": list(result.free_variables),
+            "candidates": result.candidates,
+            "best": asdict(result.best) if result.best else None,
+            "frontier": [asdict(design) for design in result.frontier],
+        }
+        args.json.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return 0 if result.best is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,601 @@
+"""Offline throughput benchmark for the source load and chart export paths.
+
+Generates synthetic GCAT/Celestrak-shaped files (same columns, separators, sentinels, keys and typed columns as the
+specs in ``source_registry``) at multiples of the current catalog sizes, then for every source and scale runs:
+
+- ``load``: the first load, a full staged reload through ``table_sync.load_chunks`` (parse, fingerprint, insert
+  into ``<table>_Staging``, row count check, swap, fingerprint and generation writes);
+- ``update``: a nightly refresh against a revised file (1% of rows changed, 0.2% removed, 0.5% added), again through
+  ``load_chunks``: diff against the stored fingerprints, stage only the changed rows, then merge and delete with their
+  pre-images captured in ``<table>_Delta``;
+- ``export``: ``export_charts.export_task`` on the loaded table, writing rows and columnar JSON plus gzip siblings.
+
+The database is a local SQLite file standing in for SQL Server: :class:`SqliteDialect` replaces the loader's SQL
+Server-only statements, and everything else runs unchanged, with the phases the loader records. With
+``--connection-string`` (a scratch SQL Server database, e.g. a local container) the statements run as written, on
+``Bench_<table>`` tables. Each case runs in a fresh process so its peak RSS is its own. Results are printed,
+appended to ``.cache/benchmark/history.jsonl`` with the git commit, and optionally written to ``--json``;
+``--compare`` prints the change in rows/s and peak RSS against an earlier results file.
+
+    python scripts/pipeline_benchmark.py --scales 1 10 --json bench.json
+    python scripts/pipeline_benchmark.py --scales 1 10 --compare bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import multiprocessing
+import platform
+import shutil
+import sqlite3
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from export_charts import ExportTask, export_task
+from run_report import capture, peak_rss_bytes
+from source_registry import SOURCES, SOURCES_BY_NAME, SourceSpec, iter_source
+from table_sync import (
+    DELTA_SUFFIX,
+    FINGERPRINT_TABLE,
+    GENERATION_TABLE,
+    RETIRED_SUFFIX,
+    SQL_SERVER,
+    SqlServerDialect,
+    load_chunks,
+    quote_name,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+BENCH_DIR = ROOT / ".cache" / "benchmark"
+HISTORY_PATH = BENCH_DIR / "history.jsonl"
+RESULTS_VERSION = 1
+GENERATOR_VERSION = 1
+GENERATE_CHUNK_ROWS = 200_000
+DEFAULT_SCALES = (1, 10, 100)
+
+# Approximate row counts of the live files; scale 1 generates this many rows
+BASE_ROWS: dict[str, int] = {
+    "launch": 7_000,
+    "satcat": 68_000,
+    "celestrak_satcat": 64_000,
+    "sites": 1_700,
+    "orgs": 3_900,
+    "psatcat": 26_000,
+}
+
+# Raw header rows in file order; usecols in the specs pick from these by position
+HEADERS: dict[str, tuple[str, ...]] = {
+    "launch": (
+        "#Launch_Tag", "Launch_JD", "Launch_Date", "LV_Type", "Variant", "Flight_ID", "Flight", "Mission",
+        "FlightCode", "Platform", "Launch_Site", "Launch_Pad", "Ascent_Site", "Ascent_Pad", "Apogee", "Apoflag",
+        "Range", "RangeFlag", "Dest", "OrbPay", "Agency", "Launch_Code", "FailCode", "Group", "Category", "LTCite",
+        "Cite", "Notes",
+    ),
+    "satcat": (
+        "#JCAT", "Satcat", "Launch_Tag", "Piece", "Type", "Name", "PLName", "LDate", "Parent", "SDate", "Primary",
+        "DDate", "Status", "Dest", "Owner", "State", "Manufacturer", "Bus", "Motor", "Mass", "MassFlag", "DryMass",
+        "DryFlag", "TotMass", "TotFlag", "Length", "LFlag", "Diameter", "DFlag", "Span", "SpanFlag", "Shape", "ODate",
+        "Perigee", "PF", "Apogee", "AF", "Inc", "IF", "OpOrbit", "OQUAL", "AltNames",
+    ),
+    "celestrak_satcat": (
+        "OBJECT_NAME", "OBJECT_ID", "NORAD_CAT_ID", "OBJECT_TYPE", "OPS_STATUS_CODE", "OWNER", "LAUNCH_DATE",
+        "LAUNCH_SITE", "DECAY_DATE", "PERIOD", "INCLINATION", "APOGEE", "PERIGEE", "RCS", "DATA_STATUS_CODE",
+        "ORBIT_CENTER", "ORBIT_TYPE",
+    ),
+    "sites": (
+        "#Site_Code", "Ucode", "Type", "StateCode", "TStart", "TStop", "ShortName", "Name", "Location", "Longitude",
+        "Latitude", "Error", "Parent", "ShortEName", "EName", "Group", "UName",
+    ),
+    "orgs": (
+        "#Code", "UCode", "StateCode", "Type", "Class", "TStart", "TStop", "ShortName", "Name", "Location",
+        "Longitude", "Latitude", "Error", "Parent", "ShortEName", "EName", "UName",
+    ),
+    "psatcat": (
+        "#JCAT", "Piece", "Name", "LDate", "TLast", "TOp", "TDate", "TF", "Program", "Plane", "Att", "Mvr", "Class",
+        "Category", "UNState", "UNReg", "UNPeriod", "UNPerigee", "UNApogee", "UNInc", "Result", "Control",
+        "Discipline", "Unused_23", "Unused_24", "Unused_25", "Unused_26", "Comment",
+    ),
+}
+
+DATE_COLUMNS = {"Launch_Date", "LDate", "SDate", "DDate", "ODate", "TLast", "TOp", "TDate", "TStart", "TStop",
+                "LAUNCH_DATE", "DECAY_DATE"}
+NAME_COLUMNS = {"Name", "PLName", "Mission", "Flight", "ShortName", "EName", "ShortEName", "Location", "AltNames",
+                "Comment", "Notes", "UName", "Manufacturer", "OBJECT_NAME"}
+MONTHS = np.array(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+CODES = np.array([f"C{index:02d}" for index in range(40)])
+MISSING_SHARE = 0.1
+
+
+# --- synthetic sources -----------------------------------------------------------------------------------------------
+
+def _column_kind(spec: SourceSpec, column: str) -> str:
+    if column == spec.key:
+        return "int" if column in spec.integers else "key"
+    if column in spec.floats or column in spec.coerce_numeric:
+        return "float"
+    if column in spec.integers:
+        return "int"
+    if column in DATE_COLUMNS:
+        return "date"
+    if column in NAME_COLUMNS:
+        return "name"
+    return "code"
+
+
+def _key_values(source: str, ids: np.ndarray) -> pd.Series:
+    numbers = pd.Series(ids)
+    if source == "launch":
+        return (1957 + numbers // 1000).astype(str) + "-" + (numbers % 1000).astype(str).str.zfill(3)
+    prefix = {"satcat": "S", "psatcat": "S", "sites": "SITE", "orgs": "ORG"}[source]
+    return prefix + (numbers + 1).astype(str)
+
+
+def synthetic_frame(source: str, start: int, stop: int, revision: int = 0) -> pd.DataFrame:
+    """Raw text columns for the rows ``start`` to ``stop``; a row's values depend only on its id and revision."""
+    spec = SOURCES_BY_NAME[source]
+    missing = "" if spec.sep == "," else "-"
+    ids = np.arange(start, stop)
+    count = len(ids)
+
+    def draw(index: int, salt: int) -> np.random.Generator:
+        # One generator per column and draw, so a row's values do not depend on how many rows follow it
+        return np.random.default_rng([GENERATOR_VERSION, start, index, salt])
+
+    columns: dict[str, Any] = {}
+    for index, raw in enumerate(HEADERS[source]):
+        column = raw.lstrip("#")
+        kind = _column_kind(spec, column)
+        if kind == "key":
+            values = _key_values(source, ids)
+        elif kind == "int":
+            values = pd.Series(ids + 1).astype(str)
+        elif kind == "float":
+            values = pd.Series(np.round(draw(index, 0).random(count) * 40_000, 3)).astype(str)
+        elif kind == "date":
+            years = pd.Series(draw(index, 0).integers(1957, 2026, count)).astype(str)
+            days = draw(index, 1).integers(1, 29, count).astype(str)
+            values = years + " " + MONTHS[draw(index, 2).integers(0, 12, count)] + " " + days
+        elif kind == "name":
+            values = column + " " + pd.Series(draw(index, 0).integers(0, 1 << 20, count)).astype(str)
+        else:
+            values = pd.Series(CODES[draw(index, 0).integers(0, len(CODES), count)])
+        if kind not in ("key", "int"):
+            values = values.mask(draw(index, 3).random(count) < MISSING_SHARE, missing)
+        columns[raw] = values.to_numpy()
+    frame = pd.DataFrame(columns)
+    if revision:
+        # The nightly revision rewrites one loaded text column of every hundredth row and drops every 500th row
+        header = HEADERS[source]
+        loaded = [header[index] for index in spec.usecols] if spec.usecols is not None else header
+        text = [raw for raw in loaded if _column_kind(spec, raw.lstrip("#")) in ("code", "name")][-1]
+        frame.loc[ids % 100 == 7, text] = f"REV{revision}"
+        frame = frame[ids % 500 != 3]
+    return frame
+
+
+def write_source(source: str, rows: int, path: Path, revision: int = 0) -> None:
+    spec = SOURCES_BY_NAME[source]
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8", newline="") as fh:
+        fh.write(spec.sep.join(HEADERS[source]) + "\n")
+        if spec.skip_first_row:
+            fh.write("# Synthetic benchmark data\n")
+        # Revision 1 also appends 0.5% new rows
+        total = rows + (rows // 200 if revision else 0)
+        for start in range(0, total, GENERATE_CHUNK_ROWS):
+            frame = synthetic_frame(source, start, min(total, start + GENERATE_CHUNK_ROWS), revision)
+            frame.to_csv(fh, sep=spec.sep, header=False, index=False, lineterminator="\n")
+    tmp_path.replace(path)
+
+
+def ensure_dataset(scale: int, sources: Iterable[str], data_dir: Path) -> dict[str, dict[str, Path]]:
+    """Generate (or reuse) the base and revised file of every source at ``scale``."""
+    scale_dir = data_dir / f"x{scale}"
+    scale_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = scale_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    paths: dict[str, dict[str, Path]] = {}
+    for source in sources:
+        rows = BASE_ROWS[source] * scale
+        suffix = ".csv" if SOURCES_BY_NAME[source].sep == "," else ".tsv"
+        paths[source] = {}
+        for revision, label in enumerate(("base", "revised")):
+            path = scale_dir / f"{source}.{label}{suffix}"
+            entry = {"rows": rows, "generator": GENERATOR_VERSION}
+            if manifest.get(path.name) != entry or not path.exists():
+                started = perf_counter()
+                write_source(source, rows, path, revision)
+                print(f"Generated {path.relative_to(data_dir)} ({rows:,} rows) in {perf_counter() - started:.1f}s")
+                manifest[path.name] = entry
+                manifest_path.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+            paths[source][label] = path
+    return paths
+
+
+# --- measurement -----------------------------------------------------------------------------------------------------
+
+class PhaseTimer:
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += perf_counter() - started
+
+    def timed(self, iterable: Iterable[Any], name: str) -> Iterator[Any]:
+        """Yield from ``iterable``, charging the time spent producing each item to ``name``."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                item = next(iterator, StopIteration)
+            if item is StopIteration:
+                return
+            yield item
+
+
+def stage_result(rows: int, timer: PhaseTimer, seconds: float, **extra: Any) -> dict[str, Any]:
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rowsPerSecond": round(rows / seconds) if seconds > 0 else None,
+        "phases": {name: round(value, 4) for name, value in timer.seconds.items()},
+        "peakRssBytes": peak_rss_bytes(),
+        **extra,
+    }
+
+
+# --- SQLite stand-in -------------------------------------------------------------------------------------------------
+
+class SqliteCursor:
+    """A sqlite3 cursor that takes pyodbc-style positional parameters, as the loader passes them."""
+
+    def __init__(self, cursor: sqlite3.Cursor) -> None:
+        self.cursor = cursor
+        self.fast_executemany = False
+
+    def execute(self, sql: str, *params: Any) -> SqliteCursor:
+        self.cursor.execute(sql, params)
+        return self
+
+    def executemany(self, sql: str, rows: Iterable[tuple]) -> None:
+        self.cursor.executemany(sql, rows)
+
+    def fetchone(self) -> Any:
+        return self.cursor.fetchone()
+
+    def fetchall(self) -> list[Any]:
+        return self.cursor.fetchall()
+
+
+class SqliteConnection:
+    def __init__(self, db: sqlite3.Connection) -> None:
+        self.db = db
+
+    def cursor(self) -> SqliteCursor:
+        return SqliteCursor(self.db.cursor())
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def rollback(self) -> None:
+        self.db.rollback()
+
+
+class SqliteDialect(SqlServerDialect):
+    """The SQLite equivalents of the loader's SQL Server statements.
+
+    The stand-in tables have no keys or indexes, so there is no design to copy before a swap; the MERGE and
+    ``OUTPUT deleted.*`` become a pre-image insert into the delta followed by a delete and an insert.
+    """
+
+    def ensure_tables(self, cursor: SqliteCursor) -> None:
+        cursor.execute(
+            f"create table if not exists {FINGERPRINT_TABLE} (Table_Name text not null, Row_Key text not null, "
+            "Row_Hash integer not null, primary key (Table_Name, Row_Key))"
+        )
+        cursor.execute(
+            f"create table if not exists {GENERATION_TABLE} (Table_Name text not null, Generation integer not null, "
+            "Load_Mode text not null, Row_Count integer not null, Loaded_At text not null default current_timestamp, "
+            "primary key (Table_Name, Generation))"
+        )
+
+    def table_exists(self, cursor: SqliteCursor, table: str) -> bool:
+        cursor.execute("select 1 from sqlite_master where type = 'table' and name = ?", table)
+        return cursor.fetchone() is not None
+
+    def drop_table(self, cursor: SqliteCursor, table: str) -> None:
+        cursor.execute(f"drop table if exists {quote_name(table)}")
+
+    def table_row_count(self, cursor: SqliteCursor, table: str) -> int:
+        cursor.execute(f"select count(*) from {quote_name(table)}")
+        return int(cursor.fetchone()[0])
+
+    def table_columns(self, cursor: SqliteCursor, table: str) -> list[str]:
+        cursor.execute("select name from pragma_table_info(?) order by cid", table)
+        return [row[0] for row in cursor.fetchall()]
+
+    def record_generation(self, cursor: SqliteCursor, table: str, mode: str, rows: int) -> int:
+        cursor.execute(f"select coalesce(max(Generation), 0) + 1 from {GENERATION_TABLE} where Table_Name = ?", table)
+        generation = int(cursor.fetchone()[0])
+        cursor.execute(
+            f"insert into {GENERATION_TABLE} (Table_Name, Generation, Load_Mode, Row_Count) values (?, ?, ?, ?)",
+            table,
+            generation,
+            mode,
+            rows,
+        )
+        return generation
+
+    def create_empty(self, cursor: SqliteCursor, table: str, target: str) -> None:
+        cursor.execute(f"create table {quote_name(target)} as select * from {quote_name(table)} where 0")
+
+    def create_from_frame(self, cnxn: SqliteConnection, frame: pd.DataFrame, table: str) -> None:
+        cursor = cnxn.cursor()
+        cursor.execute(f"drop table if exists {quote_name(table)}")
+        cursor.execute(pd.io.sql.get_schema(frame, table))
+        self.insert_rows(cursor, quote_name(table), frame)
+
+    def create_stage(self, cursor: SqliteCursor, table: str, name: str, columns: list[str]) -> str:
+        stage = "temp." + quote_name(name)
+        selected = ", ".join(quote_name(column) for column in columns)
+        cursor.execute(f"drop table if exists {stage}")
+        cursor.execute(f"create temp table {quote_name(name)} as select {selected} from {quote_name(table)} where 0")
+        return stage
+
+    def swap_in(self, cursor: SqliteCursor, table: str, staging: str) -> None:
+        retired = table + RETIRED_SUFFIX
+        self.drop_table(cursor, retired)
+        self.drop_table(cursor, table + DELTA_SUFFIX)
+        if self.table_exists(cursor, table):
+            cursor.execute(f"alter table {quote_name(table)} rename to {quote_name(retired)}")
+        cursor.execute(f"alter table {quote_name(staging)} rename to {quote_name(table)}")
+
+    def create_delta(self, cursor: SqliteCursor, table: str, key: str, delta: str) -> None:
+        self.drop_table(cursor, delta)
+        cursor.execute(
+            f"create table {quote_name(delta)} as select cast(null as text) as Delta_Action, "
+            f"{quote_name(key)} as Delta_Key, * from {quote_name(table)} where 0"
+        )
+
+    def _save_pre_images(self, cursor: SqliteCursor, action: str, table: str, stage: str, key: str, delta: str) -> None:
+        key_name = quote_name(key)
+        cursor.execute(
+            f"insert into {quote_name(delta)} select ?, {key_name}, * from {quote_name(table)} "
+            f"where {key_name} in (select {key_name} from {stage})",
+            action,
+        )
+
+    def merge(self, cursor: SqliteCursor, table: str, stage: str, key: str, columns: list[str], delta: str) -> None:
+        target = quote_name(table)
+        key_name = quote_name(key)
+        column_list = ", ".join(quote_name(column) for column in columns)
+        self._save_pre_images(cursor, "UPDATE", table, stage, key, delta)
+        cursor.execute(
+            f"insert into {quote_name(delta)} (Delta_Action, Delta_Key) select 'INSERT', {key_name} from {stage} "
+            f"where {key_name} not in (select {key_name} from {target})"
+        )
+        cursor.execute(f"delete from {target} where {key_name} in (select {key_name} from {stage})")
+        cursor.execute(f"insert into {target} ({column_list}) select {column_list} from {stage}")
+
+    def delete_keys(self, cursor: SqliteCursor, table: str, stage: str, key: str, delta: str) -> None:
+        self._save_pre_images(cursor, "DELETE", table, stage, key, delta)
+        cursor.execute(
+            f"delete from {quote_name(table)} where {quote_name(key)} in (select {quote_name(key)} from {stage})"
+        )
+
+    def write_fingerprints(
+        self, cursor: SqliteCursor, table: str, changed: pd.Series, deleted: pd.Index, *, replace_all: bool = False
+    ) -> None:
+        if replace_all:
+            cursor.execute(f"delete from {FINGERPRINT_TABLE} where Table_Name = ?", table)
+        else:
+            removed = deleted.union(changed.index, sort=False)
+            cursor.executemany(
+                f"delete from {FINGERPRINT_TABLE} where Table_Name = ? and Row_Key = ?", [(table, k) for k in removed]
+            )
+        cursor.executemany(
+            f"insert into {FINGERPRINT_TABLE} (Table_Name, Row_Key, Row_Hash) values (?, ?, ?)",
+            [(table, key, int(value)) for key, value in changed.items()],
+        )
+
+
+def run_export(cursor: Any, table: str, query: str, out_dir: Path, compress: tuple[str, ...]) -> dict[str, Any]:
+    timer = PhaseTimer()
+    task = ExportTask(
+        name=table,
+        query=query,
+        output=str(out_dir / f"{table}.json"),
+        formats=("rows", "columnar"),
+        compress=compress,
+    )
+    started = perf_counter()
+    result = export_task(cursor, task, force=True)
+    seconds = perf_counter() - started
+    stats = result.stats
+    timer.seconds["sql"] = stats["sqlSeconds"]
+    timer.seconds["write"] = seconds - stats["sqlSeconds"]
+    return stage_result(stats["rows"], timer, seconds, bytes=stats["bytes"])
+
+
+# --- cases -----------------------------------------------------------------------------------------------------------
+
+def run_case(
+    source: str, scale: int, paths: dict[str, Path], work_dir: Path, compress: tuple[str, ...], connection_string: str
+) -> dict[str, Any]:
+    """Load, refresh and export one source at one scale; runs in its own process."""
+    spec = SOURCES_BY_NAME[source]
+    out_dir = work_dir / f"{source}-x{scale}"
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True)
+    result: dict[str, Any] = {"source": source, "scale": scale, "startRssBytes": peak_rss_bytes(), "stages": {}}
+    try:
+        if connection_string:
+            import pyodbc
+
+            cnxn = pyodbc.connect(connection_string)
+            table = f"Bench_{spec.table}"
+            dialect = SQL_SERVER
+        else:
+            cnxn = sqlite3.connect(out_dir / "standin.sqlite")
+            cnxn.execute("pragma journal_mode = wal")
+            table = spec.table
+            dialect = SqliteDialect()
+        try:
+            loader = cnxn if connection_string else SqliteConnection(cnxn)
+            result["stages"] = load_stages(loader, dialect, spec, paths, table)
+            cursor = cnxn.cursor()
+            try:
+                result["stages"]["export"] = run_export(
+                    cursor, table, f"select * from {quote_name(table)}", out_dir, compress
+                )
+            finally:
+                cursor.close()
+        finally:
+            cnxn.close()
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    result["peakRssBytes"] = peak_rss_bytes()
+    return result
+
+
+def load_stages(
+    cnxn: Any, dialect: SqlServerDialect, spec: SourceSpec, paths: dict[str, Path], table: str
+) -> dict[str, dict[str, Any]]:
+    """The first load and the nightly refresh, through ``table_sync.load_chunks`` with the phases it records."""
+    stages: dict[str, dict[str, Any]] = {}
+    for stage, label, mode in (("load", "base", "replace"), ("update", "revised", "upsert")):
+        timer = PhaseTimer()
+        started = perf_counter()
+        with capture(stage) as span:
+            sync = load_chunks(cnxn, functools.partial(iter_source, spec, paths[label]), table, spec.key, mode, dialect)
+        seconds = perf_counter() - started
+        timer.seconds.update(span.phases)
+        stages[stage] = stage_result(
+            sync.inserted + sync.updated + sync.unchanged,
+            timer,
+            seconds,
+            inserted=sync.inserted,
+            updated=sync.updated,
+            deleted=sync.deleted,
+            staged=span.attrs.get("staged", sync.inserted),
+        )
+    return stages
+
+
+# --- reporting -------------------------------------------------------------------------------------------------------
+
+def git_revision() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT, capture_output=True, text=True
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+def _mib(value: int | None) -> str:
+    return "-" if value is None else f"{value / (1 << 20):,.0f} MiB"
+
+
+def print_case(case: dict[str, Any]) -> None:
+    for stage, stats in case["stages"].items():
+        phases = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in stats["phases"].items())
+        print(
+            f"  {case['source']:<17} x{case['scale']:<4} {stage:<7} {stats['rows']:>10,} rows "
+            f"{stats['seconds']:>8.2f}s {stats['rowsPerSecond'] or 0:>10,} rows/s  peak {_mib(stats['peakRssBytes'])}"
+            f"  ({phases})"
+        )
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    before = {
+        (case["source"], case["scale"], stage): stats
+        for case in baseline["cases"]
+        for stage, stats in case["stages"].items()
+    }
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'} ({baseline.get('createdAt')}):")
+    for case in results["cases"]:
+        for stage, stats in case["stages"].items():
+            old = before.get((case["source"], case["scale"], stage))
+            if not old or not old.get("rowsPerSecond") or not stats.get("rowsPerSecond"):
+                continue
+            speed = stats["rowsPerSecond"] / old["rowsPerSecond"]
+            memory = (
+                f", peak RSS x{stats['peakRssBytes'] / old['peakRssBytes']:.2f}"
+                if stats.get("peakRssBytes") and old.get("peakRssBytes")
+                else ""
+            )
+            print(f"  {case['source']:<17} x{case['scale']:<4} {stage:<7} rows/s x{speed:.2f}{memory}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES), help="size multiples (1 10 100)")
+    parser.add_argument(
+        "--sources", nargs="+", default=[spec.name for spec in SOURCES], choices=[spec.name for spec in SOURCES]
+    )
+    parser.add_argument("--compress", nargs="*", default=["gzip"], help="export siblings to write (default gzip)")
+    parser.add_argument("--connection-string", default="", help="scratch SQL Server database to use instead of SQLite")
+    parser.add_argument("--data-dir", type=Path, default=BENCH_DIR / "data", help="where generated files are kept")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    parser.add_argument("--compare", type=Path, help="results file of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    results: dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        **git_revision(),
+        "database": "sqlserver" if args.connection_string else f"sqlite {sqlite3.sqlite_version}",
+        "machine": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": multiprocessing.cpu_count(),
+        },
+        "cases": [],
+    }
+    work_dir = BENCH_DIR / "work"
+    context = multiprocessing.get_context("spawn")
+    for scale in args.scales:
+        paths = ensure_dataset(scale, args.sources, args.data_dir)
+        for source in args.sources:
+            # A fresh process per case, so each peak RSS belongs to that case alone
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                case = pool.submit(
+                    run_case, source, scale, paths[source], work_dir, tuple(args.compress), args.connection_string
+                ).result()
+            results["cases"].append(case)
+            print_case(case)
+
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    with HISTORY_PATH.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(results, separators=(",", ":")) + "\n")
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
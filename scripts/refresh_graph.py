@@ -0,0 +1,270 @@
+"""A small dependency graph runner for the refresh pipeline.
+
+Each :class:`Node` is one step (fetch a source, load a table, run an export) with the names of the nodes it needs.
+Nodes whose dependencies are done run concurrently on a thread pool, so a full run takes about as long as its
+critical path. A failed node only stops the nodes downstream of it. Completed nodes are checkpointed to a JSON file
+after each finishes; when the previous run did not complete, the next one resumes and skips them.
+"""
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from run_report import bind, span
+
+STATUSES = ("done", "resumed", "failed", "skipped")
+
+
+@dataclass(frozen=True)
+class Node:
+    name: str
+    # Runs the step; the returned text (if any) is printed as its summary. Raise to fail the node.
+    run: Callable[[], str | None]
+    deps: tuple[str, ...] = ()
+
+
+@dataclass
+class NodeResult:
+    name: str
+    status: str  # one of STATUSES
+    seconds: float = 0.0
+    summary: str | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("done", "resumed")
+
+
+class Checkpoint:
+    """Completed nodes of the current run, persisted after every node so an interrupted run can resume."""
+
+    def __init__(self, path: Path, *, fresh: bool = False) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        state = {} if fresh or not path.exists() else json.loads(path.read_text(encoding="utf-8"))
+        self.resumed = bool(state) and not state.get("complete", False)
+        if self.resumed:
+            self.state = state
+        else:
+            self.state = {
+                "run": uuid.uuid4().hex,
+                "started": datetime.now(timezone.utc).isoformat(),
+                "complete": False,
+                "nodes": {},
+            }
+
+    def done(self, name: str) -> bool:
+        return self.resumed and name in self.state["nodes"]
+
+    def record(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.state["nodes"][name] = {
+                "seconds": round(seconds, 3),
+                "finished": datetime.now(timezone.utc).isoformat(),
+            }
+            self._write()
+
+    def finish(self, complete: bool) -> None:
+        with self.lock:
+            self.state["complete"] = complete
+            self._write()
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.state, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+def check_graph(nodes: Sequence[Node]) -> dict[str, Node]:
+    """Index ``nodes`` by name; raises ``ValueError`` on duplicate names, unknown dependencies or cycles."""
+    by_name: dict[str, Node] = {}
+    for node in nodes:
+        if node.name in by_name:
+            raise ValueError(f"Duplicate refresh node {node.name!r}.")
+        by_name[node.name] = node
+    for node in nodes:
+        missing = [dep for dep in node.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"Refresh node {node.name!r} depends on unknown node(s): {', '.join(missing)}.")
+    topological_order(by_name)
+    return by_name
+
+
+def topological_order(nodes: Mapping[str, Node]) -> list[str]:
+    order: list[str] = []
+    state: dict[str, int] = {}  # 1 visiting, 2 done
+
+    def visit(name: str, path: tuple[str, ...]) -> None:
+        if state.get(name) == 2:
+            return
+        if state.get(name) == 1:
+            raise ValueError(f"Refresh graph has a cycle: {' -> '.join((*path, name))}.")
+        state[name] = 1
+        for dep in nodes[name].deps:
+            visit(dep, (*path, name))
+        state[name] = 2
+        order.append(name)
+
+    for name in nodes:
+        visit(name, ())
+    return order
+
+
+def downstream(nodes: Mapping[str, Node], names: Iterable[str]) -> set[str]:
+    """``names`` and every node that depends on them, directly or not."""
+    dependents: dict[str, list[str]] = {name: [] for name in nodes}
+    for node in nodes.values():
+        for dep in node.deps:
+            dependents[dep].append(node.name)
+    selected: set[str] = set()
+    stack = list(names)
+    while stack:
+        name = stack.pop()
+        if name not in selected:
+            selected.add(name)
+            stack.extend(dependents[name])
+    return selected
+
+
+def select(nodes: Mapping[str, Node], only: Sequence[str] = (), since: Sequence[str] = ()) -> set[str]:
+    """Nodes to run: those matching an ``only`` pattern, plus those matching a ``since`` pattern and everything
+    downstream of them. With neither, every node. Patterns are shell-style globs on node names."""
+    if not only and not since:
+        return set(nodes)
+
+    def matching(patterns: Sequence[str]) -> set[str]:
+        found: set[str] = set()
+        for pattern in patterns:
+            names = fnmatch.filter(nodes, pattern)
+            if not names:
+                raise ValueError(f"No refresh node matches {pattern!r}.")
+            found.update(names)
+        return found
+
+    return matching(only) | downstream(nodes, matching(since))
+
+
+def run_graph(
+    nodes: Mapping[str, Node],
+    selected: Iterable[str],
+    *,
+    workers: int,
+    checkpoint: Checkpoint | None = None,
+    on_result: Callable[[NodeResult], None] | None = None,
+) -> dict[str, NodeResult]:
+    """Run the ``selected`` nodes in dependency order, up to ``workers`` at a time.
+
+    Dependencies outside the selection are taken as already up to date. Returns a result for every selected node,
+    in topological order.
+    """
+    selected = set(selected)
+    pending = {name: {dep for dep in nodes[name].deps if dep in selected} for name in selected}
+    results: dict[str, NodeResult] = {}
+    lock = threading.Lock()
+
+    def finish(result: NodeResult) -> None:
+        with lock:
+            results[result.name] = result
+        if on_result is not None:
+            on_result(result)
+
+    def execute(node: Node) -> NodeResult:
+        started = perf_counter()
+        try:
+            with span(node.name):
+                summary = node.run()
+        except BaseException as error:  # noqa: BLE001 - a node failure must not take down the other branches
+            if isinstance(error, KeyboardInterrupt):
+                raise
+            message = str(error) or error.__class__.__name__
+            return NodeResult(node.name, "failed", perf_counter() - started, error=message)
+        seconds = perf_counter() - started
+        if checkpoint is not None:
+            checkpoint.record(node.name, seconds)
+        return NodeResult(node.name, "done", seconds, summary)
+
+    def skip_downstream(name: str, reason: str) -> None:
+        for other in sorted(downstream(nodes, [name]) & selected - {name}):
+            if other not in results:
+                pending.pop(other, None)
+                finish(NodeResult(other, "skipped", error=reason))
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        running: dict[Future, str] = {}
+
+        def launch_ready() -> None:
+            for name in sorted(pending):
+                if pending[name]:
+                    continue
+                del pending[name]
+                if checkpoint is not None and checkpoint.done(name):
+                    finish(NodeResult(name, "resumed"))
+                    release(name)
+                else:
+                    running[pool.submit(bind(execute), nodes[name])] = name
+
+        def release(name: str) -> None:
+            for deps in pending.values():
+                deps.discard(name)
+
+        launch_ready()
+        while running or pending:
+            if not running:
+                # Only reachable if dependencies can never be met; check_graph rules out cycles
+                for name in list(pending):
+                    finish(NodeResult(name, "skipped", error="dependencies never completed"))
+                pending.clear()
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                result = future.result()
+                finish(result)
+                if result.ok:
+                    release(name)
+                else:
+                    skip_downstream(name, f"upstream {name} failed")
+            launch_ready()
+
+    order = topological_order(nodes)
+    return {name: results[name] for name in order if name in results}
+
+
+def critical_path(nodes: Mapping[str, Node], results: Mapping[str, NodeResult]) -> tuple[float, list[str]]:
+    """Longest chain of node run times through the graph: the least wall time any schedule could take."""
+    finish: dict[str, float] = {}
+    previous: dict[str, str | None] = {}
+    for name in topological_order(nodes):
+        if name not in results:
+            continue
+        deps = [dep for dep in nodes[name].deps if dep in finish]
+        before = max(deps, key=lambda dep: finish[dep], default=None)
+        finish[name] = (finish[before] if before else 0.0) + results[name].seconds
+        previous[name] = before
+    if not finish:
+        return 0.0, []
+    name: str | None = max(finish, key=finish.__getitem__)
+    total = finish[name]
+    path: list[str] = []
+    while name is not None:
+        path.append(name)
+        name = previous[name]
+    return total, path[::-1]
+
+
+def summarize(results: Mapping[str, NodeResult]) -> dict[str, Any]:
+    counts = {status: 0 for status in STATUSES}
+    for result in results.values():
+        counts[result.status] += 1
+    return counts
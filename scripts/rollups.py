@@ -0,0 +1,255 @@
+"""Pre-aggregated rollup ("cube") outputs for chart exports.
+
+A :class:`Rollup` declared on an ``ExportTask`` groups the task's rows by a few dimension columns and computes
+measures per group, so a chart such as launches per year by country group downloads a few hundred rows instead of
+every launch. Rollups are accumulated from the same converted batches the detail export streams, so the query runs
+once and no second pass over the rows is needed. Grouping is vectorized: the rollup's columns are buffered and reduced
+with pandas/NumPy group codes a block of rows at a time, so there is no Python work per row. Each rollup is written as
+a columnar file next to the detail output (``launch_data.by_year_group.columnar.json``) in the format described in
+``columnar.py``.
+
+Measures follow SQL aggregate semantics: ``count`` without a column counts rows, ``count`` of a column counts its
+non-null values, and ``sum``/``min``/``max`` ignore nulls (and are null for a group with no values).
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import chain
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from columnar import ColumnarWriter
+
+MEASURE_OPS = ("count", "sum", "min", "max")
+# min/max of columns of these types compare as float64; other columns (strings, dates) compare by sorted value codes
+NUMERIC_TYPES = (int, float, Decimal, bool)
+REDUCERS = {"min": np.fmin, "max": np.fmax}
+# Rows buffered between reductions; each reduction costs a few NumPy calls per dimension and measure
+REDUCE_ROWS = 1 << 16
+# Sums are rounded so that the row order of the query result cannot change the written bytes
+SUM_DIGITS = 6
+
+
+@dataclass(frozen=True)
+class Measure:
+    name: str
+    op: str  # one of MEASURE_OPS
+    column: str | None = None  # required except for a row count
+
+
+@dataclass(frozen=True)
+class Rollup:
+    name: str
+    dimensions: tuple[str, ...]
+    measures: tuple[Measure, ...] = (Measure("count", "count"),)
+
+
+def check_rollups(rollups: Sequence[Rollup]) -> list[str]:
+    """Problems with a task's rollup declarations (the columns themselves are checked against the query result)."""
+    problems = []
+    names = [rollup.name for rollup in rollups]
+    problems += [f"duplicate rollup {name!r}" for name in sorted({name for name in names if names.count(name) > 1})]
+    for rollup in rollups:
+        if not rollup.dimensions:
+            problems.append(f"rollup {rollup.name!r} has no dimensions")
+        if not rollup.measures:
+            problems.append(f"rollup {rollup.name!r} has no measures")
+        for measure in rollup.measures:
+            if measure.op not in MEASURE_OPS:
+                problems.append(f"rollup {rollup.name!r} measure {measure.name!r} has unknown op {measure.op!r}")
+            elif measure.column is None and measure.op != "count":
+                problems.append(f"rollup {rollup.name!r} measure {measure.name!r} needs a column")
+        output = [*rollup.dimensions, *(measure.name for measure in rollup.measures)]
+        if len(set(output)) != len(output):
+            problems.append(f"rollup {rollup.name!r} repeats an output column name")
+    return problems
+
+
+def _sort_key(key: tuple[Any, ...]) -> tuple[tuple[bool, Any], ...]:
+    # Nulls last within each dimension; the values of one dimension share a type
+    return tuple((value is None, value if value is not None else 0) for value in key)
+
+
+def group_rows(dimensions: Sequence[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Group number of every row and the first row of every group, for rows keyed by the ``dimensions`` object arrays.
+
+    Null is a group of its own in each dimension, as in SQL ``GROUP BY``. Groups are numbered in order of first
+    appearance.
+    """
+    group = np.zeros(len(dimensions[0]), dtype=np.int64)
+    for values in dimensions:
+        # Nulls get code -1; shifted up by one they are a group like any other value
+        codes, uniques = pd.factorize(values)
+        # Renumber after every dimension so the combined codes stay below the row count
+        group, _ = pd.factorize(group * (len(uniques) + 1) + codes + 1)
+    first = np.flatnonzero(np.diff(np.maximum.accumulate(group), prepend=-1) > 0)
+    return group, first
+
+
+def _present(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Mask of the non-null entries of a measure column (objects with None, or float64 with NaN) and those entries."""
+    if values.dtype == object:
+        present = np.not_equal(values, None)
+    else:
+        present = ~np.isnan(values)
+    return present, values[present]
+
+
+def reduce_measure(op: str, values: np.ndarray | None, group: np.ndarray, size: int, numeric: bool) -> np.ndarray:
+    """Aggregate one measure column into ``size`` groups.
+
+    ``values`` is None for a row count. Counts come back as int64, sums and numeric ``min``/``max`` as float64 with NaN
+    for a group without values, and other ``min``/``max`` as objects with None. Feeding the result back in with
+    ``op="sum"`` for counts combines partial results from several batches.
+    """
+    if values is None:
+        return np.bincount(group, minlength=size)
+    present, entries = _present(values)
+    counts = np.bincount(group[present], minlength=size)
+    if op == "count":
+        return counts
+    group = group[present]
+    if op == "sum":
+        totals = np.bincount(group, weights=entries.astype(np.float64), minlength=size)
+        if entries.dtype.kind == "i":
+            # Partial counts being combined: every group has one
+            return totals.astype(np.int64)
+    elif numeric or entries.dtype != object:
+        totals = np.full(size, np.nan)
+        REDUCERS[op].at(totals, group, entries.astype(np.float64))
+    else:
+        # Strings and dates compare through the codes of their sorted distinct values
+        codes, uniques = pd.factorize(entries, sort=True)
+        best = np.full(size, np.nan)
+        REDUCERS[op].at(best, group, codes.astype(np.float64))
+        totals = np.full(size, None, dtype=object)
+        found = counts > 0
+        totals[found] = uniques[best[found].astype(np.int64)]
+        return totals
+    totals[counts == 0] = np.nan
+    return totals
+
+
+def _scalar(value: Any, type_code: Any, op: str) -> Any:
+    """A group result as the value the row-by-row SQL aggregate gives: None for no values, ints for int columns."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if op == "count":
+        return value
+    if type_code is int or (type_code is bool and op == "sum"):
+        return int(value)
+    if type_code is bool:
+        return bool(value)
+    if op == "sum" and isinstance(value, float):
+        return round(value, SUM_DIGITS)
+    return value
+
+
+class RollupBuilder:
+    """Accumulates one rollup's groups from converted row batches.
+
+    Only the rollup's own columns are kept from each batch. Every ``REDUCE_ROWS`` rows they are reduced to their
+    groups, appended to the groups so far (one array per dimension and per measure) and reduced again, so nothing is
+    done per row or per group in Python until :meth:`rows`.
+    """
+
+    def __init__(self, rollup: Rollup, columns: Sequence[str], description: Sequence[Sequence[Any]]) -> None:
+        index = {name: position for position, name in enumerate(columns)}
+        wanted = [*rollup.dimensions, *(measure.column for measure in rollup.measures if measure.column)]
+        missing = sorted({name for name in wanted if name not in index})
+        if missing:
+            raise ValueError(f"Rollup {rollup.name!r} uses column(s) not in the query: {', '.join(missing)}.")
+        self.rollup = rollup
+        positions = [index[name] for name in rollup.dimensions]
+        self.width = len(positions)
+        # Query columns kept from each batch, and where the dimensions and measures sit among them
+        fields = sorted({*positions, *(index[measure.column] for measure in rollup.measures if measure.column)})
+        slot = {position: number for number, position in enumerate(fields)}
+        self.fields = fields
+        self.dimension_slots = [slot[position] for position in positions]
+        self.columns = [
+            (measure.op, None if measure.column is None else slot[index[measure.column]]) for measure in rollup.measures
+        ]
+        self.type_codes = [
+            None if measure.column is None else description[index[measure.column]][1] for measure in rollup.measures
+        ]
+        self.pending: list[list[Sequence[Any]]] = [[] for _ in fields]
+        self.pending_rows = 0
+        self.keys: list[np.ndarray] = []
+        self.values: list[np.ndarray] = []
+        self.description = [description[position] for position in positions] + [
+            (measure.name, int if measure.op == "count" else description[index[measure.column]][1])
+            for measure in rollup.measures
+        ]
+
+    def _reduce(
+        self, keys: list[np.ndarray], values: list[np.ndarray | None], combine: bool
+    ) -> tuple[list[np.ndarray], list[np.ndarray]]:
+        group, first = group_rows(keys)
+        reduced = [
+            reduce_measure(
+                "sum" if combine and op == "count" else op,
+                column,
+                group,
+                len(first),
+                type_code in NUMERIC_TYPES,
+            )
+            for (op, _), type_code, column in zip(self.columns, self.type_codes, values)
+        ]
+        return [column[first] for column in keys], reduced
+
+    def add_batch(self, batch: Sequence[Sequence[Any]]) -> None:
+        if batch:
+            self.add_columns(list(zip(*batch)))
+
+    def add_columns(self, columns: Sequence[Sequence[Any]]) -> None:
+        """Add a non-empty batch already transposed to one sequence per query column, as ``zip(*batch)`` gives it,
+        so the columnar writer and every rollup share one transpose."""
+        for pending, position in zip(self.pending, self.fields):
+            pending.append(columns[position])
+        self.pending_rows += len(columns[0])
+        if self.pending_rows >= REDUCE_ROWS:
+            self.flush()
+
+    def flush(self) -> None:
+        """Fold the buffered rows into the groups."""
+        if not self.pending_rows:
+            return
+        rows = self.pending_rows
+        fields = [np.fromiter(chain.from_iterable(parts), dtype=object, count=rows) for parts in self.pending]
+        self.pending = [[] for _ in fields]
+        self.pending_rows = 0
+        keys, values = self._reduce(
+            [fields[slot] for slot in self.dimension_slots],
+            [None if slot is None else fields[slot] for _, slot in self.columns],
+            combine=False,
+        )
+        if self.keys:
+            keys = [np.concatenate(pair) for pair in zip(self.keys, keys)]
+            values = [np.concatenate(pair) for pair in zip(self.values, values)]
+            keys, values = self._reduce(keys, values, combine=True)
+        self.keys, self.values = keys, values
+
+    def rows(self) -> list[list[Any]]:
+        self.flush()
+        if not self.keys:
+            return []
+        measures = [
+            [_scalar(value, type_code, op) for value in column.tolist()]
+            for (op, _), type_code, column in zip(self.columns, self.type_codes, self.values)
+        ]
+        out = [[*key, *values] for key, values in zip(zip(*(column.tolist() for column in self.keys)), zip(*measures))]
+        out.sort(key=lambda row: _sort_key(row[: self.width]))
+        return out
+
+    def write(self, fh) -> int:
+        """Write the groups as a columnar document and return how many there are."""
+        rows = self.rows()
+        writer = ColumnarWriter(self.description)
+        writer.add_batch(rows)
+        writer.write(fh)
+        return len(rows)
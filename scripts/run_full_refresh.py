@@ -1,29 +1,237 @@
-﻿"""Run the SQL refresh script and export JSON snapshots for the static site."""
+﻿"""Refresh the source tables and the JSON snapshots for the static site as one dependency graph.
+
+Every step is a node: ``fetch:<source>`` downloads a file into the cache, ``load:<source>`` applies it to its table,
+``materialize:Launch_Data_Enriched`` rebuilds the enriched launch table from the sources it reads,
+``export:<task>`` runs one ``ExportTask`` once the tables in its ``sources`` are loaded, and ``tiles`` regenerates
+the scenario tiles. Independent nodes run concurrently, so a full refresh takes about as long as its slowest chain,
+and a failed node only stops the nodes downstream of it. Completed nodes are checkpointed in
+``.cache/sources/refresh-checkpoint.json``; running again after a failure resumes where the last run stopped.
+
+    python scripts/run_full_refresh.py                          # everything
+    python scripts/run_full_refresh.py --only "load:satcat"     # just that node
+    python scripts/run_full_refresh.py --since "load:sites"     # that node and everything downstream of it
+"""
 from __future__ import annotations
 
-import runpy
+import argparse
+import os
+from functools import partial
 from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import pyodbc
+
+from export_charts import (
+    DATA_DIR,
+    EXPORT_TASKS,
+    ExportResult,
+    ExportTask,
+    describe_result,
+    ensure_tasks_defined,
+    export_task,
+    load_env,
+    read_metadata,
+    update_metadata,
+)
+from launch_materialization import MATERIALIZED_TABLE, SOURCE_TABLES, refresh_launch_data
+from refresh_graph import Checkpoint, Node, NodeResult, check_graph, critical_path, run_graph, select, summarize
+from run_report import TRACE_MEMORY, current, instrument, run as report_run
+from scenario_tiles import update_tile_metadata, write_scenario_tiles
+from source_fetch import CACHE_DIR, fetch_one
+from source_registry import SOURCES
+from space_data_update import cnxn_string, load_source
+from table_sync import ensure_fingerprint_table, ensure_generation_table
+
+CHECKPOINT_PATH = CACHE_DIR / "refresh-checkpoint.json"
+REFRESH_WORKERS = int(os.environ.get("REFRESH_WORKERS", "6"))
+
+
+def fetch(name: str, force: bool) -> str:
+    result = fetch_one(name, force=force)
+    if not result.ok:
+        raise RuntimeError(f"download failed - {result.error}")
+    return f"{result.status} ({result.path.name})"
+
+
+def prepare_load_tables() -> None:
+    """Create the loader's fingerprint and generation tables before the load nodes race to create them."""
+    cnxn = pyodbc.connect(cnxn_string)
+    try:
+        cursor = cnxn.cursor()
+        ensure_fingerprint_table(cursor)
+        ensure_generation_table(cursor)
+        cnxn.commit()
+    finally:
+        cnxn.close()
+
+
+def materialize(force: bool) -> str:
+    cnxn = instrument(pyodbc.connect(cnxn_string))
+    try:
+        result = refresh_launch_data(cnxn, force=force)
+    finally:
+        cnxn.close()
+    return result.summary() if result else f"{MATERIALIZED_TABLE} is up to date"
+
+
+def export(
+    task: ExportTask,
+    connection_string: str,
+    previous: dict[str, Any],
+    results: dict[str, ExportResult],
+    force: bool,
+) -> str:
+    connection = instrument(pyodbc.connect(connection_string))
+    try:
+        cursor = connection.cursor()
+        results[task.name] = export_task(cursor, task, previous.get(task.name), force=force)
+    finally:
+        connection.close()
+    return describe_result(results[task.name])
 
-from export_charts import main as export_json
 
-ROOT = Path(__file__).resolve().parents[1]
-SQL_REFRESH_SCRIPT = ROOT / "scripts" / "space_data_update.py"
+def tiles() -> str:
+    stats = write_scenario_tiles()
+    update_tile_metadata(stats)
+    current().set(tiles=stats["tiles"], bytes=stats["bytes"], changed=stats["changed"])
+    return (
+        f"{stats['tiles']} tiles, {stats['bytes']} bytes, grid computed in {stats['gridSeconds']:.2f}s "
+        f"({'changed' if stats['changed'] else 'unchanged'})"
+    )
 
 
-def run_sql_refresh() -> None:
-    if not SQL_REFRESH_SCRIPT.exists():
+def build_graph(
+    *,
+    offline: bool = False,
+    force: bool = False,
+    skip_tiles: bool = False,
+    connection_string: str = "",
+    previous: dict[str, Any] | None = None,
+    exports: dict[str, ExportResult] | None = None,
+) -> list[Node]:
+    """The refresh nodes; finished exports are collected in ``exports`` for ``last-updated.json``."""
+    previous = previous if previous is not None else {}
+    exports = exports if exports is not None else {}
+    nodes: list[Node] = []
+    # Table -> node that writes it, so dependencies follow the tables each step reads
+    producers: dict[str, str] = {}
+
+    for spec in SOURCES:
+        deps: tuple[str, ...] = ()
+        if not offline:
+            nodes.append(Node(f"fetch:{spec.name}", partial(fetch, spec.name, force)))
+            deps = (f"fetch:{spec.name}",)
+        nodes.append(Node(f"load:{spec.name}", partial(load_source, spec, force), deps))
+        producers[spec.table] = f"load:{spec.name}"
+
+    materialize_node = f"materialize:{MATERIALIZED_TABLE}"
+    deps = tuple(producers[table] for table in SOURCE_TABLES if table in producers)
+    nodes.append(Node(materialize_node, partial(materialize, force), deps))
+    producers[MATERIALIZED_TABLE] = materialize_node
+
+    for task in EXPORT_TASKS:
+        deps = tuple(dict.fromkeys(producers[table] for table in task.sources if table in producers))
+        run = partial(export, task, connection_string, previous, exports, force)
+        nodes.append(Node(f"export:{task.name}", run, deps))
+
+    if not skip_tiles:
+        nodes.append(Node("tiles", tiles))
+    return nodes
+
+
+def print_result(result: NodeResult) -> None:
+    if result.status == "done":
+        print(f"[{result.name}] done in {result.seconds:.1f}s" + (f": {result.summary}" if result.summary else ""))
+    elif result.status == "resumed":
+        print(f"[{result.name}] already completed in the interrupted run")
+    else:
+        print(f"[{result.name}] {result.status}: {result.error}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offline", action="store_true", help="skip the downloads and load from the local cache")
+    parser.add_argument("--force", action="store_true", help="reload sources and re-run exports even if unchanged")
+    parser.add_argument("--only", action="append", default=[], metavar="PATTERN", help="run only matching nodes")
+    parser.add_argument(
+        "--since", action="append", default=[], metavar="PATTERN", help="run matching nodes and everything downstream"
+    )
+    parser.add_argument("--skip-tiles", action="store_true", help="do not regenerate the precomputed scenario tiles")
+    parser.add_argument("--workers", type=int, default=REFRESH_WORKERS, help="nodes run at once (default 6)")
+    parser.add_argument("--fresh", action="store_true", help="ignore the checkpoint of an interrupted run")
+    parser.add_argument("--list", action="store_true", help="print the nodes and their dependencies and exit")
+    parser.add_argument("--report", type=Path, help="write the JSON run report here (default .cache/reports/)")
+    parser.add_argument("--trace", type=Path, help="also write a Chrome trace of the run")
+    parser.add_argument(
+        "--trace-memory", action="store_true", default=TRACE_MEMORY, help="record tracemalloc peaks per stage (slow)"
+    )
+    args = parser.parse_args(argv)
+
+    load_env()
+    ensure_tasks_defined()
+    connection_string = os.environ.get("SQLSERVER_CONNECTION_STRING", "")
+    previous = read_metadata().get("exports") or {}
+    exports: dict[str, ExportResult] = {}
+    try:
+        nodes = check_graph(
+            build_graph(
+                offline=args.offline,
+                force=args.force,
+                skip_tiles=args.skip_tiles,
+                connection_string=connection_string,
+                previous=previous,
+                exports=exports,
+            )
+        )
+        selected = select(nodes, args.only, args.since)
+    except ValueError as error:
+        raise SystemExit(str(error)) from None
+
+    if args.list:
+        for name, node in nodes.items():
+            marker = "*" if name in selected else " "
+            print(f"{marker} {name}" + (f" <- {', '.join(node.deps)}" if node.deps else ""))
+        return
+    if not connection_string and any(name.startswith("export:") for name in selected):
         raise SystemExit(
-            "Expected SQL refresh script at scripts/space_data_update.py. Make sure the file is present."
+            "Missing SQLSERVER_CONNECTION_STRING environment variable."
+            " Add it to .env.local or your shell session."
         )
 
-    print("Running SQL refresh script...")
-    runpy.run_path(str(SQL_REFRESH_SCRIPT), run_name="__main__")
+    checkpoint = Checkpoint(CHECKPOINT_PATH, fresh=args.fresh)
+    if checkpoint.resumed:
+        print(f"Resuming the refresh started {checkpoint.state['started']} (use --fresh to start over)")
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+    started = perf_counter()
+    with report_run(
+        "run_full_refresh", report=args.report, trace=args.trace, memory=args.trace_memory, nodes=len(selected)
+    ):
+        if any(name.startswith("load:") for name in selected):
+            prepare_load_tables()
+        results = run_graph(nodes, selected, workers=args.workers, checkpoint=checkpoint, on_result=print_result)
+    seconds = perf_counter() - started
+    failed = [name for name, result in results.items() if not result.ok]
+    checkpoint.finish(not failed)
 
+    if exports:
+        export_seconds = max(results[f"export:{name}"].seconds for name in exports)
+        written = [name for name, result in exports.items() if result.status == "written"]
+        update_metadata(
+            {name: result.stats for name, result in exports.items()}, round(export_seconds, 3), changed=bool(written)
+        )
 
-def main() -> None:
-    run_sql_refresh()
-    print("\nRefreshing JSON chart exports...")
-    export_json()
+    counts = summarize(results)
+    path_seconds, path = critical_path(nodes, results)
+    print(
+        f"\nRefresh finished in {seconds:.1f}s ({sum(result.seconds for result in results.values()):.1f}s of work): "
+        + ", ".join(f"{count} {status}" for status, count in counts.items() if count)
+    )
+    if path:
+        print(f"Critical path {path_seconds:.1f}s: {' -> '.join(path)}")
+    if failed:
+        raise SystemExit(f"{len(failed)} refresh step(s) did not run to completion: {', '.join(failed)}")
 
 
 if __name__ == "__main__":
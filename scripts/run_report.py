@@ -0,0 +1,490 @@
+"""Timing and memory instrumentation for the refresh scripts.
+
+A run (:func:`run`) is a tree of nested :func:`span`s. Every span records its wall time, its attributes (rows, bytes
+downloaded, load mode, ...), the time of named phases inside it (:meth:`Span.phase`, :meth:`Span.timed`), counters
+such as database round trips (connections wrapped with :func:`instrument`), and the process's peak resident set size
+when it closed (plus how far the stage raised it). Runs started with ``memory=True`` (``--trace-memory`` or
+``SPACE_DATA_TRACEMALLOC=1``) also record the peak ``tracemalloc`` memory while each span was open; tracing slows
+allocation-heavy stages several times over, so it is off by default. Spans started in worker threads nest under the
+span that submitted the work when the callable is wrapped with :func:`bind`.
+
+When the run finishes it is written as a JSON report to ``.cache/reports/`` (or ``--report``), optionally as a Chrome
+trace (``--trace``, open in ``chrome://tracing`` or Perfetto), and summarized in ``.cache/reports/history.jsonl``.
+Stages that took much longer than their recent median are printed as possible regressions. Code running outside a
+run gets detached spans, so the instrumented modules work the same when imported on their own.
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import statistics
+import sys
+import threading
+import tracemalloc
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+ROOT = Path(__file__).resolve().parents[1]
+REPORT_DIR = Path(os.environ.get("SPACE_DATA_REPORT_DIR", ROOT / ".cache" / "reports"))
+HISTORY_NAME = "history.jsonl"
+REPORT_VERSION = 1
+# tracemalloc slows allocation-heavy code down several times over; set SPACE_DATA_TRACEMALLOC=1 to turn it on
+TRACE_MEMORY = os.environ.get("SPACE_DATA_TRACEMALLOC", "0") == "1"
+KEEP_REPORTS = 30
+REGRESSION_WINDOW = 10
+REGRESSION_RATIO = 1.5
+REGRESSION_MIN_SECONDS = 1.0
+
+T = TypeVar("T")
+
+
+class Span:
+    def __init__(self, name: str, attrs: dict[str, Any] | None = None) -> None:
+        self.name = name
+        self.attrs: dict[str, Any] = dict(attrs or {})
+        self.phases: dict[str, float] = defaultdict(float)
+        self.counters: dict[str, int] = defaultdict(int)
+        self.children: list[Span] = []
+        self.thread = threading.current_thread().name
+        self.start = perf_counter()
+        self.end: float | None = None
+        self.peak_bytes = 0
+        self.start_rss = 0
+        self.peak_rss = 0
+        self.error: str | None = None
+
+    @property
+    def seconds(self) -> float:
+        return (self.end if self.end is not None else perf_counter()) - self.start
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def add(self, **amounts: float) -> None:
+        for name, amount in amounts.items():
+            self.attrs[name] = self.attrs.get(name, 0) + amount
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += perf_counter() - started
+
+    def timed(self, iterable: Iterable[T], name: str) -> Iterator[T]:
+        """Yield from ``iterable``, charging the time spent producing each item to the phase ``name``."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                item = next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def totals(self) -> dict[str, int]:
+        """Counters of this span and everything under it."""
+        totals: dict[str, int] = defaultdict(int)
+        for span in self.walk():
+            for name, value in span.counters.items():
+                totals[name] += value
+        return dict(totals)
+
+    def walk(self) -> Iterator[Span]:
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+    def to_dict(self, origin: float) -> dict[str, Any]:
+        entry: dict[str, Any] = {
+            "name": self.name,
+            "start": round(self.start - origin, 6),
+            "seconds": round(self.seconds, 6),
+            "thread": self.thread,
+        }
+        if self.attrs:
+            entry["attrs"] = self.attrs
+        if self.phases:
+            entry["phases"] = {name: round(seconds, 6) for name, seconds in self.phases.items()}
+        if self.counters:
+            entry["counters"] = dict(self.counters)
+        if self.peak_rss:
+            entry["peakRssBytes"] = self.peak_rss
+            entry["rssRaisedBytes"] = max(self.peak_rss - self.start_rss, 0)
+        if self.peak_bytes:
+            entry["peakTracedBytes"] = self.peak_bytes
+        if self.error:
+            entry["error"] = self.error
+        if self.children:
+            entry["children"] = [child.to_dict(origin) for child in self.children]
+        return entry
+
+
+_DONE = object()
+_CURRENT: contextvars.ContextVar[Span | None] = contextvars.ContextVar("run_report_span", default=None)
+_LOCK = threading.Lock()
+_OPEN: set[Span] = set()
+_ACTIVE: Span | None = None
+
+
+def current() -> Span:
+    """The innermost open span, or a detached one when no run is active."""
+    return _CURRENT.get() or Span("detached")
+
+
+def peak_rss_bytes() -> int | None:
+    """High-water resident set size of this process."""
+    # On Linux ru_maxrss carries over the parent's peak into a spawned child; VmHWM starts afresh at exec
+    status = Path("/proc/self/status")
+    if status.exists():
+        for line in status.read_text(encoding="ascii", errors="replace").splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def _windows_peak_rss() -> int | None:
+    try:
+        import ctypes
+        from ctypes import wintypes
+    except ImportError:
+        return None
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return int(counters.PeakWorkingSetSize)
+
+
+def _fold_memory() -> None:
+    """Credit the traced peak since the last fold to every open span, then start a new interval."""
+    if not tracemalloc.is_tracing():
+        return
+    with _LOCK:
+        _, peak = tracemalloc.get_traced_memory()
+        for span in _OPEN:
+            span.peak_bytes = max(span.peak_bytes, peak)
+        tracemalloc.reset_peak()
+
+
+def _open(span: Span) -> contextvars.Token:
+    span.start_rss = peak_rss_bytes() or 0
+    _fold_memory()
+    with _LOCK:
+        _OPEN.add(span)
+    return _CURRENT.set(span)
+
+
+def _close(span: Span, token: contextvars.Token) -> None:
+    span.end = perf_counter()
+    span.peak_rss = peak_rss_bytes() or 0
+    _fold_memory()
+    with _LOCK:
+        _OPEN.discard(span)
+    _CURRENT.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    """Time a nested stage; an exception escaping the block is recorded on the span and re-raised."""
+    parent = _CURRENT.get()
+    child = Span(name, attrs)
+    if parent is None:
+        yield child
+        return
+    with _LOCK:
+        parent.children.append(child)
+    token = _open(child)
+    try:
+        yield child
+    except BaseException as error:
+        child.error = str(error) or error.__class__.__name__
+        raise
+    finally:
+        _close(child, token)
+
+
+@contextmanager
+def capture(name: str, **attrs: Any) -> Iterator[Span]:
+    """Collect the spans and phases of a block under a fresh root span without writing a report."""
+    root = Span(name, attrs)
+    token = _CURRENT.set(root)
+    try:
+        yield root
+    finally:
+        root.end = perf_counter()
+        _CURRENT.reset(token)
+
+
+def bind(fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``fn`` so spans it opens on another thread nest under the span that is current now."""
+    parent = _CURRENT.get()
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = _CURRENT.set(parent)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _CURRENT.reset(token)
+
+    return wrapper
+
+
+class _CountingCursor:
+    """Forwards to a DB-API cursor and counts every call that goes to the server as a round trip."""
+
+    def __init__(self, cursor: Any) -> None:
+        object.__setattr__(self, "_cursor", cursor)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._cursor, name, value)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._cursor)
+
+    def execute(self, *args: Any) -> _CountingCursor:
+        current().count("dbRoundTrips")
+        self._cursor.execute(*args)
+        return self
+
+    def executemany(self, *args: Any) -> None:
+        current().count("dbRoundTrips")
+        self._cursor.executemany(*args)
+
+    def fetchone(self) -> Any:
+        current().count("dbRoundTrips")
+        return self._cursor.fetchone()
+
+    def fetchmany(self, *args: Any) -> Any:
+        current().count("dbRoundTrips")
+        return self._cursor.fetchmany(*args)
+
+    def fetchall(self) -> Any:
+        current().count("dbRoundTrips")
+        return self._cursor.fetchall()
+
+
+class _CountingConnection:
+    def __init__(self, connection: Any) -> None:
+        object.__setattr__(self, "_connection", connection)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._connection, name, value)
+
+    def cursor(self) -> _CountingCursor:
+        return _CountingCursor(self._connection.cursor())
+
+    def execute(self, *args: Any) -> _CountingCursor:
+        return self.cursor().execute(*args)
+
+    def commit(self) -> None:
+        current().count("dbRoundTrips")
+        self._connection.commit()
+
+    def rollback(self) -> None:
+        current().count("dbRoundTrips")
+        self._connection.rollback()
+
+
+def instrument(connection: Any) -> Any:
+    """Wrap a pyodbc connection so its queries, fetches and commits are counted on the current span."""
+    return _CountingConnection(connection)
+
+
+@contextmanager
+def run(
+    name: str, *, report: Path | None = None, trace: Path | None = None, memory: bool = TRACE_MEMORY, **attrs: Any
+) -> Iterator[Span]:
+    """Instrument a whole script run and write its report when it ends; inside another run this is just a span."""
+    global _ACTIVE
+    if _ACTIVE is not None:
+        with span(name, **attrs) as child:
+            yield child
+        return
+
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    root = Span(name, attrs)
+    started_at = datetime.now(timezone.utc)
+    _ACTIVE = root
+    token = _open(root)
+    try:
+        yield root
+    except BaseException as error:
+        root.error = str(error) or error.__class__.__name__
+        raise
+    finally:
+        _close(root, token)
+        _ACTIVE = None
+        if started_tracing:
+            tracemalloc.stop()
+        try:
+            write_report(root, started_at, report=report, trace=trace, memory=memory)
+        except OSError as error:
+            print(f"Couldn't write the run report: {error}")
+
+
+def _summary(root: Span, run_id: str, started_at: datetime) -> dict[str, Any]:
+    stages: dict[str, float] = {}
+    for child in root.children:
+        # Repeated stage names (retries) add up
+        stages[child.name] = round(stages.get(child.name, 0.0) + child.seconds, 3)
+    return {
+        "id": run_id,
+        "run": root.name,
+        "started": started_at.isoformat(),
+        "seconds": round(root.seconds, 3),
+        "ok": root.error is None and all(span.error is None for span in root.walk()),
+        "peakRssBytes": root.peak_rss or None,
+        "peakTracedBytes": root.peak_bytes or None,
+        "counters": root.totals(),
+        "stages": stages,
+    }
+
+
+def find_regressions(summary: dict[str, Any], history: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Stages (and the whole run) that took ``REGRESSION_RATIO`` times their median over recent successful runs."""
+    previous = [entry for entry in history if entry.get("run") == summary["run"] and entry.get("ok")]
+    previous = previous[-REGRESSION_WINDOW:]
+    timings = {"(total)": summary["seconds"], **summary["stages"]}
+    regressions = []
+    for stage, seconds in timings.items():
+        past = [entry["seconds"] if stage == "(total)" else entry["stages"].get(stage) for entry in previous]
+        past = [value for value in past if value is not None]
+        if len(past) < 3:
+            continue
+        median = statistics.median(past)
+        if seconds > REGRESSION_RATIO * median and seconds - median >= REGRESSION_MIN_SECONDS:
+            regressions.append({"stage": stage, "seconds": seconds, "median": round(median, 3), "runs": len(past)})
+    return regressions
+
+
+def chrome_trace(root: Span) -> dict[str, Any]:
+    """The span tree as Chrome trace events (one complete event per span, one track per thread)."""
+    pid = os.getpid()
+    threads: dict[str, int] = {}
+    events: list[dict[str, Any]] = []
+    for item in root.walk():
+        tid = threads.setdefault(item.thread, len(threads) + 1)
+        args = {**item.attrs, **item.counters}
+        args.update({f"phase:{name}": round(seconds, 6) for name, seconds in item.phases.items()})
+        if item.peak_rss:
+            args["peakRssBytes"] = item.peak_rss
+        if item.peak_bytes:
+            args["peakTracedBytes"] = item.peak_bytes
+        if item.error:
+            args["error"] = item.error
+        events.append(
+            {
+                "name": item.name,
+                "cat": root.name,
+                "ph": "X",
+                "ts": round((item.start - root.start) * 1e6, 1),
+                "dur": round(item.seconds * 1e6, 1),
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            }
+        )
+    for thread, tid in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _write_json(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, default=str) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def read_history(report_dir: Path = REPORT_DIR) -> list[dict[str, Any]]:
+    path = report_dir / HISTORY_NAME
+    if not path.exists():
+        return []
+    entries = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
+def write_report(
+    root: Span,
+    started_at: datetime,
+    *,
+    report: Path | None = None,
+    trace: Path | None = None,
+    memory: bool = TRACE_MEMORY,
+    report_dir: Path = REPORT_DIR,
+) -> Path:
+    run_id = f"{started_at:%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:6]}"
+    summary = _summary(root, run_id, started_at)
+    regressions = find_regressions(summary, read_history(report_dir))
+    document = {
+        "version": REPORT_VERSION,
+        **summary,
+        "memoryTraced": memory,
+        "regressions": regressions,
+        "spans": root.to_dict(root.start),
+    }
+    path = report or report_dir / f"{root.name}-{run_id}.json"
+    _write_json(path, document)
+    if trace is not None:
+        _write_json(trace, chrome_trace(root))
+
+    report_dir.mkdir(parents=True, exist_ok=True)
+    with (report_dir / HISTORY_NAME).open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps(summary, separators=(",", ":")) + "\n")
+    if report is None:
+        for stale in sorted(report_dir.glob(f"{root.name}-*.json"))[:-KEEP_REPORTS]:
+            stale.unlink(missing_ok=True)
+
+    print(f"Run report: {path}" + (f" (trace: {trace})" if trace is not None else ""))
+    for regression in regressions:
+        print(
+            f"  {regression['stage']} took {regression['seconds']:.1f}s against a median of "
+            f"{regression['median']:.1f}s over the last {regression['runs']} runs"
+        )
+    return path
@@ -0,0 +1,34 @@
+"""Batched, vectorized port of the SBI cost model in ``src/model``.
+
+``evaluate`` takes every assumption as a scalar or NumPy array and returns each metric for the whole broadcast grid
+in one pass; ``evaluate_parallel`` splits very large grids across processes. ``model_golden.py`` checks the port
+against the JavaScript model the app runs. ``optimize_design`` searches the design variables for the cheapest
+feasible design and its cost frontier across salvo sizes. ``simulate_coverage`` flies a Walker constellation to check
+the analytic constellation size against orbital geometry.
+"""
+from .coverage import CoverageResult, Walker, simulate_coverage
+from .engine import FLYOUT_MESSAGES, METRIC_NAMES, evaluate, evaluate_parallel
+from .inputs import DEFAULT_INPUTS, FIELD_NAMES, FIELDS, PreparedInputs, prepare_inputs
+from .learning_curve import learning_curve_cost
+from .optimize import DESIGN_BOUNDS, DESIGN_VARIABLES, Design, OptimizationResult, optimize_design
+
+__all__ = [
+    "CoverageResult",
+    "DEFAULT_INPUTS",
+    "DESIGN_BOUNDS",
+    "DESIGN_VARIABLES",
+    "Design",
+    "FIELD_NAMES",
+    "FIELDS",
+    "FLYOUT_MESSAGES",
+    "METRIC_NAMES",
+    "OptimizationResult",
+    "PreparedInputs",
+    "Walker",
+    "evaluate",
+    "evaluate_parallel",
+    "learning_curve_cost",
+    "optimize_design",
+    "prepare_inputs",
+    "simulate_coverage",
+]
@@ -0,0 +1,263 @@
+"""Geometric coverage simulation to check the analytic constellation sizing.
+
+``constellation_size`` divides the covered latitude band by one interceptor's footprint and multiplies by the
+interceptors each salvo needs, which ignores orbital geometry and footprint overlap. This module flies an actual
+Walker-delta constellation of that size (or any other) and counts, at every timestep, the interceptors within flyout
+range of a near-uniform grid of threat points covering the same band.
+
+Orbits are circular and Keplerian (no J2 drift) and the Earth rotates underneath them. The constellation is
+evaluated on a time grid; at each step the satellites' unit vectors go into a k-d tree (``scipy.spatial.cKDTree``)
+and every threat point's count of interceptors in range is one ball query: "within flyout range" at the two
+altitudes is a fixed chord length between unit vectors. Without SciPy the counts come from blocked dot products
+instead, which gives the same result more slowly. Timesteps are split into chunks that run on a process pool, and
+only per-point and per-step tallies leave each worker, so memory stays bounded by one step.
+"""
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Mapping
+
+import numpy as np
+
+from .engine import EARTH_RADIUS_KM, evaluate
+from .inputs import prepare_inputs
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # optional: the brute-force counter is used instead
+    cKDTree = None
+
+EARTH_MU_KM3_S2 = 398_600.4418
+EARTH_ROTATION_RAD_S = 7.292_115_9e-5
+
+DEFAULT_GROUND_POINTS = 20_000
+DEFAULT_TIMESTEPS = 96
+DEFAULT_DURATION_HOURS = 24.0
+# Timesteps per process-pool task, and threat points per block of the brute-force counter
+STEP_CHUNK = 8
+POINT_BLOCK = 4096
+LATITUDE_BANDS = 9
+INDEXES = ("auto", "kdtree", "brute")
+
+
+@dataclass(frozen=True)
+class Walker:
+    """A Walker-delta constellation i:T/P/F on circular orbits at ``altitude_km``."""
+
+    planes: int
+    per_plane: int
+    phasing: int
+    inclination_deg: float
+    altitude_km: float
+
+    @property
+    def satellites(self) -> int:
+        return self.planes * self.per_plane
+
+    @property
+    def period_seconds(self) -> float:
+        return 2 * math.pi / self.mean_motion
+
+    @property
+    def mean_motion(self) -> float:
+        return math.sqrt(EARTH_MU_KM3_S2 / (EARTH_RADIUS_KM + self.altitude_km) ** 3)
+
+    @classmethod
+    def for_size(
+        cls, size: int, altitude_km: float, inclination_deg: float, planes: int | None = None, phasing: int = 1
+    ) -> Walker:
+        """The constellation of at least ``size`` satellites with ``planes`` planes (about √size by default)."""
+        size = max(1, int(size))
+        planes = max(1, min(planes or round(math.sqrt(size)), size))
+        return cls(planes, math.ceil(size / planes), phasing % planes, inclination_deg, altitude_km)
+
+    def unit_vectors(self, times: np.ndarray) -> np.ndarray:
+        """Earth-fixed unit vectors of every satellite at each of ``times`` (seconds), shape (steps, satellites, 3)."""
+        plane = np.repeat(np.arange(self.planes), self.per_plane)
+        slot = np.tile(np.arange(self.per_plane), self.planes)
+        raan = 2 * math.pi * plane / self.planes
+        anomaly = 2 * math.pi * (slot / self.per_plane + self.phasing * plane / self.satellites)
+
+        times = np.asarray(times, dtype=np.float64)[:, None]
+        node = raan[None, :] - EARTH_ROTATION_RAD_S * times
+        u = anomaly[None, :] + self.mean_motion * times
+        inclination = math.radians(self.inclination_deg)
+        cos_u, sin_u = np.cos(u), np.sin(u)
+        cos_node, sin_node = np.cos(node), np.sin(node)
+        vectors = np.empty((*u.shape, 3))
+        vectors[..., 0] = cos_node * cos_u - sin_node * sin_u * math.cos(inclination)
+        vectors[..., 1] = sin_node * cos_u + cos_node * sin_u * math.cos(inclination)
+        vectors[..., 2] = sin_u * math.sin(inclination)
+        return vectors
+
+
+@dataclass
+class CoverageResult:
+    walker: Walker
+    # Interceptors that must be in range of a threat point: salvo size x interceptors per threat
+    required: int
+    ground_points: int
+    timesteps: int
+    flyout_range_km: float
+    # Constellation size from the analytic model, for comparison with ``walker.satellites``
+    analytic_size: float
+    # Mean over points and steps of whether at least ``required`` interceptors were in range
+    average_availability: float
+    # Lowest availability of a single timestep across all points, and of a single point across all timesteps
+    worst_step_availability: float
+    worst_point_availability: float
+    mean_in_range: float
+    min_in_range: int
+    # (band centre latitude in degrees, availability) from the equator to the covered latitude
+    latitude_profile: list[tuple[float, float]] = field(default_factory=list)
+    index: str = ""
+    seconds: float = 0.0
+
+
+def threat_points(count: int, max_latitude_deg: float) -> np.ndarray:
+    """About ``count`` equal-area points (a Fibonacci lattice) on the band within ``max_latitude_deg`` of the
+    equator, as unit vectors."""
+    top = math.sin(math.radians(min(max(max_latitude_deg, 0.0), 90.0)))
+    index = np.arange(count) + 0.5
+    z = top * (1 - 2 * index / count)
+    longitude = index * math.pi * (3 - math.sqrt(5))
+    radius = np.sqrt(1 - z * z)
+    return np.column_stack((radius * np.cos(longitude), radius * np.sin(longitude), z))
+
+
+def range_chord(flyout_range_km: float, orbit_altitude_km: float, intercept_altitude_km: float) -> float:
+    """Chord between unit vectors at which an interceptor at orbit altitude is exactly ``flyout_range_km`` from a
+    threat at intercept altitude; NaN if it can never reach intercept altitude."""
+    orbit = EARTH_RADIUS_KM + orbit_altitude_km
+    threat = EARTH_RADIUS_KM + intercept_altitude_km
+    cos_angle = (orbit**2 + threat**2 - flyout_range_km**2) / (2 * orbit * threat)
+    if not math.isfinite(cos_angle) or cos_angle > 1:
+        return math.nan
+    return math.sqrt(2 - 2 * max(cos_angle, -1.0))
+
+
+def _counts_kdtree(satellites: np.ndarray, points: np.ndarray, chord: float) -> np.ndarray:
+    return cKDTree(satellites).query_ball_point(points, chord, return_length=True)
+
+
+def _counts_brute(satellites: np.ndarray, points: np.ndarray, chord: float) -> np.ndarray:
+    threshold = 1 - chord * chord / 2
+    counts = np.empty(len(points), dtype=np.int64)
+    for start in range(0, len(points), POINT_BLOCK):
+        block = points[start : start + POINT_BLOCK] @ satellites.T
+        counts[start : start + POINT_BLOCK] = np.count_nonzero(block >= threshold, axis=1)
+    return counts
+
+
+def _simulate_steps(task: tuple[Walker, np.ndarray, np.ndarray, float, int, str]) -> dict[str, Any]:
+    """Tallies for one chunk of timesteps: per-point steps covered, per-step availability and in-range counts."""
+    walker, points, times, chord, required, index = task
+    count = _counts_kdtree if index == "kdtree" else _counts_brute
+    covered = np.zeros(len(points), dtype=np.int64)
+    step_availability = np.empty(len(times))
+    total = 0
+    lowest = np.iinfo(np.int64).max
+    for step, satellites in enumerate(walker.unit_vectors(times)):
+        counts = np.asarray(count(satellites, points, chord), dtype=np.int64)
+        ok = counts >= required
+        covered += ok
+        step_availability[step] = ok.mean()
+        total += int(counts.sum())
+        lowest = min(lowest, int(counts.min()))
+    return {"covered": covered, "steps": step_availability, "total": total, "lowest": lowest}
+
+
+def simulate_coverage(
+    inputs: Mapping[str, Any] | None = None,
+    *,
+    satellites: int | None = None,
+    planes: int | None = None,
+    phasing: int = 1,
+    inclination_deg: float | None = None,
+    ground_points: int = DEFAULT_GROUND_POINTS,
+    timesteps: int = DEFAULT_TIMESTEPS,
+    duration_hours: float = DEFAULT_DURATION_HOURS,
+    workers: int | None = None,
+    index: str = "auto",
+) -> CoverageResult:
+    """Fly a Walker constellation for the scenario ``inputs`` (raw app inputs, defaults fill the rest) and measure
+    how often each threat point has the required interceptors in range.
+
+    The constellation has ``satellites`` interceptors (the analytic ``constellationSize`` by default, rounded up to
+    fill every plane) at the scenario's orbit altitude and an inclination equal to its covered latitude unless
+    ``inclination_deg`` is given. ``timesteps`` are spread evenly over ``duration_hours``.
+    """
+    started = perf_counter()
+    if index not in INDEXES:
+        raise ValueError(f"Unknown index {index!r}; use one of {', '.join(INDEXES)}.")
+    if index == "auto":
+        index = "kdtree" if cKDTree is not None else "brute"
+    elif index == "kdtree" and cKDTree is None:
+        raise ValueError("The k-d tree index needs SciPy; install it with pip install scipy or use index='brute'.")
+
+    prepared = prepare_inputs(inputs or {})
+    if prepared.errors:
+        raise ValueError("The scenario inputs are invalid: " + " ".join(prepared.errors))
+    metrics = {name: float(value) for name, value in evaluate(prepared.numbers).items()}
+    numbers = {name: float(value) for name, value in prepared.numbers.items()}
+    if not math.isfinite(metrics["constellationSize"]):
+        raise ValueError("The scenario has no analytic constellation size (check the flyout and coverage inputs).")
+    flyout_range = metrics["interceptorFlyoutRangeKm"]
+    chord = range_chord(flyout_range, numbers["sbiOrbitAltitudeKm"], numbers["interceptAltitudeKm"])
+    if not math.isfinite(chord):
+        raise ValueError("The interceptor flyout range does not reach the intercept altitude.")
+
+    latitude = numbers["maxLatitudeCoverageDeg"]
+    walker = Walker.for_size(
+        satellites or int(metrics["constellationSize"]),
+        numbers["sbiOrbitAltitudeKm"],
+        latitude if inclination_deg is None else inclination_deg,
+        planes,
+        phasing,
+    )
+    required = int(metrics["interceptorsPerSalvo"])
+    points = threat_points(ground_points, latitude)
+    times = np.linspace(0.0, duration_hours * 3600, timesteps, endpoint=False)
+
+    tasks = [
+        (walker, points, times[start : start + STEP_CHUNK], chord, required, index)
+        for start in range(0, timesteps, STEP_CHUNK)
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_steps, tasks))
+    else:
+        parts = [_simulate_steps(task) for task in tasks]
+
+    covered = np.sum([part["covered"] for part in parts], axis=0)
+    steps = np.concatenate([part["steps"] for part in parts])
+    point_availability = covered / timesteps
+    band_latitude = np.degrees(np.arcsin(np.abs(points[:, 2])))
+    edges = np.linspace(0.0, max(latitude, 1e-9), LATITUDE_BANDS + 1)
+    band = np.clip(np.digitize(band_latitude, edges) - 1, 0, LATITUDE_BANDS - 1)
+    profile = [
+        (round(float((edges[i] + edges[i + 1]) / 2), 2), float(point_availability[band == i].mean()))
+        for i in range(LATITUDE_BANDS)
+        if np.any(band == i)
+    ]
+    return CoverageResult(
+        walker=walker,
+        required=required,
+        ground_points=len(points),
+        timesteps=timesteps,
+        flyout_range_km=flyout_range,
+        analytic_size=metrics["constellationSize"],
+        average_availability=float(point_availability.mean()),
+        worst_step_availability=float(steps.min()),
+        worst_point_availability=float(point_availability.min()),
+        mean_in_range=sum(part["total"] for part in parts) / (len(points) * timesteps),
+        min_in_range=min(part["lowest"] for part in parts),
+        latitude_profile=profile,
+        index=index,
+        seconds=perf_counter() - started,
+    )
@@ -0,0 +1,370 @@
+"""Vectorized SBI scenario engine (mirrors ``computeScenario`` in ``src/model/scenario.js``).
+
+Every assumption may be a scalar or an array; inputs are broadcast against each other and every metric comes back as
+an array of the broadcast shape. Each guard in the JavaScript model (``Number.isFinite`` checks, positivity tests,
+``Math.max(1, ...)`` clamps) is reproduced with ``np.where`` so invalid scenarios turn into NaN exactly where the app
+shows an empty value.
+"""
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Mapping
+
+import numpy as np
+
+from .learning_curve import learning_curve_cost
+
+G0 = 9.81
+STANDARD_GRAVITY = 9.80665
+EARTH_RADIUS_KM = 6378.1
+PARALLEL_CHUNK_ROWS = 250_000
+
+# Values of the ``flyoutMessageCode`` metric, indexing the app's ``interceptorFlyoutRangeMessage`` strings
+FLYOUT_MESSAGES: tuple[str, ...] = (
+    "",
+    "Acceleration is insufficient to reach the velocity specified over the flyout time specified.",
+    "Acceleration inputs result in an invalid time to max velocity.",
+)
+
+METRIC_NAMES: tuple[str, ...] = (
+    "totalSystemCostMillion",
+    "totalSystemCostBillion",
+    "nonRecurringMillion",
+    "productionCostMillion",
+    "operationsCostMillion",
+    "launchCampaignCostMillion",
+    "averageInterceptorUnitCostMillion",
+    "averageProcurementUnitCostMillion",
+    "averageLaunchCostMillion",
+    "costPerInterceptAttemptMillion",
+    "interceptorDryMassKg",
+    "killVehiclePropellantMassKg",
+    "interceptorPropellantMassKg",
+    "interceptorMassKg",
+    "interceptorsPerLaunch",
+    "payloadUtilizationKg",
+    "payloadUtilizationPercent",
+    "launchCount",
+    "totalPayloadToOrbitKg",
+    "totalInterceptors",
+    "interceptorsPerThreat",
+    "interceptorsPerSalvo",
+    "interceptorReplacements",
+    "compositeKillProbabilityPercent",
+    "requestedCompositeKillProbabilityPercent",
+    "deltaVMarginKmPerS",
+    "averageAccelerationG",
+    "averageAccelerationMS2",
+    "averageAccelerationKmPerS2",
+    "timeToReachMaxVelocitySeconds",
+    "interceptorFlyoutRangeKm",
+    "flyoutMessageCode",
+    "coverageRadiusKm",
+    "earthCoverageSqKm",
+    "interceptAltitudeKm",
+    "maxLatitudeCoverageDeg",
+    "sbiOrbitAltitudeKm",
+    "flyoutTimeSeconds",
+    "sbiLifeExpectancyYears",
+    "interceptorsPerYear",
+    "constellationSize",
+    "costEstimatePeriodYears",
+)
+
+NAN = math.nan
+
+
+def js_round(value: np.ndarray) -> np.ndarray:
+    """``Math.round``: nearest integer with halves rounded towards +infinity (``np.round`` rounds half to even)."""
+    value = np.asarray(value, dtype=np.float64)
+    floor = np.floor(value)
+    with np.errstate(invalid="ignore"):
+        return floor + (value - floor >= 0.5)
+
+
+def _isfinite(*values: np.ndarray) -> np.ndarray:
+    mask = np.isfinite(values[0])
+    for value in values[1:]:
+        mask = mask & np.isfinite(value)
+    return mask
+
+
+def _rocket_propellant(dry_mass: np.ndarray, isp: np.ndarray, delta_v_km_s: np.ndarray) -> np.ndarray:
+    """Propellant for ``delta_v`` on ``dry_mass`` via the rocket equation, NaN where the app's guards fail."""
+    exponent = (delta_v_km_s * 1000) / (G0 * isp)
+    mass_ratio = np.exp(exponent)
+    ok = (
+        np.isfinite(dry_mass)
+        & (dry_mass >= 0)
+        & np.isfinite(isp)
+        & (isp > 0)
+        & np.isfinite(delta_v_km_s)
+        & np.isfinite(exponent)
+        & np.isfinite(mass_ratio)
+    )
+    return np.where(ok, dry_mass * (mass_ratio - 1), NAN)
+
+
+def calculate_interceptor_masses(a: Mapping[str, np.ndarray]) -> dict[str, np.ndarray]:
+    with np.errstate(all="ignore"):
+        kill_vehicle = np.asarray(a["killVehicleDryMassKg"], dtype=np.float64)
+        body = np.asarray(a["interceptorBodyDryMassKg"], dtype=np.float64)
+        support = np.asarray(a["supportModuleDryMassKg"], dtype=np.float64)
+        isp = np.asarray(a["thrusterIspSeconds"], dtype=np.float64)
+
+        dry = np.where(_isfinite(kill_vehicle, body, support), kill_vehicle + body + support, NAN)
+        kill_vehicle_propellant = _rocket_propellant(kill_vehicle, isp, np.asarray(a["divertVelocityKmPerS"]))
+        pre_main_burn = np.where(
+            np.isfinite(kill_vehicle_propellant), kill_vehicle + kill_vehicle_propellant + body, NAN
+        )
+        interceptor_propellant = _rocket_propellant(pre_main_burn, isp, np.asarray(a["maxDeltaVKmPerS"]))
+        total = np.where(
+            _isfinite(dry, kill_vehicle_propellant, interceptor_propellant),
+            dry + kill_vehicle_propellant + interceptor_propellant,
+            NAN,
+        )
+    return {
+        "killVehiclePropellantMassKg": kill_vehicle_propellant,
+        "interceptorPropellantMassKg": interceptor_propellant,
+        "interceptorDryMassKg": dry,
+        "interceptorTotalMassKg": total,
+    }
+
+
+def compute_interceptors_per_threat(single_shot_pk_percent: np.ndarray, composite_pk_percent: np.ndarray) -> np.ndarray:
+    with np.errstate(all="ignore"):
+        single = np.asarray(single_shot_pk_percent, dtype=np.float64) / 100
+        desired = np.asarray(composite_pk_percent, dtype=np.float64) / 100
+        required = np.maximum(1, np.ceil(np.log(1 - desired) / np.log(1 - single)))
+        result = np.where((single >= 1) | (desired >= 1), 1.0, required)
+        return np.where(_isfinite(single, desired) & (single > 0) & (desired > 0), result, NAN)
+
+
+def average_learning_cost(first: np.ndarray, percent: np.ndarray, quantity: np.ndarray) -> np.ndarray:
+    """Closed-form average unit cost used for procurement and launches in the app."""
+    rate = percent / 100
+    log_slope = np.where(rate > 0, np.log(rate) / np.log(2), NAN)
+    ok = (
+        np.isfinite(quantity)
+        & (quantity > 0)
+        & (rate > 0)
+        & np.isfinite(log_slope)
+        & ((1 + log_slope) != 0)
+    )
+    average = first * ((np.power(quantity, 1 + log_slope) + 1) / (quantity * (1 + log_slope)))
+    return np.where(ok, average, NAN)
+
+
+def coverage_geometry(a: Mapping[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Flyout kinematics and the ground footprint of one interceptor; depends only on acceleration, ΔV, flyout time,
+    the two altitudes and the coverage latitude."""
+    with np.errstate(all="ignore"):
+        max_dv = np.asarray(a["maxDeltaVKmPerS"], dtype=np.float64)
+        acceleration_ms2 = np.asarray(a["averageAccelerationG"], dtype=np.float64) * STANDARD_GRAVITY
+        acceleration_kms2 = acceleration_ms2 / 1000
+        time_to_max = np.where(acceleration_kms2 > 0, max_dv / acceleration_kms2, NAN)
+
+        flyout_time = np.asarray(a["flyoutTimeSeconds"], dtype=np.float64)
+        timing_ok = _isfinite(time_to_max, flyout_time)
+        insufficient = timing_ok & (time_to_max > flyout_time)
+        accel_distance = 0.5 * acceleration_kms2 * np.power(time_to_max, 2)
+        flyout_range = np.where(
+            timing_ok & ~insufficient, accel_distance + max_dv * (flyout_time - time_to_max), NAN
+        )
+        flyout_message = np.where(timing_ok, np.where(insufficient, 1, 0), 2).astype(np.int8)
+
+        intercept_altitude = np.asarray(a["interceptAltitudeKm"], dtype=np.float64)
+        altitude_delta = np.asarray(a["sbiOrbitAltitudeKm"], dtype=np.float64) - intercept_altitude
+        radicand = np.power(flyout_range, 2) - np.power(altitude_delta, 2)
+        coverage_radius = np.where(np.isfinite(flyout_range) & (radicand >= 0), np.sqrt(radicand), NAN)
+
+        latitude = np.asarray(a["maxLatitudeCoverageDeg"], dtype=np.float64)
+        earth_coverage = np.where(
+            np.isfinite(latitude),
+            4 * math.pi * np.power(EARTH_RADIUS_KM + intercept_altitude, 2) * np.sin((latitude * math.pi) / 180),
+            NAN,
+        )
+    return {
+        "averageAccelerationMS2": acceleration_ms2,
+        "averageAccelerationKmPerS2": acceleration_kms2,
+        "timeToReachMaxVelocitySeconds": time_to_max,
+        "interceptorFlyoutRangeKm": flyout_range,
+        "flyoutMessageCode": flyout_message,
+        "coverageRadiusKm": coverage_radius,
+        "earthCoverageSqKm": earth_coverage,
+    }
+
+
+def constellation_size(
+    earth_coverage: np.ndarray, coverage_radius: np.ndarray, salvo: np.ndarray, per_threat: np.ndarray
+) -> np.ndarray:
+    """Interceptors on orbit so that ``salvo * per_threat`` are in range of any covered point."""
+    with np.errstate(all="ignore"):
+        coverage_area = math.pi * np.power(coverage_radius, 2)
+        raw_constellation = (earth_coverage / coverage_area) * salvo * per_threat
+        return np.where(
+            np.isfinite(coverage_radius)
+            & (coverage_radius > 0)
+            & np.isfinite(earth_coverage)
+            & (earth_coverage > 0)
+            & np.isfinite(raw_constellation)
+            & (raw_constellation > 0),
+            np.maximum(1, np.ceil(raw_constellation)),
+            NAN,
+        )
+
+
+def evaluate(assumptions: Mapping[str, Any]) -> dict[str, np.ndarray]:
+    """Evaluate every scenario in ``assumptions`` (field name -> scalar or array) and return all metrics as arrays."""
+    a = {name: np.asarray(value, dtype=np.float64) for name, value in assumptions.items()}
+    shape = np.broadcast_shapes(*(value.shape for value in a.values()))
+
+    with np.errstate(all="ignore"):
+        salvo = a["salvoSize"]
+        kill_pk = a["killProbabilityPercent"]
+        per_threat = compute_interceptors_per_threat(kill_pk, a["compositeKillProbabilityPercent"])
+        per_threat_ok = np.isfinite(per_threat)
+        per_salvo = np.where(per_threat_ok, per_threat * salvo, NAN)
+        composite_pk = np.where(per_threat_ok, 100 * (1 - np.power(1 - kill_pk / 100, per_threat)), NAN)
+
+        max_dv = a["maxDeltaVKmPerS"]
+        masses = calculate_interceptor_masses(a)
+        total_mass = masses["interceptorTotalMassKg"]
+
+        geometry = coverage_geometry(a)
+        acceleration_ms2 = geometry["averageAccelerationMS2"]
+        acceleration_kms2 = geometry["averageAccelerationKmPerS2"]
+        time_to_max = geometry["timeToReachMaxVelocitySeconds"]
+        flyout_time = a["flyoutTimeSeconds"]
+        flyout_range = geometry["interceptorFlyoutRangeKm"]
+        flyout_message = geometry["flyoutMessageCode"]
+        coverage_radius = geometry["coverageRadiusKm"]
+        earth_coverage = geometry["earthCoverageSqKm"]
+        intercept_altitude = a["interceptAltitudeKm"]
+        latitude = a["maxLatitudeCoverageDeg"]
+
+        constellation = constellation_size(earth_coverage, coverage_radius, salvo, per_threat)
+
+        life = a["sbiLifeExpectancyYears"]
+        period = a["costEstimatePeriodYears"]
+        replacement_ratio = np.where(life > 0, period / life, NAN)
+        replacements = np.where(np.isfinite(replacement_ratio), np.maximum(1, np.floor(replacement_ratio)), NAN)
+        total_interceptors = np.where(_isfinite(constellation, replacements), constellation * replacements, NAN)
+
+        payload = a["payloadCapacityPerVehicleKg"]
+        possible = np.floor(payload / total_mass)
+        per_launch = np.where(
+            np.isfinite(total_mass) & (total_mass > 0) & np.isfinite(payload) & (payload > 0) & (possible >= 1),
+            possible,
+            NAN,
+        )
+        utilization_kg = np.where(_isfinite(per_launch, total_mass), per_launch * total_mass, NAN)
+        utilization_percent = np.where(
+            np.isfinite(utilization_kg) & (payload > 0), (utilization_kg / payload) * 100, NAN
+        )
+        launch_count = np.where(
+            _isfinite(constellation, per_launch) & (per_launch > 0), np.ceil(constellation / per_launch), NAN
+        )
+
+        units = np.where(np.isfinite(total_interceptors) & (total_interceptors > 0), js_round(total_interceptors), 0)
+        production = np.where(
+            units > 0,
+            learning_curve_cost(a["firstUnitInterceptorCostMillion"], a["interceptorLearningPercent"], units),
+            NAN,
+        )
+
+        unit_cost = average_learning_cost(
+            a["firstUnitInterceptorCostMillion"], a["interceptorLearningPercent"], constellation
+        )
+        launch_cost = average_learning_cost(a["firstUnitLaunchCostMillion"], a["launchLearningPercent"], launch_count)
+        launch_campaign = np.where(_isfinite(launch_cost, launch_count), launch_cost * launch_count, NAN)
+
+        non_recurring = a["nonRecurringDevCostMillion"]
+        operations = a["operatingSupportCostPerYearMillion"] * period
+        cycle = np.where(
+            _isfinite(unit_cost, constellation, launch_cost, launch_count),
+            unit_cost * constellation + launch_cost * launch_count,
+            NAN,
+        )
+        system = np.where(_isfinite(cycle, replacements), cycle * replacements + operations + non_recurring, NAN)
+        system_billion = np.where(np.isfinite(system), system / 1000, NAN)
+        per_year = np.where(np.isfinite(total_interceptors) & (period > 0), total_interceptors / period, NAN)
+        payload_to_orbit = np.where(
+            _isfinite(utilization_kg, launch_count, replacements), utilization_kg * launch_count * replacements, NAN
+        )
+
+    metrics = {
+        "totalSystemCostMillion": system,
+        "totalSystemCostBillion": system_billion,
+        "nonRecurringMillion": non_recurring,
+        "productionCostMillion": production,
+        "operationsCostMillion": operations,
+        "launchCampaignCostMillion": launch_campaign,
+        "averageInterceptorUnitCostMillion": unit_cost,
+        "averageProcurementUnitCostMillion": unit_cost,
+        "averageLaunchCostMillion": launch_cost,
+        "costPerInterceptAttemptMillion": unit_cost,
+        "interceptorDryMassKg": masses["interceptorDryMassKg"],
+        "killVehiclePropellantMassKg": masses["killVehiclePropellantMassKg"],
+        "interceptorPropellantMassKg": masses["interceptorPropellantMassKg"],
+        "interceptorMassKg": total_mass,
+        "interceptorsPerLaunch": per_launch,
+        "payloadUtilizationKg": utilization_kg,
+        "payloadUtilizationPercent": utilization_percent,
+        "launchCount": launch_count,
+        "totalPayloadToOrbitKg": payload_to_orbit,
+        "totalInterceptors": total_interceptors,
+        "interceptorsPerThreat": per_threat,
+        "interceptorsPerSalvo": per_salvo,
+        "interceptorReplacements": replacements,
+        "compositeKillProbabilityPercent": composite_pk,
+        "requestedCompositeKillProbabilityPercent": a["compositeKillProbabilityPercent"],
+        "deltaVMarginKmPerS": max_dv - a["divertVelocityKmPerS"],
+        "averageAccelerationG": a["averageAccelerationG"],
+        "averageAccelerationMS2": acceleration_ms2,
+        "averageAccelerationKmPerS2": acceleration_kms2,
+        "timeToReachMaxVelocitySeconds": time_to_max,
+        "interceptorFlyoutRangeKm": flyout_range,
+        "flyoutMessageCode": flyout_message,
+        "coverageRadiusKm": coverage_radius,
+        "earthCoverageSqKm": earth_coverage,
+        "interceptAltitudeKm": intercept_altitude,
+        "maxLatitudeCoverageDeg": latitude,
+        "sbiOrbitAltitudeKm": a["sbiOrbitAltitudeKm"],
+        "flyoutTimeSeconds": flyout_time,
+        "sbiLifeExpectancyYears": life,
+        "interceptorsPerYear": per_year,
+        "constellationSize": constellation,
+        "costEstimatePeriodYears": period,
+    }
+    return {name: np.broadcast_to(value, shape) for name, value in metrics.items()}
+
+
+def _evaluate_chunk(assumptions: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    return {name: np.ascontiguousarray(value) for name, value in evaluate(assumptions).items()}
+
+
+def evaluate_parallel(
+    assumptions: Mapping[str, Any], *, workers: int | None = None, chunk_rows: int = PARALLEL_CHUNK_ROWS
+) -> dict[str, np.ndarray]:
+    """:func:`evaluate` split into row chunks across a process pool; returns the same arrays, flattened to 1-D.
+
+    Worth it once the grid has a few million scenarios; smaller inputs are evaluated in-process.
+    """
+    arrays = {name: np.asarray(value, dtype=np.float64) for name, value in assumptions.items()}
+    shape = np.broadcast_shapes(*(value.shape for value in arrays.values()))
+    flat = {name: np.broadcast_to(value, shape).reshape(-1) for name, value in arrays.items()}
+    rows = int(np.prod(shape, dtype=np.int64))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or rows <= chunk_rows:
+        return _evaluate_chunk(flat)
+
+    chunks = [
+        {name: value[start : start + chunk_rows] for name, value in flat.items()}
+        for start in range(0, rows, chunk_rows)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_evaluate_chunk, chunks))
+    return {name: np.concatenate([result[name] for result in results]) for name in METRIC_NAMES}
@@ -0,0 +1,210 @@
+"""Input fields, defaults and validation for the batched SBI model (mirrors ``src/model/inputs.js``)."""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+import numpy as np
+
+from .engine import calculate_interceptor_masses, js_round
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    default: str
+    minimum: float | None = None
+    maximum: float | None = None
+    step: str = "1"
+
+
+FIELDS: tuple[FieldSpec, ...] = (
+    FieldSpec("sbiOrbitAltitudeKm", "300", 150, 22500, "5"),
+    FieldSpec("averageAccelerationG", "15.0", 1, 30, "0.1"),
+    FieldSpec("maxDeltaVKmPerS", "6.0", 0.1, 20, "0.1"),
+    FieldSpec("divertVelocityKmPerS", "2.5", 0, 10, "0.1"),
+    FieldSpec("thrusterIspSeconds", "240", 100, 1000, "1"),
+    FieldSpec("killVehicleDryMassKg", "25.0", 1, None, "0.1"),
+    FieldSpec("interceptorBodyDryMassKg", "25.0", 1, None, "0.1"),
+    FieldSpec("supportModuleDryMassKg", "50.0", 1, None, "0.1"),
+    FieldSpec("sbiLifeExpectancyYears", "5", 1, 20, "1"),
+    FieldSpec("killProbabilityPercent", "80.0", 1, 99.9, "0.1"),
+    FieldSpec("compositeKillProbabilityPercent", "96.0", 1, 99.9, "0.1"),
+    FieldSpec("salvoSize", "1", 1, 1000, "1"),
+    FieldSpec("interceptAltitudeKm", "200", 50, 10000, "5"),
+    FieldSpec("maxLatitudeCoverageDeg", "90", 1, 90, "1"),
+    FieldSpec("flyoutTimeSeconds", "120.0", 10, 1800, "1"),
+    FieldSpec("nonRecurringDevCostMillion", "7000", 0, None, "1"),
+    FieldSpec("firstUnitInterceptorCostMillion", "70.0", 1, None, "0.1"),
+    FieldSpec("interceptorLearningPercent", "85.0", 70, 100, "0.1"),
+    FieldSpec("operatingSupportCostPerYearMillion", "450", 0, None, "1"),
+    FieldSpec("costEstimatePeriodYears", "20", 1, 100, "1"),
+    FieldSpec("payloadCapacityPerVehicleKg", "45000", 15000, 300000, "100"),
+    FieldSpec("firstUnitLaunchCostMillion", "150.0", 1, None, "0.1"),
+    FieldSpec("launchLearningPercent", "95", 70, 100, "0.1"),
+)
+
+FIELDS_BY_NAME: dict[str, FieldSpec] = {spec.name: spec for spec in FIELDS}
+FIELD_NAMES: tuple[str, ...] = tuple(spec.name for spec in FIELDS)
+DEFAULT_INPUTS: dict[str, str] = {spec.name: spec.default for spec in FIELDS}
+
+# JavaScript ``Number()`` accepts decimal, exponent and 0x/0o/0b literals; anything else is NaN
+_JS_NUMBER = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?|0[xX][0-9a-fA-F]+|0[oO][0-7]+|0[bB][01]+")
+
+
+def to_number(raw: Any) -> float:
+    """Scalar ``toNumber`` from the app: strings are trimmed and stripped of thousands separators."""
+    if isinstance(raw, (int, float, np.number)) and not isinstance(raw, bool):
+        return float(raw)
+    if not isinstance(raw, str):
+        return math.nan
+    text = raw.strip().replace(",", "")
+    if not text or not _JS_NUMBER.fullmatch(text):
+        return math.nan
+    value = float(int(text, 0)) if text[:2].lower() in ("0x", "0o", "0b") else float(text)
+    return value if math.isfinite(value) else math.nan
+
+
+def convert_to_numeric(raw: Mapping[str, Any]) -> dict[str, np.ndarray]:
+    """Convert every input to a float array; strings go through :func:`to_number`, arrays are taken as-is."""
+    return {
+        name: np.asarray(to_number(value) if isinstance(value, str) else value, dtype=np.float64)
+        for name, value in raw.items()
+    }
+
+
+def default_numeric_inputs() -> dict[str, np.ndarray]:
+    return convert_to_numeric(DEFAULT_INPUTS)
+
+
+@dataclass
+class PreparedInputs:
+    numbers: dict[str, np.ndarray]
+    # Validation message -> mask of the scenarios that fail it (only messages that fire anywhere are kept)
+    errors: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def valid(self) -> np.ndarray:
+        shape = np.broadcast_shapes(*(value.shape for value in self.numbers.values()))
+        valid = np.ones(shape, dtype=bool)
+        for mask in self.errors.values():
+            valid &= ~mask
+        return valid
+
+
+def _finite(value: np.ndarray) -> np.ndarray:
+    return np.isfinite(value)
+
+
+def _positive(value: np.ndarray) -> np.ndarray:
+    return np.isfinite(value) & (value > 0)
+
+
+def _non_negative(value: np.ndarray) -> np.ndarray:
+    return np.isfinite(value) & (value >= 0)
+
+
+def prepare_inputs(raw: Mapping[str, Any]) -> PreparedInputs:
+    """Vectorized ``prepareInputs``: validate every scenario and apply the same rounding as the app."""
+    n = convert_to_numeric({**DEFAULT_INPUTS, **raw})
+    errors: dict[str, np.ndarray] = {}
+
+    def fail(message: str, mask: np.ndarray) -> None:
+        if np.any(mask):
+            errors[message] = errors.get(message, False) | mask
+
+    with np.errstate(invalid="ignore"):
+        fail("SBI orbit altitude must be greater than zero.", ~_positive(n["sbiOrbitAltitudeKm"]))
+        fail("Average acceleration must be greater than zero.", ~_positive(n["averageAccelerationG"]))
+        fail("Max Velocity (ΔV) must be greater than zero.", ~_positive(n["maxDeltaVKmPerS"]))
+
+        divert_ok = _non_negative(n["divertVelocityKmPerS"])
+        fail("Divert velocity must be zero or greater.", ~divert_ok)
+        fail(
+            "Divert velocity cannot exceed the total ΔV budget.",
+            divert_ok & (n["divertVelocityKmPerS"] > n["maxDeltaVKmPerS"]),
+        )
+
+        fail("Thruster performance (Isp) must be greater than zero.", ~_positive(n["thrusterIspSeconds"]))
+        fail("Kill vehicle dry mass must be greater than zero.", ~_positive(n["killVehicleDryMassKg"]))
+        fail("Interceptor body dry mass must be greater than zero.", ~_positive(n["interceptorBodyDryMassKg"]))
+        fail("Support module dry mass must be greater than zero.", ~_positive(n["supportModuleDryMassKg"]))
+
+        for key, label in (
+            ("killProbabilityPercent", "Kill probability"),
+            ("compositeKillProbabilityPercent", "Composite kill probability"),
+        ):
+            value = n[key]
+            fail(f"{label} must be a number.", ~_finite(value))
+            fail(f"{label} must be between 0% and 100%.", _finite(value) & ((value <= 0) | (value >= 100)))
+
+        life_ok = _positive(n["sbiLifeExpectancyYears"])
+        fail("SBI life expectancy must be greater than zero.", ~life_ok)
+        n["sbiLifeExpectancyYears"] = np.where(
+            life_ok, js_round(n["sbiLifeExpectancyYears"]), n["sbiLifeExpectancyYears"]
+        )
+
+        salvo_ok = _positive(n["salvoSize"])
+        fail("Salvo size must be at least one missile.", ~salvo_ok)
+        n["salvoSize"] = np.where(salvo_ok, np.maximum(1, js_round(n["salvoSize"])), n["salvoSize"])
+
+        intercept_low = n["interceptAltitudeKm"] < 50
+        fail("Intercept altitude must be at least 50km.", intercept_low)
+        fail(
+            "Intercept altitude cannot exceed the SBI orbit altitude.",
+            ~intercept_low & (n["interceptAltitudeKm"] > n["sbiOrbitAltitudeKm"]),
+        )
+
+        latitude = n["maxLatitudeCoverageDeg"]
+        fail("Max latitude coverage must be a number.", ~_finite(latitude))
+        fail(
+            "Max latitude coverage must be between 0 and 90 degrees.",
+            _finite(latitude) & ((latitude < 0) | (latitude > 90)),
+        )
+
+        fail("Flyout time must be greater than zero.", ~_positive(n["flyoutTimeSeconds"]))
+        fail("Non-recurring development cost must be zero or greater.", ~_non_negative(n["nonRecurringDevCostMillion"]))
+        fail("First unit interceptor cost must be greater than zero.", ~_positive(n["firstUnitInterceptorCostMillion"]))
+
+        learning = n["interceptorLearningPercent"]
+        fail("Interceptor learning percent must be a number.", ~_finite(learning))
+        fail(
+            "Interceptor learning percent must be between 70% and 100%.",
+            _finite(learning) & ((learning < 70) | (learning > 100)),
+        )
+
+        fail(
+            "Operating and support cost must be zero or greater.",
+            ~_non_negative(n["operatingSupportCostPerYearMillion"]),
+        )
+
+        period_ok = _positive(n["costEstimatePeriodYears"])
+        fail("Cost estimate period must be greater than zero.", ~period_ok)
+        n["costEstimatePeriodYears"] = np.where(
+            period_ok, np.maximum(1, js_round(n["costEstimatePeriodYears"])), n["costEstimatePeriodYears"]
+        )
+
+        fail("Payload capacity per vehicle must be greater than zero.", ~_positive(n["payloadCapacityPerVehicleKg"]))
+        fail("First unit launch cost must be greater than zero.", ~_positive(n["firstUnitLaunchCostMillion"]))
+
+        learning = n["launchLearningPercent"]
+        fail("Launch learning percent must be a number.", ~_finite(learning))
+        fail(
+            "Launch learning percent must be between 70% and 100%.",
+            _finite(learning) & ((learning < 70) | (learning > 100)),
+        )
+
+        for key in ("killVehicleDryMassKg", "interceptorBodyDryMassKg", "supportModuleDryMassKg"):
+            n[key] = js_round(n[key] * 10) / 10
+
+        total_mass = calculate_interceptor_masses(n)["interceptorTotalMassKg"]
+        payload = n["payloadCapacityPerVehicleKg"]
+        fail(
+            "The interceptor mass is greater than the payload capacity of the launch vehicle. Consider reducing "
+            "interceptor performance or using a higher capacity launch vehicle.",
+            _finite(total_mass) & _finite(payload) & (payload > 0) & (total_mass > payload),
+        )
+
+    return PreparedInputs(n, errors)
@@ -0,0 +1,340 @@
+"""Constrained minimum-cost design search over the SBI model.
+
+Threat, requirement and cost inputs stay fixed; the design variables (by default orbit altitude, ΔV, acceleration,
+Isp and the three dry masses) are searched for the design with the lowest ``totalSystemCostMillion`` that passes
+every rule ``prepare_inputs`` enforces. A grid over the bounds is searched first, then re-gridded around the best
+design and searched again until the grid reaches each field's input step.
+
+The full Cartesian product is never evaluated. For a given ΔV the model separates into a mass stack (Isp, divert,
+dry masses) that only reaches cost through interceptors per launch, and a coverage footprint (orbit altitude,
+acceleration) that only reaches cost through constellation size. Each side is evaluated once on its own sub-grid and
+reduced to its distinct integer outcomes, so cost is computed on a small table of (constellation size, interceptors
+per launch) pairs. ΔV slices are independent and are spread across processes.
+"""
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Iterable, Mapping
+
+import numpy as np
+
+from .engine import (
+    average_learning_cost,
+    calculate_interceptor_masses,
+    compute_interceptors_per_threat,
+    constellation_size,
+    coverage_geometry,
+    evaluate,
+)
+from .inputs import FIELDS_BY_NAME, prepare_inputs
+
+MASS_VARIABLES: tuple[str, ...] = (
+    "thrusterIspSeconds",
+    "divertVelocityKmPerS",
+    "killVehicleDryMassKg",
+    "interceptorBodyDryMassKg",
+    "supportModuleDryMassKg",
+)
+COVERAGE_VARIABLES: tuple[str, ...] = ("sbiOrbitAltitudeKm", "averageAccelerationG")
+DESIGN_VARIABLES: tuple[str, ...] = ("maxDeltaVKmPerS", *COVERAGE_VARIABLES, *MASS_VARIABLES)
+
+# Default search box; any design variable left out is held at its input value
+DESIGN_BOUNDS: dict[str, tuple[float, float]] = {
+    "sbiOrbitAltitudeKm": (250, 2000),
+    "maxDeltaVKmPerS": (2, 12),
+    "averageAccelerationG": (2, 30),
+    "thrusterIspSeconds": (200, 400),
+    "killVehicleDryMassKg": (15, 40),
+    "interceptorBodyDryMassKg": (15, 40),
+    "supportModuleDryMassKg": (30, 80),
+}
+
+DEFAULT_GRID_POINTS = 24
+DEFAULT_REFINEMENTS = 4
+
+REPORT_METRICS: tuple[str, ...] = (
+    "totalSystemCostMillion",
+    "constellationSize",
+    "launchCount",
+    "interceptorsPerLaunch",
+    "interceptorMassKg",
+    "coverageRadiusKm",
+    "interceptorFlyoutRangeKm",
+)
+
+
+@dataclass(frozen=True)
+class Design:
+    salvo_size: float
+    inputs: dict[str, float]
+    metrics: dict[str, float]
+
+    @property
+    def cost_million(self) -> float:
+        return self.metrics["totalSystemCostMillion"]
+
+
+@dataclass
+class OptimizationResult:
+    # Cheapest feasible design at the input salvo size (None when nothing in the bounds is feasible)
+    best: Design | None
+    # Cheapest design per salvo size that no larger salvo matches at equal or lower cost, by salvo size
+    frontier: list[Design] = field(default_factory=list)
+    free_variables: tuple[str, ...] = ()
+    # Designs covered by the grids (before the factorisation collapses them)
+    candidates: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class _Problem:
+    fixed: dict[str, float]
+    salvo_sizes: tuple[float, ...]
+    max_constellation: float | None
+    max_launches: float | None
+
+
+def _axis(name: str, low: float, high: float, points: int) -> np.ndarray:
+    """Up to ``points`` values from ``low`` to ``high`` on the field's input step, inside the field's limits."""
+    spec = FIELDS_BY_NAME[name]
+    step = float(spec.step)
+    decimals = len(spec.step.partition(".")[2])
+    if spec.minimum is not None:
+        low = max(low, spec.minimum)
+    if spec.maximum is not None:
+        high = min(high, spec.maximum)
+    first = math.ceil(round(low / step, 9)) * step
+    last = math.floor(round(high / step, 9)) * step
+    if first > last:
+        raise ValueError(f"No {name} value on its {spec.step} step lies between {low} and {high}.")
+    values = np.round(np.linspace(first, last, max(points, 2)) / step) * step
+    return np.unique(np.round(values, decimals))
+
+
+def _narrow(axis: np.ndarray, value: float, name: str, bounds: tuple[float, float], points: int) -> np.ndarray:
+    """Re-grid between the neighbours of ``value`` on ``axis``."""
+    index = int(np.searchsorted(axis, value))
+    low = axis[max(index - 1, 0)]
+    high = axis[min(index + 1, axis.size - 1)]
+    return _axis(name, max(low, bounds[0]), min(high, bounds[1]), points)
+
+
+def _open_grid(names: Iterable[str], axes: Mapping[str, np.ndarray], fixed: Mapping[str, float]):
+    """Inputs for ``names`` as an open mesh over the free ones; returns (free names, grid shape, inputs)."""
+    names = tuple(names)
+    free = tuple(name for name in names if name in axes)
+    mesh = np.meshgrid(*(axes[name] for name in free), indexing="ij", sparse=True) if free else []
+    inputs = {name: np.float64(fixed[name]) for name in names if name not in axes}
+    inputs.update(zip(free, mesh))
+    return free, tuple(axes[name].size for name in free), inputs
+
+
+def _flat(value: np.ndarray, shape: tuple[int, ...]) -> np.ndarray:
+    return np.broadcast_to(value, shape).reshape(-1)
+
+
+def _cell(free: tuple[str, ...], shape: tuple[int, ...], axes: Mapping[str, np.ndarray], index: int) -> dict[str, float]:
+    position = np.unravel_index(index, shape) if free else ()
+    return {name: float(axes[name][at]) for name, at in zip(free, position)}
+
+
+def _system_cost(fixed: Mapping[str, float], sizes: np.ndarray, launches: np.ndarray) -> np.ndarray:
+    """``totalSystemCostMillion`` for constellation sizes against launch counts, in the engine's operation order."""
+    with np.errstate(all="ignore"):
+        unit_cost = average_learning_cost(
+            fixed["firstUnitInterceptorCostMillion"], fixed["interceptorLearningPercent"], sizes
+        )
+        launch_cost = average_learning_cost(fixed["firstUnitLaunchCostMillion"], fixed["launchLearningPercent"], launches)
+        period = fixed["costEstimatePeriodYears"]
+        replacements = max(1, math.floor(period / fixed["sbiLifeExpectancyYears"]))
+        operations = fixed["operatingSupportCostPerYearMillion"] * period
+        cycle = unit_cost * sizes + launch_cost * launches
+        return cycle * replacements + operations + fixed["nonRecurringDevCostMillion"]
+
+
+def _search_slice(task: tuple[_Problem, dict[str, np.ndarray], float]) -> list[tuple[float, dict[str, float]] | None]:
+    """Cheapest design per salvo size with ΔV fixed at ``delta_v``: (cost, design variables) or None."""
+    problem, axes, delta_v = task
+    fixed = problem.fixed
+
+    mass_free, mass_shape, mass_inputs = _open_grid(MASS_VARIABLES, axes, fixed)
+    mass_inputs["maxDeltaVKmPerS"] = np.float64(delta_v)
+    with np.errstate(all="ignore"):
+        total_mass = _flat(calculate_interceptor_masses(mass_inputs)["interceptorTotalMassKg"], mass_shape)
+        divert = _flat(mass_inputs["divertVelocityKmPerS"], mass_shape)
+        payload = fixed["payloadCapacityPerVehicleKg"]
+        per_launch = np.floor(payload / total_mass)
+        mass_ok = (
+            np.isfinite(total_mass) & (total_mass > 0) & (total_mass <= payload) & (per_launch >= 1) & (divert <= delta_v)
+        )
+    per_launch_values = np.unique(per_launch[mass_ok])
+
+    coverage_free, coverage_shape, coverage_inputs = _open_grid(
+        (*COVERAGE_VARIABLES, "flyoutTimeSeconds", "interceptAltitudeKm", "maxLatitudeCoverageDeg"), axes, fixed
+    )
+    coverage_inputs["maxDeltaVKmPerS"] = np.float64(delta_v)
+    geometry = coverage_geometry(coverage_inputs)
+    radius = _flat(geometry["coverageRadiusKm"], coverage_shape)
+    earth = _flat(geometry["earthCoverageSqKm"], coverage_shape)
+    orbit = _flat(coverage_inputs["sbiOrbitAltitudeKm"], coverage_shape)
+    coverage_ok = orbit >= fixed["interceptAltitudeKm"]
+
+    per_threat = compute_interceptors_per_threat(fixed["killProbabilityPercent"], fixed["compositeKillProbabilityPercent"])
+    results: list[tuple[float, dict[str, float]] | None] = []
+    for salvo in problem.salvo_sizes:
+        sizes = constellation_size(earth, radius, salvo, per_threat)
+        with np.errstate(invalid="ignore"):
+            ok = coverage_ok & np.isfinite(sizes)
+            if problem.max_constellation is not None:
+                ok &= sizes <= problem.max_constellation
+        if not ok.any() or not per_launch_values.size:
+            results.append(None)
+            continue
+
+        size_values = np.unique(sizes[ok])
+        launches = np.ceil(size_values[:, None] / per_launch_values[None, :])
+        cost = _system_cost(fixed, size_values[:, None], launches)
+        feasible = np.isfinite(cost)
+        if problem.max_launches is not None:
+            feasible &= launches <= problem.max_launches
+        if not feasible.any():
+            results.append(None)
+            continue
+        cost = np.where(feasible, cost, np.inf)
+        # Ties go to the most interceptors per launch (the last column at the minimum), leaving the most mass margin
+        rows, columns = np.nonzero(cost == cost.min())
+        row, column = rows[-1], columns[-1]
+
+        # Many designs share the optimal outcome: take the widest footprint and the lightest interceptor
+        coverage_cells = np.flatnonzero(ok & (sizes == size_values[row]))
+        coverage_index = coverage_cells[np.argmax(radius[coverage_cells])]
+        mass_cells = np.flatnonzero(mass_ok & (per_launch == per_launch_values[column]))
+        mass_index = mass_cells[np.argmin(total_mass[mass_cells])]
+
+        design = {"maxDeltaVKmPerS": float(delta_v)}
+        design.update(_cell(mass_free, mass_shape, axes, int(mass_index)))
+        design.update(_cell(coverage_free, coverage_shape, axes, int(coverage_index)))
+        results.append((float(cost[row, column]), design))
+    return results
+
+
+def _search(
+    problem: _Problem, axes: dict[str, np.ndarray], pool: Executor | None
+) -> list[tuple[float, dict[str, float]] | None]:
+    slice_axes = {name: values for name, values in axes.items() if name != "maxDeltaVKmPerS"}
+    delta_vs = axes.get("maxDeltaVKmPerS", np.array([problem.fixed["maxDeltaVKmPerS"]]))
+    tasks = [(problem, slice_axes, float(delta_v)) for delta_v in delta_vs]
+    slices = list(pool.map(_search_slice, tasks)) if pool and len(tasks) > 1 else [_search_slice(t) for t in tasks]
+
+    best: list[tuple[float, dict[str, float]] | None] = [None] * len(problem.salvo_sizes)
+    for found in slices:
+        for index, candidate in enumerate(found):
+            if candidate is not None and (best[index] is None or candidate[0] < best[index][0]):
+                best[index] = candidate
+    return best
+
+
+def _grid_size(axes: Mapping[str, np.ndarray]) -> int:
+    return int(np.prod([values.size for values in axes.values()], dtype=np.int64))
+
+
+def _design(fixed: Mapping[str, float], variables: Mapping[str, float]) -> Design:
+    inputs = {**fixed, **variables}
+    prepared = prepare_inputs(inputs)
+    if prepared.errors:
+        raise ValueError("The fixed inputs are invalid: " + " ".join(prepared.errors))
+    metrics = evaluate(prepared.numbers)
+    return Design(
+        salvo_size=inputs["salvoSize"],
+        inputs={name: float(value) for name, value in prepared.numbers.items()},
+        metrics={name: float(metrics[name]) for name in REPORT_METRICS},
+    )
+
+
+def _pareto(designs: list[Design]) -> list[Design]:
+    """Designs no other design beats on both salvo size (higher) and cost (lower), ordered by salvo size."""
+    frontier = [
+        design
+        for design in designs
+        if not any(
+            other.salvo_size >= design.salvo_size
+            and other.cost_million <= design.cost_million
+            and (other.salvo_size > design.salvo_size or other.cost_million < design.cost_million)
+            for other in designs
+        )
+    ]
+    return sorted(frontier, key=lambda design: design.salvo_size)
+
+
+def optimize_design(
+    inputs: Mapping[str, Any] | None = None,
+    *,
+    bounds: Mapping[str, tuple[float, float]] | None = None,
+    salvo_sizes: Iterable[float] = (),
+    grid_points: int = DEFAULT_GRID_POINTS,
+    refinements: int = DEFAULT_REFINEMENTS,
+    max_constellation: float | None = None,
+    max_launches: float | None = None,
+    workers: int | None = None,
+) -> OptimizationResult:
+    """Search ``bounds`` (design variable -> (low, high), default :data:`DESIGN_BOUNDS`) for the cheapest design.
+
+    ``inputs`` are raw app inputs (defaults fill the rest) and fix every non-design variable, including the salvo size
+    the ``best`` design is sized for. ``salvo_sizes`` adds salvo sizes to the cost frontier. ``max_constellation``
+    and ``max_launches`` are optional extra limits on the design.
+    """
+    started = perf_counter()
+    bounds = dict(DESIGN_BOUNDS if bounds is None else bounds)
+    unknown = sorted(set(bounds) - set(DESIGN_VARIABLES))
+    if unknown:
+        raise ValueError(f"Not design variables: {', '.join(unknown)} (choose from {', '.join(DESIGN_VARIABLES)}).")
+
+    fixed = {name: float(value) for name, value in prepare_inputs(inputs or {}).numbers.items()}
+    salvos = tuple(sorted({fixed["salvoSize"], *(max(1.0, float(round(salvo))) for salvo in salvo_sizes)}))
+    problem = _Problem(fixed, salvos, max_constellation, max_launches)
+
+    axes = {name: _axis(name, low, high, grid_points) for name, (low, high) in bounds.items()}
+    workers = workers or os.cpu_count() or 1
+    delta_v_count = axes["maxDeltaVKmPerS"].size if "maxDeltaVKmPerS" in axes else 1
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and delta_v_count > 1 else None
+    try:
+        candidates = _grid_size(axes) * len(salvos)
+        best = _search(problem, axes, pool)
+
+        # Each salvo size is refined on its own grid around its own optimum
+        for index, salvo in enumerate(salvos):
+            found = best[index]
+            salvo_axes = axes
+            single = _Problem(fixed, (salvo,), max_constellation, max_launches)
+            for _ in range(refinements):
+                if found is None:
+                    break
+                narrowed = {
+                    name: _narrow(values, found[1][name], name, bounds[name], grid_points)
+                    for name, values in salvo_axes.items()
+                }
+                if all(np.array_equal(narrowed[name], salvo_axes[name]) for name in narrowed):
+                    break
+                salvo_axes = narrowed
+                candidates += _grid_size(salvo_axes)
+                candidate = _search(single, salvo_axes, pool)[0]
+                if candidate is not None and candidate[0] < found[0]:
+                    found = candidate
+            best[index] = found
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    designs = [_design({**fixed, "salvoSize": salvo}, found[1]) for salvo, found in zip(salvos, best) if found]
+    primary = next((design for design in designs if design.salvo_size == fixed["salvoSize"]), None)
+    return OptimizationResult(
+        best=primary,
+        frontier=_pareto(designs),
+        free_variables=tuple(name for name in DESIGN_VARIABLES if name in bounds),
+        candidates=candidates,
+        seconds=perf_counter() - started,
+    )
@@ -0,0 +1,185 @@
+"""Precomputed scenario tiles: chart sweeps around the default inputs, shipped with the site as float32 binaries.
+
+For each of the most-swept fields (ΔV, orbit altitude, salvo size, single-shot Pk) a grid holds a line of every
+chart metric along that field for each combination of a few node values of the other three, with every other input
+at its default. ``src/model/tileSweep.js`` reads the chart's line straight out of a tile whenever the reader's
+inputs and sweep range sit on the grid, so those charts draw without running the model.
+
+Lines are stored at each field's input step: the model has step changes (whole interceptors per threat, rounded-up
+constellation and launch counts), so interpolating between coarser points is off by tens of percent next to a step.
+
+A tile (``<swept field>.<first fixed field>-<node>.bin``) is the block of lines for one node value of the first
+fixed field, laid out as little-endian float32 ``[metric][second fixed node][third fixed node][x]``; ``index.json``
+describes the axes, node values and files. Regenerated by ``export_charts.py`` (or ``python
+scripts/scenario_tiles.py``); unchanged tiles are not rewritten.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+
+from sbi_model import evaluate
+from sbi_model.inputs import FIELDS_BY_NAME, default_numeric_inputs
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_DIR = ROOT / "src" / "data"
+TILE_DIR = DATA_DIR / "scenario-tiles"
+TILE_FORMAT_VERSION = 1
+
+# Must match CHART_Y_OPTIONS in src/App.jsx
+TILE_METRICS: tuple[str, ...] = (
+    "totalSystemCostBillion",
+    "constellationSize",
+    "launchCount",
+    "interceptorMassKg",
+    "interceptorFlyoutRangeKm",
+)
+
+# Swept field -> (start, stop); each covers the chart's default ±50-step range around the default input
+SWEEP_AXES: dict[str, tuple[float, float]] = {
+    "maxDeltaVKmPerS": (0.5, 12.0),
+    "sbiOrbitAltitudeKm": (150, 1500),
+    "salvoSize": (1, 100),
+    "killProbabilityPercent": (60, 99.9),
+}
+
+# Values the other swept fields may take for a tile line to apply; each includes the default input
+NODE_VALUES: dict[str, tuple[float, ...]] = {
+    "maxDeltaVKmPerS": (2.0, 4.0, 6.0, 8.0, 10.0),
+    "sbiOrbitAltitudeKm": (250, 300, 500, 1000, 2000),
+    "salvoSize": (1, 2, 5, 10, 20),
+    "killProbabilityPercent": (60, 70, 80, 90, 95),
+}
+
+
+def _decimals(name: str) -> int:
+    return len(FIELDS_BY_NAME[name].step.partition(".")[2])
+
+
+def axis_values(name: str) -> np.ndarray:
+    """Every value on the field's input step from the axis start to its stop, rounded like the chart's x values."""
+    start, stop = SWEEP_AXES[name]
+    step = float(FIELDS_BY_NAME[name].step)
+    count = int(round((stop - start) / step)) + 1
+    return np.round(start + step * np.arange(count), _decimals(name))
+
+
+def build_grid(field: str, base: dict[str, np.ndarray]) -> tuple[dict[str, Any], list[bytes]]:
+    """Index entry and tile payloads for the lines along ``field``."""
+    fixed = [name for name in SWEEP_AXES if name != field]
+    x = axis_values(field)
+    nodes = [np.asarray(NODE_VALUES[name], dtype=np.float64) for name in fixed]
+    # Broadcast shape (first node, second node, third node, x)
+    inputs = dict(base)
+    inputs[field] = x.reshape(1, 1, 1, -1)
+    for axis, (name, values) in enumerate(zip(fixed, nodes)):
+        shape = [1, 1, 1, 1]
+        shape[axis] = values.size
+        inputs[name] = values.reshape(shape)
+    metrics = evaluate(inputs)
+
+    # (metric, first, second, third, x) -> one contiguous tile per first-node value
+    stacked = np.stack([np.asarray(metrics[key], dtype="<f4") for key in TILE_METRICS])
+    tiles = [np.ascontiguousarray(stacked[:, index]).tobytes() for index in range(nodes[0].size)]
+    entry = {
+        "axis": {"start": SWEEP_AXES[field][0], "step": float(FIELDS_BY_NAME[field].step), "count": int(x.size)},
+        "fixed": [{"name": name, "values": values.tolist()} for name, values in zip(fixed, nodes)],
+        "tiles": [],
+    }
+    return entry, tiles
+
+
+def build_tiles() -> tuple[dict[str, Any], dict[str, bytes]]:
+    """The tile index and ``{file name: payload}`` for every grid."""
+    base = default_numeric_inputs()
+    index: dict[str, Any] = {
+        "version": TILE_FORMAT_VERSION,
+        "dtype": "float32le",
+        "metrics": list(TILE_METRICS),
+        "base": {name: float(value) for name, value in base.items()},
+        "grids": {},
+    }
+    files: dict[str, bytes] = {}
+    for field in SWEEP_AXES:
+        entry, tiles = build_grid(field, base)
+        for node, payload in zip(entry["fixed"][0]["values"], tiles):
+            name = f"{field}.{entry['fixed'][0]['name']}-{node:g}.bin"
+            files[name] = payload
+            entry["tiles"].append({"file": name, "bytes": len(payload)})
+        index["grids"][field] = entry
+    return index, files
+
+
+def _write_if_changed(path: Path, payload: bytes) -> bool:
+    if path.exists() and path.read_bytes() == payload:
+        return False
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_scenario_tiles(out_dir: Path = TILE_DIR) -> dict[str, Any]:
+    """Regenerate every tile and the index under ``out_dir``; returns the stats recorded in ``last-updated.json``."""
+    started = perf_counter()
+    index, files = build_tiles()
+    grid_seconds = perf_counter() - started
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    files = {**files, "index.json": (json.dumps(index, separators=(",", ":")) + "\n").encode("utf-8")}
+    written = [name for name, payload in files.items() if _write_if_changed(out_dir / name, payload)]
+    for stale in out_dir.glob("*.bin"):
+        if stale.name not in files:
+            stale.unlink()
+            written.append(stale.name)
+
+    return {
+        "tiles": len(files) - 1,
+        "points": sum(len(payload) for name, payload in files.items() if name != "index.json") // 4,
+        "bytes": sum(len(payload) for payload in files.values()),
+        "largestTileBytes": max(len(payload) for name, payload in files.items() if name != "index.json"),
+        "gridSeconds": round(grid_seconds, 3),
+        "hashes": {name: hashlib.sha256(payload).hexdigest() for name, payload in files.items()},
+        "changed": bool(written),
+    }
+
+
+def update_tile_metadata(stats: dict[str, Any], meta_path: Path = DATA_DIR / "last-updated.json") -> bool:
+    """Record ``stats`` under ``scenarioTiles`` in ``last-updated.json`` when the tiles changed."""
+    metadata = json.loads(meta_path.read_text(encoding="utf-8-sig")) if meta_path.exists() else {}
+    previous = metadata.get("scenarioTiles") or {}
+    if previous.get("hashes") == stats["hashes"]:
+        return False
+    entry = {key: value for key, value in stats.items() if key != "changed"}
+    entry["generatedAt"] = datetime.now(timezone.utc).isoformat()
+    metadata["scenarioTiles"] = entry
+    with meta_path.open("w", encoding="utf-8") as fh:
+        json.dump(metadata, fh, indent=2)
+        fh.write("\n")
+    return True
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, default=TILE_DIR, help="output directory (default src/data/scenario-tiles)")
+    args = parser.parse_args(argv)
+
+    stats = write_scenario_tiles(args.out)
+    if args.out.resolve() == TILE_DIR.resolve():
+        update_tile_metadata(stats)
+    print(
+        f"Scenario tiles: {stats['tiles']} tiles, {stats['points']:,} values, {stats['bytes']:,} bytes; "
+        f"grid computed in {stats['gridSeconds']:.2f}s ({'changed' if stats['changed'] else 'unchanged'})"
+    )
+
+
+if __name__ == "__main__":
+    main()
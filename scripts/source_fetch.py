@@ -0,0 +1,242 @@
+"""Fetch the raw GCAT/Celestrak source files into a local cache.
+
+Downloads run concurrently and send ``If-None-Match``/``If-Modified-Since`` so unchanged files are not transferred
+again. Every cached file is recorded in ``manifest.json`` with its checksum, which lets the loader run fully offline
+from the cache and skip sources whose content it has already loaded.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping
+
+from run_report import bind, current, span
+from source_registry import SOURCES
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = Path(os.environ.get("SPACE_DATA_CACHE_DIR", ROOT / ".cache" / "sources"))
+MANIFEST_NAME = "manifest.json"
+USER_AGENT = "aei-space-charts-refresh/1.0"
+CHUNK_SIZE = 1 << 20
+
+SOURCE_URLS: dict[str, str] = {spec.name: spec.url for spec in SOURCES}
+
+# Serializes read-modify-write of the manifest when sources are fetched or marked loaded from several threads
+_MANIFEST_LOCK = threading.Lock()
+
+
+@dataclass
+class FetchResult:
+    name: str
+    status: str  # "downloaded", "unchanged" or "failed"
+    path: Path
+    sha256: str | None = None
+    bytes: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status != "failed"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(name: str, url: str, cache_dir: Path = CACHE_DIR) -> Path:
+    suffix = Path(urllib.parse.urlparse(url).path).suffix or ".dat"
+    return cache_dir / f"{name}{suffix}"
+
+
+def read_manifest(cache_dir: Path = CACHE_DIR) -> dict[str, dict[str, Any]]:
+    manifest_path = cache_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+
+def write_manifest(manifest: Mapping[str, Mapping[str, Any]], cache_dir: Path = CACHE_DIR) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = cache_dir / MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+
+
+def _download(response: Any, path: Path) -> tuple[str, int]:
+    """Stream ``response`` to ``path`` through a temp file so a failed transfer never replaces a good copy."""
+    digest = hashlib.sha256()
+    size = 0
+    tmp_path = path.with_name(path.name + ".part")
+    try:
+        with tmp_path.open("wb") as fh:
+            for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+                fh.write(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return digest.hexdigest(), size
+
+
+def fetch_source(
+    name: str,
+    url: str,
+    entry: Mapping[str, Any] | None = None,
+    cache_dir: Path = CACHE_DIR,
+    *,
+    timeout: float = 120,
+    force: bool = False,
+) -> tuple[FetchResult, dict[str, Any]]:
+    """Download one source unless the server reports it unchanged. Returns the result and the new manifest entry."""
+    entry = dict(entry or {})
+    path = cache_path(name, url, cache_dir)
+    headers = {"User-Agent": USER_AGENT}
+    cached_ok = path.exists() and entry.get("sha256") == file_sha256(path)
+    if cached_ok and not force and entry.get("url") == url:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    checked_at = datetime.now(timezone.utc).isoformat()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=timeout) as response:
+            sha256, size = _download(response, path)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+    except urllib.error.HTTPError as error:
+        if error.code == 304 and cached_ok:
+            entry["checked_at"] = checked_at
+            current().set(status="unchanged", bytesDownloaded=0)
+            return FetchResult(name, "unchanged", path, entry["sha256"]), entry
+        return FetchResult(name, "failed", path, error=f"HTTP {error.code}: {error.reason}"), entry
+    except (urllib.error.URLError, OSError) as error:
+        return FetchResult(name, "failed", path, error=str(error)), entry
+
+    status = "unchanged" if cached_ok and sha256 == entry.get("sha256") else "downloaded"
+    current().set(status=status, bytesDownloaded=size)
+    entry.update(
+        url=url,
+        file=path.name,
+        sha256=sha256,
+        bytes=size,
+        etag=etag,
+        last_modified=last_modified,
+        checked_at=checked_at,
+    )
+    if status == "downloaded":
+        entry["fetched_at"] = checked_at
+    return FetchResult(name, status, path, sha256, size), entry
+
+
+def fetch_all(
+    sources: Mapping[str, str] = SOURCE_URLS,
+    cache_dir: Path = CACHE_DIR,
+    *,
+    max_workers: int | None = None,
+    timeout: float = 120,
+    force: bool = False,
+) -> dict[str, FetchResult]:
+    """Fetch every source concurrently and record the outcome in the cache manifest."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(cache_dir)
+    workers = max_workers or len(sources) or 1
+
+    def fetch(name: str, url: str) -> tuple[FetchResult, dict[str, Any]]:
+        with span(f"fetch {name}", url=url):
+            return fetch_source(name, url, manifest.get(name), cache_dir, timeout=timeout, force=force)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(bind(fetch), name, url) for name, url in sources.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+
+    results: dict[str, FetchResult] = {}
+    with _MANIFEST_LOCK:
+        manifest = read_manifest(cache_dir)
+        for name, (result, entry) in outcomes.items():
+            manifest[name] = entry
+            results[name] = result
+        write_manifest(manifest, cache_dir)
+    return results
+
+
+def fetch_one(
+    name: str, cache_dir: Path = CACHE_DIR, *, timeout: float = 120, force: bool = False
+) -> FetchResult:
+    """Fetch a single source and record it in the manifest; safe to call for several sources at once."""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    result, entry = fetch_source(
+        name, SOURCE_URLS[name], read_manifest(cache_dir).get(name), cache_dir, timeout=timeout, force=force
+    )
+    with _MANIFEST_LOCK:
+        manifest = read_manifest(cache_dir)
+        manifest[name] = entry
+        write_manifest(manifest, cache_dir)
+    return result
+
+
+def cached_source(name: str, cache_dir: Path = CACHE_DIR) -> Path:
+    """Return the verified cached file for ``name``; raises if it is missing or does not match its checksum."""
+    entry = read_manifest(cache_dir).get(name)
+    if not entry or not entry.get("file"):
+        raise FileNotFoundError(f"No cached copy of source {name!r} in {cache_dir}. Run the fetch stage first.")
+    path = cache_dir / entry["file"]
+    if not path.exists() or file_sha256(path) != entry.get("sha256"):
+        raise ValueError(f"Cached copy of source {name!r} at {path} is missing or does not match its checksum.")
+    return path
+
+
+def needs_load(name: str, cache_dir: Path = CACHE_DIR) -> bool:
+    """True when the cached content of ``name`` has not been loaded into the database yet."""
+    entry = read_manifest(cache_dir).get(name, {})
+    return entry.get("sha256") is None or entry.get("sha256") != entry.get("loaded_sha256")
+
+
+def mark_loaded(name: str, cache_dir: Path = CACHE_DIR) -> None:
+    with _MANIFEST_LOCK:
+        manifest = read_manifest(cache_dir)
+        entry = manifest.get(name)
+        if entry:
+            entry["loaded_sha256"] = entry.get("sha256")
+            entry["loaded_at"] = datetime.now(timezone.utc).isoformat()
+            write_manifest(manifest, cache_dir)
+
+
+def report(results: Mapping[str, FetchResult]) -> None:
+    for result in results.values():
+        if result.ok:
+            print(f"{result.name}: {result.status} ({result.path.name})")
+        else:
+            print(f"{result.name}: download failed - {result.error}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="ignore ETag/Last-Modified and download everything")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds")
+    args = parser.parse_args(argv)
+
+    results = fetch_all(force=args.force, timeout=args.timeout)
+    report(results)
+    if not all(result.ok for result in results.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Declarative registry of the GCAT/Celestrak sources loaded into SQL Server.
+
+Each :class:`SourceSpec` describes how one raw file is parsed (columns, sentinel values, dtypes) and where it lands.
+:func:`read_source` turns a spec and a cached file into a clean DataFrame in a single ``read_csv`` pass: sentinels are
+recognised as missing and numeric columns are typed while parsing, instead of inferring object columns first and
+running full-frame ``replace``/``astype`` passes afterwards. Sources with a ``chunksize`` are streamed through
+:func:`iter_source` so peak memory is bounded by one chunk rather than the whole catalog.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+
+GCAT_NA_VALUES = ("", "-", "*")
+STREAM_CHUNK_ROWS = int(os.environ.get("SPACE_DATA_CHUNK_ROWS", "20000"))
+
+LAUNCH_DATE_QUERY = (
+    "select max( cast((case when Launch_Date not like '%Q%' and substring(Launch_Date, 10, 2) <> '' and "
+    "substring(Launch_Date, 6, 3) <> '' then substring(Launch_Date, 10, 2) + '-' + substring(Launch_Date, 6, 3) "
+    "+ '-' + substring(Launch_Date, 1,4) "
+    "when substring(Launch_Date, 10, 2) = '' and Launch_Date not like '%Q%' and substring(Launch_Date, 6, 3) <> '' "
+    "then '01-' + substring(Launch_Date, 6, 3) + '-' + substring(Launch_Date, 1,4) "
+    "else '01-01-' + substring(Launch_Date, 1,4) end) as date)) from McDowell_Launch_List"
+)
+
+SATCAT_DATE_QUERY = (
+    "select max(case when right(LDate, 1) = '?' then convert(date, substring(LDate, 1, len(LDate)-1)) "
+    "else convert(date, LDate) end) from McDowell_Satellite_Catalog"
+)
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    name: str
+    label: str
+    url: str
+    table: str
+    key: str
+    sep: str = "\t"
+    usecols: tuple[int, ...] | None = None
+    skip_first_row: bool = True
+    na_values: tuple[str, ...] = GCAT_NA_VALUES
+    column_na_values: Mapping[str, tuple[str, ...]] = field(default_factory=dict)
+    floats: tuple[str, ...] = ()
+    integers: tuple[str, ...] = ()
+    coerce_numeric: tuple[str, ...] = ()
+    blank_values: tuple[str, ...] = ()
+    null_columns: tuple[str, ...] = ()
+    column_order: tuple[str, ...] | None = None
+    chunksize: int | None = None
+    freshness_query: str | None = None
+    freshness_label: str | None = None
+
+
+SOURCES: tuple[SourceSpec, ...] = (
+    SourceSpec(
+        name="launch",
+        label="McDowell Launch List",
+        url="https://www.planet4589.org/space/gcat/tsv/launch/launch.tsv",
+        table="McDowell_Launch_List",
+        key="Launch_Tag",
+        usecols=tuple(range(27)),
+        na_values=("  ", "-", "      -"),
+        floats=("Launch_JD", "Apogee"),
+        null_columns=("Flight_ID",),
+        freshness_query=LAUNCH_DATE_QUERY,
+        freshness_label="Most recent launch",
+    ),
+    SourceSpec(
+        name="satcat",
+        label="McDowell Satellite Catalog",
+        url="https://www.planet4589.org/space/gcat/tsv/cat/satcat.tsv",
+        table="McDowell_Satellite_Catalog",
+        key="JCAT",
+        usecols=(0, 1, *range(3, 42)),
+        na_values=("-", "      -"),
+        column_na_values={"Apogee": ("Inf",)},
+        floats=("Mass", "DryMass", "TotMass", "Length", "Diameter", "Span", "Perigee", "Inc"),
+        coerce_numeric=("Satcat", "Apogee"),
+        blank_values=("  ",),
+        chunksize=STREAM_CHUNK_ROWS,
+        freshness_query=SATCAT_DATE_QUERY,
+        freshness_label="Most recent object launched",
+    ),
+    SourceSpec(
+        name="celestrak_satcat",
+        label="Celestrak SATCAT",
+        url="https://celestrak.org/pub/satcat.csv",
+        table="Celestrak_SATCAT",
+        key="NORAD_CAT_ID",
+        sep=",",
+        skip_first_row=False,
+        na_values=("",),
+        floats=("PERIOD", "INCLINATION", "APOGEE", "PERIGEE", "RCS"),
+        integers=("NORAD_CAT_ID",),
+        chunksize=STREAM_CHUNK_ROWS,
+    ),
+    SourceSpec(
+        name="sites",
+        label="McDowell Launch Sites",
+        url="https://www.planet4589.org/space/gcat/tsv/tables/sites.tsv",
+        table="McDowell_Launch_Sites",
+        key="Site_Code",
+        floats=("Longitude", "Latitude", "Error"),
+    ),
+    SourceSpec(
+        name="orgs",
+        label="McDowell Organizations",
+        url="https://www.planet4589.org/space/gcat/tsv/tables/orgs.tsv",
+        table="McDowell_Organizations",
+        key="Code",
+        floats=("Longitude", "Latitude", "Error"),
+    ),
+    SourceSpec(
+        name="psatcat",
+        label="McDowell Payload Catalog",
+        url="https://www.planet4589.org/space/gcat/tsv/cat/psatcat.tsv",
+        table="McDowell_Payloads",
+        key="JCAT",
+        usecols=(*range(0, 23), 27),
+        floats=("UNPeriod", "UNPerigee", "UNApogee", "UNInc"),
+        column_order=(
+            "JCAT", "Piece", "Name", "LDate", "TLast", "TOp", "TDate", "TF", "Program", "Plane", "Att", "Mvr",
+            "Class", "Category", "UNState", "UNReg", "UNPeriod", "UNPerigee", "UNApogee", "UNInc", "Result",
+            "Control", "Discipline", "Comment",
+        ),
+    ),
+)
+
+SOURCES_BY_NAME: dict[str, SourceSpec] = {spec.name: spec for spec in SOURCES}
+
+
+def clean_column_name(raw: str) -> str:
+    return raw.replace("#", "")
+
+
+def read_options(spec: SourceSpec, header: list[str]) -> dict[str, Any]:
+    """Build the ``read_csv`` keyword arguments for ``spec`` given the file's raw header row."""
+    used = [header[i] for i in spec.usecols] if spec.usecols is not None else header
+    dtypes: dict[str, Any] = {}
+    na_values: dict[str, list[str]] = {}
+    for raw in used:
+        column = clean_column_name(raw)
+        if column in spec.floats:
+            dtypes[raw] = np.float64
+        elif column in spec.integers:
+            dtypes[raw] = np.int64
+        else:
+            dtypes[raw] = object
+        na_values[raw] = [*spec.na_values, *spec.column_na_values.get(column, ())]
+    return {
+        "sep": spec.sep,
+        "usecols": list(spec.usecols) if spec.usecols is not None else None,
+        "skiprows": [1] if spec.skip_first_row else None,
+        "dtype": dtypes,
+        "na_values": na_values,
+    }
+
+
+def read_header(spec: SourceSpec, path: Path) -> list[str]:
+    return list(pd.read_csv(path, sep=spec.sep, nrows=0).columns)
+
+
+def finish_frame(spec: SourceSpec, data: pd.DataFrame) -> pd.DataFrame:
+    """Apply the column-level fix-ups that cannot be expressed as ``read_csv`` options."""
+    data.columns = [clean_column_name(column) for column in data.columns]
+    for column in spec.coerce_numeric:
+        data[column] = pd.to_numeric(data[column], errors="coerce").astype(np.float64)
+    if spec.blank_values:
+        for column in data.columns[data.dtypes == object]:
+            values = data[column]
+            data[column] = values.mask(values.isin(spec.blank_values), "")
+    for column in spec.null_columns:
+        data[column] = np.nan
+    if spec.column_order is not None:
+        data = data[list(spec.column_order)]
+    return data
+
+
+def read_source(spec: SourceSpec, path: Path) -> pd.DataFrame:
+    """Parse a cached source file into the frame that is loaded into ``spec.table``."""
+    options = read_options(spec, read_header(spec, path))
+    data = pd.read_csv(path, low_memory=False, **options)
+    return finish_frame(spec, data)
+
+
+def iter_source(spec: SourceSpec, path: Path, chunksize: int | None = None) -> Iterator[pd.DataFrame]:
+    """Yield the cleaned source in chunks of ``chunksize`` rows (the spec's own size by default).
+
+    Dtypes are fixed by the spec, so every chunk has the same schema and row fingerprints match a whole-file read.
+    Sources without a chunk size are yielded as a single frame.
+    """
+    chunksize = chunksize or spec.chunksize
+    if not chunksize:
+        yield read_source(spec, path)
+        return
+    options = read_options(spec, read_header(spec, path))
+    with pd.read_csv(path, chunksize=chunksize, **options) as reader:
+        for chunk in reader:
+            yield finish_frame(spec, chunk)
@@ -0,0 +1,337 @@
+"""Versioned, typed snapshots of the cleaned source tables.
+
+The first time a cached source file is loaded, its cleaned chunks (exactly what ``iter_source`` yields) are written
+to an Arrow IPC file under ``.cache/snapshots/<source>/``, one record batch per chunk and typed by the spec (float64,
+int64 or string). The snapshot is keyed by the file's checksum and the spec, so later loads of the same content
+(``--force``, a retry after a database error, a key fallback that reloads in full) read it back instead of parsing
+the text again.
+
+Arrow IPC files are memory-mapped: :func:`open_snapshot` returns a ``pyarrow.Table`` whose buffers point straight
+into the mapped file, with nothing parsed or copied. :func:`read_snapshot` and :func:`iter_snapshot` convert to the
+same pandas frames as the text parser, so row fingerprints match. The last ``SNAPSHOT_KEEP`` versions of each source
+are kept for :func:`diff_snapshots`. From the command line:
+
+    python scripts/source_snapshots.py --list
+    python scripts/source_snapshots.py --build                    # snapshot every cached source
+    python scripts/source_snapshots.py --diff satcat              # previous snapshot against the latest
+    python scripts/source_snapshots.py --parquet exports/ satcat  # latest snapshot as Parquet, for other tools
+
+Needs the ``pyarrow`` package; without it the loader parses the text files as before.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Iterator, Sequence
+
+import numpy as np
+import pandas as pd
+
+from run_report import current
+from source_fetch import CACHE_DIR, cached_source, read_manifest
+from source_registry import SOURCES, SOURCES_BY_NAME, SourceSpec, iter_source
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+SNAPSHOT_DIR = Path(os.environ.get("SPACE_DATA_SNAPSHOT_DIR", CACHE_DIR.parent / "snapshots"))
+SNAPSHOTS_ENABLED = os.environ.get("SPACE_DATA_SNAPSHOTS", "1") != "0"
+SNAPSHOT_KEEP = int(os.environ.get("SPACE_DATA_SNAPSHOT_KEEP", "10"))
+SNAPSHOT_FORMAT_VERSION = 1
+INDEX_NAME = "index.json"
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    source: str
+    version: str
+    file: str
+    sha256: str
+    spec: str
+    rows: int
+    bytes: int
+    created_at: str
+    columns: dict[str, str]
+
+    def path(self, snapshot_dir: Path = SNAPSHOT_DIR) -> Path:
+        return snapshot_dir / self.source / self.file
+
+
+@dataclass
+class SnapshotDiff:
+    source: str
+    old: str
+    new: str
+    inserted: pd.Index
+    updated: pd.Index
+    deleted: pd.Index
+
+    def summary(self) -> str:
+        return (
+            f"{self.source} {self.old} -> {self.new}: {len(self.inserted)} inserted, {len(self.updated)} updated, "
+            f"{len(self.deleted)} deleted"
+        )
+
+
+def available() -> bool:
+    return pa is not None and SNAPSHOTS_ENABLED
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("Source snapshots need the 'pyarrow' package; install it with pip install pyarrow.")
+
+
+def spec_fingerprint(spec: SourceSpec) -> str:
+    """Changes whenever the spec would parse the same file differently."""
+    fields = {field.name: getattr(spec, field.name) for field in dataclasses.fields(spec) if field.name != "url"}
+    payload = json.dumps([SNAPSHOT_FORMAT_VERSION, fields], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def read_index(source: str, snapshot_dir: Path = SNAPSHOT_DIR) -> list[SnapshotInfo]:
+    """Snapshots of ``source``, oldest first."""
+    path = snapshot_dir / source / INDEX_NAME
+    if not path.exists():
+        return []
+    return [SnapshotInfo(**entry) for entry in json.loads(path.read_text(encoding="utf-8"))]
+
+
+def _write_index(source: str, entries: Sequence[SnapshotInfo], snapshot_dir: Path) -> None:
+    path = snapshot_dir / source / INDEX_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps([dataclasses.asdict(entry) for entry in entries], indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def find_snapshot(source: str, version: str | None = None, snapshot_dir: Path = SNAPSHOT_DIR) -> SnapshotInfo:
+    """The snapshot ``version`` of ``source`` (a version id or a unique prefix of one); the latest by default."""
+    entries = read_index(source, snapshot_dir)
+    if not entries:
+        raise FileNotFoundError(f"No snapshots of source {source!r} in {snapshot_dir}.")
+    if version is None:
+        return entries[-1]
+    matches = [entry for entry in entries if entry.version.startswith(version)]
+    if len(matches) != 1:
+        raise ValueError(f"Snapshot version {version!r} of {source!r} matches {len(matches)} snapshots.")
+    return matches[0]
+
+
+def _arrow_schema(frame: pd.DataFrame) -> pa.Schema:
+    fields = []
+    for column, dtype in frame.dtypes.items():
+        if dtype == np.float64:
+            fields.append(pa.field(column, pa.float64()))
+        elif dtype == np.int64:
+            fields.append(pa.field(column, pa.int64()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def write_snapshot(
+    spec: SourceSpec, path: Path, sha256: str, snapshot_dir: Path = SNAPSHOT_DIR
+) -> SnapshotInfo:
+    """Parse ``path`` with ``spec`` and store the cleaned chunks as a new snapshot version."""
+    _require_pyarrow()
+    source_dir = snapshot_dir / spec.name
+    source_dir.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.now(timezone.utc)
+    version = f"{created_at:%Y%m%dT%H%M%SZ}-{sha256[:12]}"
+    target = source_dir / f"{version}.arrow"
+    tmp_path = target.with_name(target.name + ".tmp")
+
+    rows = 0
+    writer = None
+    schema = None
+    try:
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            for chunk in iter_source(spec, path):
+                if writer is None:
+                    schema = _arrow_schema(chunk)
+                    writer = pa.ipc.new_file(sink, schema)
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                rows += len(chunk)
+            if writer is None:
+                raise ValueError(f"Source {spec.name!r} at {path} has no rows to snapshot.")
+            writer.close()
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    info = SnapshotInfo(
+        source=spec.name,
+        version=version,
+        file=target.name,
+        sha256=sha256,
+        spec=spec_fingerprint(spec),
+        rows=rows,
+        bytes=target.stat().st_size,
+        created_at=created_at.isoformat(),
+        columns={field.name: str(field.type) for field in schema},
+    )
+    entries = [entry for entry in read_index(spec.name, snapshot_dir) if entry.version != version] + [info]
+    for stale in entries[:-SNAPSHOT_KEEP] if SNAPSHOT_KEEP > 0 else []:
+        stale.path(snapshot_dir).unlink(missing_ok=True)
+    _write_index(spec.name, entries[-SNAPSHOT_KEEP:] if SNAPSHOT_KEEP > 0 else entries, snapshot_dir)
+    return info
+
+
+def ensure_snapshot(spec: SourceSpec, path: Path, snapshot_dir: Path = SNAPSHOT_DIR) -> SnapshotInfo:
+    """The snapshot of the cached file ``path``, written first if this content and spec have none yet."""
+    sha256 = (read_manifest().get(spec.name) or {}).get("sha256")
+    if sha256 is None:
+        raise FileNotFoundError(f"Source {spec.name!r} has no checksum in the cache manifest.")
+    fingerprint = spec_fingerprint(spec)
+    for entry in reversed(read_index(spec.name, snapshot_dir)):
+        if entry.sha256 == sha256 and entry.spec == fingerprint and entry.path(snapshot_dir).exists():
+            return entry
+    with current().phase("snapshot_write"):
+        info = write_snapshot(spec, path, sha256, snapshot_dir)
+    current().set(snapshotRows=info.rows, snapshotBytes=info.bytes)
+    return info
+
+
+def open_snapshot(source: str, version: str | None = None, snapshot_dir: Path = SNAPSHOT_DIR) -> pa.Table:
+    """Memory-map a snapshot as an Arrow table; its buffers are read from the file only when touched."""
+    _require_pyarrow()
+    info = find_snapshot(source, version, snapshot_dir)
+    return pa.ipc.open_file(pa.memory_map(str(info.path(snapshot_dir)), "r")).read_all()
+
+
+def _to_frame(table: pa.Table | pa.RecordBatch) -> pd.DataFrame:
+    """Convert like the text parser does: text columns as object arrays with NaN for missing values."""
+    columns: dict[str, np.ndarray | pd.Series] = {}
+    for name, values in zip(table.column_names, table.columns):
+        array = values.to_numpy(zero_copy_only=False)
+        if pa.types.is_string(values.type):
+            if values.null_count:
+                array[values.is_null().to_numpy(zero_copy_only=False)] = np.nan
+            # Keep object dtype; pandas would otherwise infer its own string dtype from the array
+            columns[name] = pd.Series(array, dtype=object, copy=False)
+        else:
+            columns[name] = array
+    return pd.DataFrame(columns, copy=False)
+
+
+def read_snapshot(
+    source: str, version: str | None = None, columns: Sequence[str] | None = None, snapshot_dir: Path = SNAPSHOT_DIR
+) -> pd.DataFrame:
+    table = open_snapshot(source, version, snapshot_dir)
+    return _to_frame(table.select(list(columns)) if columns else table)
+
+
+def iter_snapshot(source: str, version: str | None = None, snapshot_dir: Path = SNAPSHOT_DIR) -> Iterator[pd.DataFrame]:
+    """Yield a snapshot in its stored chunks, as the frames ``iter_source`` produced when it was written."""
+    _require_pyarrow()
+    info = find_snapshot(source, version, snapshot_dir)
+    reader = pa.ipc.open_file(pa.memory_map(str(info.path(snapshot_dir)), "r"))
+    for index in range(reader.num_record_batches):
+        yield _to_frame(reader.get_batch(index))
+
+
+def source_chunks(spec: SourceSpec, path: Path) -> Callable[[], Iterator[pd.DataFrame]]:
+    """The chunk source the loader should use: the snapshot of ``path`` when snapshots are available."""
+    if not available():
+        return lambda: iter_source(spec, path)
+    try:
+        info = ensure_snapshot(spec, path)
+    except (OSError, pa.ArrowException) as error:
+        # A snapshot is only a faster way to read the file; never fail a load over it
+        print(f"Couldn't snapshot {spec.label}, reading the cached file instead: {error}")
+        return lambda: iter_source(spec, path)
+    current().set(snapshot=info.version)
+    return lambda: iter_snapshot(spec.name, info.version)
+
+
+def _row_hashes(frame: pd.DataFrame, key: str) -> pd.Series:
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return pd.Series(hashes, index=pd.Index(frame[key].astype(str), name=key))
+
+
+def diff_snapshots(
+    source: str, old: str | None = None, new: str | None = None, snapshot_dir: Path = SNAPSHOT_DIR
+) -> SnapshotDiff:
+    """Rows inserted, updated and deleted between two snapshots (by default the previous and the latest)."""
+    key = SOURCES_BY_NAME[source].key
+    entries = read_index(source, snapshot_dir)
+    new_info = find_snapshot(source, new, snapshot_dir)
+    if old is None:
+        earlier = [entry for entry in entries if entry.version < new_info.version]
+        if not earlier:
+            raise ValueError(f"Source {source!r} has no snapshot before {new_info.version}.")
+        old_info = earlier[-1]
+    else:
+        old_info = find_snapshot(source, old, snapshot_dir)
+    before = _row_hashes(read_snapshot(source, old_info.version, snapshot_dir=snapshot_dir), key)
+    after = _row_hashes(read_snapshot(source, new_info.version, snapshot_dir=snapshot_dir), key)
+    common = after.index.intersection(before.index, sort=False)
+    changed = after.loc[common].to_numpy() != before.loc[common].to_numpy()
+    return SnapshotDiff(
+        source=source,
+        old=old_info.version,
+        new=new_info.version,
+        inserted=after.index.difference(before.index, sort=False),
+        updated=common[changed],
+        deleted=before.index.difference(after.index, sort=False),
+    )
+
+
+def export_parquet(source: str, out_dir: Path, version: str | None = None) -> Path:
+    """Write a snapshot as ``<out_dir>/<source>-<version>.parquet``."""
+    _require_pyarrow()
+    info = find_snapshot(source, version)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    target = out_dir / f"{source}-{info.version}.parquet"
+    pq.write_table(open_snapshot(source, info.version), target, compression="zstd")
+    return target
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sources", nargs="*", help="sources to act on (default: all)")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--list", action="store_true", help="list the stored snapshots (the default action)")
+    action.add_argument("--build", action="store_true", help="snapshot the cached file of each source if needed")
+    action.add_argument("--diff", action="store_true", help="compare the previous snapshot with the latest")
+    action.add_argument("--parquet", type=Path, metavar="DIR", help="write the latest snapshots as Parquet")
+    args = parser.parse_args(argv)
+    _require_pyarrow()
+
+    unknown = [name for name in args.sources if name not in SOURCES_BY_NAME]
+    if unknown:
+        raise SystemExit(f"Unknown source(s): {', '.join(unknown)}.")
+    names = args.sources or [spec.name for spec in SOURCES]
+
+    for name in names:
+        try:
+            if args.build:
+                started = perf_counter()
+                info = ensure_snapshot(SOURCES_BY_NAME[name], cached_source(name))
+                seconds = perf_counter() - started
+                print(f"{name}: {info.version} ({info.rows:,} rows, {info.bytes:,} bytes) in {seconds:.2f}s")
+            elif args.diff:
+                diff = diff_snapshots(name)
+                print(diff.summary())
+            elif args.parquet:
+                print(f"{name}: {export_parquet(name, args.parquet)}")
+            else:
+                for info in read_index(name):
+                    print(f"{name}: {info.version} {info.rows:>9,} rows {info.bytes:>12,} bytes")
+        except (FileNotFoundError, ValueError) as error:
+            print(f"{name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,316 +1,157 @@
-import pandas as pd
-import numpy as np
+"""Load the GCAT/Celestrak source tables into SQL Server.
+
+Every source is described once in ``source_registry.SOURCES``; this script fetches the raw files into the local cache,
+parses each changed source with its spec and applies the result to its table.
+"""
+import argparse
+from pathlib import Path
+
 import pyodbc
-#import adalimport pandas as pd
-from fast_to_sql import fast_to_sql as fts
+from launch_materialization import refresh_launch_data
+from run_report import TRACE_MEMORY, current, instrument, run as report_run, span
+from source_fetch import cached_source, fetch_all, mark_loaded, needs_load, report
+from source_registry import SOURCES, SourceSpec, read_header
+from source_snapshots import source_chunks
+from table_sync import load_chunks, rollback_table
 
 # Set up the connection string with the required parameters
 server = r"THAR-5C85WT3-L\SQLEXPRESS"
 database = 'Space_Data'
 cnxn_string = f'DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={server};DATABASE={database};trusted_connection=yes'
 
-try:
-    # Connect to the database
-    cnxn = pyodbc.connect(cnxn_string)
-    cursor = cnxn.cursor()
-    cursor.fast_executemany = True
-except Exception as e:
-    print("Couldn't connect to the database. Please check the connection details.")
-    print(e)
-
-###################################
-#   MCDOWELL LAUNCH LIST UPDATE
-###################################
-
-# URL of the spreadsheet to download and the table name to upload it into
-url = 'https://www.planet4589.org/space/gcat/tsv/launch/launch.tsv'
-table = 'McDowell_Launch_List'
-
-# Download the spreadsheet and read it into a DataFrame
-try:
-    data = pd.read_csv(url, sep='\t', low_memory=False, usecols=[0,1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26])
-except Exception as e:
-    print("Couldn't download or read McDowell Launch List. Please check the URL.")
-    print(e)
-
-# Clean up the data
-data.columns = data.columns.str.replace('#', '')
-data = data.iloc[1:, :]  # Delete the first row
-data = data.replace(['  ', '-', '      -'], np.nan)
-data['Flight_ID'] = np.nan
-convert_dict = {'Launch_JD': float, 'Apogee': float}
-data = data.astype(convert_dict)
-
-# Delete existing data
-try:
-    cursor.execute(f"DELETE FROM {table}")
-    cnxn.commit()
-except Exception as e:
-    print("Couldn't delete the data from the McDowell Launch List table in the database. Please check the table's name.")
-    print(e)
-
-# Upload the data
-try:
-    create_statement = fts.fast_to_sql(data, table, cnxn, if_exists="append", custom=None, temp=False, copy=False)
-    cnxn.commit()
-    print('MCDOWELL LAUNCH LIST UPDATED')
-    cursor.execute("select max( cast((case when Launch_Date not like '%Q%' and substring(Launch_Date, 10, 2) <> '' and substring(Launch_Date, 6, 3) <> '' then substring(Launch_Date, 10, 2) + '-' + substring(Launch_Date, 6, 3) + '-' + substring(Launch_Date, 1,4) \
-            when substring(Launch_Date, 10, 2) = '' and Launch_Date not like '%Q%' and substring(Launch_Date, 6, 3) <> '' then '01-' + substring(Launch_Date, 6, 3) + '-' + substring(Launch_Date, 1,4) \
-            else '01-01-' + substring(Launch_Date, 1,4) end) as date)) from McDowell_Launch_List")
-    result = cursor.fetchall()
-    if result:
-        print('Most recent launch: ' + str(result[0][0]))
-except Exception as e:
-    print("Couldn't upload the McDowell Launch List data to the table. Please check the details.")
-    print(e)
-from fast_to_sql import fast_to_sql as fts
-
-#########################################
-#   MCDOWELL Satellite Catalog Update
-#########################################
-
-# URL of the spreadsheet to download and the table name to upload it into
-url = 'https://www.planet4589.org/space/gcat/tsv/cat/satcat.tsv'
-table = 'McDowell_Satellite_Catalog'
-
-# Download the spreadsheet and read it into a DataFrame
-try:
-    data = pd.read_csv(url, sep='\t', low_memory=False, usecols=[0,1,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41])
-except Exception as e:
-    print("Couldn't download or read McDowell Satellite Catalog. Please check the URL.")
-    print(e)
-
-# Clean the data
-data.columns = data.columns.str.replace('#', '')
-data = data.iloc[1:, :] #Delete the first row
-data = data.replace('  ', '')
-data = data.replace('-', np.nan)
-data['Apogee'] = data['Apogee'].replace('Inf', np.nan)
-data = data.replace('      -', np.nan)
-data['Satcat'] = pd.to_numeric(data['Satcat'], errors='coerce')
-data['Apogee'] = pd.to_numeric(data['Apogee'], errors='coerce')
-convert_dict = {   'Satcat': float,
-                    'Mass': float,
-                    'DryMass': float,
-                    'TotMass': float,
-                    'Length': float,
-                    'Diameter': float,
-                    'Span': float,
-                    'Perigee': float,
-                    'Apogee': float,
-                    'Inc': float}
-data = data.astype(convert_dict)
-
-# Delete existing data
-try:
-    cursor.execute(f"DELETE FROM {table}")
-    cnxn.commit()
-except Exception as e:
-    print("Couldn't delete the data from the McDowell Satellite Catalog table in the database. Please check the table's name.")
-    print(e)
-
-# Upload the data
-try:
-    create_statement = fts.fast_to_sql(data, table, cnxn, if_exists="append", custom=None, temp=False, copy=False)
-    cnxn.commit()
-    print('MCDOWELL SATELLITE CATALOG UPDATED')
-    cursor.execute("select max(case when right(LDate, 1) = '?' then convert(date, substring(LDate, 1, len(LDate)-1)) else convert(date, LDate) end) from McDowell_Satellite_Catalog")
-    result = cursor.fetchall()
-    if result:
-        print('Most recent object launched: ' + str(result[0][0]))
-except Exception as e:
-    print("Couldn't upload the McDowell Satellite Catalog data to the table. Please check the details.")
-    print(e)
-from fast_to_sql import fast_to_sql as fts
-
-
-#########################################
-#   Celestrak Satellite Catalog
-#########################################
-
-# URL of the spreadsheet to download and the table name to upload it into
-url = 'https://celestrak.org/pub/satcat.csv'
-table = 'Celestrak_SATCAT'
-
-# Download the spreadsheet and read it into a DataFrame
-try:
-    data = pd.read_csv(url)
-except Exception as e:
-    print("Couldn't download or read Celestrak SATCAT. Please check the URL.")
-    print(e)
-
-# Clean the data
-data.columns = data.columns.str.replace('#', '')
-data = data.replace('', np.nan)
-convert_dict = {   'NORAD_CAT_ID': int,
-                    'PERIOD': float,
-                    'INCLINATION': float,
-                    'APOGEE': float,
-                    'PERIGEE': float,
-                    'RCS': float}
-data = data.astype(convert_dict)
-
-# Delete existing data
-try:
-    cursor.execute(f"DELETE FROM {table}")
-    cnxn.commit()
-except Exception as e:
-    print("Couldn't delete the data from the Celestrak SATCAT table in the database. Please check the table's name.")
-    print(e)
-
-# Upload the data
-try:
-    create_statement = fts.fast_to_sql(data, table, cnxn, if_exists="append", custom=None, temp=False, copy=False)
-    cnxn.commit()
-    print('CELESTRAK SATCAT UPDATED')
-except Exception as e:
-    print("Couldn't upload the Celestrak SATCAT data to the table. Please check the details.")
-    print(e)
-from fast_to_sql import fast_to_sql as fts
-
-
-#########################################
-#   McDowell Launch Sites
-#########################################
-
-# URL of the spreadsheet to download and the table name to upload it into
-url = 'https://www.planet4589.org/space/gcat/tsv/tables/sites.tsv'
-table = 'McDowell_Launch_Sites'
-
-# Download the spreadsheet and read it into a DataFrame
-try:
-    data = pd.read_csv(url, sep='\t')
-except Exception as e:
-    print("Couldn't download or read McDowell Launch Sites. Please check the URL.")
-    print(e)
-
-# Clean the data
-data.columns = data.columns.str.replace('#', '')
-data = data.iloc[1:, :] #Delete the first row
-data = data.replace('', np.nan)
-data = data.replace('-', np.nan)
-data = data.replace('*', np.nan)
-
-convert_dict = {   'Longitude': float,
-                    'Latitude': float,
-                    'Error': float}
-data = data.astype(convert_dict)
-
-# Delete existing data
-try:
-    cursor.execute(f"DELETE FROM {table}")
-    cnxn.commit()
-except Exception as e:
-    print("Couldn't delete the data from the McDowell Launch Sites table in the database. Please check the table's name.")
-    print(e)
-
-# Upload the data
-try:
-    create_statement = fts.fast_to_sql(data, table, cnxn, if_exists="append", custom=None, temp=False, copy=False)
-    cnxn.commit()
-    print('MCDOWELL LAUNCH SITES UPDATED')
-except Exception as e:
-    print("Couldn't upload the McDowell Launch Sites data to the table. Please check the details.")
-    print(e)
-from fast_to_sql import fast_to_sql as fts
-
-#########################################
-#   McDowell Organizations
-#########################################
-
-# URL of the spreadsheet to download and the table name to upload it into
-url = 'https://www.planet4589.org/space/gcat/tsv/tables/orgs.tsv'
-table = 'McDowell_Organizations'
-
-# Download the spreadsheet and read it into a DataFrame
-try:
-    data = pd.read_csv(url, sep='\t')
-except Exception as e:
-    print("Couldn't download or read McDowell Organizations. Please check the URL.")
-    print(e)
-
-# Clean the data
-data.columns = data.columns.str.replace('#', '')
-data = data.iloc[1:, :] #Delete the first row
-data = data.replace('', np.nan)
-data = data.replace('-', np.nan)
-data = data.replace('*', np.nan)
-
-convert_dict = {   'Longitude': float,
-                    'Latitude': float,
-                    'Error': float}
-data = data.astype(convert_dict)
-
-# Delete existing data
-try:
-    cursor.execute(f"DELETE FROM {table}")
-    cnxn.commit()
-except Exception as e:
-    print("Couldn't delete the data from the McDowell Organizations table in the database. Please check the table's name.")
-    print(e)
-
-# Upload the data
-try:
-    create_statement = fts.fast_to_sql(data, table, cnxn, if_exists="append", custom=None, temp=False, copy=False)
-    cnxn.commit()
-    print('MCDOWELL ORGANIZATIONS UPDATED')
-except Exception as e:
-    print("Couldn't upload the McDowell Organizations data to the table. Please check the details.")
-    print(e)
-from fast_to_sql import fast_to_sql as fts
-
-
-#########################################
-#   McDowell Payload Catalog
-#########################################
-
-# URL of the spreadsheet to download and the table name to upload it into
-url = 'https://www.planet4589.org/space/gcat/tsv/cat/psatcat.tsv'
-table = 'McDowell_Payloads'
-
-# Download the spreadsheet and read it into a DataFrame
-try:
-    data = pd.read_csv(url, sep='\t', usecols=[0,1,2,3,4,5,6,7,8,9,10,11,12,13,17,18,19,20,21,22,14,15,16,27])
-except Exception as e:
-    print("Couldn't download or read McDowell Payload Catalog. Please check the URL.")
-    print(e)
-
-# Clean the data
-data.columns = data.columns.str.replace('#', '')
-data = data.iloc[1:, :] #Delete the first row
-data = data.replace('', np.nan)
-data = data.replace('-', np.nan)
-data = data.replace('*', np.nan)
-
-convert_dict = {    'UNPeriod': float,
-                    'UNPerigee': float,
-                    'UNApogee': float,
-                    'UNInc': float}
-data = data.astype(convert_dict)
-
-#Order the columns
-columns_order = ['JCAT','Piece','Name','LDate','TLast','TOp','TDate','TF','Program','Plane','Att','Mvr','Class','Category','UNState','UNReg','UNPeriod','UNPerigee','UNApogee','UNInc','Result','Control','Discipline','Comment']
-data = data[columns_order]
-
-# Delete existing data
-try:
-    cursor.execute(f"DELETE FROM {table}")
-    cnxn.commit()
-except Exception as e:
-    print("Couldn't delete the data from the McDowell Payload Catalog table in the database. Please check the table's name.")
-    print(e)
-
-# Upload the data
-try:
-    create_statement = fts.fast_to_sql(data, table, cnxn, if_exists="append", custom=None, temp=False, copy=False)
-    cnxn.commit()
-    print('MCDOWELL PAYLOAD CATALOG UPDATED')
-except Exception as e:
-    print("Couldn't upload the McDowell Payload Catalog data to the table. Please check the details.")
-    print(e)
-from fast_to_sql import fast_to_sql as fts
-
-# Close the database connection
-cursor.close()
-cnxn.close()
 
+def apply_source(cnxn, spec: SourceSpec, path: Path) -> str:
+    """Stream the cached file (or its typed snapshot) into ``spec.table`` and return a summary; raises on failure.
+
+    Only the changes since the last refresh are applied. Shared by the sequential refresh below and ``load_source``.
+    """
+    result = load_chunks(cnxn, source_chunks(spec, path), spec.table, key=spec.key)
+    summary = result.summary()
+    if spec.freshness_query:
+        with span('freshness') as check:
+            rows = cnxn.cursor().execute(spec.freshness_query).fetchall()
+        if rows:
+            check.set(latest=str(rows[0][0]))
+            summary += f'; {spec.freshness_label}: {rows[0][0]}'
+    return summary
+
+
+def update_source(cnxn, spec: SourceSpec, path: Path) -> bool:
+    # Check the cached file can be read before touching the table
+    try:
+        read_header(spec, path)
+    except Exception as e:
+        print(f"Couldn't read {spec.label}. Please check the cached file.")
+        print(e)
+        return False
+
+    try:
+        summary = apply_source(cnxn, spec, path)
+    except Exception as e:
+        print(f"Couldn't upload the {spec.label} data to the table. Please check the details.")
+        print(e)
+        return False
+    print(f'{spec.label.upper()} UPDATED')
+    print(summary)
+    return True
+
+
+def load_source(spec: SourceSpec, force: bool = False) -> str:
+    """Load one source from the cache on its own connection and return a summary; raises when the load fails.
+
+    Used by ``run_full_refresh.py``, which runs the loads of independent sources concurrently.
+    """
+    if not force and not needs_load(spec.name):
+        return 'content already loaded'
+    path = cached_source(spec.name)
+    read_header(spec, path)
+
+    cnxn = instrument(pyodbc.connect(cnxn_string))
+    try:
+        summary = apply_source(cnxn, spec, path)
+    finally:
+        cnxn.close()
+    mark_loaded(spec.name)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load the GCAT/Celestrak source tables into SQL Server.')
+    parser.add_argument('--offline', action='store_true', help='skip the fetch stage and load from the local cache')
+    parser.add_argument('--force', action='store_true', help='reload sources even if their content was already loaded')
+    parser.add_argument('--rollback', metavar='TABLE', help='swap the previous generation of TABLE back in and exit')
+    parser.add_argument('--report', type=Path, help='write the JSON run report here (default .cache/reports/)')
+    parser.add_argument('--trace', type=Path, help='also write a Chrome trace of the run')
+    parser.add_argument(
+        '--trace-memory', action='store_true', default=TRACE_MEMORY, help='record tracemalloc peaks per stage (slow)'
+    )
+    args = parser.parse_args(argv)
+
+    if args.rollback:
+        spec = next((spec for spec in SOURCES if spec.table == args.rollback), None)
+        if spec is None:
+            raise SystemExit(f'{args.rollback} is not a source table ({", ".join(source.table for source in SOURCES)}).')
+        cnxn = pyodbc.connect(cnxn_string)
+        try:
+            generation = rollback_table(cnxn, spec.table, spec.key)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        finally:
+            cnxn.close()
+        print(f'{args.rollback} rolled back to its previous generation (recorded as generation {generation})')
+        return
+
+    with report_run('space_data_update', report=args.report, trace=args.trace, memory=args.trace_memory):
+        refresh(args)
+
+
+def refresh(args):
+    # Fetch stage: download every changed source into the local cache
+    if not args.offline:
+        with span('fetch') as stage:
+            results = fetch_all()
+            stage.set(bytesDownloaded=sum(result.bytes for result in results.values() if result.status != 'failed'))
+        report(results)
+
+    pending = [spec for spec in SOURCES if args.force or needs_load(spec.name)]
+    if not pending:
+        print('No upstream changes since the last refresh; nothing to load.')
+        return
+
+    try:
+        # Connect to the database
+        cnxn = instrument(pyodbc.connect(cnxn_string))
+    except Exception as e:
+        print("Couldn't connect to the database. Please check the connection details.")
+        print(e)
+        raise SystemExit(1)
+
+    # Load stage: parse each changed source from the cache, so a failed download never feeds another table's data
+    for spec in pending:
+        try:
+            path = cached_source(spec.name)
+        except (FileNotFoundError, ValueError) as e:
+            print(e)
+            continue
+        with span(f'load {spec.name}', table=spec.table):
+            loaded = update_source(cnxn, spec, path)
+            if not loaded:
+                current().set(failed=True)
+        if loaded:
+            mark_loaded(spec.name)
+
+    # Rebuild the enriched launch table behind the Launch_Data export from whatever changed
+    try:
+        with span('materialize'):
+            result = refresh_launch_data(cnxn, force=args.force)
+        print(result.summary() if result else 'Launch_Data_Enriched is up to date')
+    except Exception as e:
+        print("Couldn't refresh Launch_Data_Enriched. The export will keep the previous build.")
+        print(e)
+
+    # Close the database connection
+    cnxn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,747 @@
+"""Diff-based and streaming loading of source tables into SQL Server.
+
+Each loaded row is fingerprinted on its natural key and the fingerprints are kept in ``Load_Fingerprints``. A refresh
+only stages the rows whose fingerprint changed and applies them with a single MERGE, so a nightly run writes the few
+rows that actually moved instead of rewriting the whole table.
+
+Data arrives as an iterable of DataFrame chunks, so the large catalogs never have to be held in memory as one frame.
+Full reloads (the first load of a table, ``replace`` mode, or a table whose key is not unique) are inserted batch by
+batch into a ``<table>_Staging`` table that is swapped in with ``sp_rename`` once it is complete.
+
+Every load is checked against the previous generation before it becomes visible: the columns must match and the row
+count may not drop below ``SPACE_DATA_MIN_ROW_RATIO`` of the live table. A staged reload gets the live table's keys,
+indexes, constraints and grants before it is swapped in, and the generation it replaced is kept as ``<table>_Old``.
+A merge instead records the pre-images of the rows it touches in ``<table>_Delta`` (``OUTPUT deleted.*``), so it still
+writes only the changed rows. Either way :func:`rollback_table` restores the previous generation: by swapping
+``_Old`` back in or by replaying the delta. Each load is recorded in ``Load_Generations``.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+import run_report
+
+if TYPE_CHECKING:
+    import pyodbc
+
+FINGERPRINT_TABLE = "Load_Fingerprints"
+GENERATION_TABLE = "Load_Generations"
+LOAD_MODES = ("upsert", "replace")
+DEFAULT_LOAD_MODE = os.environ.get("SPACE_DATA_LOAD_MODE", "upsert")
+STAGING_SUFFIX = "_Staging"
+RETIRED_SUFFIX = "_Old"
+DELTA_SUFFIX = "_Delta"
+ROLLBACK_SUFFIX = "_Rollback"
+MIN_ROW_RATIO = float(os.environ.get("SPACE_DATA_MIN_ROW_RATIO", "0.9"))
+
+ChunkSource = Callable[[], Iterable[pd.DataFrame]]
+
+
+class KeyNotUniqueError(ValueError):
+    """The natural key of a table is null or repeated, so rows cannot be diffed by key."""
+
+
+class GenerationCheckError(RuntimeError):
+    """A new load failed its sanity checks against the previous generation and was not made visible."""
+
+
+@dataclass
+class SyncResult:
+    table: str
+    mode: str
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    generation: int | None = None
+
+    def summary(self) -> str:
+        return (
+            f"{self.table} ({self.mode}, generation {self.generation}): {self.inserted} inserted, "
+            f"{self.updated} updated, {self.deleted} deleted, {self.unchanged} unchanged"
+        )
+
+
+def quote_name(name: str) -> str:
+    return "[" + name.replace("]", "]]") + "]"
+
+
+def frame_records(frame: pd.DataFrame) -> list[tuple]:
+    """Rows as plain tuples with missing values mapped to None for pyodbc."""
+    return list(frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+def row_fingerprints(data: pd.DataFrame, key: str) -> pd.Series:
+    """Return a 64-bit hash of every row, indexed by the row's natural key."""
+    if key not in data.columns:
+        raise KeyError(f"Natural key column {key!r} is not present in the data for this table.")
+    if data[key].isna().any():
+        raise KeyNotUniqueError(f"Natural key {key} has missing values.")
+    hashes = pd.util.hash_pandas_object(data, index=False).to_numpy().view(np.int64)
+    return pd.Series(hashes, index=pd.Index(data[key].astype(str), name="Row_Key"), name="Row_Hash")
+
+
+def ensure_fingerprint_table(cursor: pyodbc.Cursor) -> None:
+    cursor.execute(
+        f"""
+        if object_id('{FINGERPRINT_TABLE}', 'U') is null
+        create table {FINGERPRINT_TABLE} (
+            Table_Name nvarchar(128) not null,
+            Row_Key nvarchar(450) not null,
+            Row_Hash bigint not null,
+            constraint PK_{FINGERPRINT_TABLE} primary key (Table_Name, Row_Key)
+        )
+        """
+    )
+
+
+def ensure_generation_table(cursor: pyodbc.Cursor) -> None:
+    cursor.execute(
+        f"""
+        if object_id('{GENERATION_TABLE}', 'U') is null
+        create table {GENERATION_TABLE} (
+            Table_Name nvarchar(128) not null,
+            Generation int not null,
+            Load_Mode nvarchar(16) not null,
+            Row_Count bigint not null,
+            Loaded_At datetime2 not null default sysutcdatetime(),
+            constraint PK_{GENERATION_TABLE} primary key (Table_Name, Generation)
+        )
+        """
+    )
+
+
+def record_generation(cursor: pyodbc.Cursor, table: str, mode: str, rows: int) -> int:
+    """Append the next generation number for ``table`` (inside the caller's transaction) and return it."""
+    cursor.execute(
+        f"select coalesce(max(Generation), 0) + 1 from {GENERATION_TABLE} with (updlock) where Table_Name = ?", table
+    )
+    generation = int(cursor.fetchone()[0])
+    cursor.execute(
+        f"insert into {GENERATION_TABLE} (Table_Name, Generation, Load_Mode, Row_Count) values (?, ?, ?, ?)",
+        table,
+        generation,
+        mode,
+        rows,
+    )
+    return generation
+
+
+def current_generation(cursor: pyodbc.Cursor, table: str) -> int | None:
+    cursor.execute(f"select max(Generation) from {GENERATION_TABLE} where Table_Name = ?", table)
+    generation = cursor.fetchone()[0]
+    return None if generation is None else int(generation)
+
+
+def source_signature(cursor: pyodbc.Cursor, tables: Sequence[str]) -> dict[str, str]:
+    """Cheap change tokens for ``tables``, used to skip downstream work when none of them moved.
+
+    Tables managed by the loader use their latest generation from ``Load_Generations``; any other table falls back
+    to its row count and ``CHECKSUM_AGG(BINARY_CHECKSUM(*))``.
+    """
+    generations: dict[str, int] = {}
+    cursor.execute("select object_id(?, 'U')", GENERATION_TABLE)
+    if cursor.fetchone()[0] is not None:
+        placeholders = ", ".join("?" for _ in tables)
+        cursor.execute(
+            f"select Table_Name, max(Generation) from {GENERATION_TABLE} "
+            f"where Table_Name in ({placeholders}) group by Table_Name",
+            *tables,
+        )
+        generations = {table: int(generation) for table, generation in cursor.fetchall()}
+
+    signature: dict[str, str] = {}
+    for table in tables:
+        if table in generations:
+            signature[table] = f"generation:{generations[table]}"
+        else:
+            cursor.execute(f"select count_big(*), checksum_agg(binary_checksum(*)) from {table}")
+            count, checksum = cursor.fetchone()
+            signature[table] = f"checksum:{count}:{checksum}"
+    return signature
+
+
+def read_fingerprints(cursor: pyodbc.Cursor, table: str) -> pd.Series:
+    cursor.execute(f"select Row_Key, Row_Hash from {FINGERPRINT_TABLE} where Table_Name = ?", table)
+    rows = cursor.fetchall()
+    return pd.Series(
+        np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows)),
+        index=pd.Index([row[0] for row in rows], name="Row_Key"),
+        name="Row_Hash",
+    )
+
+
+def changed_mask(current: pd.Series, stored: pd.Series) -> np.ndarray:
+    """Boolean mask of the rows in ``current`` that are new or differ from ``stored``."""
+    # get_indexer reuses the hash table cached on stored.index, so each chunk costs its own size, not the table's
+    position = stored.index.get_indexer(current.index)
+    changed = position < 0
+    known = ~changed
+    changed[known] = current.to_numpy()[known] != stored.to_numpy()[position[known]]
+    return changed
+
+
+def diff_fingerprints(current: pd.Series, stored: pd.Series) -> tuple[pd.Index, pd.Index, pd.Index]:
+    """Split keys into (inserted, updated, deleted) by comparing current and stored fingerprints."""
+    inserted = current.index.difference(stored.index, sort=False)
+    common = current.index.intersection(stored.index, sort=False)
+    changed = current.loc[common].to_numpy() != stored.loc[common].to_numpy()
+    updated = common[changed]
+    deleted = stored.index.difference(current.index, sort=False)
+    return inserted, updated, deleted
+
+
+def table_exists(cursor: pyodbc.Cursor, table: str) -> bool:
+    cursor.execute("select object_id(?, 'U')", table)
+    return cursor.fetchone()[0] is not None
+
+
+def drop_table(cursor: pyodbc.Cursor, table: str) -> None:
+    cursor.execute(f"if object_id(?, 'U') is not null drop table {quote_name(table)}", table)
+
+
+def table_row_count(cursor: pyodbc.Cursor, table: str) -> int:
+    cursor.execute(f"select count_big(*) from {quote_name(table)}")
+    return int(cursor.fetchone()[0])
+
+
+def table_columns(cursor: pyodbc.Cursor, table: str) -> list[str]:
+    cursor.execute(
+        "select COLUMN_NAME from INFORMATION_SCHEMA.COLUMNS where TABLE_NAME = ? order by ORDINAL_POSITION", table
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def check_schema(
+    cursor: pyodbc.Cursor, table: str, columns: list[str], dialect: SqlServerDialect | None = None
+) -> None:
+    """The incoming columns must be exactly the columns of the live generation."""
+    live = (dialect or SQL_SERVER).table_columns(cursor, table)
+    missing = [column for column in live if column not in columns]
+    extra = [column for column in columns if column not in live]
+    if missing or extra:
+        raise GenerationCheckError(
+            f"{table}: source columns no longer match the table (missing: {missing or 'none'}, "
+            f"unexpected: {extra or 'none'}). The live table was left untouched."
+        )
+
+
+def check_row_count(cursor: pyodbc.Cursor, table: str, rows: int, dialect: SqlServerDialect | None = None) -> None:
+    """Refuse empty loads and loads that shrink the table below ``MIN_ROW_RATIO`` of the live generation."""
+    dialect = dialect or SQL_SERVER
+    previous = dialect.table_row_count(cursor, table) if dialect.table_exists(cursor, table) else 0
+    if rows == 0:
+        raise GenerationCheckError(f"{table}: the new load has no rows. The live table was left untouched.")
+    if previous and rows < MIN_ROW_RATIO * previous:
+        raise GenerationCheckError(
+            f"{table}: the new load has {rows} rows against {previous} in the live table "
+            f"(below the {MIN_ROW_RATIO:.0%} threshold). The live table was left untouched."
+        )
+
+
+def create_stage(cursor: pyodbc.Cursor, table: str, stage: str, columns: list[str] | None = None) -> None:
+    """Create an empty session temp table with the same column types as ``table``."""
+    selected = ", ".join(quote_name(column) for column in columns) if columns else "*"
+    cursor.execute(f"if object_id('tempdb..{stage}') is not null drop table {stage}")
+    cursor.execute(f"select top 0 {selected} into {stage} from {quote_name(table)}")
+
+
+def insert_rows(cursor: pyodbc.Cursor, table: str, frame: pd.DataFrame) -> None:
+    rows = frame_records(frame)
+    if not rows:
+        return
+    columns = ", ".join(quote_name(column) for column in frame.columns)
+    params = ", ".join("?" for _ in frame.columns)
+    cursor.fast_executemany = True
+    cursor.executemany(f"insert into {table} ({columns}) values ({params})", rows)
+
+
+def merge_statement(table: str, stage: str, key: str, columns: list[str], delta: str) -> str:
+    target = quote_name(table)
+    updates = ", ".join(f"T.{quote_name(c)} = S.{quote_name(c)}" for c in columns if c != key)
+    column_list = ", ".join(quote_name(c) for c in columns)
+    values = ", ".join(f"S.{quote_name(c)}" for c in columns)
+    return (
+        f"merge {target} with (holdlock) as T "
+        f"using {stage} as S on T.{quote_name(key)} = S.{quote_name(key)} "
+        f"when matched then update set {updates} "
+        f"when not matched by target then insert ({column_list}) values ({values}) "
+        f"output $action, inserted.{quote_name(key)}, deleted.* into {quote_name(delta)};"
+    )
+
+
+def write_fingerprints(
+    cursor: pyodbc.Cursor, table: str, changed: pd.Series, deleted: pd.Index, *, replace_all: bool = False
+) -> None:
+    if replace_all:
+        cursor.execute(f"delete from {FINGERPRINT_TABLE} where Table_Name = ?", table)
+    else:
+        removed = list(deleted.union(changed.index, sort=False))
+        if removed:
+            cursor.execute("create table #Removed_Keys (Row_Key nvarchar(450) not null primary key)")
+            cursor.fast_executemany = True
+            cursor.executemany("insert into #Removed_Keys (Row_Key) values (?)", [(k,) for k in removed])
+            cursor.execute(
+                f"delete F from {FINGERPRINT_TABLE} as F join #Removed_Keys as K on K.Row_Key = F.Row_Key "
+                "where F.Table_Name = ?",
+                table,
+            )
+            cursor.execute("drop table #Removed_Keys")
+    if len(changed):
+        cursor.fast_executemany = True
+        cursor.executemany(
+            f"insert into {FINGERPRINT_TABLE} (Table_Name, Row_Key, Row_Hash) values (?, ?, ?)",
+            [(table, key, int(value)) for key, value in changed.items()],
+        )
+
+
+def copy_table_design(cursor: pyodbc.Cursor, source: str, target: str, suffix: str) -> None:
+    """Recreate the keys, indexes, default and check constraints and grants of ``source`` on ``target``.
+
+    ``select ... into`` copies only the columns. Constraint names are schema-wide, so the copies are named with
+    ``suffix`` appended; :func:`rename_constraints` moves the names along when the tables are swapped.
+    """
+    target_name = quote_name(target)
+    cursor.execute(
+        "select index_id, name, type_desc, is_unique, is_primary_key, is_unique_constraint, filter_definition "
+        "from sys.indexes where object_id = object_id(?) and type in (1, 2) order by type, index_id",
+        source,
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "select ic.index_id, c.name, ic.is_descending_key, ic.is_included_column from sys.index_columns as ic "
+        "join sys.columns as c on c.object_id = ic.object_id and c.column_id = ic.column_id "
+        "where ic.object_id = object_id(?) order by ic.index_id, ic.key_ordinal, ic.index_column_id",
+        source,
+    )
+    keys: dict[int, list[str]] = {}
+    included: dict[int, list[str]] = {}
+    for index_id, column, descending, is_included in cursor.fetchall():
+        if is_included:
+            included.setdefault(index_id, []).append(quote_name(column))
+        else:
+            keys.setdefault(index_id, []).append(quote_name(column) + (" desc" if descending else ""))
+    # Clustered indexes come first so the nonclustered ones are not rebuilt
+    for index_id, name, type_desc, unique, primary, unique_constraint, filter_definition in indexes:
+        kind = type_desc.lower()
+        columns = ", ".join(keys[index_id])
+        if primary or unique_constraint:
+            constraint = "primary key" if primary else "unique"
+            cursor.execute(
+                f"alter table {target_name} add constraint {quote_name(name + suffix)} {constraint} {kind} ({columns})"
+            )
+            continue
+        statement = f"create {'unique ' if unique else ''}{kind} index {quote_name(name)} on {target_name} ({columns})"
+        if index_id in included:
+            statement += f" include ({', '.join(included[index_id])})"
+        if filter_definition:
+            statement += f" where {filter_definition}"
+        cursor.execute(statement)
+
+    cursor.execute(
+        "select d.name, c.name, d.definition from sys.default_constraints as d "
+        "join sys.columns as c on c.object_id = d.parent_object_id and c.column_id = d.parent_column_id "
+        "where d.parent_object_id = object_id(?)",
+        source,
+    )
+    for name, column, definition in cursor.fetchall():
+        cursor.execute(
+            f"alter table {target_name} add constraint {quote_name(name + suffix)} default {definition} "
+            f"for {quote_name(column)}"
+        )
+    cursor.execute("select name, definition from sys.check_constraints where parent_object_id = object_id(?)", source)
+    for name, definition in cursor.fetchall():
+        cursor.execute(f"alter table {target_name} add constraint {quote_name(name + suffix)} check {definition}")
+
+    cursor.execute(
+        "select p.state_desc, p.permission_name, pr.name, c.name from sys.database_permissions as p "
+        "join sys.database_principals as pr on pr.principal_id = p.grantee_principal_id "
+        "left join sys.columns as c on c.object_id = p.major_id and c.column_id = p.minor_id "
+        "where p.class = 1 and p.major_id = object_id(?)",
+        source,
+    )
+    for state, permission, principal, column in cursor.fetchall():
+        on_columns = f" ({quote_name(column)})" if column else ""
+        action = "deny" if state == "DENY" else "grant"
+        statement = f"{action} {permission}{on_columns} on {target_name} to {quote_name(principal)}"
+        if state == "GRANT_WITH_GRANT_OPTION":
+            statement += " with grant option"
+        cursor.execute(statement)
+
+
+def rename_constraints(cursor: pyodbc.Cursor, table: str, old_suffix: str, new_suffix: str) -> None:
+    """Swap ``old_suffix`` for ``new_suffix`` on the names of ``table``'s constraints (append when ``old_suffix`` is
+    empty), so a table keeps unsuffixed constraint names only while it is live."""
+    cursor.execute(
+        "select name from sys.objects where parent_object_id = object_id(?) and type in ('PK', 'UQ', 'D', 'C')", table
+    )
+    for (name,) in cursor.fetchall():
+        if old_suffix and not name.endswith(old_suffix):
+            continue
+        base = name[: -len(old_suffix)] if old_suffix else name
+        cursor.execute("exec sp_rename ?, ?, 'OBJECT'", name, base + new_suffix)
+
+
+def create_delta(cursor: pyodbc.Cursor, table: str, key: str, delta: str) -> None:
+    """Create an empty ``delta`` table: the action, the row's key, then ``table``'s columns as nullable pre-images.
+
+    A delta row whose action is ``INSERT`` has no pre-image; restoring it deletes the key. Any other action restores
+    its pre-image. The outer join makes every copied column nullable and drops identity properties.
+    """
+    drop_table(cursor, delta)
+    cursor.execute(
+        f"select top 0 cast(null as nvarchar(10)) as Delta_Action, T.{quote_name(key)} as Delta_Key, T.* "
+        f"into {quote_name(delta)} from (select 1 as One) as O left join {quote_name(table)} as T on 1 = 0"
+    )
+
+
+def swap_in(cursor: pyodbc.Cursor, table: str, staging: str) -> None:
+    """Rename ``staging`` to ``table`` and keep the replaced generation as ``<table>_Old``.
+
+    Runs inside the caller's transaction, so readers see either the old or the new table and never a gap between
+    the renames.
+    """
+    retired = table + RETIRED_SUFFIX
+    drop_table(cursor, retired)
+    drop_table(cursor, table + DELTA_SUFFIX)
+    if table_exists(cursor, table):
+        cursor.execute("exec sp_rename ?, ?", table, retired)
+        rename_constraints(cursor, retired, "", RETIRED_SUFFIX)
+    cursor.execute("exec sp_rename ?, ?", staging, table)
+    rename_constraints(cursor, table, STAGING_SUFFIX, "")
+
+
+def replay_delta(cursor: pyodbc.Cursor, table: str, key: str) -> None:
+    """Restore the rows recorded in ``<table>_Delta`` and replace it with the delta of the restore itself."""
+    delta = table + DELTA_SUFFIX
+    redo = delta + ROLLBACK_SUFFIX
+    target = quote_name(table)
+    key_name = quote_name(key)
+    create_delta(cursor, table, key, redo)
+    cursor.execute(
+        f"delete T output 'DELETE', deleted.{key_name}, deleted.* into {quote_name(redo)} from {target} as T "
+        f"where exists (select 1 from {quote_name(delta)} as D where D.Delta_Key = T.{key_name})"
+    )
+    column_list = ", ".join(quote_name(column) for column in table_columns(cursor, table))
+    cursor.execute(
+        f"insert into {target} ({column_list}) "
+        f"output 'INSERT', inserted.{key_name} into {quote_name(redo)} (Delta_Action, Delta_Key) "
+        f"select {column_list} from {quote_name(delta)} where Delta_Action <> 'INSERT'"
+    )
+    drop_table(cursor, delta)
+    cursor.execute("exec sp_rename ?, ?", redo, delta)
+
+
+def rollback_table(cnxn: pyodbc.Connection, table: str, key: str) -> int:
+    """Restore the generation before the last load; rolling back again restores the rolled-back load.
+
+    A staged reload is undone by swapping ``<table>_Old`` back in (the rolled-back load becomes ``<table>_Old``), a
+    merge by replaying ``<table>_Delta`` (which then holds the rolled-back rows). Fingerprints for the table are
+    cleared so the next refresh does a full reload instead of diffing against the generation that was just rolled
+    back. Returns the generation number recorded for the rollback.
+    """
+    cursor = cnxn.cursor()
+    retired = table + RETIRED_SUFFIX
+    parked = table + ROLLBACK_SUFFIX
+    replay = table_exists(cursor, table + DELTA_SUFFIX)
+    if not replay and not table_exists(cursor, retired):
+        raise ValueError(f"No retained generation {retired} or {table}{DELTA_SUFFIX} to roll {table} back to.")
+    try:
+        ensure_generation_table(cursor)
+        ensure_fingerprint_table(cursor)
+        if replay:
+            replay_delta(cursor, table, key)
+        else:
+            drop_table(cursor, parked)
+            cursor.execute("exec sp_rename ?, ?", table, parked)
+            rename_constraints(cursor, parked, "", ROLLBACK_SUFFIX)
+            cursor.execute("exec sp_rename ?, ?", retired, table)
+            rename_constraints(cursor, table, RETIRED_SUFFIX, "")
+            cursor.execute("exec sp_rename ?, ?", parked, retired)
+            rename_constraints(cursor, retired, ROLLBACK_SUFFIX, RETIRED_SUFFIX)
+        cursor.execute(f"delete from {FINGERPRINT_TABLE} where Table_Name = ?", table)
+        generation = record_generation(cursor, table, "rollback", table_row_count(cursor, table))
+        cnxn.commit()
+    except Exception:
+        cnxn.rollback()
+        raise
+    return generation
+
+
+class SqlServerDialect:
+    """The statements of :func:`load_chunks` that only SQL Server understands.
+
+    Everything else the loader sends is portable. ``pipeline_benchmark`` subclasses this to run the same load on a
+    SQLite stand-in; the methods here just call the module's SQL Server helpers.
+    """
+
+    def ensure_tables(self, cursor: pyodbc.Cursor) -> None:
+        ensure_fingerprint_table(cursor)
+        ensure_generation_table(cursor)
+
+    def table_exists(self, cursor: pyodbc.Cursor, table: str) -> bool:
+        return table_exists(cursor, table)
+
+    def drop_table(self, cursor: pyodbc.Cursor, table: str) -> None:
+        drop_table(cursor, table)
+
+    def table_row_count(self, cursor: pyodbc.Cursor, table: str) -> int:
+        return table_row_count(cursor, table)
+
+    def table_columns(self, cursor: pyodbc.Cursor, table: str) -> list[str]:
+        return table_columns(cursor, table)
+
+    def record_generation(self, cursor: pyodbc.Cursor, table: str, mode: str, rows: int) -> int:
+        return record_generation(cursor, table, mode, rows)
+
+    def create_empty(self, cursor: pyodbc.Cursor, table: str, target: str) -> None:
+        """Create ``target`` with ``table``'s columns and no rows."""
+        cursor.execute(f"select top 0 * into {quote_name(target)} from {quote_name(table)}")
+
+    def create_from_frame(self, cnxn: pyodbc.Connection, frame: pd.DataFrame, table: str) -> None:
+        """Create ``table`` from ``frame``'s dtypes and insert its rows."""
+        from fast_to_sql import fast_to_sql as fts
+
+        fts.fast_to_sql(frame, table, cnxn, if_exists="replace", custom=None, temp=False, copy=False)
+
+    def create_stage(self, cursor: pyodbc.Cursor, table: str, name: str, columns: list[str]) -> str:
+        """Create a session temp table with ``columns`` of ``table`` and return the name to use in statements."""
+        stage = "#" + name
+        create_stage(cursor, table, stage, columns)
+        return stage
+
+    def insert_rows(self, cursor: pyodbc.Cursor, table: str, frame: pd.DataFrame) -> None:
+        insert_rows(cursor, table, frame)
+
+    def swap_in(self, cursor: pyodbc.Cursor, table: str, staging: str) -> None:
+        # Build the live table's keys and indexes after the bulk insert, then swap
+        if table_exists(cursor, table):
+            copy_table_design(cursor, table, staging, STAGING_SUFFIX)
+        swap_in(cursor, table, staging)
+
+    def create_delta(self, cursor: pyodbc.Cursor, table: str, key: str, delta: str) -> None:
+        create_delta(cursor, table, key, delta)
+
+    def merge(self, cursor: pyodbc.Cursor, table: str, stage: str, key: str, columns: list[str], delta: str) -> None:
+        cursor.execute(merge_statement(table, stage, key, columns, delta))
+
+    def delete_keys(self, cursor: pyodbc.Cursor, table: str, stage: str, key: str, delta: str) -> None:
+        """Delete the rows whose key is in ``stage``, writing their pre-images to ``delta``."""
+        cursor.execute(
+            f"delete T output 'DELETE', deleted.{quote_name(key)}, deleted.* into {quote_name(delta)} "
+            f"from {quote_name(table)} as T "
+            f"join {stage} as D on D.{quote_name(key)} = T.{quote_name(key)}"
+        )
+
+    def write_fingerprints(
+        self, cursor: pyodbc.Cursor, table: str, changed: pd.Series, deleted: pd.Index, *, replace_all: bool = False
+    ) -> None:
+        write_fingerprints(cursor, table, changed, deleted, replace_all=replace_all)
+
+
+SQL_SERVER = SqlServerDialect()
+
+
+def reload_table(
+    cnxn: pyodbc.Connection,
+    chunks: Iterable[pd.DataFrame],
+    table: str,
+    key: str,
+    mode: str,
+    dialect: SqlServerDialect = SQL_SERVER,
+) -> SyncResult:
+    """Stream every chunk into ``<table>_Staging`` and swap it in once the whole source has been written.
+
+    Each batch is committed on its own so the transaction log stays small; readers keep seeing the previous table
+    until the final rename. A load that fails its checks is left in ``<table>_Staging`` for inspection. Fingerprints
+    are rewritten in the swap transaction so the next refresh can diff against this load.
+    """
+    cursor = cnxn.cursor()
+    stage = run_report.current()
+    staging = table + STAGING_SUFFIX
+    fingerprints: list[pd.Series] = []
+    keyed = True
+    rows = 0
+    try:
+        dialect.drop_table(cursor, staging)
+        created = False
+        if dialect.table_exists(cursor, table):
+            dialect.create_empty(cursor, table, staging)
+            created = True
+        for chunk in stage.timed(chunks, "parse"):
+            if created and rows == 0:
+                check_schema(cursor, table, list(chunk.columns), dialect)
+            if created:
+                with stage.phase("insert"):
+                    dialect.insert_rows(cursor, quote_name(staging), chunk)
+                    cnxn.commit()
+            else:
+                # No existing table to copy the schema from: let fast_to_sql create it from the first batch
+                with stage.phase("fast_to_sql"):
+                    dialect.create_from_frame(cnxn, chunk, staging)
+                    cnxn.commit()
+                created = True
+            rows += len(chunk)
+            if keyed:
+                with stage.phase("fingerprint"):
+                    try:
+                        fingerprints.append(row_fingerprints(chunk, key))
+                    except KeyNotUniqueError:
+                        keyed = False
+
+        current = pd.concat(fingerprints) if keyed and fingerprints else pd.Series(dtype=np.int64)
+        if keyed and not current.index.is_unique:
+            keyed = False
+        if not keyed:
+            print(f"{table}: natural key {key} is missing or not unique; the next refresh will reload it in full.")
+            current = pd.Series(dtype=np.int64)
+
+        with stage.phase("swap"):
+            check_row_count(cursor, table, rows, dialect)
+            dialect.swap_in(cursor, table, staging)
+        with stage.phase("write_fingerprints"):
+            dialect.write_fingerprints(cursor, table, current, pd.Index([]), replace_all=True)
+        generation = dialect.record_generation(cursor, table, mode, rows)
+        with stage.phase("commit"):
+            cnxn.commit()
+    except Exception:
+        cnxn.rollback()
+        raise
+    stage.set(table=table, loadMode=mode, rows=rows, inserted=rows)
+    return SyncResult(table=table, mode=mode, inserted=rows, generation=generation)
+
+
+def merge_chunks(
+    cnxn: pyodbc.Connection,
+    chunks: Iterable[pd.DataFrame],
+    table: str,
+    key: str,
+    stored: pd.Series,
+    dialect: SqlServerDialect = SQL_SERVER,
+) -> SyncResult:
+    """Stage only the new and changed rows of each chunk, then apply them with one MERGE plus deletes.
+
+    The MERGE and deletes write the pre-images of the rows they touch to ``<table>_Delta``. They commit in one
+    transaction with the fingerprint updates, so readers never see a partial refresh and replaying the delta restores
+    exactly the pre-merge table.
+    """
+    cursor = cnxn.cursor()
+    stage = run_report.current()
+    fingerprints: list[pd.Series] = []
+    columns: list[str] | None = None
+    upserts = ""
+    staged = 0
+    try:
+        for chunk in stage.timed(chunks, "parse"):
+            with stage.phase("fingerprint"):
+                current = row_fingerprints(chunk, key)
+                fingerprints.append(current)
+                changed = changed_mask(current, stored)
+            if columns is None:
+                columns = list(chunk.columns)
+                check_schema(cursor, table, columns, dialect)
+                upserts = dialect.create_stage(cursor, table, "Stage_Upsert", columns)
+            if changed.any():
+                with stage.phase("stage"):
+                    dialect.insert_rows(cursor, upserts, chunk[changed])
+                staged += int(changed.sum())
+
+        current = pd.concat(fingerprints) if fingerprints else pd.Series(dtype=np.int64)
+        if not current.index.is_unique:
+            raise KeyNotUniqueError(f"Natural key {key} is not unique.")
+        check_row_count(cursor, table, len(current), dialect)
+        inserted, updated, deleted = diff_fingerprints(current, stored)
+        upserted = inserted.append(updated)
+
+        delta = table + DELTA_SUFFIX
+        if len(upserted) or len(deleted):
+            # The delta now holds the previous generation; the last staged reload's copy no longer does
+            dialect.drop_table(cursor, table + RETIRED_SUFFIX)
+            dialect.create_delta(cursor, table, key, delta)
+        with stage.phase("merge"):
+            if staged and columns is not None:
+                dialect.merge(cursor, table, upserts, key, columns, delta)
+            if columns is not None:
+                cursor.execute(f"drop table {upserts}")
+
+        if len(deleted):
+            with stage.phase("delete"):
+                deletes = dialect.create_stage(cursor, table, "Stage_Delete", [key])
+                dialect.insert_rows(cursor, deletes, pd.DataFrame({key: list(deleted)}))
+                dialect.delete_keys(cursor, table, deletes, key, delta)
+                cursor.execute(f"drop table {deletes}")
+
+        with stage.phase("write_fingerprints"):
+            dialect.write_fingerprints(cursor, table, current.loc[upserted], deleted)
+        # A refresh with no changes keeps the current generation, so exports keyed on it can be skipped
+        if len(upserted) or len(deleted):
+            generation = dialect.record_generation(cursor, table, "upsert", len(current))
+        else:
+            generation = current_generation(cursor, table)
+        with stage.phase("commit"):
+            cnxn.commit()
+    except Exception:
+        cnxn.rollback()
+        raise
+
+    stage.set(
+        table=table,
+        loadMode="upsert",
+        rows=len(current),
+        inserted=len(inserted),
+        updated=len(updated),
+        deleted=len(deleted),
+        staged=staged,
+    )
+    return SyncResult(
+        table=table,
+        mode="upsert",
+        inserted=len(inserted),
+        updated=len(updated),
+        deleted=len(deleted),
+        unchanged=len(current) - len(upserted),
+        generation=generation,
+    )
+
+
+def load_chunks(
+    cnxn: pyodbc.Connection,
+    chunks: ChunkSource,
+    table: str,
+    key: str,
+    mode: str = DEFAULT_LOAD_MODE,
+    dialect: SqlServerDialect = SQL_SERVER,
+) -> SyncResult:
+    """Load a source delivered as DataFrame chunks; ``chunks`` is called again if the load has to restart.
+
+    In ``upsert`` mode only changed rows are written. The first sync of a table (no stored fingerprints yet) and
+    tables whose key turns out not to be unique fall back to a full staged reload.
+    """
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode {mode!r}; expected one of {', '.join(LOAD_MODES)}.")
+    cursor = cnxn.cursor()
+    dialect.ensure_tables(cursor)
+    cnxn.commit()
+
+    if mode == "replace":
+        return reload_table(cnxn, chunks(), table, key, "replace", dialect)
+
+    with run_report.current().phase("read_fingerprints"):
+        stored = read_fingerprints(cursor, table)
+    if stored.empty or not dialect.table_exists(cursor, table):
+        return reload_table(cnxn, chunks(), table, key, "bootstrap", dialect)
+    try:
+        return merge_chunks(cnxn, chunks(), table, key, stored, dialect)
+    except KeyNotUniqueError as error:
+        print(f"{table}: {error} Falling back to a full reload.")
+        return reload_table(cnxn, chunks(), table, key, "replace", dialect)
+
+
+def load_table(
+    cnxn: pyodbc.Connection, data: pd.DataFrame, table: str, key: str, mode: str = DEFAULT_LOAD_MODE
+) -> SyncResult:
+    return load_chunks(cnxn, lambda: (data,), table, key, mode)
@@ -1,76 +1,28 @@
 import { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import { utils as XLSXUtils, writeFile as writeXLSXFile } from 'xlsx';
+import {
+  DEFAULT_INPUTS,
+  DEFAULT_NUMERIC_INPUTS,
+  FIELD_CONFIG_MAP,
+  FIELD_NAMES,
+  FORM_SECTIONS,
+  prepareInputs,
+  toNumber
+} from './model/inputs.js';
+import { computeScenario } from './model/scenario.js';
+import { getFieldStepValue, getFractionDigits, hashAssumptions, planSweep } from './model/sweep.js';
+import { createSweepClient } from './model/sweepClient.js';
+import { loadTileSweep } from './data/scenarioTiles.js';
+import {
+  DEFAULT_SAMPLE_COUNT,
+  DEFAULT_UNCERTAIN_FIELDS,
+  DISTRIBUTION_TYPES,
+  defaultDistribution,
+  validateDistribution
+} from './model/uncertainty.js';
 
-const g0 = 9.81;
-
-const FORM_SECTIONS = [
-  {
-    id: 'sbi-performance',
-    title: 'Interceptor performance',
-    fields: [
-      { name: 'sbiOrbitAltitudeKm', label: 'SBI orbit altitude', defaultValue: '300', unit: 'km', min: 150, max: 22500, step: '5', hint: 'Orbital altitude at which SBIs will be stationed.' },
-      { name: 'averageAccelerationG', label: 'Average acceleration', defaultValue: '15.0', unit: 'g', min: 1, max: 30, step: '0.1', hint: 'Average acceleration of the interceptor over its flight profile.' },
-      { name: 'maxDeltaVKmPerS', label: 'Max velocity (ΔV)', defaultValue: '6.0', unit: 'km/s', min: 0.1, max: 20, step: '0.1', hint: 'Maximum change in velocity of the interceptor.' },
-      { name: 'divertVelocityKmPerS', label: 'Divert velocity', defaultValue: '2.5', unit: 'km/s', min: 0, max: 10, step: '0.1', hint: 'Divert velocity of the kill vehicle for terminal maneuvers.' },
-      { name: 'thrusterIspSeconds', label: 'Thruster performance (Isp)', defaultValue: '240', unit: 's', min: 100, max: 1000, step: '1', hint: 'Specific impulse for the interceptor and kill vehicle thrusters.' },
-      { name: 'killVehicleDryMassKg', label: 'Kill vehicle dry mass', defaultValue: '25.0', unit: 'kg', min: 1, step: '0.1', hint: 'Total mass of the kill vehicle (structure, sensors, thrusters, avionics, etc.) not including propellant.' },
-      { name: 'interceptorBodyDryMassKg', label: 'Interceptor body dry mass', defaultValue: '25.0', unit: 'kg', min: 1, step: '0.1', hint: 'Total mass of the interceptor (structure, thrusters, avionics, etc.) not including the kill vehicle or propellant.' },
-      { name: 'supportModuleDryMassKg', label: 'Support module dry mass', defaultValue: '50.0', unit: 'kg', min: 1, step: '0.1', hint: 'Mass of the module that houses the interceptor in orbit for power, communications, station keeping, etc. that is left behind when the interceptor fires. If multiple interceptors are housed together, this is the fraction of the total module mass allocated for each interceptor.'},
-      { name: 'sbiLifeExpectancyYears', label: 'SBI life expectancy', defaultValue: '5', unit: 'years', min: 1, max: 20, step: '1', hint: 'How long each interceptor is expected to last in orbit before replacement.' },
-      { name: 'killProbabilityPercent', label: 'Kill probability (Pk)', defaultValue: '80.0', unit: '%', min: 1, max: 99.9, step: '0.1', hint: 'Probability that a single interceptor will destory its target.' },
-      { name: 'compositeKillProbabilityPercent', label: 'Composite kill probability', defaultValue: '96.0', unit: '%', min: 1, max: 99.9, step: '0.1', hint: 'Desired overall probability that each threat will be destroyed. In combination with the single-shot Pk, this determines how many interceptors must be fired at each threat.' }
-      
-    ]
-  },
-  {
-    id: 'threat-parameters',
-    title: 'Threat parameters',
-    fields: [
-      { name: 'salvoSize', label: 'Salvo size', defaultValue: '1', unit: 'missiles', min: 1, max: 1000, step: '1', hint: 'Maximum number of missiles launched at once the systems should be able to intercept.' },
-      { name: 'interceptAltitudeKm', label: 'Intercept altitude', defaultValue: '200', unit: 'km', min: 50, max: 10000, step: '5', hint: 'Minimum altitude at which threats will be engaged. If below 100km, additional mass should be added to the kill vehicle to accomodate atmospheric re-entry (heat sheilding, etc.).' },
-      { name: 'maxLatitudeCoverageDeg', label: 'Max latitude coverage', defaultValue: '90', unit: 'deg', min: 1, max: 90, step: '1', hint: 'Maximum latitude where SBIs will provide coverage. For global coverage, use 90 degrees. For North Korea and Iran only, use 45 degrees.' },
-      { name: 'flyoutTimeSeconds', label: 'Flyout time', defaultValue: '120.0', unit: 's', min: 10, max: 1800, step: '1', hint: 'The time between when the command is given to fire an interceptor and the latest point at which it can hit a target.' }
-    ]
-  },
-  {
-    id: 'cost-parameters',
-    title: 'Interceptor cost parameters (in constant dollars)',
-    fields: [
-      { name: 'nonRecurringDevCostMillion', label: 'Non-recurring development', defaultValue: '7000', prefix: '$', unit: 'million USD', min: 0, step: '1', hint: 'Total non-recurring research, development, and integration cost for each generation of interceptors.' },
-      { name: 'firstUnitInterceptorCostMillion', label: 'First unit interceptor cost', defaultValue: '70.0', prefix: '$', unit: 'million USD', min: 1, step: '0.1', hint: 'Unit cost of the first interceptor produced.' },
-      { name: 'interceptorLearningPercent', label: 'Interceptor learning percent', defaultValue: '85.0', unit: '%', min: 70, max: 100, step: '0.1', hint: 'The rate at which the unit cost will decline as more are built. An 90% learning curve means that each time the quantity doubles the unit cost declines by 10%.' },
-      { name: 'operatingSupportCostPerYearMillion', label: 'Operating & support cost per year', defaultValue: '450', prefix: '$', unit: 'million USD', min: 0, step: '1', hint: 'Estimated cost to operate the system, including personnel, training, facilities, etc.' },
-      { name: 'costEstimatePeriodYears', label: 'Period of cost estimate', defaultValue: '20', unit: 'years', min: 1, max: 100, step: '1', hint: 'The total number of years assessed in the cost estimate.' }
-    ]
-  },
-  {
-    id: 'launch-parameters',
-    title: 'Launch vehicle parameters',
-    fields: [
-      { name: 'payloadCapacityPerVehicleKg', label: 'Payload capacity per vehicle', defaultValue: '45000', unit: 'kg', min: 15000, max: 300000, step: '100', hint: 'Lift capability for the selected launch vehicle.' },
-      { name: 'firstUnitLaunchCostMillion', label: 'First unit launch cost', defaultValue: '150.0', prefix: '$', unit: 'million USD', min: 1, step: '0.1', hint: 'Initial cost per launch.' },
-      { name: 'launchLearningPercent', label: 'Launch learning percent', defaultValue: '95', unit: '%', min: 70, max: 100, step: '0.1', hint: 'The rate at which launch costs will decline as more are built. An 90% learning curve means that each time the quantity doubles the cost per launch declines by 10%.' }
-    ]
-  }
-];
-
-const FIELD_CONFIG_MAP = FORM_SECTIONS.reduce((accumulator, section) => {
-  section.fields.forEach((field) => {
-    accumulator[field.name] = field;
-  });
-  return accumulator;
-}, {});
-const FIELD_NAMES = FORM_SECTIONS.flatMap((section) => section.fields.map((field) => field.name));
 const IS_BROWSER = typeof window !== 'undefined';
 
-const DEFAULT_INPUTS = FORM_SECTIONS.reduce((accumulator, section) => {
-  section.fields.forEach((field) => {
-    accumulator[field.name] = field.defaultValue;
-  });
-  return accumulator;
-}, {});
-
-const DEFAULT_NUMERIC_INPUTS = convertToNumeric(DEFAULT_INPUTS);
 const timestampFormatter = new Intl.DateTimeFormat('en-US', {
   dateStyle: 'medium',
   timeStyle: 'short'
@@ -107,8 +59,8 @@ const DEFAULT_CHART_CONFIG = {
   rangeEnd: '10'
 };
 
-const MAX_CHART_POINTS = 3000;
-const MAX_SWEEP_STEPS = 500;
+// Wait for typing in the range inputs to pause before starting a new sweep
+const SWEEP_DEBOUNCE_MS = 150;
 
 const RESOURCE_LINKS = [
   {
@@ -166,7 +118,6 @@ const CHART_Y_OPTIONS = [
   {
     value: 'totalSystemCostBillion',
     label: 'Total system cost',
-    accessor: (metrics) => metrics.totalSystemCostBillion,
     axisLabel: 'Total system cost (USD billions)',
     tickFormatter: (value) => formatUSDbillions(value),
     tooltipFormatter: (value) => formatUSDbillions(value)
@@ -174,7 +125,6 @@ const CHART_Y_OPTIONS = [
   {
     value: 'constellationSize',
     label: 'Constellation size',
-    accessor: (metrics) => metrics.constellationSize,
     axisLabel: 'Constellation size (interceptors)',
     tickFormatter: (value) => formatInt(value),
     tooltipFormatter: (value) => formatInt(value)
@@ -182,7 +132,6 @@ const CHART_Y_OPTIONS = [
   {
     value: 'launchCount',
     label: '# of launches required',
-    accessor: (metrics) => metrics.launchCount,
     axisLabel: 'Launches required',
     tickFormatter: (value) => formatInt(value),
     tooltipFormatter: (value) => formatInt(value)
@@ -190,7 +139,6 @@ const CHART_Y_OPTIONS = [
   {
     value: 'interceptorMassKg',
     label: 'Interceptor mass',
-    accessor: (metrics) => metrics.interceptorMassKg,
     axisLabel: 'Interceptor mass (kg)',
     tickFormatter: (value) => decimalFormatter.format(value),
     tooltipFormatter: (value) => formatKg(value)
@@ -198,21 +146,27 @@ const CHART_Y_OPTIONS = [
   {
     value: 'interceptorFlyoutRangeKm',
     label: 'Interceptor flyout range',
-    accessor: (metrics) => metrics.interceptorFlyoutRangeKm,
     axisLabel: 'Interceptor flyout range (km)',
     tickFormatter: (value) => decimalFormatter.format(value),
     tooltipFormatter: (value) => `${decimalFormatter.format(value)} km`
   }
 ];
 
+// Metrics every sweep records, so switching the plotted metric never re-runs it
+const CHART_METRIC_KEYS = CHART_Y_OPTIONS.map((option) => option.value);
+
+const DISTRIBUTION_LABELS = {
+  triangular: 'Triangular',
+  uniform: 'Uniform',
+  lognormal: 'Lognormal (P10–P90)'
+};
+
+const UNCERTAINTY_RESULTS = [
+  { key: 'totalSystemCostBillion', label: 'Total system cost', format: (value) => formatUSDbillions(value) },
+  { key: 'constellationSize', label: 'Constellation size', format: (value) => formatInt(value) },
+  { key: 'launchCount', label: 'Launches required', format: (value) => formatInt(value) }
+];
 
-function getFractionDigits(fieldName) {
-  const field = FIELD_CONFIG_MAP[fieldName];
-  if (!field || field.step === undefined) return 0;
-  const text = String(field.step);
-  const point = text.indexOf('.');
-  return point >= 0 ? text.length - point - 1 : 0;
-}
 
 function formatInputValue(fieldName, raw) {
   if (raw === undefined || raw === '') return '';
@@ -231,9 +185,22 @@ export default function App() {
   const [errors, setErrors] = useState(() => collectScenarioMessages(computeScenario(DEFAULT_NUMERIC_INPUTS)));
   const [lastRun, setLastRun] = useState(() => new Date());
   const [chartConfig, setChartConfig] = useState(() => ({ ...DEFAULT_CHART_CONFIG }));
+  const [uncertaintyInputs, setUncertaintyInputs] = useState(() => defaultUncertaintyInputs(DEFAULT_NUMERIC_INPUTS));
+  // Ranges of the last run; the analysis re-runs with them whenever the scenario changes
+  const [appliedUncertainty, setAppliedUncertainty] = useState(null);
+  const [showBands, setShowBands] = useState(false);
+  const modelClient = useModelClient();
+  const chartFocusRef = useRef(undefined);
+  const sweepPlan = useMemo(
+    () => buildSweepPlan(scenario.assumptions, chartConfig.xField, chartConfig.rangeStart, chartConfig.rangeEnd),
+    [scenario, chartConfig.xField, chartConfig.rangeStart, chartConfig.rangeEnd]
+  );
+  const sweep = useSweep(modelClient, sweepPlan, chartFocusRef);
+  const uncertainty = useUncertainty(modelClient, scenario.assumptions, appliedUncertainty);
+  const bands = useUncertaintyBands(modelClient, sweepPlan, showBands ? uncertainty.distributions : null);
   const chartState = useMemo(
-    () => buildChartState(scenario.assumptions, chartConfig),
-    [scenario, chartConfig]
+    () => buildChartState(sweepPlan, chartConfig.yField, sweep, bands),
+    [sweepPlan, chartConfig.yField, sweep, bands]
   );
 
   const updateChartConfig = (partial) => {
@@ -295,6 +262,14 @@ export default function App() {
     setErrors(collectScenarioMessages(nextScenario));
   };
 
+  const handleRunUncertainty = () => {
+    setAppliedUncertainty({ ...uncertaintyInputs });
+  };
+
+  const handleResetUncertainty = () => {
+    setUncertaintyInputs(defaultUncertaintyInputs(scenario.assumptions));
+  };
+
   const { assumptions, metrics } = scenario;
 
   return (
@@ -536,11 +511,25 @@ export default function App() {
         </div>
       </section>
 
+      <section className="uncertainty-section">
+        <UncertaintySection
+          assumptions={assumptions}
+          inputs={uncertaintyInputs}
+          onInputsChange={setUncertaintyInputs}
+          onRun={handleRunUncertainty}
+          onReset={handleResetUncertainty}
+          uncertainty={uncertainty}
+          showBands={showBands}
+          onShowBandsChange={setShowBands}
+        />
+      </section>
+
       <section className="chart-section">
         <ChartSection
           assumptions={assumptions}
           chartConfig={chartConfig}
           chartState={chartState}
+          focusRef={chartFocusRef}
           onChartConfigChange={updateChartConfig}
         />
       </section>
@@ -656,10 +645,202 @@ function ResourceIcon({ type }) {
   }
 }
 
-function ChartSection({ assumptions, chartConfig, chartState, onChartConfigChange }) {
+function UncertaintySection({
+  assumptions,
+  inputs,
+  onInputsChange,
+  onRun,
+  onReset,
+  uncertainty,
+  showBands,
+  onShowBandsChange
+}) {
+  const uncertainNames = FIELD_NAMES.filter((name) => inputs[name]);
+  const availableNames = FIELD_NAMES.filter((name) => !inputs[name]);
+  const { status, result, errors } = uncertainty;
+
+  const updateField = (name, patch) => {
+    onInputsChange({ ...inputs, [name]: { ...inputs[name], ...patch } });
+  };
+
+  const handleTypeChange = (name, type) => {
+    // Lognormal ranges are P10/P90 rather than hard limits, so switching type re-seeds sensible defaults
+    onInputsChange({ ...inputs, [name]: uncertaintyInputFor(name, assumptions[name], type) });
+  };
+
+  const handleRemove = (name) => {
+    const next = { ...inputs };
+    delete next[name];
+    onInputsChange(next);
+  };
+
+  const handleAdd = (event) => {
+    const name = event.target.value;
+    if (name) {
+      onInputsChange({ ...inputs, [name]: uncertaintyInputFor(name, assumptions[name]) });
+    }
+  };
+
+  const excluded = result ? result.samples - result.valid : 0;
+
+  return (
+    <div className="uncertainty-section__inner">
+      <div className="chart-header">
+        <h2>Uncertainty analysis</h2>
+        <p>
+          Sample the uncertain inputs together ({formatInt(DEFAULT_SAMPLE_COUNT)} Monte Carlo draws, learning rates
+          and cost drivers correlated) and report the 10th, 50th and 90th percentile outcomes. The most likely value of
+          each input is its current value above.
+        </p>
+      </div>
+
+      <div className="uncertainty-table" role="table" aria-label="Uncertain inputs">
+        <div className="uncertainty-row uncertainty-row--head" role="row">
+          <span role="columnheader">Input</span>
+          <span role="columnheader">Current</span>
+          <span role="columnheader">Distribution</span>
+          <span role="columnheader">Low</span>
+          <span role="columnheader">High</span>
+          <span role="columnheader" aria-label="Remove" />
+        </div>
+        {uncertainNames.map((name) => {
+          const field = FIELD_CONFIG_MAP[name];
+          const input = inputs[name];
+          return (
+            <div className="uncertainty-row" role="row" key={name}>
+              <span role="cell">{field.label}</span>
+              <span role="cell">{formatValueForField(field, assumptions[name])}</span>
+              <span role="cell">
+                <select
+                  className="chart-select"
+                  value={input.type}
+                  onChange={(event) => handleTypeChange(name, event.target.value)}
+                  aria-label={`${field.label} distribution`}
+                >
+                  {DISTRIBUTION_TYPES.map((type) => (
+                    <option key={type} value={type}>
+                      {DISTRIBUTION_LABELS[type]}
+                    </option>
+                  ))}
+                </select>
+              </span>
+              <span role="cell">
+                <input
+                  className="chart-input"
+                  type="number"
+                  inputMode="decimal"
+                  step={field.step ?? 'any'}
+                  value={input.low}
+                  onChange={(event) => updateField(name, { low: event.target.value })}
+                  aria-label={`${field.label} low`}
+                />
+              </span>
+              <span role="cell">
+                <input
+                  className="chart-input"
+                  type="number"
+                  inputMode="decimal"
+                  step={field.step ?? 'any'}
+                  value={input.high}
+                  onChange={(event) => updateField(name, { high: event.target.value })}
+                  aria-label={`${field.label} high`}
+                />
+              </span>
+              <span role="cell">
+                <button
+                  className="uncertainty-remove"
+                  type="button"
+                  onClick={() => handleRemove(name)}
+                  aria-label={`Remove ${field.label}`}
+                >
+                  ×
+                </button>
+              </span>
+            </div>
+          );
+        })}
+      </div>
+
+      <div className="uncertainty-controls">
+        <label className="chart-field">
+          <span>Add uncertain input</span>
+          <select className="chart-select" value="" onChange={handleAdd}>
+            <option value="">Select an input…</option>
+            {availableNames.map((name) => (
+              <option key={name} value={name}>
+                {FIELD_CONFIG_MAP[name].label}
+              </option>
+            ))}
+          </select>
+        </label>
+        <label className="uncertainty-toggle">
+          <input
+            type="checkbox"
+            checked={showBands}
+            onChange={(event) => onShowBandsChange(event.target.checked)}
+            disabled={!result}
+          />
+          <span>Show P10–P90 band on the trade-off chart</span>
+        </label>
+      </div>
+
+      <div className="form-actions">
+        <button className="primary" type="button" onClick={onRun} disabled={!uncertainNames.length}>
+          Run analysis
+        </button>
+        <button className="secondary" type="button" onClick={onReset}>
+          Reset ranges
+        </button>
+      </div>
+
+      {errors.length > 0 && (
+        <div className="alert" role="alert">
+          <h3>We need a couple adjustments:</h3>
+          <ul>
+            {errors.map((message) => (
+              <li key={message}>{message}</li>
+            ))}
+          </ul>
+        </div>
+      )}
+
+      {status === 'running' && !result ? (
+        <div className="chart-empty" role="status">
+          Sampling scenarios…
+        </div>
+      ) : null}
+
+      {result ? (
+        <>
+          <div className="result-grid" aria-busy={status === 'running'}>
+            {UNCERTAINTY_RESULTS.map(({ key, label, format }) => {
+              const summary = result.metrics[key];
+              return (
+                <article className="result-card" key={key}>
+                  <h3>{label}</h3>
+                  <p className="result-value">{format(summary.p50)}</p>
+                  <p className="result-hint">
+                    Median. P10 {format(summary.p10)} · P90 {format(summary.p90)}
+                  </p>
+                </article>
+              );
+            })}
+          </div>
+          <p className="chart-field__hint">
+            {formatInt(result.samples)} samples in {formatInt(result.milliseconds)} ms
+            {excluded > 0 ? `; ${formatInt(excluded)} excluded for breaking an input rule (for example divert above maximum ΔV)` : ''}.
+          </p>
+        </>
+      ) : null}
+    </div>
+  );
+}
+
+function ChartSection({ assumptions, chartConfig, chartState, focusRef, onChartConfigChange }) {
   const xField = FIELD_CONFIG_MAP[chartConfig.xField] ?? null;
   const [activeIndex, setActiveIndex] = useState(null);
 
+  // Points arrive progressively, so the active point is tracked by its x value rather than its index
   useEffect(() => {
     if (!chartState.points.length) {
       setActiveIndex(null);
@@ -667,13 +848,18 @@ function ChartSection({ assumptions, chartConfig, chartState, onChartConfigChang
     }
 
     setActiveIndex((previous) => {
-      if (previous === null) {
+      if (previous === null || !Number.isFinite(focusRef.current)) {
         return chartState.points.length - 1;
       }
 
-      return Math.min(previous, chartState.points.length - 1);
+      return findClosestIndex(chartState.points, focusRef.current);
     });
-  }, [chartState.points]);
+  }, [chartState.points, focusRef]);
+
+  const handleActiveIndexChange = (index) => {
+    focusRef.current = chartState.points[index]?.x;
+    setActiveIndex(index);
+  };
 
   const handleYFieldChange = (event) => {
     onChartConfigChange({ yField: event.target.value });
@@ -715,6 +901,9 @@ function ChartSection({ assumptions, chartConfig, chartState, onChartConfigChang
   const yValueLabel = pointForReadout
     ? chartState.yOption.tooltipFormatter(pointForReadout.y)
     : '--';
+  const bandForReadout = pointForReadout && chartState.band.length
+    ? chartState.band[findClosestIndex(chartState.band, pointForReadout.x)]
+    : null;
   const handleDownloadClick = useCallback(() => {
     if (!chartState.points.length) {
       return;
@@ -843,12 +1032,16 @@ function ChartSection({ assumptions, chartConfig, chartState, onChartConfigChang
         <div className="chart-empty" role="status">
           {chartState.error}
         </div>
+      ) : chartState.pending && !chartState.points.length ? (
+        <div className="chart-empty" role="status">
+          Calculating scenarios…
+        </div>
       ) : (
         <>
           <LineChart
             chartState={chartState}
             activeIndex={activeIndex}
-            onActiveIndexChange={setActiveIndex}
+            onActiveIndexChange={handleActiveIndexChange}
             xAxisLabel={
               xField ? `${xField.label}${xField.unit ? ` (${xField.unit})` : ''}` : 'Input value'
             }
@@ -866,12 +1059,26 @@ function ChartSection({ assumptions, chartConfig, chartState, onChartConfigChang
               <span>{chartState.yOption.label}</span>
               <strong>{yValueLabel}</strong>
             </div>
+            {bandForReadout ? (
+              <div className="chart-readout__item">
+                <span>P10–P90 range</span>
+                <strong>
+                  {chartState.yOption.tooltipFormatter(bandForReadout.low)} –{' '}
+                  {chartState.yOption.tooltipFormatter(bandForReadout.high)}
+                </strong>
+              </div>
+            ) : null}
           </div>
           {chartState.warning ? (
             <p className="chart-warning" role="note">
               {chartState.warning}
             </p>
           ) : null}
+          {chartState.fromTiles ? (
+            <p className="chart-field__hint" role="note">
+              Read from the precomputed scenario grid.
+            </p>
+          ) : null}
         </>
       )}
     </div>
@@ -958,6 +1165,21 @@ function LineChart({ chartState, activeIndex, onActiveIndexChange, xAxisLabel })
     })
     .join(' ');
 
+  const { band } = chartState;
+  const bandAreaData = band.length > 1
+    ? [
+        ...band.map((point, index) => `${index === 0 ? 'M' : 'L'}${xScale(point.x)} ${yScale(point.high)}`),
+        ...band
+          .slice()
+          .reverse()
+          .map((point) => `L${xScale(point.x)} ${yScale(point.low)}`),
+        'Z'
+      ].join(' ')
+    : '';
+  const bandMedianData = band.length > 1
+    ? band.map((point, index) => `${index === 0 ? 'M' : 'L'}${xScale(point.x)} ${yScale(point.mid)}`).join(' ')
+    : '';
+
   const updateActivePoint = (clientX, rect) => {
     if (!rect || !rect.width) return;
     const ratio = (clientX - rect.left) / rect.width;
@@ -1003,7 +1225,7 @@ function LineChart({ chartState, activeIndex, onActiveIndexChange, xAxisLabel })
   };
 
   return (
-    <div className="chart-canvas" ref={containerRef}>
+    <div className="chart-canvas" ref={containerRef} aria-busy={chartState.pending}>
       <svg
         className="chart-svg"
         viewBox={`0 0 ${width} ${height}`}
@@ -1033,6 +1255,8 @@ function LineChart({ chartState, activeIndex, onActiveIndexChange, xAxisLabel })
               y2={innerHeight}
             />
           ))}
+          {bandAreaData ? <path className="chart-band" d={bandAreaData} /> : null}
+          {bandMedianData ? <path className="chart-band-median" d={bandMedianData} /> : null}
           <path className="chart-line" d={pathData} />
           {activePoint ? (
             <g className="chart-focus">
@@ -1106,253 +1330,308 @@ function LineChart({ chartState, activeIndex, onActiveIndexChange, xAxisLabel })
   );
 }
 
-function buildChartState(baseAssumptions, chartConfig) {
-  const yOption = CHART_Y_OPTIONS.find((option) => option.value === chartConfig.yField) ?? CHART_Y_OPTIONS[0];
-  const field = FIELD_CONFIG_MAP[chartConfig.xField];
+function buildSweepPlan(baseAssumptions, xField, rangeStart, rangeEnd) {
+  const field = FIELD_CONFIG_MAP[xField];
 
   if (!field) {
-    return {
-      field: null,
-      yOption,
-      points: [],
-      step: 1,
-      warning: null,
-      error: 'Select a valid input field for the horizontal axis.',
-      xDecimals: 0,
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
-    };
+    return { field: null, error: 'Select a valid input field for the horizontal axis.' };
   }
 
-  const start = toNumber(chartConfig.rangeStart);
-  const end = toNumber(chartConfig.rangeEnd);
-
-  if (!Number.isFinite(start) || !Number.isFinite(end)) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: getFieldStepValue(field),
-      warning: null,
-      error: 'Enter numeric values for the sweep range.',
-      xDecimals: getFractionDigits(field.name),
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
-    };
+  const range = planSweep(field, rangeStart, rangeEnd);
+  if (range.error) {
+    return { field, error: range.error, step: range.step, decimals: range.decimals };
   }
 
-  if (start > end) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: getFieldStepValue(field),
-      warning: null,
-      error: 'Range start must be less than or equal to the end value.',
-      xDecimals: getFractionDigits(field.name),
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
-    };
+  if (!baseAssumptions) {
+    return { field, error: 'Run the scenario to populate baseline assumptions.' };
   }
 
-  if (field.min !== undefined && start < field.min) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: getFieldStepValue(field),
-      warning: null,
-      error: `Start value must be at least ${field.min}.`,
-      xDecimals: getFractionDigits(field.name),
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
+  return {
+    field,
+    error: null,
+    step: range.step,
+    decimals: range.decimals,
+    xValues: range.xValues,
+    assumptions: baseAssumptions,
+    sweepKey: `${hashAssumptions(baseAssumptions)}|${range.key}`
+  };
+}
+
+// One worker client per app, shared by the chart sweep and the uncertainty analysis.
+function useModelClient() {
+  const [client, setClient] = useState(null);
+
+  useEffect(() => {
+    const created = createSweepClient({ tileSource: loadTileSweep });
+    setClient(created);
+    return () => created.dispose();
+  }, []);
+
+  return client;
+}
+
+// Runs the planned sweep through the shared worker client: cached sweeps are served at once, new ones start once
+// the inputs settle and are cancelled as soon as the plan changes again.
+function useSweep(client, plan, focusRef) {
+  const [sweep, setSweep] = useState(null);
+  const startedRef = useRef(false);
+
+  useEffect(() => {
+    if (!client || plan.error) {
+      return undefined;
+    }
+
+    const { sweepKey: key, field } = plan;
+    const publish = (series, { complete, error }) => {
+      setSweep({ key, fieldName: field.name, series, complete, error, computed: series.computed });
     };
-  }
 
-  if (field.max !== undefined && end > field.max) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: getFieldStepValue(field),
-      warning: null,
-      error: `End value must be no more than ${field.max}.`,
-      xDecimals: getFractionDigits(field.name),
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
+    let cancel = () => {};
+    const start = () => {
+      cancel = client.request(
+        key,
+        {
+          assumptions: plan.assumptions,
+          fieldName: field.name,
+          xValues: plan.xValues,
+          metricKeys: CHART_METRIC_KEYS,
+          focusX: focusRef.current
+        },
+        publish
+      );
     };
-  }
 
-  if (!baseAssumptions) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: getFieldStepValue(field),
-      warning: null,
-      error: 'Run the scenario to populate baseline assumptions.',
-      xDecimals: getFractionDigits(field.name),
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
+    if (client.lookup(key)) {
+      start();
+      return undefined;
+    }
+
+    // The first sweep starts straight away; later ones wait for the inputs to settle
+    const timer = setTimeout(start, startedRef.current ? SWEEP_DEBOUNCE_MS : 0);
+    startedRef.current = true;
+    return () => {
+      clearTimeout(timer);
+      cancel();
     };
+  }, [client, plan, focusRef]);
+
+  return sweep;
+}
+
+function defaultUncertaintyInputs(assumptions) {
+  const inputs = {};
+  for (const { name, type, spread } of DEFAULT_UNCERTAIN_FIELDS) {
+    inputs[name] = uncertaintyInputFor(name, assumptions[name], type, spread);
   }
+  return inputs;
+}
 
-  const stepValue = getFieldStepValue(field);
-  const decimals = getFractionDigits(field.name);
-  const scale = Math.pow(10, decimals);
-  const scaledStart = Math.round(start * scale);
-  const scaledEnd = Math.round(end * scale);
-  const scaledStep = Math.max(1, Math.round(stepValue * scale));
-  const scaledSpan = Math.max(0, scaledEnd - scaledStart);
-  const stepCount = Math.floor(scaledSpan / scaledStep);
-  const estimatedPoints = stepCount + 1;
-
-  if (stepCount > MAX_SWEEP_STEPS) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: stepValue,
-      warning: null,
-      error: `Limit the sweep to ${MAX_SWEEP_STEPS} steps or fewer (current range: ${stepCount}).`,
-      xDecimals: decimals,
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
+function uncertaintyInputFor(name, value, type = 'triangular', spread = 0.1) {
+  const { low, high } = defaultDistribution(name, value, type, spread);
+  return { type, low: serialiseNumber(low), high: serialiseNumber(high) };
+}
+
+// Turns the editable ranges into distributions around the current assumptions; returns { distributions, errors }.
+function buildDistributions(assumptions, inputs) {
+  const distributions = {};
+  const errors = [];
+  for (const name of FIELD_NAMES) {
+    const input = inputs[name];
+    if (!input) continue;
+    const distribution = {
+      type: input.type,
+      low: toNumber(input.low),
+      mode: assumptions[name],
+      high: toNumber(input.high)
     };
+    const error = validateDistribution(name, distribution);
+    if (error) {
+      errors.push(error);
+    } else {
+      distributions[name] = distribution;
+    }
   }
+  return { distributions, errors };
+}
+
+function useUncertainty(client, assumptions, applied) {
+  const [state, setState] = useState({ status: 'idle', result: null, errors: [], distributions: null });
+
+  useEffect(() => {
+    if (!client || !applied || !assumptions) {
+      return undefined;
+    }
 
-  if (estimatedPoints > MAX_CHART_POINTS) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: stepValue,
-      warning: null,
-      error: `This range would generate ${estimatedPoints} data points. Narrow the range to keep it under ${MAX_CHART_POINTS}.`,
-      xDecimals: decimals,
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
+    const { distributions, errors } = buildDistributions(assumptions, applied);
+    if (errors.length) {
+      setState({ status: 'invalid', result: null, errors, distributions: null });
+      return undefined;
+    }
+
+    let cancelled = false;
+    const key = `uncertainty|${hashAssumptions(assumptions)}|${JSON.stringify(distributions)}`;
+    setState((previous) => ({ ...previous, status: 'running', errors: [] }));
+    client
+      .analyse(key, { kind: 'summary', assumptions, distributions, samples: DEFAULT_SAMPLE_COUNT })
+      .then((result) => {
+        if (!cancelled) setState({ status: 'done', result, errors: [], distributions });
+      })
+      .catch((error) => {
+        if (!cancelled) setState({ status: 'invalid', result: null, errors: [error.message], distributions: null });
+      });
+    return () => {
+      cancelled = true;
     };
+  }, [client, assumptions, applied]);
+
+  return state;
+}
+
+function useUncertaintyBands(client, plan, distributions) {
+  const [bands, setBands] = useState(null);
+
+  useEffect(() => {
+    if (!client || !distributions || plan.error) {
+      setBands(null);
+      return undefined;
+    }
+
+    let cancelled = false;
+    const key = `bands|${plan.sweepKey}|${JSON.stringify(distributions)}`;
+    const start = () => {
+      client
+        .analyse(key, {
+          kind: 'bands',
+          assumptions: plan.assumptions,
+          distributions,
+          fieldName: plan.field.name,
+          xValues: plan.xValues,
+          metricKeys: CHART_METRIC_KEYS
+        })
+        .then((result) => {
+          if (!cancelled) setBands({ sweepKey: plan.sweepKey, ...result });
+        })
+        .catch(() => {
+          if (!cancelled) setBands(null);
+        });
+    };
+
+    const timer = setTimeout(start, client.lookup(key) ? 0 : SWEEP_DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [client, plan, distributions]);
+
+  return bands;
+}
+
+function emptyChartState(plan, yOption, error, pending = false) {
+  const { field } = plan;
+  return {
+    field,
+    yOption,
+    points: [],
+    step: plan.step ?? getFieldStepValue(field),
+    warning: null,
+    error,
+    pending,
+    fromTiles: false,
+    band: [],
+    xDecimals: plan.decimals ?? (field ? getFractionDigits(field.name) : 0),
+    xMin: Number.NaN,
+    xMax: Number.NaN,
+    yMin: Number.NaN,
+    yMax: Number.NaN,
+    xDomainMin: Number.NaN,
+    xDomainMax: Number.NaN,
+    yDomainMin: Number.NaN,
+    yDomainMax: Number.NaN
+  };
+}
+
+function buildChartState(plan, yField, sweep, bands) {
+  const yOption = CHART_Y_OPTIONS.find((option) => option.value === yField) ?? CHART_Y_OPTIONS[0];
+
+  if (plan.error) {
+    return emptyChartState(plan, yOption, plan.error);
+  }
+
+  // While a new sweep of the same input starts, keep drawing the previous one instead of blanking the chart
+  const shown = sweep && sweep.fieldName === plan.field.name ? sweep : null;
+  const complete = Boolean(shown && shown.key === plan.sweepKey && shown.complete);
+
+  if (!shown) {
+    return emptyChartState(plan, yOption, null, true);
   }
 
+  if (shown.error) {
+    return emptyChartState(plan, yOption, `The sweep could not be calculated: ${shown.error}`);
+  }
+
+  const { xValues, values, done } = shown.series;
+  const column = values[yOption.value];
   const points = [];
   let skipped = 0;
 
-  for (let value = scaledStart, guard = 0; value <= scaledEnd + Math.round(scaledStep * 0.25); value += scaledStep, guard += 1) {
-    if (guard > MAX_CHART_POINTS * 2) {
-      break;
+  for (let index = 0; index < xValues.length; index += 1) {
+    if (!done[index]) {
+      continue;
     }
 
-    const xValue = value / scale;
-    const nextAssumptions = { ...baseAssumptions, [field.name]: xValue };
-    const scenario = computeScenario(nextAssumptions);
-    const yValue = yOption.accessor(scenario.metrics);
-
+    const yValue = column[index];
     if (Number.isFinite(yValue)) {
-      points.push({
-        x: xValue,
-        y: yValue,
-        metrics: scenario.metrics
-      });
+      points.push({ x: xValues[index], y: yValue });
     } else {
       skipped += 1;
     }
   }
 
   if (!points.length) {
-    return {
-      field,
-      yOption,
-      points: [],
-      step: stepValue,
-      warning: null,
-      error: 'No valid data points were produced for this range.',
-      xDecimals: decimals,
-      xMin: Number.NaN,
-      xMax: Number.NaN,
-      yMin: Number.NaN,
-      yMax: Number.NaN,
-      xDomainMin: Number.NaN,
-      xDomainMax: Number.NaN,
-      yDomainMin: Number.NaN,
-      yDomainMax: Number.NaN
-    };
+    return complete
+      ? emptyChartState(plan, yOption, 'No valid data points were produced for this range.')
+      : emptyChartState(plan, yOption, null, true);
   }
 
-  const warning = skipped > 0
+  const warning = complete && skipped > 0
     ? `${skipped} point${skipped === 1 ? '' : 's'} were skipped because the metric could not be calculated.`
     : null;
 
-  const xValues = points.map((point) => point.x);
+  const xValuesShown = points.map((point) => point.x);
   const yValues = points.map((point) => point.y);
-  const xMin = Math.min(...xValues);
-  const xMax = Math.max(...xValues);
+  const xMin = Math.min(...xValuesShown);
+  const xMax = Math.max(...xValuesShown);
   const yMin = Math.min(...yValues);
   const yMax = Math.max(...yValues);
 
   const xPad = (xMax - xMin) * 0.05 || Math.max(Math.abs(xMax) || 0, 1) * 0.05;
-  const yPad = (yMax - yMin) * 0.1 || Math.max(Math.abs(yMax) || 0, 1) * 0.05;
+
+  const band = [];
+  if (bands && bands.sweepKey === plan.sweepKey) {
+    const { p10, p50, p90 } = bands.bands[yOption.value];
+    bands.xValues.forEach((x, index) => {
+      if (Number.isFinite(p10[index]) && Number.isFinite(p90[index])) {
+        band.push({ x, low: p10[index], mid: p50[index], high: p90[index] });
+      }
+    });
+  }
+  const bandMax = band.reduce((max, point) => Math.max(max, point.high), Number.NEGATIVE_INFINITY);
 
   const y0 = 0;
-  const yMaxAdj = Math.max(yMax, y0); // ensure top is ≥ 0
+  const yMaxAdj = Math.max(yMax, bandMax, y0); // ensure top is ≥ 0
   const yPadTop = (yMaxAdj - y0) * 0.1 || 1; // avoid zero span
-  
+
   return {
-    field,
+    field: plan.field,
     yOption,
     points,
-    step: stepValue,
+    step: plan.step,
     warning,
     error: null,
-    xDecimals: decimals,
+    pending: !complete,
+    fromTiles: shown.series.source === 'tiles',
+    band,
+    xDecimals: plan.decimals,
     xMin,
     xMax,
     yMin,
@@ -1364,12 +1643,6 @@ function buildChartState(baseAssumptions, chartConfig) {
   };
 }
 
-function getFieldStepValue(field) {
-  if (!field) return 1;
-  const numeric = Number(field.step);
-  return Number.isFinite(numeric) && numeric > 0 ? numeric : 1;
-}
-
 function computeDefaultRangeForField(field, baseAssumptions) {
   const step = getFieldStepValue(field);
   const decimals = getFractionDigits(field.name);
@@ -1528,427 +1801,6 @@ function findClosestIndex(points, target) {
   return Math.abs(points[low].x - target) < Math.abs(points[high].x - target) ? low : high;
 }
 
-
-function calculateInterceptorMasses(assumptions) {
-  const thrusterIsp = assumptions.thrusterIspSeconds;
-  const killVehicleDryMassKg = assumptions.killVehicleDryMassKg;
-  const interceptorBodyDryMassKg = assumptions.interceptorBodyDryMassKg;
-  const supportModuleDryMassKg = assumptions.supportModuleDryMassKg;
-  const divertVelocityKmPerS = assumptions.divertVelocityKmPerS;
-  const maxDeltaVKmPerS = assumptions.maxDeltaVKmPerS;
-
-  const hasDryMassInputs =
-    Number.isFinite(killVehicleDryMassKg) &&
-    Number.isFinite(interceptorBodyDryMassKg) &&
-    Number.isFinite(supportModuleDryMassKg);
-
-  const interceptorDryMassKg = hasDryMassInputs
-    ? killVehicleDryMassKg + interceptorBodyDryMassKg + supportModuleDryMassKg
-    : Number.NaN;
-
-  let killVehiclePropellantMassKg = Number.NaN;
-  if (
-    Number.isFinite(killVehicleDryMassKg) &&
-    killVehicleDryMassKg >= 0 &&
-    Number.isFinite(thrusterIsp) &&
-    thrusterIsp > 0 &&
-    Number.isFinite(divertVelocityKmPerS)
-  ) {
-    const exponent = (divertVelocityKmPerS * 1000) / (g0 * thrusterIsp);
-    if (Number.isFinite(exponent)) {
-      const massRatio = Math.exp(exponent);
-      if (Number.isFinite(massRatio)) {
-        killVehiclePropellantMassKg = killVehicleDryMassKg * (massRatio - 1);
-      }
-    }
-  }
-
-  let interceptorPropellantMassKg = Number.NaN;
-  const preMainBurnMassKg = Number.isFinite(killVehiclePropellantMassKg)
-    ? killVehicleDryMassKg + killVehiclePropellantMassKg + interceptorBodyDryMassKg
-    : Number.NaN;
-
-  if (
-    Number.isFinite(preMainBurnMassKg) &&
-    preMainBurnMassKg >= 0 &&
-    Number.isFinite(thrusterIsp) &&
-    thrusterIsp > 0 &&
-    Number.isFinite(maxDeltaVKmPerS)
-  ) {
-    const exponent = (maxDeltaVKmPerS * 1000) / (g0 * thrusterIsp);
-    if (Number.isFinite(exponent)) {
-      const massRatio = Math.exp(exponent);
-      if (Number.isFinite(massRatio)) {
-        interceptorPropellantMassKg = preMainBurnMassKg * (massRatio - 1);
-      }
-    }
-  }
-
-  const interceptorTotalMassKg =
-    Number.isFinite(interceptorDryMassKg) &&
-    Number.isFinite(killVehiclePropellantMassKg) &&
-    Number.isFinite(interceptorPropellantMassKg)
-      ? interceptorDryMassKg + killVehiclePropellantMassKg + interceptorPropellantMassKg
-      : Number.NaN;
-
-  return {
-    killVehiclePropellantMassKg,
-    interceptorPropellantMassKg,
-    interceptorDryMassKg,
-    interceptorTotalMassKg
-  };
-}
-
-function prepareInputs(rawInputs) {
-  const numbers = convertToNumeric(rawInputs);
-  const validationErrors = [];
-
-  if (!positive(numbers.sbiOrbitAltitudeKm)) {
-    validationErrors.push('SBI orbit altitude must be greater than zero.');
-  }
-
-  if (!positive(numbers.averageAccelerationG)) {
-    validationErrors.push('Average acceleration must be greater than zero.');
-  }
-
-  if (!positive(numbers.maxDeltaVKmPerS)) {
-    validationErrors.push('Max Velocity (ΔV) must be greater than zero.');
-  }
-
-  if (!nonNegative(numbers.divertVelocityKmPerS)) {
-    validationErrors.push('Divert velocity must be zero or greater.');
-  } else if (numbers.divertVelocityKmPerS > numbers.maxDeltaVKmPerS) {
-    validationErrors.push('Divert velocity cannot exceed the total ΔV budget.');
-  }
-
-  if (!positive(numbers.thrusterIspSeconds)) {
-    validationErrors.push('Thruster performance (Isp) must be greater than zero.');
-  }
-
-  if (!positive(numbers.killVehicleDryMassKg)) {
-    validationErrors.push('Kill vehicle dry mass must be greater than zero.');
-  }
-
-  if (!positive(numbers.interceptorBodyDryMassKg)) {
-    validationErrors.push('Interceptor body dry mass must be greater than zero.');
-  }
-
-  if (!positive(numbers.supportModuleDryMassKg)) {
-    validationErrors.push('Support module dry mass must be greater than zero.');
-  }
-
-  if (!Number.isFinite(numbers.killProbabilityPercent)) {
-    validationErrors.push('Kill probability must be a number.');
-  } else if (numbers.killProbabilityPercent <= 0 || numbers.killProbabilityPercent >= 100) {
-    validationErrors.push('Kill probability must be between 0% and 100%.');
-  }
-
-  if (!Number.isFinite(numbers.compositeKillProbabilityPercent)) {
-    validationErrors.push('Composite kill probability must be a number.');
-  } else if (numbers.compositeKillProbabilityPercent <= 0 || numbers.compositeKillProbabilityPercent >= 100) {
-    validationErrors.push('Composite kill probability must be between 0% and 100%.');
-  }
-
-  if (!positive(numbers.sbiLifeExpectancyYears)) {
-    validationErrors.push('SBI life expectancy must be greater than zero.');
-  } else {
-    numbers.sbiLifeExpectancyYears = Math.round(numbers.sbiLifeExpectancyYears);
-  }
-
-  if (!positive(numbers.salvoSize)) {
-    validationErrors.push('Salvo size must be at least one missile.');
-  } else {
-    numbers.salvoSize = Math.max(1, Math.round(numbers.salvoSize));
-  }
-
-  if (numbers.interceptAltitudeKm < 50) {
-    validationErrors.push('Intercept altitude must be at least 50km.');
-  } else if (numbers.interceptAltitudeKm > numbers.sbiOrbitAltitudeKm) {
-    validationErrors.push('Intercept altitude cannot exceed the SBI orbit altitude.');
-  }
-
-  if (!Number.isFinite(numbers.maxLatitudeCoverageDeg)) {
-    validationErrors.push('Max latitude coverage must be a number.');
-  } else if (numbers.maxLatitudeCoverageDeg < 0 || numbers.maxLatitudeCoverageDeg > 90) {
-    validationErrors.push('Max latitude coverage must be between 0 and 90 degrees.');
-  }
-
-  if (!positive(numbers.flyoutTimeSeconds)) {
-    validationErrors.push('Flyout time must be greater than zero.');
-  }
-
-  if (!nonNegative(numbers.nonRecurringDevCostMillion)) {
-    validationErrors.push('Non-recurring development cost must be zero or greater.');
-  }
-
-  if (!positive(numbers.firstUnitInterceptorCostMillion)) {
-    validationErrors.push('First unit interceptor cost must be greater than zero.');
-  }
-
-  if (!Number.isFinite(numbers.interceptorLearningPercent)) {
-    validationErrors.push('Interceptor learning percent must be a number.');
-  } else if (numbers.interceptorLearningPercent < 70 || numbers.interceptorLearningPercent > 100) {
-    validationErrors.push('Interceptor learning percent must be between 70% and 100%.');
-  }
-
-  if (!nonNegative(numbers.operatingSupportCostPerYearMillion)) {
-    validationErrors.push('Operating and support cost must be zero or greater.');
-  }
-
-  if (!positive(numbers.costEstimatePeriodYears)) {
-    validationErrors.push('Cost estimate period must be greater than zero.');
-  } else {
-    numbers.costEstimatePeriodYears = Math.max(1, Math.round(numbers.costEstimatePeriodYears));
-  }
-
-  if (!positive(numbers.payloadCapacityPerVehicleKg)) {
-    validationErrors.push('Payload capacity per vehicle must be greater than zero.');
-  }
-
-  if (!positive(numbers.firstUnitLaunchCostMillion)) {
-    validationErrors.push('First unit launch cost must be greater than zero.');
-  }
-
-  if (!Number.isFinite(numbers.launchLearningPercent)) {
-    validationErrors.push('Launch learning percent must be a number.');
-  } else if (numbers.launchLearningPercent < 70 || numbers.launchLearningPercent > 100) {
-    validationErrors.push('Launch learning percent must be between 70% and 100%.');
-  }
-
-  numbers.killVehicleDryMassKg = roundToTenth(numbers.killVehicleDryMassKg);
-  numbers.interceptorBodyDryMassKg = roundToTenth(numbers.interceptorBodyDryMassKg);
-  numbers.supportModuleDryMassKg = roundToTenth(numbers.supportModuleDryMassKg);
-
-  const { interceptorTotalMassKg } = calculateInterceptorMasses(numbers);
-  if (
-    Number.isFinite(interceptorTotalMassKg) &&
-    Number.isFinite(numbers.payloadCapacityPerVehicleKg) &&
-    numbers.payloadCapacityPerVehicleKg > 0 &&
-    interceptorTotalMassKg > numbers.payloadCapacityPerVehicleKg
-  ) {
-    validationErrors.push(
-      'The interceptor mass is greater than the payload capacity of the launch vehicle. Consider reducing interceptor performance or using a higher capacity launch vehicle.'
-    );
-  }
-
-  return { numbers, errors: validationErrors };
-}
-function computeScenario(values) {
-  const assumptions = { ...values };
-
-  const interceptorsPerThreat = computeInterceptorsPerThreat(
-    assumptions.killProbabilityPercent,
-    assumptions.compositeKillProbabilityPercent
-  );
-
-  const interceptorsPerSalvo = Number.isFinite(interceptorsPerThreat)
-    ? interceptorsPerThreat * assumptions.salvoSize
-    : Number.NaN;
-
-  const compositeKillProbabilityPercent = Number.isFinite(interceptorsPerThreat)
-    ? 100 * (1 - Math.pow(1 - assumptions.killProbabilityPercent / 100, interceptorsPerThreat))
-    : Number.NaN;
-
-  const deltaVMarginKmPerS = assumptions.maxDeltaVKmPerS - assumptions.divertVelocityKmPerS;
-
-  const {
-    killVehiclePropellantMassKg,
-    interceptorPropellantMassKg,
-    interceptorDryMassKg,
-    interceptorTotalMassKg
-  } = calculateInterceptorMasses(assumptions);
-
-  const averageAccelerationMS2 = assumptions.averageAccelerationG * 9.80665;
-  const averageAccelerationKmPerS2 = averageAccelerationMS2 / 1000;
-
-  const timeToReachMaxVelocitySeconds = averageAccelerationKmPerS2 > 0
-    ? assumptions.maxDeltaVKmPerS / averageAccelerationKmPerS2
-    : Number.NaN;
-
-  let interceptorFlyoutRangeKm = Number.NaN;
-  let interceptorFlyoutRangeMessage = '';
-
-  if (Number.isFinite(timeToReachMaxVelocitySeconds) && Number.isFinite(assumptions.flyoutTimeSeconds)) {
-    if (timeToReachMaxVelocitySeconds > assumptions.flyoutTimeSeconds) {
-      interceptorFlyoutRangeMessage = 'Acceleration is insufficient to reach the velocity specified over the flyout time specified.';
-    } else {
-      const accelDistance = 0.5 * averageAccelerationKmPerS2 * Math.pow(timeToReachMaxVelocitySeconds, 2);
-      const cruiseTime = assumptions.flyoutTimeSeconds - timeToReachMaxVelocitySeconds;
-      interceptorFlyoutRangeKm = accelDistance + assumptions.maxDeltaVKmPerS * cruiseTime;
-    }
-  } else {
-    interceptorFlyoutRangeMessage = 'Acceleration inputs result in an invalid time to max velocity.';
-  }
-
-  const altitudeDeltaKm = assumptions.sbiOrbitAltitudeKm - assumptions.interceptAltitudeKm;
-  let coverageRadiusKm = Number.NaN;
-
-  if (Number.isFinite(interceptorFlyoutRangeKm)) {
-    const radicand = Math.pow(interceptorFlyoutRangeKm, 2) - Math.pow(altitudeDeltaKm, 2);
-    if (radicand >= 0) {
-      coverageRadiusKm = Math.sqrt(radicand);
-    }
-  }
-
-  const earthRadiusKm = 6378.1;
-  const earthCoverageSqKm = Number.isFinite(assumptions.maxLatitudeCoverageDeg)
-    ? 4 * Math.PI * Math.pow(earthRadiusKm + assumptions.interceptAltitudeKm, 2) * Math.sin((assumptions.maxLatitudeCoverageDeg * Math.PI) / 180)
-    : Number.NaN;
-
-  let constellationSize = Number.NaN;
-  if (Number.isFinite(coverageRadiusKm) && coverageRadiusKm > 0 && Number.isFinite(earthCoverageSqKm) && earthCoverageSqKm > 0) {
-    const coverageAreaPerInterceptor = Math.PI * Math.pow(coverageRadiusKm, 2);
-    const rawConstellation = (earthCoverageSqKm / coverageAreaPerInterceptor) * assumptions.salvoSize * interceptorsPerThreat;
-    if (Number.isFinite(rawConstellation) && rawConstellation > 0) {
-      constellationSize = Math.max(1, Math.ceil(rawConstellation));
-    }
-  }
-
-  const rawReplacementRatio = assumptions.sbiLifeExpectancyYears > 0
-    ? assumptions.costEstimatePeriodYears / assumptions.sbiLifeExpectancyYears
-    : Number.NaN;
-  const interceptorReplacements = Number.isFinite(rawReplacementRatio)
-    ? Math.max(1, Math.floor(rawReplacementRatio))
-    : Number.NaN;
-
-  const totalInterceptors = Number.isFinite(constellationSize) && Number.isFinite(interceptorReplacements)
-    ? constellationSize * interceptorReplacements
-    : Number.NaN;
-
-  let interceptorsPerLaunch = Number.NaN;
-  if (Number.isFinite(interceptorTotalMassKg) && interceptorTotalMassKg > 0 &&
-      Number.isFinite(assumptions.payloadCapacityPerVehicleKg) && assumptions.payloadCapacityPerVehicleKg > 0) {
-    const possible = Math.floor(assumptions.payloadCapacityPerVehicleKg / interceptorTotalMassKg);
-    if (possible >= 1) {
-      interceptorsPerLaunch = possible;
-    }
-  }
-
-  const payloadUtilizationKg = Number.isFinite(interceptorsPerLaunch) && Number.isFinite(interceptorTotalMassKg)
-    ? interceptorsPerLaunch * interceptorTotalMassKg
-    : Number.NaN;
-
-  const payloadUtilizationPercent = Number.isFinite(payloadUtilizationKg) && assumptions.payloadCapacityPerVehicleKg > 0
-    ? (payloadUtilizationKg / assumptions.payloadCapacityPerVehicleKg) * 100
-    : Number.NaN;
-
-  const launchCount = Number.isFinite(constellationSize) && Number.isFinite(interceptorsPerLaunch) && interceptorsPerLaunch > 0
-    ? Math.ceil(constellationSize / interceptorsPerLaunch)
-    : Number.NaN;
-
-  const unitsForProduction = Number.isFinite(totalInterceptors) && totalInterceptors > 0
-    ? Math.round(totalInterceptors)
-    : 0;
-
-  const productionCostMillion = unitsForProduction > 0
-    ? computeLearningCurveCost(
-        assumptions.firstUnitInterceptorCostMillion,
-        assumptions.interceptorLearningPercent,
-        unitsForProduction
-      )
-    : Number.NaN;
-
-  const interceptorLearningRate = assumptions.interceptorLearningPercent / 100;
-  const interceptorLogSlope = interceptorLearningRate > 0 ? Math.log(interceptorLearningRate) / Math.log(2) : Number.NaN;
-
-  const averageProcurementUnitCostMillion =
-    Number.isFinite(constellationSize) && constellationSize > 0 &&
-    interceptorLearningRate > 0 && Number.isFinite(interceptorLogSlope) && (1 + interceptorLogSlope) !== 0
-      ? assumptions.firstUnitInterceptorCostMillion *
-        ((Math.pow(constellationSize, 1 + interceptorLogSlope) + 1) / (constellationSize * (1 + interceptorLogSlope)))
-      : Number.NaN;
-
-  const launchLearningRate = assumptions.launchLearningPercent / 100;
-  const launchLogSlope = launchLearningRate > 0 ? Math.log(launchLearningRate) / Math.log(2) : Number.NaN;
-
-  const averageLaunchCostMillion =
-    Number.isFinite(launchCount) && launchCount > 0 &&
-    launchLearningRate > 0 && Number.isFinite(launchLogSlope) && (1 + launchLogSlope) !== 0
-      ? assumptions.firstUnitLaunchCostMillion *
-        ((Math.pow(launchCount, 1 + launchLogSlope) + 1) / (launchCount * (1 + launchLogSlope)))
-      : Number.NaN;
-
-  const launchCampaignCostMillion =
-    Number.isFinite(averageLaunchCostMillion) && Number.isFinite(launchCount)
-      ? averageLaunchCostMillion * launchCount
-      : Number.NaN;
-
-  const nonRecurringMillion = assumptions.nonRecurringDevCostMillion;
-  const operationsCostMillion = assumptions.operatingSupportCostPerYearMillion * assumptions.costEstimatePeriodYears;
-
-  const totalCycleCostMillion =
-    Number.isFinite(averageProcurementUnitCostMillion) && Number.isFinite(constellationSize) &&
-    Number.isFinite(averageLaunchCostMillion) && Number.isFinite(launchCount)
-      ? averageProcurementUnitCostMillion * constellationSize + averageLaunchCostMillion * launchCount
-      : Number.NaN;
-
-  const totalSystemCostMillion =
-    Number.isFinite(totalCycleCostMillion) && Number.isFinite(interceptorReplacements)
-      ? totalCycleCostMillion * interceptorReplacements + operationsCostMillion + nonRecurringMillion
-      : Number.NaN;
-
-  const totalSystemCostBillion = Number.isFinite(totalSystemCostMillion)
-    ? totalSystemCostMillion / 1000
-    : Number.NaN;
-
-  const interceptorsPerYear = Number.isFinite(totalInterceptors) && assumptions.costEstimatePeriodYears > 0
-    ? totalInterceptors / assumptions.costEstimatePeriodYears
-    : Number.NaN;
-
-  const totalPayloadToOrbitKg =
-    Number.isFinite(payloadUtilizationKg) && Number.isFinite(launchCount) && Number.isFinite(interceptorReplacements)
-      ? payloadUtilizationKg * launchCount * interceptorReplacements
-      : Number.NaN;
-
-  return {
-    assumptions,
-    metrics: {
-      totalSystemCostMillion,
-      totalSystemCostBillion,
-      nonRecurringMillion,
-      productionCostMillion,
-      operationsCostMillion,
-      launchCampaignCostMillion,
-      averageInterceptorUnitCostMillion: averageProcurementUnitCostMillion,
-      averageProcurementUnitCostMillion,
-      averageLaunchCostMillion,
-      costPerInterceptAttemptMillion: averageProcurementUnitCostMillion,
-      interceptorDryMassKg,
-      killVehiclePropellantMassKg,
-      interceptorPropellantMassKg,
-      interceptorMassKg: interceptorTotalMassKg,
-      interceptorsPerLaunch,
-      payloadUtilizationKg,
-      payloadUtilizationPercent,
-      launchCount,
-      totalPayloadToOrbitKg,
-      totalInterceptors,
-      interceptorsPerThreat,
-      interceptorsPerSalvo,
-      interceptorReplacements,
-      compositeKillProbabilityPercent,
-      requestedCompositeKillProbabilityPercent: assumptions.compositeKillProbabilityPercent,
-      deltaVMarginKmPerS,
-      averageAccelerationG: assumptions.averageAccelerationG,
-      averageAccelerationMS2,
-      averageAccelerationKmPerS2,
-      timeToReachMaxVelocitySeconds,
-      interceptorFlyoutRangeKm,
-      interceptorFlyoutRangeMessage,
-      coverageRadiusKm,
-      earthCoverageSqKm,
-      interceptAltitudeKm: assumptions.interceptAltitudeKm,
-      maxLatitudeCoverageDeg: assumptions.maxLatitudeCoverageDeg,
-      sbiOrbitAltitudeKm: assumptions.sbiOrbitAltitudeKm,
-      flyoutTimeSeconds: assumptions.flyoutTimeSeconds,
-      sbiLifeExpectancyYears: assumptions.sbiLifeExpectancyYears,
-      interceptorsPerYear,
-      constellationSize,
-      costEstimatePeriodYears: assumptions.costEstimatePeriodYears
-    }
-  };
-}
-
 function collectScenarioMessages(scenario) {
   if (!scenario || !scenario.metrics) {
     return [];
@@ -1963,41 +1815,6 @@ function collectScenarioMessages(scenario) {
   return messages;
 }
 
-function computeInterceptorsPerThreat(singleShotPkPercent, desiredCompositePkPercent) {
-  const singleShotPk = singleShotPkPercent / 100;
-  const desiredPk = desiredCompositePkPercent / 100;
-
-  if (!Number.isFinite(singleShotPk) || !Number.isFinite(desiredPk)) {
-    return Number.NaN;
-  }
-
-  if (singleShotPk <= 0 || desiredPk <= 0) return Number.NaN;
-  if (singleShotPk >= 1 || desiredPk >= 1) return 1;
-
-  const required = Math.log(1 - desiredPk) / Math.log(1 - singleShotPk);
-  return Math.max(1, Math.ceil(required));
-}
-
-function computeLearningCurveCost(firstUnitCostMillion, learningPercent, units) {
-  if (!Number.isFinite(units) || units <= 0) {
-    return 0;
-  }
-
-  const slope = learningPercent / 100;
-  if (slope <= 0) {
-    return firstUnitCostMillion * units;
-  }
-
-  const exponent = Math.log(slope) / Math.log(2);
-  let total = 0;
-
-  for (let unitNumber = 1; unitNumber <= units; unitNumber += 1) {
-    total += firstUnitCostMillion * Math.pow(unitNumber, exponent);
-  }
-
-  return total;
-}
-
 function readInputsFromUrl() {
   if (!IS_BROWSER) {
     return null;
@@ -2064,24 +1881,6 @@ function trimTrailingZeros(value) {
   return trimmed;
 }
 
-function convertToNumeric(map) {
-  const numeric = {};
-  for (const [key, value] of Object.entries(map)) {
-    numeric[key] = toNumber(value);
-  }
-  return numeric;
-}
-
-function toNumber(raw) {
-  if (typeof raw === 'number') return raw;
-  if (typeof raw !== 'string') return Number.NaN;
-  const trimmed = raw.trim();
-  if (!trimmed) return Number.NaN;
-  const normalised = trimmed.replace(/,/g, '');
-  const parsed = Number(normalised);
-  return Number.isFinite(parsed) ? parsed : Number.NaN;
-}
-
 function formatTimestamp(date) {
   if (!(date instanceof Date) || Number.isNaN(date.getTime())) {
     return '--';
@@ -2169,16 +1968,3 @@ function formatDecimal(value) {
   if (!Number.isFinite(value)) return '--';
   return decimalFormatter.format(value);
 }
-
-function roundToTenth(value) {
-  return Math.round(value * 10) / 10;
-}
-
-function positive(value) {
-  return Number.isFinite(value) && value > 0;
-}
-
-function nonNegative(value) {
-  return Number.isFinite(value) && value >= 0;
-}
-
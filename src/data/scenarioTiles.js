@@ -0,0 +1,47 @@
+// Loads the precomputed scenario tiles written by scripts/scenario_tiles.py (bundled from src/data/scenario-tiles).
+// Without tiles, or for sweeps off the grid, loadTileSweep resolves with null and the sweep is computed live.
+import { planTileLine, readTileLine } from '../model/tileSweep.js';
+
+const indexModules = import.meta.glob('./scenario-tiles/index.json', { eager: true, import: 'default' });
+const tileUrls = import.meta.glob('./scenario-tiles/*.bin', { eager: true, query: '?url', import: 'default' });
+const tileIndex = indexModules['./scenario-tiles/index.json'] ?? null;
+const buffers = new Map();
+
+const loadTile = (file, bytes) => {
+  if (!buffers.has(file)) {
+    const url = tileUrls[`./scenario-tiles/${file}`];
+    const pending = url
+      ? fetch(url)
+          .then((response) => {
+            if (!response.ok) {
+              throw new Error(`Scenario tile ${file} returned ${response.status}.`);
+            }
+            return response.arrayBuffer();
+          })
+          .then((buffer) => {
+            if (buffer.byteLength !== bytes) {
+              throw new Error(`Scenario tile ${file} is ${buffer.byteLength} bytes, expected ${bytes}.`);
+            }
+            return buffer;
+          })
+      : Promise.reject(new Error(`Scenario tile ${file} is missing.`));
+    // A failed download is retried next time rather than cached
+    pending.catch(() => buffers.delete(file));
+    buffers.set(file, pending);
+  }
+  return buffers.get(file);
+};
+
+// Resolves with a complete sweep series for request (as sent to runSweep) when it lies on a tile grid, else null.
+export const loadTileSweep = async (request) => {
+  const plan = planTileLine(tileIndex, request);
+  if (!plan) {
+    return null;
+  }
+
+  try {
+    return readTileLine(plan, await loadTile(plan.file, plan.bytes), request.xValues);
+  } catch {
+    return null;
+  }
+};
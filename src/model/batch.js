@@ -0,0 +1,114 @@
+// Batched evaluation of the headline scenario metrics over typed-array columns.
+//
+// Runs the same step functions as computeScenario (exported from scenario.js, so the two cannot drift apart) but only
+// for the metrics the uncertainty analysis and the chart need, over one Float64Array per input, and skips the derived
+// metrics nothing here reads. Large sample sets go through this instead of calling computeScenario once per sample;
+// scripts/model_golden.mjs checks that both give identical results.
+import { FIELD_NAMES } from './inputs.js';
+import {
+  calculateAverageUnitCost,
+  calculateConstellationSize,
+  calculateCoverage,
+  calculateFlyout,
+  calculateInterceptorMasses,
+  calculateInterceptorsPerLaunch,
+  calculateLaunchCount,
+  calculateReplacements,
+  calculateTotalSystemCostMillion,
+  computeInterceptorsPerThreat
+} from './scenario.js';
+
+export const BATCH_METRICS = [
+  'totalSystemCostBillion',
+  'constellationSize',
+  'launchCount',
+  'interceptorMassKg',
+  'interceptorFlyoutRangeKm'
+];
+
+// Columns may mix Float64Arrays and plain numbers; numbers are broadcast to every row.
+export function toColumns(values, count) {
+  const columns = {};
+  for (const name of FIELD_NAMES) {
+    const value = values[name];
+    columns[name] = typeof value === 'number' || value === undefined
+      ? new Float64Array(count).fill(value ?? Number.NaN)
+      : value;
+  }
+  return columns;
+}
+
+// Evaluates `count` scenarios. Returns one Float64Array per BATCH_METRICS entry plus `valid`, a Uint8Array that is 0
+// where the sampled inputs break a cross-field rule prepareInputs enforces (divert above max ΔV, intercept above the
+// SBI orbit, interceptor heavier than the launch vehicle's payload).
+export function evaluateBatch(columns, count) {
+  const totalSystemCostBillion = new Float64Array(count);
+  const constellationSize = new Float64Array(count);
+  const launchCount = new Float64Array(count);
+  const interceptorMassKg = new Float64Array(count);
+  const interceptorFlyoutRangeKm = new Float64Array(count);
+  const valid = new Uint8Array(count);
+
+  const c = columns;
+  // Reused for every row: calculateInterceptorMasses takes its inputs as one object, as computeScenario passes them
+  const massInputs = {
+    thrusterIspSeconds: Number.NaN,
+    killVehicleDryMassKg: Number.NaN,
+    interceptorBodyDryMassKg: Number.NaN,
+    supportModuleDryMassKg: Number.NaN,
+    divertVelocityKmPerS: Number.NaN,
+    maxDeltaVKmPerS: Number.NaN
+  };
+
+  for (let i = 0; i < count; i += 1) {
+    const maxDeltaV = c.maxDeltaVKmPerS[i];
+    const divert = c.divertVelocityKmPerS[i];
+    const interceptAltitude = c.interceptAltitudeKm[i];
+    const orbitAltitude = c.sbiOrbitAltitudeKm[i];
+    const payload = c.payloadCapacityPerVehicleKg[i];
+    const period = c.costEstimatePeriodYears[i];
+
+    massInputs.thrusterIspSeconds = c.thrusterIspSeconds[i];
+    massInputs.killVehicleDryMassKg = c.killVehicleDryMassKg[i];
+    massInputs.interceptorBodyDryMassKg = c.interceptorBodyDryMassKg[i];
+    massInputs.supportModuleDryMassKg = c.supportModuleDryMassKg[i];
+    massInputs.divertVelocityKmPerS = divert;
+    massInputs.maxDeltaVKmPerS = maxDeltaV;
+    const { interceptorTotalMassKg: totalMass } = calculateInterceptorMasses(massInputs);
+
+    const perThreat = computeInterceptorsPerThreat(c.killProbabilityPercent[i], c.compositeKillProbabilityPercent[i]);
+    const { interceptorFlyoutRangeKm: flyoutRange } = calculateFlyout(
+      c.averageAccelerationG[i],
+      maxDeltaV,
+      c.flyoutTimeSeconds[i]
+    );
+    const { coverageRadiusKm, earthCoverageSqKm } = calculateCoverage(
+      flyoutRange,
+      orbitAltitude,
+      interceptAltitude,
+      c.maxLatitudeCoverageDeg[i]
+    );
+    const constellation = calculateConstellationSize(coverageRadiusKm, earthCoverageSqKm, c.salvoSize[i], perThreat);
+    const replacements = calculateReplacements(period, c.sbiLifeExpectancyYears[i]);
+    const launches = calculateLaunchCount(constellation, calculateInterceptorsPerLaunch(totalMass, payload));
+
+    const systemCost = calculateTotalSystemCostMillion(
+      calculateAverageUnitCost(c.firstUnitInterceptorCostMillion[i], c.interceptorLearningPercent[i], constellation),
+      constellation,
+      calculateAverageUnitCost(c.firstUnitLaunchCostMillion[i], c.launchLearningPercent[i], launches),
+      launches,
+      replacements,
+      c.operatingSupportCostPerYearMillion[i] * period,
+      c.nonRecurringDevCostMillion[i]
+    );
+
+    totalSystemCostBillion[i] = Number.isFinite(systemCost) ? systemCost / 1000 : Number.NaN;
+    constellationSize[i] = constellation;
+    launchCount[i] = launches;
+    interceptorMassKg[i] = totalMass;
+    interceptorFlyoutRangeKm[i] = flyoutRange;
+    valid[i] = divert <= maxDeltaV && interceptAltitude <= orbitAltitude && !(totalMass > payload) ? 1 : 0;
+  }
+
+  return { totalSystemCostBillion, constellationSize, launchCount, interceptorMassKg, interceptorFlyoutRangeKm, valid };
+}
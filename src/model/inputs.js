@@ -0,0 +1,235 @@
+// Input fields, defaults and validation for the SBI model.
+import { calculateInterceptorMasses } from './scenario.js';
+
+export const FORM_SECTIONS = [
+  {
+    id: 'sbi-performance',
+    title: 'Interceptor performance',
+    fields: [
+      { name: 'sbiOrbitAltitudeKm', label: 'SBI orbit altitude', defaultValue: '300', unit: 'km', min: 150, max: 22500, step: '5', hint: 'Orbital altitude at which SBIs will be stationed.' },
+      { name: 'averageAccelerationG', label: 'Average acceleration', defaultValue: '15.0', unit: 'g', min: 1, max: 30, step: '0.1', hint: 'Average acceleration of the interceptor over its flight profile.' },
+      { name: 'maxDeltaVKmPerS', label: 'Max velocity (ΔV)', defaultValue: '6.0', unit: 'km/s', min: 0.1, max: 20, step: '0.1', hint: 'Maximum change in velocity of the interceptor.' },
+      { name: 'divertVelocityKmPerS', label: 'Divert velocity', defaultValue: '2.5', unit: 'km/s', min: 0, max: 10, step: '0.1', hint: 'Divert velocity of the kill vehicle for terminal maneuvers.' },
+      { name: 'thrusterIspSeconds', label: 'Thruster performance (Isp)', defaultValue: '240', unit: 's', min: 100, max: 1000, step: '1', hint: 'Specific impulse for the interceptor and kill vehicle thrusters.' },
+      { name: 'killVehicleDryMassKg', label: 'Kill vehicle dry mass', defaultValue: '25.0', unit: 'kg', min: 1, step: '0.1', hint: 'Total mass of the kill vehicle (structure, sensors, thrusters, avionics, etc.) not including propellant.' },
+      { name: 'interceptorBodyDryMassKg', label: 'Interceptor body dry mass', defaultValue: '25.0', unit: 'kg', min: 1, step: '0.1', hint: 'Total mass of the interceptor (structure, thrusters, avionics, etc.) not including the kill vehicle or propellant.' },
+      { name: 'supportModuleDryMassKg', label: 'Support module dry mass', defaultValue: '50.0', unit: 'kg', min: 1, step: '0.1', hint: 'Mass of the module that houses the interceptor in orbit for power, communications, station keeping, etc. that is left behind when the interceptor fires. If multiple interceptors are housed together, this is the fraction of the total module mass allocated for each interceptor.'},
+      { name: 'sbiLifeExpectancyYears', label: 'SBI life expectancy', defaultValue: '5', unit: 'years', min: 1, max: 20, step: '1', hint: 'How long each interceptor is expected to last in orbit before replacement.' },
+      { name: 'killProbabilityPercent', label: 'Kill probability (Pk)', defaultValue: '80.0', unit: '%', min: 1, max: 99.9, step: '0.1', hint: 'Probability that a single interceptor will destory its target.' },
+      { name: 'compositeKillProbabilityPercent', label: 'Composite kill probability', defaultValue: '96.0', unit: '%', min: 1, max: 99.9, step: '0.1', hint: 'Desired overall probability that each threat will be destroyed. In combination with the single-shot Pk, this determines how many interceptors must be fired at each threat.' }
+      
+    ]
+  },
+  {
+    id: 'threat-parameters',
+    title: 'Threat parameters',
+    fields: [
+      { name: 'salvoSize', label: 'Salvo size', defaultValue: '1', unit: 'missiles', min: 1, max: 1000, step: '1', hint: 'Maximum number of missiles launched at once the systems should be able to intercept.' },
+      { name: 'interceptAltitudeKm', label: 'Intercept altitude', defaultValue: '200', unit: 'km', min: 50, max: 10000, step: '5', hint: 'Minimum altitude at which threats will be engaged. If below 100km, additional mass should be added to the kill vehicle to accomodate atmospheric re-entry (heat sheilding, etc.).' },
+      { name: 'maxLatitudeCoverageDeg', label: 'Max latitude coverage', defaultValue: '90', unit: 'deg', min: 1, max: 90, step: '1', hint: 'Maximum latitude where SBIs will provide coverage. For global coverage, use 90 degrees. For North Korea and Iran only, use 45 degrees.' },
+      { name: 'flyoutTimeSeconds', label: 'Flyout time', defaultValue: '120.0', unit: 's', min: 10, max: 1800, step: '1', hint: 'The time between when the command is given to fire an interceptor and the latest point at which it can hit a target.' }
+    ]
+  },
+  {
+    id: 'cost-parameters',
+    title: 'Interceptor cost parameters (in constant dollars)',
+    fields: [
+      { name: 'nonRecurringDevCostMillion', label: 'Non-recurring development', defaultValue: '7000', prefix: '$', unit: 'million USD', min: 0, step: '1', hint: 'Total non-recurring research, development, and integration cost for each generation of interceptors.' },
+      { name: 'firstUnitInterceptorCostMillion', label: 'First unit interceptor cost', defaultValue: '70.0', prefix: '$', unit: 'million USD', min: 1, step: '0.1', hint: 'Unit cost of the first interceptor produced.' },
+      { name: 'interceptorLearningPercent', label: 'Interceptor learning percent', defaultValue: '85.0', unit: '%', min: 70, max: 100, step: '0.1', hint: 'The rate at which the unit cost will decline as more are built. An 90% learning curve means that each time the quantity doubles the unit cost declines by 10%.' },
+      { name: 'operatingSupportCostPerYearMillion', label: 'Operating & support cost per year', defaultValue: '450', prefix: '$', unit: 'million USD', min: 0, step: '1', hint: 'Estimated cost to operate the system, including personnel, training, facilities, etc.' },
+      { name: 'costEstimatePeriodYears', label: 'Period of cost estimate', defaultValue: '20', unit: 'years', min: 1, max: 100, step: '1', hint: 'The total number of years assessed in the cost estimate.' }
+    ]
+  },
+  {
+    id: 'launch-parameters',
+    title: 'Launch vehicle parameters',
+    fields: [
+      { name: 'payloadCapacityPerVehicleKg', label: 'Payload capacity per vehicle', defaultValue: '45000', unit: 'kg', min: 15000, max: 300000, step: '100', hint: 'Lift capability for the selected launch vehicle.' },
+      { name: 'firstUnitLaunchCostMillion', label: 'First unit launch cost', defaultValue: '150.0', prefix: '$', unit: 'million USD', min: 1, step: '0.1', hint: 'Initial cost per launch.' },
+      { name: 'launchLearningPercent', label: 'Launch learning percent', defaultValue: '95', unit: '%', min: 70, max: 100, step: '0.1', hint: 'The rate at which launch costs will decline as more are built. An 90% learning curve means that each time the quantity doubles the cost per launch declines by 10%.' }
+    ]
+  }
+];
+
+export const FIELD_CONFIG_MAP = FORM_SECTIONS.reduce((accumulator, section) => {
+  section.fields.forEach((field) => {
+    accumulator[field.name] = field;
+  });
+  return accumulator;
+}, {});
+export const FIELD_NAMES = FORM_SECTIONS.flatMap((section) => section.fields.map((field) => field.name));
+
+export const DEFAULT_INPUTS = FORM_SECTIONS.reduce((accumulator, section) => {
+  section.fields.forEach((field) => {
+    accumulator[field.name] = field.defaultValue;
+  });
+  return accumulator;
+}, {});
+
+export const DEFAULT_NUMERIC_INPUTS = convertToNumeric(DEFAULT_INPUTS);
+
+export function prepareInputs(rawInputs) {
+  const numbers = convertToNumeric(rawInputs);
+  const validationErrors = [];
+
+  if (!positive(numbers.sbiOrbitAltitudeKm)) {
+    validationErrors.push('SBI orbit altitude must be greater than zero.');
+  }
+
+  if (!positive(numbers.averageAccelerationG)) {
+    validationErrors.push('Average acceleration must be greater than zero.');
+  }
+
+  if (!positive(numbers.maxDeltaVKmPerS)) {
+    validationErrors.push('Max Velocity (ΔV) must be greater than zero.');
+  }
+
+  if (!nonNegative(numbers.divertVelocityKmPerS)) {
+    validationErrors.push('Divert velocity must be zero or greater.');
+  } else if (numbers.divertVelocityKmPerS > numbers.maxDeltaVKmPerS) {
+    validationErrors.push('Divert velocity cannot exceed the total ΔV budget.');
+  }
+
+  if (!positive(numbers.thrusterIspSeconds)) {
+    validationErrors.push('Thruster performance (Isp) must be greater than zero.');
+  }
+
+  if (!positive(numbers.killVehicleDryMassKg)) {
+    validationErrors.push('Kill vehicle dry mass must be greater than zero.');
+  }
+
+  if (!positive(numbers.interceptorBodyDryMassKg)) {
+    validationErrors.push('Interceptor body dry mass must be greater than zero.');
+  }
+
+  if (!positive(numbers.supportModuleDryMassKg)) {
+    validationErrors.push('Support module dry mass must be greater than zero.');
+  }
+
+  if (!Number.isFinite(numbers.killProbabilityPercent)) {
+    validationErrors.push('Kill probability must be a number.');
+  } else if (numbers.killProbabilityPercent <= 0 || numbers.killProbabilityPercent >= 100) {
+    validationErrors.push('Kill probability must be between 0% and 100%.');
+  }
+
+  if (!Number.isFinite(numbers.compositeKillProbabilityPercent)) {
+    validationErrors.push('Composite kill probability must be a number.');
+  } else if (numbers.compositeKillProbabilityPercent <= 0 || numbers.compositeKillProbabilityPercent >= 100) {
+    validationErrors.push('Composite kill probability must be between 0% and 100%.');
+  }
+
+  if (!positive(numbers.sbiLifeExpectancyYears)) {
+    validationErrors.push('SBI life expectancy must be greater than zero.');
+  } else {
+    numbers.sbiLifeExpectancyYears = Math.round(numbers.sbiLifeExpectancyYears);
+  }
+
+  if (!positive(numbers.salvoSize)) {
+    validationErrors.push('Salvo size must be at least one missile.');
+  } else {
+    numbers.salvoSize = Math.max(1, Math.round(numbers.salvoSize));
+  }
+
+  if (numbers.interceptAltitudeKm < 50) {
+    validationErrors.push('Intercept altitude must be at least 50km.');
+  } else if (numbers.interceptAltitudeKm > numbers.sbiOrbitAltitudeKm) {
+    validationErrors.push('Intercept altitude cannot exceed the SBI orbit altitude.');
+  }
+
+  if (!Number.isFinite(numbers.maxLatitudeCoverageDeg)) {
+    validationErrors.push('Max latitude coverage must be a number.');
+  } else if (numbers.maxLatitudeCoverageDeg < 0 || numbers.maxLatitudeCoverageDeg > 90) {
+    validationErrors.push('Max latitude coverage must be between 0 and 90 degrees.');
+  }
+
+  if (!positive(numbers.flyoutTimeSeconds)) {
+    validationErrors.push('Flyout time must be greater than zero.');
+  }
+
+  if (!nonNegative(numbers.nonRecurringDevCostMillion)) {
+    validationErrors.push('Non-recurring development cost must be zero or greater.');
+  }
+
+  if (!positive(numbers.firstUnitInterceptorCostMillion)) {
+    validationErrors.push('First unit interceptor cost must be greater than zero.');
+  }
+
+  if (!Number.isFinite(numbers.interceptorLearningPercent)) {
+    validationErrors.push('Interceptor learning percent must be a number.');
+  } else if (numbers.interceptorLearningPercent < 70 || numbers.interceptorLearningPercent > 100) {
+    validationErrors.push('Interceptor learning percent must be between 70% and 100%.');
+  }
+
+  if (!nonNegative(numbers.operatingSupportCostPerYearMillion)) {
+    validationErrors.push('Operating and support cost must be zero or greater.');
+  }
+
+  if (!positive(numbers.costEstimatePeriodYears)) {
+    validationErrors.push('Cost estimate period must be greater than zero.');
+  } else {
+    numbers.costEstimatePeriodYears = Math.max(1, Math.round(numbers.costEstimatePeriodYears));
+  }
+
+  if (!positive(numbers.payloadCapacityPerVehicleKg)) {
+    validationErrors.push('Payload capacity per vehicle must be greater than zero.');
+  }
+
+  if (!positive(numbers.firstUnitLaunchCostMillion)) {
+    validationErrors.push('First unit launch cost must be greater than zero.');
+  }
+
+  if (!Number.isFinite(numbers.launchLearningPercent)) {
+    validationErrors.push('Launch learning percent must be a number.');
+  } else if (numbers.launchLearningPercent < 70 || numbers.launchLearningPercent > 100) {
+    validationErrors.push('Launch learning percent must be between 70% and 100%.');
+  }
+
+  numbers.killVehicleDryMassKg = roundToTenth(numbers.killVehicleDryMassKg);
+  numbers.interceptorBodyDryMassKg = roundToTenth(numbers.interceptorBodyDryMassKg);
+  numbers.supportModuleDryMassKg = roundToTenth(numbers.supportModuleDryMassKg);
+
+  const { interceptorTotalMassKg } = calculateInterceptorMasses(numbers);
+  if (
+    Number.isFinite(interceptorTotalMassKg) &&
+    Number.isFinite(numbers.payloadCapacityPerVehicleKg) &&
+    numbers.payloadCapacityPerVehicleKg > 0 &&
+    interceptorTotalMassKg > numbers.payloadCapacityPerVehicleKg
+  ) {
+    validationErrors.push(
+      'The interceptor mass is greater than the payload capacity of the launch vehicle. Consider reducing interceptor performance or using a higher capacity launch vehicle.'
+    );
+  }
+
+  return { numbers, errors: validationErrors };
+}
+
+export function convertToNumeric(map) {
+  const numeric = {};
+  for (const [key, value] of Object.entries(map)) {
+    numeric[key] = toNumber(value);
+  }
+  return numeric;
+}
+
+export function toNumber(raw) {
+  if (typeof raw === 'number') return raw;
+  if (typeof raw !== 'string') return Number.NaN;
+  const trimmed = raw.trim();
+  if (!trimmed) return Number.NaN;
+  const normalised = trimmed.replace(/,/g, '');
+  const parsed = Number(normalised);
+  return Number.isFinite(parsed) ? parsed : Number.NaN;
+}
+
+export function roundToTenth(value) {
+  return Math.round(value * 10) / 10;
+}
+
+export function positive(value) {
+  return Number.isFinite(value) && value > 0;
+}
+
+export function nonNegative(value) {
+  return Number.isFinite(value) && value >= 0;
+}
@@ -0,0 +1,84 @@
+// Learning-curve production cost: unit n costs firstUnitCost * n^b with b = log2(learning rate), so building N units
+// costs firstUnitCost * S(N) with S(N) = 1^b + 2^b + ... + N^b.
+//
+// S(N) is read from cached prefix sums up to EXACT_UNIT_LIMIT (exact, same order of summation as a plain loop).
+// Past that, the tail S(N) - S(M) with M = EXACT_UNIT_LIMIT comes from the Euler–Maclaurin formula (the same
+// expansion that gives the Hurwitz-zeta asymptotics), so every call is O(1) once the prefix for b is cached.
+// With three Bernoulli corrections the remainder is bounded by
+//   2 ζ(6) / (2π)^6 * |b (b-1) ... (b-5)| * M^(b-5) / (5 - b)  ≈  3e-20 * firstUnitCost  for b in [log2(0.7), 0],
+// far below the rounding error of the loop it replaces. scripts/learning_curve_benchmark.mjs measures both.
+
+export const EXACT_UNIT_LIMIT = 1024;
+const PREFIX_CACHE_LIMIT = 256;
+
+// B2/2!, B4/4!, B6/6!
+const EULER_MACLAURIN_WEIGHTS = [1 / 12, -1 / 720, 1 / 30240];
+
+const prefixCache = new Map();
+
+function prefixSum(exponent, units) {
+  let entry = prefixCache.get(exponent);
+  if (!entry) {
+    if (prefixCache.size >= PREFIX_CACHE_LIMIT) {
+      prefixCache.delete(prefixCache.keys().next().value);
+    }
+    entry = { sums: new Float64Array(EXACT_UNIT_LIMIT + 1), filled: 0 };
+    prefixCache.set(exponent, entry);
+  }
+  const { sums } = entry;
+  for (let unitNumber = entry.filled + 1; unitNumber <= units; unitNumber += 1) {
+    sums[unitNumber] = sums[unitNumber - 1] + Math.pow(unitNumber, exponent);
+  }
+  entry.filled = Math.max(entry.filled, units);
+  return sums[units];
+}
+
+// Sum of n^exponent for n = from + 1 .. to (from >= 1).
+export function powerSumTail(exponent, from, to) {
+  const integral = exponent === -1
+    ? Math.log(to / from)
+    : (Math.pow(to, exponent + 1) - Math.pow(from, exponent + 1)) / (exponent + 1);
+  let total = integral + (Math.pow(to, exponent) - Math.pow(from, exponent)) / 2;
+
+  // Odd derivatives of x^b: coefficient * x^power with coefficient = b (b-1) ... (b-power+1)
+  let coefficient = exponent;
+  let power = exponent - 1;
+  for (const weight of EULER_MACLAURIN_WEIGHTS) {
+    total += weight * coefficient * (Math.pow(to, power) - Math.pow(from, power));
+    coefficient *= power * (power - 1);
+    power -= 2;
+  }
+  return total;
+}
+
+// S(N) = sum of n^exponent for n = 1 .. units (units a positive integer).
+export function powerSum(exponent, units) {
+  if (units <= EXACT_UNIT_LIMIT) {
+    return prefixSum(exponent, units);
+  }
+  return prefixSum(exponent, EXACT_UNIT_LIMIT) + powerSumTail(exponent, EXACT_UNIT_LIMIT, units);
+}
+
+export function computeLearningCurveCost(firstUnitCostMillion, learningPercent, units) {
+  if (!Number.isFinite(units) || units <= 0) {
+    return 0;
+  }
+
+  const slope = learningPercent / 100;
+  if (slope <= 0) {
+    return firstUnitCostMillion * units;
+  }
+
+  // Units 1..floor(units) are built; a fraction of a unit costs nothing
+  const wholeUnits = Math.floor(units);
+  if (wholeUnits < 1) {
+    return 0;
+  }
+
+  const exponent = Math.log(slope) / Math.log(2);
+  if (!Number.isFinite(exponent)) {
+    return Number.NaN;
+  }
+
+  return firstUnitCostMillion * powerSum(exponent, wholeUnits);
+}
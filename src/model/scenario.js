@@ -0,0 +1,388 @@
+// SBI constellation cost model: one scenario at a time, shared by the app, the sweep and the golden harness.
+
+import { computeLearningCurveCost } from './learningCurve.js';
+
+export const g0 = 9.81;
+
+const STANDARD_GRAVITY = 9.80665;
+const EARTH_RADIUS_KM = 6378.1;
+
+export function calculateInterceptorMasses(assumptions) {
+  const thrusterIsp = assumptions.thrusterIspSeconds;
+  const killVehicleDryMassKg = assumptions.killVehicleDryMassKg;
+  const interceptorBodyDryMassKg = assumptions.interceptorBodyDryMassKg;
+  const supportModuleDryMassKg = assumptions.supportModuleDryMassKg;
+  const divertVelocityKmPerS = assumptions.divertVelocityKmPerS;
+  const maxDeltaVKmPerS = assumptions.maxDeltaVKmPerS;
+
+  const hasDryMassInputs =
+    Number.isFinite(killVehicleDryMassKg) &&
+    Number.isFinite(interceptorBodyDryMassKg) &&
+    Number.isFinite(supportModuleDryMassKg);
+
+  const interceptorDryMassKg = hasDryMassInputs
+    ? killVehicleDryMassKg + interceptorBodyDryMassKg + supportModuleDryMassKg
+    : Number.NaN;
+
+  let killVehiclePropellantMassKg = Number.NaN;
+  if (
+    Number.isFinite(killVehicleDryMassKg) &&
+    killVehicleDryMassKg >= 0 &&
+    Number.isFinite(thrusterIsp) &&
+    thrusterIsp > 0 &&
+    Number.isFinite(divertVelocityKmPerS)
+  ) {
+    const exponent = (divertVelocityKmPerS * 1000) / (g0 * thrusterIsp);
+    if (Number.isFinite(exponent)) {
+      const massRatio = Math.exp(exponent);
+      if (Number.isFinite(massRatio)) {
+        killVehiclePropellantMassKg = killVehicleDryMassKg * (massRatio - 1);
+      }
+    }
+  }
+
+  let interceptorPropellantMassKg = Number.NaN;
+  const preMainBurnMassKg = Number.isFinite(killVehiclePropellantMassKg)
+    ? killVehicleDryMassKg + killVehiclePropellantMassKg + interceptorBodyDryMassKg
+    : Number.NaN;
+
+  if (
+    Number.isFinite(preMainBurnMassKg) &&
+    preMainBurnMassKg >= 0 &&
+    Number.isFinite(thrusterIsp) &&
+    thrusterIsp > 0 &&
+    Number.isFinite(maxDeltaVKmPerS)
+  ) {
+    const exponent = (maxDeltaVKmPerS * 1000) / (g0 * thrusterIsp);
+    if (Number.isFinite(exponent)) {
+      const massRatio = Math.exp(exponent);
+      if (Number.isFinite(massRatio)) {
+        interceptorPropellantMassKg = preMainBurnMassKg * (massRatio - 1);
+      }
+    }
+  }
+
+  const interceptorTotalMassKg =
+    Number.isFinite(interceptorDryMassKg) &&
+    Number.isFinite(killVehiclePropellantMassKg) &&
+    Number.isFinite(interceptorPropellantMassKg)
+      ? interceptorDryMassKg + killVehiclePropellantMassKg + interceptorPropellantMassKg
+      : Number.NaN;
+
+  return {
+    killVehiclePropellantMassKg,
+    interceptorPropellantMassKg,
+    interceptorDryMassKg,
+    interceptorTotalMassKg
+  };
+}
+
+// The steps of computeScenario below are exported one by one so the batch kernel (batch.js) runs the same code.
+
+export function calculateFlyout(averageAccelerationG, maxDeltaVKmPerS, flyoutTimeSeconds) {
+  const averageAccelerationMS2 = averageAccelerationG * STANDARD_GRAVITY;
+  const averageAccelerationKmPerS2 = averageAccelerationMS2 / 1000;
+
+  const timeToReachMaxVelocitySeconds = averageAccelerationKmPerS2 > 0
+    ? maxDeltaVKmPerS / averageAccelerationKmPerS2
+    : Number.NaN;
+
+  let interceptorFlyoutRangeKm = Number.NaN;
+  let interceptorFlyoutRangeMessage = '';
+
+  if (Number.isFinite(timeToReachMaxVelocitySeconds) && Number.isFinite(flyoutTimeSeconds)) {
+    if (timeToReachMaxVelocitySeconds > flyoutTimeSeconds) {
+      interceptorFlyoutRangeMessage = 'Acceleration is insufficient to reach the velocity specified over the flyout time specified.';
+    } else {
+      const accelDistance = 0.5 * averageAccelerationKmPerS2 * Math.pow(timeToReachMaxVelocitySeconds, 2);
+      const cruiseTime = flyoutTimeSeconds - timeToReachMaxVelocitySeconds;
+      interceptorFlyoutRangeKm = accelDistance + maxDeltaVKmPerS * cruiseTime;
+    }
+  } else {
+    interceptorFlyoutRangeMessage = 'Acceleration inputs result in an invalid time to max velocity.';
+  }
+
+  return {
+    averageAccelerationMS2,
+    averageAccelerationKmPerS2,
+    timeToReachMaxVelocitySeconds,
+    interceptorFlyoutRangeKm,
+    interceptorFlyoutRangeMessage
+  };
+}
+
+export function calculateCoverage(interceptorFlyoutRangeKm, sbiOrbitAltitudeKm, interceptAltitudeKm, maxLatitudeCoverageDeg) {
+  const altitudeDeltaKm = sbiOrbitAltitudeKm - interceptAltitudeKm;
+  let coverageRadiusKm = Number.NaN;
+
+  if (Number.isFinite(interceptorFlyoutRangeKm)) {
+    const radicand = Math.pow(interceptorFlyoutRangeKm, 2) - Math.pow(altitudeDeltaKm, 2);
+    if (radicand >= 0) {
+      coverageRadiusKm = Math.sqrt(radicand);
+    }
+  }
+
+  const earthCoverageSqKm = Number.isFinite(maxLatitudeCoverageDeg)
+    ? 4 * Math.PI * Math.pow(EARTH_RADIUS_KM + interceptAltitudeKm, 2) * Math.sin((maxLatitudeCoverageDeg * Math.PI) / 180)
+    : Number.NaN;
+
+  return { coverageRadiusKm, earthCoverageSqKm };
+}
+
+export function calculateConstellationSize(coverageRadiusKm, earthCoverageSqKm, salvoSize, interceptorsPerThreat) {
+  if (Number.isFinite(coverageRadiusKm) && coverageRadiusKm > 0 && Number.isFinite(earthCoverageSqKm) && earthCoverageSqKm > 0) {
+    const coverageAreaPerInterceptor = Math.PI * Math.pow(coverageRadiusKm, 2);
+    const rawConstellation = (earthCoverageSqKm / coverageAreaPerInterceptor) * salvoSize * interceptorsPerThreat;
+    if (Number.isFinite(rawConstellation) && rawConstellation > 0) {
+      return Math.max(1, Math.ceil(rawConstellation));
+    }
+  }
+  return Number.NaN;
+}
+
+export function calculateReplacements(costEstimatePeriodYears, sbiLifeExpectancyYears) {
+  const rawReplacementRatio = sbiLifeExpectancyYears > 0
+    ? costEstimatePeriodYears / sbiLifeExpectancyYears
+    : Number.NaN;
+  return Number.isFinite(rawReplacementRatio)
+    ? Math.max(1, Math.floor(rawReplacementRatio))
+    : Number.NaN;
+}
+
+export function calculateInterceptorsPerLaunch(interceptorTotalMassKg, payloadCapacityPerVehicleKg) {
+  if (Number.isFinite(interceptorTotalMassKg) && interceptorTotalMassKg > 0 &&
+      Number.isFinite(payloadCapacityPerVehicleKg) && payloadCapacityPerVehicleKg > 0) {
+    const possible = Math.floor(payloadCapacityPerVehicleKg / interceptorTotalMassKg);
+    if (possible >= 1) {
+      return possible;
+    }
+  }
+  return Number.NaN;
+}
+
+export function calculateLaunchCount(constellationSize, interceptorsPerLaunch) {
+  return Number.isFinite(constellationSize) && Number.isFinite(interceptorsPerLaunch) && interceptorsPerLaunch > 0
+    ? Math.ceil(constellationSize / interceptorsPerLaunch)
+    : Number.NaN;
+}
+
+// Average cost of `quantity` units from the continuous learning-curve approximation.
+export function calculateAverageUnitCost(firstUnitCostMillion, learningPercent, quantity) {
+  const learningRate = learningPercent / 100;
+  const logSlope = learningRate > 0 ? Math.log(learningRate) / Math.log(2) : Number.NaN;
+
+  return Number.isFinite(quantity) && quantity > 0 &&
+    learningRate > 0 && Number.isFinite(logSlope) && (1 + logSlope) !== 0
+    ? firstUnitCostMillion * ((Math.pow(quantity, 1 + logSlope) + 1) / (quantity * (1 + logSlope)))
+    : Number.NaN;
+}
+
+export function calculateTotalSystemCostMillion(
+  averageProcurementUnitCostMillion,
+  constellationSize,
+  averageLaunchCostMillion,
+  launchCount,
+  interceptorReplacements,
+  operationsCostMillion,
+  nonRecurringMillion
+) {
+  const totalCycleCostMillion =
+    Number.isFinite(averageProcurementUnitCostMillion) && Number.isFinite(constellationSize) &&
+    Number.isFinite(averageLaunchCostMillion) && Number.isFinite(launchCount)
+      ? averageProcurementUnitCostMillion * constellationSize + averageLaunchCostMillion * launchCount
+      : Number.NaN;
+
+  return Number.isFinite(totalCycleCostMillion) && Number.isFinite(interceptorReplacements)
+    ? totalCycleCostMillion * interceptorReplacements + operationsCostMillion + nonRecurringMillion
+    : Number.NaN;
+}
+
+export function computeScenario(values) {
+  const assumptions = { ...values };
+
+  const interceptorsPerThreat = computeInterceptorsPerThreat(
+    assumptions.killProbabilityPercent,
+    assumptions.compositeKillProbabilityPercent
+  );
+
+  const interceptorsPerSalvo = Number.isFinite(interceptorsPerThreat)
+    ? interceptorsPerThreat * assumptions.salvoSize
+    : Number.NaN;
+
+  const compositeKillProbabilityPercent = Number.isFinite(interceptorsPerThreat)
+    ? 100 * (1 - Math.pow(1 - assumptions.killProbabilityPercent / 100, interceptorsPerThreat))
+    : Number.NaN;
+
+  const deltaVMarginKmPerS = assumptions.maxDeltaVKmPerS - assumptions.divertVelocityKmPerS;
+
+  const {
+    killVehiclePropellantMassKg,
+    interceptorPropellantMassKg,
+    interceptorDryMassKg,
+    interceptorTotalMassKg
+  } = calculateInterceptorMasses(assumptions);
+
+  const {
+    averageAccelerationMS2,
+    averageAccelerationKmPerS2,
+    timeToReachMaxVelocitySeconds,
+    interceptorFlyoutRangeKm,
+    interceptorFlyoutRangeMessage
+  } = calculateFlyout(assumptions.averageAccelerationG, assumptions.maxDeltaVKmPerS, assumptions.flyoutTimeSeconds);
+
+  const { coverageRadiusKm, earthCoverageSqKm } = calculateCoverage(
+    interceptorFlyoutRangeKm,
+    assumptions.sbiOrbitAltitudeKm,
+    assumptions.interceptAltitudeKm,
+    assumptions.maxLatitudeCoverageDeg
+  );
+
+  const constellationSize = calculateConstellationSize(
+    coverageRadiusKm,
+    earthCoverageSqKm,
+    assumptions.salvoSize,
+    interceptorsPerThreat
+  );
+
+  const interceptorReplacements = calculateReplacements(
+    assumptions.costEstimatePeriodYears,
+    assumptions.sbiLifeExpectancyYears
+  );
+
+  const totalInterceptors = Number.isFinite(constellationSize) && Number.isFinite(interceptorReplacements)
+    ? constellationSize * interceptorReplacements
+    : Number.NaN;
+
+  const interceptorsPerLaunch = calculateInterceptorsPerLaunch(
+    interceptorTotalMassKg,
+    assumptions.payloadCapacityPerVehicleKg
+  );
+
+  const payloadUtilizationKg = Number.isFinite(interceptorsPerLaunch) && Number.isFinite(interceptorTotalMassKg)
+    ? interceptorsPerLaunch * interceptorTotalMassKg
+    : Number.NaN;
+
+  const payloadUtilizationPercent = Number.isFinite(payloadUtilizationKg) && assumptions.payloadCapacityPerVehicleKg > 0
+    ? (payloadUtilizationKg / assumptions.payloadCapacityPerVehicleKg) * 100
+    : Number.NaN;
+
+  const launchCount = calculateLaunchCount(constellationSize, interceptorsPerLaunch);
+
+  const unitsForProduction = Number.isFinite(totalInterceptors) && totalInterceptors > 0
+    ? Math.round(totalInterceptors)
+    : 0;
+
+  const productionCostMillion = unitsForProduction > 0
+    ? computeLearningCurveCost(
+        assumptions.firstUnitInterceptorCostMillion,
+        assumptions.interceptorLearningPercent,
+        unitsForProduction
+      )
+    : Number.NaN;
+
+  const averageProcurementUnitCostMillion = calculateAverageUnitCost(
+    assumptions.firstUnitInterceptorCostMillion,
+    assumptions.interceptorLearningPercent,
+    constellationSize
+  );
+
+  const averageLaunchCostMillion = calculateAverageUnitCost(
+    assumptions.firstUnitLaunchCostMillion,
+    assumptions.launchLearningPercent,
+    launchCount
+  );
+
+  const launchCampaignCostMillion =
+    Number.isFinite(averageLaunchCostMillion) && Number.isFinite(launchCount)
+      ? averageLaunchCostMillion * launchCount
+      : Number.NaN;
+
+  const nonRecurringMillion = assumptions.nonRecurringDevCostMillion;
+  const operationsCostMillion = assumptions.operatingSupportCostPerYearMillion * assumptions.costEstimatePeriodYears;
+
+  const totalSystemCostMillion = calculateTotalSystemCostMillion(
+    averageProcurementUnitCostMillion,
+    constellationSize,
+    averageLaunchCostMillion,
+    launchCount,
+    interceptorReplacements,
+    operationsCostMillion,
+    nonRecurringMillion
+  );
+
+  const totalSystemCostBillion = Number.isFinite(totalSystemCostMillion)
+    ? totalSystemCostMillion / 1000
+    : Number.NaN;
+
+  const interceptorsPerYear = Number.isFinite(totalInterceptors) && assumptions.costEstimatePeriodYears > 0
+    ? totalInterceptors / assumptions.costEstimatePeriodYears
+    : Number.NaN;
+
+  const totalPayloadToOrbitKg =
+    Number.isFinite(payloadUtilizationKg) && Number.isFinite(launchCount) && Number.isFinite(interceptorReplacements)
+      ? payloadUtilizationKg * launchCount * interceptorReplacements
+      : Number.NaN;
+
+  return {
+    assumptions,
+    metrics: {
+      totalSystemCostMillion,
+      totalSystemCostBillion,
+      nonRecurringMillion,
+      productionCostMillion,
+      operationsCostMillion,
+      launchCampaignCostMillion,
+      averageInterceptorUnitCostMillion: averageProcurementUnitCostMillion,
+      averageProcurementUnitCostMillion,
+      averageLaunchCostMillion,
+      costPerInterceptAttemptMillion: averageProcurementUnitCostMillion,
+      interceptorDryMassKg,
+      killVehiclePropellantMassKg,
+      interceptorPropellantMassKg,
+      interceptorMassKg: interceptorTotalMassKg,
+      interceptorsPerLaunch,
+      payloadUtilizationKg,
+      payloadUtilizationPercent,
+      launchCount,
+      totalPayloadToOrbitKg,
+      totalInterceptors,
+      interceptorsPerThreat,
+      interceptorsPerSalvo,
+      interceptorReplacements,
+      compositeKillProbabilityPercent,
+      requestedCompositeKillProbabilityPercent: assumptions.compositeKillProbabilityPercent,
+      deltaVMarginKmPerS,
+      averageAccelerationG: assumptions.averageAccelerationG,
+      averageAccelerationMS2,
+      averageAccelerationKmPerS2,
+      timeToReachMaxVelocitySeconds,
+      interceptorFlyoutRangeKm,
+      interceptorFlyoutRangeMessage,
+      coverageRadiusKm,
+      earthCoverageSqKm,
+      interceptAltitudeKm: assumptions.interceptAltitudeKm,
+      maxLatitudeCoverageDeg: assumptions.maxLatitudeCoverageDeg,
+      sbiOrbitAltitudeKm: assumptions.sbiOrbitAltitudeKm,
+      flyoutTimeSeconds: assumptions.flyoutTimeSeconds,
+      sbiLifeExpectancyYears: assumptions.sbiLifeExpectancyYears,
+      interceptorsPerYear,
+      constellationSize,
+      costEstimatePeriodYears: assumptions.costEstimatePeriodYears
+    }
+  };
+}
+
+export function computeInterceptorsPerThreat(singleShotPkPercent, desiredCompositePkPercent) {
+  const singleShotPk = singleShotPkPercent / 100;
+  const desiredPk = desiredCompositePkPercent / 100;
+
+  if (!Number.isFinite(singleShotPk) || !Number.isFinite(desiredPk)) {
+    return Number.NaN;
+  }
+
+  if (singleShotPk <= 0 || desiredPk <= 0) return Number.NaN;
+  if (singleShotPk >= 1 || desiredPk >= 1) return 1;
+
+  const required = Math.log(1 - desiredPk) / Math.log(1 - singleShotPk);
+  return Math.max(1, Math.ceil(required));
+}
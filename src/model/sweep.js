@@ -0,0 +1,195 @@
+// Chart sweeps: one input stepped across a range with every other assumption held fixed.
+//
+// A sweep is evaluated once for every plottable metric, so changing the plotted metric never re-runs it. Points are
+// computed coarse-to-fine: an evenly spaced pass over the whole range first, then the remaining points in order of
+// distance from the point the reader is looking at. runSweep is shared by the Web Worker and the main-thread
+// fallback.
+import { FIELD_CONFIG_MAP, FIELD_NAMES, toNumber } from './inputs.js';
+import { computeScenario } from './scenario.js';
+
+export const MAX_CHART_POINTS = 3000;
+export const MAX_SWEEP_STEPS = 500;
+export const COARSE_SWEEP_POINTS = 60;
+export const REFINE_CHUNK_POINTS = 150;
+
+export function getFieldStepValue(field) {
+  if (!field) return 1;
+  const numeric = Number(field.step);
+  return Number.isFinite(numeric) && numeric > 0 ? numeric : 1;
+}
+
+export function getFractionDigits(fieldName) {
+  const field = FIELD_CONFIG_MAP[fieldName];
+  if (!field || field.step === undefined) return 0;
+  const text = String(field.step);
+  const point = text.indexOf('.');
+  return point >= 0 ? text.length - point - 1 : 0;
+}
+
+// Validates a sweep range and lists its x values. Returns { error } or { xValues, step, decimals, key } where key
+// identifies the range (field, scaled start/end/step) independently of the assumptions.
+export function planSweep(field, rangeStart, rangeEnd) {
+  const start = toNumber(rangeStart);
+  const end = toNumber(rangeEnd);
+
+  if (!Number.isFinite(start) || !Number.isFinite(end)) {
+    return { error: 'Enter numeric values for the sweep range.' };
+  }
+  if (start > end) {
+    return { error: 'Range start must be less than or equal to the end value.' };
+  }
+  if (field.min !== undefined && start < field.min) {
+    return { error: `Start value must be at least ${field.min}.` };
+  }
+  if (field.max !== undefined && end > field.max) {
+    return { error: `End value must be no more than ${field.max}.` };
+  }
+
+  const step = getFieldStepValue(field);
+  const decimals = getFractionDigits(field.name);
+  const scale = Math.pow(10, decimals);
+  const scaledStart = Math.round(start * scale);
+  const scaledEnd = Math.round(end * scale);
+  const scaledStep = Math.max(1, Math.round(step * scale));
+  const scaledSpan = Math.max(0, scaledEnd - scaledStart);
+  const stepCount = Math.floor(scaledSpan / scaledStep);
+  const estimatedPoints = stepCount + 1;
+
+  if (stepCount > MAX_SWEEP_STEPS) {
+    return { error: `Limit the sweep to ${MAX_SWEEP_STEPS} steps or fewer (current range: ${stepCount}).` };
+  }
+  if (estimatedPoints > MAX_CHART_POINTS) {
+    return {
+      error: `This range would generate ${estimatedPoints} data points. Narrow the range to keep it under ${MAX_CHART_POINTS}.`
+    };
+  }
+
+  const xValues = [];
+  for (let value = scaledStart, guard = 0; value <= scaledEnd + Math.round(scaledStep * 0.25); value += scaledStep, guard += 1) {
+    if (guard > MAX_CHART_POINTS * 2) {
+      break;
+    }
+    xValues.push(value / scale);
+  }
+
+  return {
+    error: null,
+    step,
+    decimals,
+    xValues: Float64Array.from(xValues),
+    key: `${field.name}|${scaledStart}|${scaledEnd}|${scaledStep}`
+  };
+}
+
+// FNV-1a over the model inputs; two assumption sets with the same inputs share cached sweeps.
+export function hashAssumptions(assumptions) {
+  const text = FIELD_NAMES.map((name) => String(assumptions?.[name])).join('|');
+  let hash = 0x811c9dc5;
+  for (let index = 0; index < text.length; index += 1) {
+    hash ^= text.charCodeAt(index);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0).toString(16).padStart(8, '0');
+}
+
+export function closestIndex(xValues, target) {
+  if (!xValues.length) return -1;
+  if (!Number.isFinite(target)) return xValues.length - 1;
+  let best = 0;
+  for (let index = 1; index < xValues.length; index += 1) {
+    if (Math.abs(xValues[index] - target) < Math.abs(xValues[best] - target)) {
+      best = index;
+    }
+  }
+  return best;
+}
+
+// Evaluation order: an evenly spaced coarse pass (always including both ends), then the rest nearest-first
+// around focusIndex.
+export function sweepOrder(count, focusIndex, coarsePoints = COARSE_SWEEP_POINTS) {
+  const stride = Math.max(1, Math.ceil(count / coarsePoints));
+  const order = [];
+  const queued = new Uint8Array(count);
+  const push = (index) => {
+    if (index >= 0 && index < count && !queued[index]) {
+      queued[index] = 1;
+      order.push(index);
+    }
+  };
+
+  for (let index = 0; index < count; index += stride) {
+    push(index);
+  }
+  push(count - 1);
+  const coarseCount = order.length;
+
+  const focus = Math.min(Math.max(focusIndex, 0), count - 1);
+  for (let distance = 0; distance < count; distance += 1) {
+    push(focus - distance);
+    push(focus + distance);
+  }
+  return { order, coarseCount };
+}
+
+export function createSweepSeries(xValues, metricKeys) {
+  const values = {};
+  for (const key of metricKeys) {
+    values[key] = new Float64Array(xValues.length).fill(Number.NaN);
+  }
+  return { xValues, values, done: new Uint8Array(xValues.length), computed: 0 };
+}
+
+// Merges an update from runSweep into a series created by createSweepSeries.
+export function applySweepUpdate(series, update) {
+  const { indices, values } = update;
+  for (const [key, column] of Object.entries(values)) {
+    const target = series.values[key];
+    for (let position = 0; position < indices.length; position += 1) {
+      target[indices[position]] = column[position];
+    }
+  }
+  for (const index of indices) {
+    if (!series.done[index]) {
+      series.done[index] = 1;
+      series.computed += 1;
+    }
+  }
+}
+
+const nextTask = () => new Promise((resolve) => setTimeout(resolve, 0));
+
+// Evaluates a sweep, reporting { indices, values, coarse, complete } updates: one for the coarse pass, then one per
+// REFINE_CHUNK_POINTS points. Between updates it yields to the event loop and stops if isCancelled() returns true.
+export async function runSweep(request, { onUpdate, isCancelled = () => false }) {
+  const { assumptions, fieldName, xValues, metricKeys, focusX } = request;
+  const { order, coarseCount } = sweepOrder(xValues.length, closestIndex(xValues, focusX));
+
+  let position = 0;
+  while (position < order.length) {
+    if (isCancelled()) {
+      return false;
+    }
+
+    const coarse = position === 0;
+    const stop = coarse ? coarseCount : Math.min(order.length, position + REFINE_CHUNK_POINTS);
+    const indices = Int32Array.from(order.slice(position, stop));
+    const values = {};
+    for (const key of metricKeys) {
+      values[key] = new Float64Array(indices.length);
+    }
+
+    for (let offset = 0; offset < indices.length; offset += 1) {
+      const { metrics } = computeScenario({ ...assumptions, [fieldName]: xValues[indices[offset]] });
+      for (const key of metricKeys) {
+        values[key][offset] = metrics[key];
+      }
+    }
+
+    position = stop;
+    onUpdate({ indices, values, coarse, complete: position >= order.length });
+    if (position < order.length) {
+      await nextTask();
+    }
+  }
+  return true;
+}
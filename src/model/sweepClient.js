@@ -0,0 +1,213 @@
+// Runs chart sweeps and uncertainty analyses in a Web Worker and keeps finished results in a small LRU cache.
+//
+// Only one sweep runs at a time: requesting a new one cancels the sweep in progress. A tileSource (see
+// src/data/scenarioTiles.js) is asked first and serves sweeps that lie on a precomputed grid without running the
+// model. Browsers without module workers (or a worker that fails to load) run the same code on the main thread,
+// sweeps still in yielding chunks.
+import { applySweepUpdate, createSweepSeries, runSweep } from './sweep.js';
+import { runUncertaintyRequest } from './uncertainty.js';
+
+export const SWEEP_CACHE_LIMIT = 24;
+
+export function createSweepClient({ cacheLimit = SWEEP_CACHE_LIMIT, tileSource = null } = {}) {
+  const cache = new Map();
+  let worker = null;
+  let workerFailed = false;
+  let nextId = 0;
+  let current = null;
+  const analyses = new Map();
+
+  const remember = (key, series) => {
+    cache.delete(key);
+    cache.set(key, series);
+    if (cache.size > cacheLimit) {
+      cache.delete(cache.keys().next().value);
+    }
+  };
+
+  const settleAnalysis = ({ id, result, error }) => {
+    const job = analyses.get(id);
+    if (!job) {
+      return;
+    }
+    analyses.delete(id);
+    if (error) {
+      job.reject(new Error(error));
+    } else {
+      remember(job.key, result);
+      job.resolve(result);
+    }
+  };
+
+  const analyseLocally = (job) => {
+    setTimeout(() => {
+      try {
+        settleAnalysis({ id: job.id, result: runUncertaintyRequest(job.request) });
+      } catch (error) {
+        settleAnalysis({ id: job.id, error: error?.message ?? String(error) });
+      }
+    }, 0);
+  };
+
+  const handleMessage = (message) => {
+    if (analyses.has(message.id)) {
+      settleAnalysis(message);
+      return;
+    }
+
+    const { id, update, error } = message;
+    if (!current || current.id !== id) {
+      return;
+    }
+
+    const job = current;
+    if (error) {
+      current = null;
+      job.onUpdate(job.series, { complete: true, error });
+      return;
+    }
+
+    applySweepUpdate(job.series, update);
+    if (update.complete) {
+      current = null;
+      remember(job.key, job.series);
+    }
+    job.onUpdate(job.series, { complete: update.complete, error: null });
+  };
+
+  const runLocally = (job) => {
+    runSweep(job.request, {
+      isCancelled: () => current?.id !== job.id,
+      onUpdate: (update) => handleMessage({ id: job.id, update })
+    }).catch((error) => handleMessage({ id: job.id, error: error?.message ?? String(error) }));
+  };
+
+  const getWorker = () => {
+    if (worker || workerFailed) {
+      return worker;
+    }
+    if (typeof Worker !== 'function') {
+      workerFailed = true;
+      return null;
+    }
+
+    try {
+      worker = new Worker(new URL('./sweepWorker.js', import.meta.url), { type: 'module' });
+    } catch {
+      workerFailed = true;
+      return null;
+    }
+
+    worker.onmessage = (event) => handleMessage(event.data);
+    worker.onerror = () => {
+      workerFailed = true;
+      worker.terminate();
+      worker = null;
+      if (current) {
+        runLocally(current);
+      }
+      analyses.forEach(analyseLocally);
+    };
+    return worker;
+  };
+
+  const cancel = (id) => {
+    if (current?.id !== id) {
+      return;
+    }
+    current = null;
+    worker?.postMessage({ type: 'cancel', id });
+  };
+
+  return {
+    lookup(key) {
+      const series = cache.get(key);
+      if (series) {
+        remember(key, series);
+      }
+      return series ?? null;
+    },
+
+    // Starts (or serves from cache) the sweep identified by key. onUpdate(series, { complete, error }) is called for
+    // every partial result; the returned function cancels the sweep.
+    request(key, request, onUpdate) {
+      const cached = this.lookup(key);
+      if (cached) {
+        onUpdate(cached, { complete: true, error: null });
+        return () => {};
+      }
+
+      if (current) {
+        cancel(current.id);
+      }
+
+      nextId += 1;
+      const job = {
+        id: nextId,
+        key,
+        request,
+        onUpdate,
+        series: createSweepSeries(request.xValues, request.metricKeys)
+      };
+      current = job;
+
+      const start = () => {
+        if (current !== job) {
+          return;
+        }
+        const target = getWorker();
+        if (target) {
+          target.postMessage({ type: 'sweep', id: job.id, request });
+        } else {
+          runLocally(job);
+        }
+      };
+
+      if (tileSource) {
+        tileSource(request).then((series) => {
+          if (current !== job) {
+            return;
+          }
+          if (!series) {
+            start();
+            return;
+          }
+          current = null;
+          remember(key, series);
+          onUpdate(series, { complete: true, error: null });
+        }, start);
+      } else {
+        start();
+      }
+      return () => cancel(job.id);
+    },
+
+    // Runs (or serves from cache) an uncertainty analysis; resolves with the result of runUncertaintyRequest.
+    analyse(key, request) {
+      const cached = this.lookup(key);
+      if (cached) {
+        return Promise.resolve(cached);
+      }
+
+      nextId += 1;
+      const id = nextId;
+      return new Promise((resolve, reject) => {
+        const job = { id, key, request, resolve, reject };
+        analyses.set(id, job);
+        const target = getWorker();
+        if (target) {
+          target.postMessage({ type: 'uncertainty', id, request });
+        } else {
+          analyseLocally(job);
+        }
+      });
+    },
+
+    dispose() {
+      current = null;
+      analyses.clear();
+      worker?.terminate();
+      worker = null;
+    }
+  };
+}
@@ -0,0 +1,44 @@
+// Web Worker running chart sweeps and uncertainty analyses off the main thread (see sweepClient.js).
+//
+// Messages in: { type: 'sweep', id, request } starts a sweep and supersedes any sweep in progress;
+// { type: 'cancel', id } stops sweep id; { type: 'uncertainty', id, request } runs an uncertainty analysis.
+// Messages out: { id, update } per runSweep update, { id, result } for an analysis, { id, error } on failure.
+import { runSweep } from './sweep.js';
+import { runUncertaintyRequest } from './uncertainty.js';
+
+let activeId = 0;
+
+self.onmessage = (event) => {
+  const message = event.data;
+
+  if (message.type === 'cancel') {
+    if (activeId === message.id) {
+      activeId = 0;
+    }
+    return;
+  }
+
+  if (message.type === 'uncertainty') {
+    const { id, request } = message;
+    try {
+      self.postMessage({ id, result: runUncertaintyRequest(request) });
+    } catch (error) {
+      self.postMessage({ id, error: error?.message ?? String(error) });
+    }
+    return;
+  }
+
+  if (message.type === 'sweep') {
+    const { id, request } = message;
+    activeId = id;
+    runSweep(request, {
+      isCancelled: () => activeId !== id,
+      onUpdate: (update) => {
+        const transfer = [update.indices.buffer, ...Object.values(update.values).map((column) => column.buffer)];
+        self.postMessage({ id, update }, transfer);
+      }
+    }).catch((error) => {
+      self.postMessage({ id, error: error?.message ?? String(error) });
+    });
+  }
+};
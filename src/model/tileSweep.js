@@ -0,0 +1,80 @@
+// Chart sweeps read from the precomputed scenario tiles written by scripts/scenario_tiles.py.
+//
+// A sweep comes from a tile when its field has a grid, every input outside the grid equals the grid's base input,
+// the other gridded fields sit exactly on node values and every x value is a point on the grid's axis. Anything else
+// is computed live: the model has step changes, so values between grid points are never guessed.
+import { FIELD_NAMES } from './inputs.js';
+import { createSweepSeries } from './sweep.js';
+
+export const TILE_FORMAT_VERSION = 1;
+const AXIS_TOLERANCE = 1e-6;
+
+// Where a sweep's line lives in the tiles, or null when the sweep is not on the grid.
+export function planTileLine(index, request) {
+  if (!index || index.version !== TILE_FORMAT_VERSION || index.dtype !== 'float32le') {
+    return null;
+  }
+
+  const { assumptions, fieldName, xValues, metricKeys } = request;
+  const grid = index.grids?.[fieldName];
+  if (!grid || !xValues.length) {
+    return null;
+  }
+
+  const gridded = new Set([fieldName, ...grid.fixed.map((fixed) => fixed.name)]);
+  if (FIELD_NAMES.some((name) => !gridded.has(name) && assumptions[name] !== index.base[name])) {
+    return null;
+  }
+
+  const nodes = grid.fixed.map(({ name, values }) => values.indexOf(assumptions[name]));
+  const metrics = metricKeys.map((key) => index.metrics.indexOf(key));
+  if (nodes.some((node) => node < 0) || metrics.some((metric) => metric < 0)) {
+    return null;
+  }
+
+  const { start, step, count } = grid.axis;
+  const positions = new Int32Array(xValues.length);
+  for (let index = 0; index < xValues.length; index += 1) {
+    const position = (xValues[index] - start) / step;
+    const nearest = Math.round(position);
+    if (nearest < 0 || nearest >= count || Math.abs(position - nearest) > AXIS_TOLERANCE) {
+      return null;
+    }
+    positions[index] = nearest;
+  }
+
+  const [, second, third] = grid.fixed;
+  const tile = grid.tiles[nodes[0]];
+  return {
+    file: tile.file,
+    bytes: tile.bytes,
+    metricKeys,
+    metrics,
+    // Offset of the line within one metric's block, and the size of that block
+    lineOffset: (nodes[1] * third.values.length + nodes[2]) * count,
+    metricStride: second.values.length * third.values.length * count,
+    positions
+  };
+}
+
+// A complete sweep series (as built by runSweep) read from the tile payload described by plan.
+export function readTileLine(plan, buffer, xValues) {
+  if (buffer.byteLength !== plan.bytes) {
+    throw new Error(`Scenario tile ${plan.file} has an unexpected size.`);
+  }
+
+  const data = new Float32Array(buffer);
+
+  const series = createSweepSeries(xValues, plan.metricKeys);
+  plan.metricKeys.forEach((key, keyIndex) => {
+    const base = plan.metrics[keyIndex] * plan.metricStride + plan.lineOffset;
+    const column = series.values[key];
+    for (let index = 0; index < xValues.length; index += 1) {
+      column[index] = data[base + plan.positions[index]];
+    }
+  });
+  series.done.fill(1);
+  series.computed = xValues.length;
+  series.source = 'tiles';
+  return series;
+}
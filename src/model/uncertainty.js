@@ -0,0 +1,317 @@
+// Monte Carlo uncertainty analysis over the scenario inputs.
+//
+// Each uncertain input gets a distribution: { type: 'triangular', low, mode, high }, { type: 'uniform', low, high }
+// or { type: 'lognormal', low, high } where low/high are the 10th/90th percentiles. Every draw is clipped to the
+// field's min/max. Inputs are correlated through a Gaussian copula: correlated standard normals are drawn with the
+// Cholesky factor of the correlation matrix and mapped through each field's inverse CDF. Samples are rounded the
+// way prepareInputs rounds typed inputs and evaluated with evaluateBatch.
+import { evaluateBatch, toColumns } from './batch.js';
+import { FIELD_CONFIG_MAP, FIELD_NAMES } from './inputs.js';
+
+export const DISTRIBUTION_TYPES = ['triangular', 'uniform', 'lognormal'];
+export const UNCERTAINTY_METRICS = ['totalSystemCostBillion', 'constellationSize', 'launchCount'];
+export const PERCENTILES = [10, 50, 90];
+export const DEFAULT_SAMPLE_COUNT = 100000;
+export const BAND_SAMPLE_COUNT = 2000;
+export const BAND_MAX_POINTS = 80;
+export const DEFAULT_SEED = 20240601;
+
+// Inputs treated as uncertain by default, with the half-width of their range as a fraction of the point value
+export const DEFAULT_UNCERTAIN_FIELDS = [
+  { name: 'killProbabilityPercent', type: 'triangular', spread: 0.15 },
+  { name: 'thrusterIspSeconds', type: 'triangular', spread: 0.1 },
+  { name: 'firstUnitInterceptorCostMillion', type: 'lognormal', spread: 0.3 },
+  { name: 'interceptorLearningPercent', type: 'triangular', spread: 0.05 },
+  { name: 'firstUnitLaunchCostMillion', type: 'lognormal', spread: 0.3 },
+  { name: 'launchLearningPercent', type: 'triangular', spread: 0.04 }
+];
+
+// Correlations between the normal variables behind each input (Gaussian copula); pairs with a fixed input are ignored
+export const DEFAULT_CORRELATIONS = [
+  ['interceptorLearningPercent', 'launchLearningPercent', 0.5],
+  ['thrusterIspSeconds', 'firstUnitInterceptorCostMillion', 0.3]
+];
+
+const Z_90 = 1.2815515655446004;
+
+export function defaultDistribution(name, value, type = 'triangular', spread = 0.1) {
+  const field = FIELD_CONFIG_MAP[name];
+  const low = clampToField(field, value * (1 - spread));
+  const high = clampToField(field, value * (1 + spread));
+  return { type, low, mode: value, high };
+}
+
+export function defaultDistributions(assumptions) {
+  const distributions = {};
+  for (const { name, type, spread } of DEFAULT_UNCERTAIN_FIELDS) {
+    distributions[name] = defaultDistribution(name, assumptions[name], type, spread);
+  }
+  return distributions;
+}
+
+function clampToField(field, value) {
+  let result = value;
+  if (field?.min !== undefined) result = Math.max(result, field.min);
+  if (field?.max !== undefined) result = Math.min(result, field.max);
+  return result;
+}
+
+// Returns an error message for an unusable distribution, or null.
+export function validateDistribution(name, distribution) {
+  const label = FIELD_CONFIG_MAP[name]?.label ?? name;
+  const { type, low, mode, high } = distribution;
+  if (!DISTRIBUTION_TYPES.includes(type)) return `${label}: unknown distribution "${type}".`;
+  if (!Number.isFinite(low) || !Number.isFinite(high)) return `${label}: enter numeric low and high values.`;
+  if (low > high) return `${label}: low must not exceed high.`;
+  if (type === 'triangular' && !(mode >= low && mode <= high)) return `${label}: the current value must lie between low and high.`;
+  if (type === 'lognormal' && !(low > 0)) return `${label}: lognormal bounds must be greater than zero.`;
+  return null;
+}
+
+// xoshiro128** seeded through splitmix32, returning floats in [0, 1)
+export function createRandom(seed) {
+  let state = seed >>> 0;
+  const splitmix = () => {
+    state = (state + 0x9e3779b9) >>> 0;
+    let z = state;
+    z = Math.imul(z ^ (z >>> 16), 0x85ebca6b);
+    z = Math.imul(z ^ (z >>> 13), 0xc2b2ae35);
+    return (z ^ (z >>> 16)) >>> 0;
+  };
+  let a = splitmix();
+  let b = splitmix();
+  let c = splitmix();
+  let d = splitmix();
+
+  return () => {
+    const result = Math.imul(rotl(Math.imul(b, 5), 7), 9) >>> 0;
+    const t = b << 9;
+    c ^= a;
+    d ^= b;
+    b ^= c;
+    a ^= d;
+    c ^= t;
+    d = rotl(d, 11);
+    return result / 4294967296;
+  };
+}
+
+const rotl = (value, shift) => (value << shift) | (value >>> (32 - shift));
+
+// Standard normal CDF (Abramowitz & Stegun 7.1.26, absolute error below 1.5e-7)
+export function normalCdf(z) {
+  const x = Math.abs(z) / Math.SQRT2;
+  const t = 1 / (1 + 0.3275911 * x);
+  const poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))));
+  const erf = 1 - poly * Math.exp(-x * x);
+  return z >= 0 ? 0.5 * (1 + erf) : 0.5 * (1 - erf);
+}
+
+function fillStandardNormals(random, target) {
+  for (let index = 0; index < target.length; index += 2) {
+    const u1 = 1 - random();
+    const u2 = random();
+    const radius = Math.sqrt(-2 * Math.log(u1));
+    target[index] = radius * Math.cos(2 * Math.PI * u2);
+    if (index + 1 < target.length) {
+      target[index + 1] = radius * Math.sin(2 * Math.PI * u2);
+    }
+  }
+}
+
+// Lower-triangular Cholesky factor (row-major) of the correlation matrix over `names`.
+export function correlationFactor(names, correlations = DEFAULT_CORRELATIONS) {
+  const size = names.length;
+  const matrix = new Float64Array(size * size);
+  for (let index = 0; index < size; index += 1) {
+    matrix[index * size + index] = 1;
+  }
+  for (const [first, second, rho] of correlations) {
+    const i = names.indexOf(first);
+    const j = names.indexOf(second);
+    if (i >= 0 && j >= 0 && i !== j) {
+      matrix[i * size + j] = rho;
+      matrix[j * size + i] = rho;
+    }
+  }
+
+  const factor = new Float64Array(size * size);
+  for (let i = 0; i < size; i += 1) {
+    for (let j = 0; j <= i; j += 1) {
+      let sum = matrix[i * size + j];
+      for (let k = 0; k < j; k += 1) {
+        sum -= factor[i * size + k] * factor[j * size + k];
+      }
+      if (i === j) {
+        if (!(sum > 0)) {
+          throw new Error('The input correlations are inconsistent (the correlation matrix is not positive definite).');
+        }
+        factor[i * size + i] = Math.sqrt(sum);
+      } else {
+        factor[i * size + j] = sum / factor[j * size + j];
+      }
+    }
+  }
+  return factor;
+}
+
+// Maps a standard normal draw to the distribution's value (its inverse CDF applied to the normal CDF).
+function quantileFunction(distribution) {
+  const { type, low, high } = distribution;
+  if (type === 'lognormal') {
+    const mu = (Math.log(low) + Math.log(high)) / 2;
+    const sigma = (Math.log(high) - Math.log(low)) / (2 * Z_90);
+    return (z) => Math.exp(mu + sigma * z);
+  }
+  if (type === 'uniform') {
+    return (z) => low + (high - low) * normalCdf(z);
+  }
+  const { mode } = distribution;
+  const span = high - low;
+  if (!(span > 0)) {
+    return () => mode;
+  }
+  const split = (mode - low) / span;
+  const lowerScale = span * (mode - low);
+  const upperScale = span * (high - mode);
+  return (z) => {
+    const u = normalCdf(z);
+    return u < split ? low + Math.sqrt(u * lowerScale) : high - Math.sqrt((1 - u) * upperScale);
+  };
+}
+
+// Same rounding prepareInputs applies before a scenario is computed
+const ROUNDING = {
+  sbiLifeExpectancyYears: (value) => Math.round(value),
+  salvoSize: (value) => Math.max(1, Math.round(value)),
+  costEstimatePeriodYears: (value) => Math.max(1, Math.round(value)),
+  killVehicleDryMassKg: (value) => Math.round(value * 10) / 10,
+  interceptorBodyDryMassKg: (value) => Math.round(value * 10) / 10,
+  supportModuleDryMassKg: (value) => Math.round(value * 10) / 10
+};
+
+// Draws `count` correlated samples. Returns batch columns: a Float64Array for every uncertain input and the
+// assumption value for every other input.
+export function sampleInputs(assumptions, distributions, { count, seed = DEFAULT_SEED, correlations = DEFAULT_CORRELATIONS }) {
+  const names = FIELD_NAMES.filter((name) => distributions[name]);
+  const factor = correlationFactor(names, correlations);
+  const random = createRandom(seed);
+  const size = names.length;
+  const normals = names.map(() => {
+    const column = new Float64Array(count);
+    fillStandardNormals(random, column);
+    return column;
+  });
+
+  const values = { ...assumptions };
+  names.forEach((name, i) => {
+    const column = new Float64Array(count);
+    for (let k = 0; k <= i; k += 1) {
+      const weight = factor[i * size + k];
+      if (weight === 0) continue;
+      const source = normals[k];
+      for (let row = 0; row < count; row += 1) {
+        column[row] += weight * source[row];
+      }
+    }
+
+    const field = FIELD_CONFIG_MAP[name];
+    const min = field?.min ?? Number.NEGATIVE_INFINITY;
+    const max = field?.max ?? Number.POSITIVE_INFINITY;
+    const quantile = quantileFunction(distributions[name]);
+    const round = ROUNDING[name];
+    for (let row = 0; row < count; row += 1) {
+      const value = Math.min(Math.max(quantile(column[row]), min), max);
+      column[row] = round ? round(value) : value;
+    }
+    values[name] = column;
+  });
+  return values;
+}
+
+// Percentiles (linear interpolation) of the finite values of `data` where `valid` is set.
+export function percentiles(data, valid, levels = PERCENTILES) {
+  const kept = new Float64Array(data.length);
+  let count = 0;
+  for (let index = 0; index < data.length; index += 1) {
+    if (valid[index] && Number.isFinite(data[index])) {
+      kept[count] = data[index];
+      count += 1;
+    }
+  }
+  const sorted = kept.subarray(0, count).sort();
+  return levels.map((level) => {
+    if (!count) return Number.NaN;
+    const position = (level / 100) * (count - 1);
+    const lower = Math.floor(position);
+    const upper = Math.min(lower + 1, count - 1);
+    return sorted[lower] + (sorted[upper] - sorted[lower]) * (position - lower);
+  });
+}
+
+// Full uncertainty run: percentiles of UNCERTAINTY_METRICS over `samples` draws around `assumptions`.
+export function runUncertainty({ assumptions, distributions, correlations, samples = DEFAULT_SAMPLE_COUNT, seed }) {
+  const started = Date.now();
+  const columns = toColumns(sampleInputs(assumptions, distributions, { count: samples, seed, correlations }), samples);
+  const results = evaluateBatch(columns, samples);
+
+  let validCount = 0;
+  for (let index = 0; index < samples; index += 1) {
+    validCount += results.valid[index];
+  }
+
+  const metrics = {};
+  for (const key of UNCERTAINTY_METRICS) {
+    const [p10, p50, p90] = percentiles(results[key], results.valid);
+    metrics[key] = { p10, p50, p90 };
+  }
+  return { samples, valid: validCount, metrics, milliseconds: Date.now() - started };
+}
+
+// P10/P50/P90 of each metric along a sweep, at up to BAND_MAX_POINTS evenly spaced x values (always including both
+// ends). The same draws are reused at every x (common random numbers), so the bands move smoothly along the axis.
+export function uncertaintyBands({
+  assumptions,
+  distributions,
+  correlations,
+  fieldName,
+  xValues,
+  metricKeys,
+  samples = BAND_SAMPLE_COUNT,
+  seed
+}) {
+  const stride = Math.max(1, Math.ceil((xValues.length - 1) / (BAND_MAX_POINTS - 1)));
+  const positions = [];
+  for (let index = 0; index < xValues.length - 1; index += stride) {
+    positions.push(xValues[index]);
+  }
+  positions.push(xValues[xValues.length - 1]);
+  const bandX = Float64Array.from(positions);
+
+  const sampled = sampleInputs(assumptions, distributions, { count: samples, seed, correlations });
+  const columns = toColumns(sampled, samples);
+  const swept = new Float64Array(samples);
+  columns[fieldName] = swept;
+
+  const bands = {};
+  for (const key of metricKeys) {
+    bands[key] = { p10: new Float64Array(bandX.length), p50: new Float64Array(bandX.length), p90: new Float64Array(bandX.length) };
+  }
+
+  for (let index = 0; index < bandX.length; index += 1) {
+    swept.fill(bandX[index]);
+    const results = evaluateBatch(columns, samples);
+    for (const key of metricKeys) {
+      const [p10, p50, p90] = percentiles(results[key], results.valid);
+      bands[key].p10[index] = p10;
+      bands[key].p50[index] = p50;
+      bands[key].p90[index] = p90;
+    }
+  }
+  return { xValues: bandX, bands };
+}
+
+// Entry point shared by the worker and the main-thread fallback: request.kind is 'summary' or 'bands'.
+export function runUncertaintyRequest(request) {
+  return request.kind === 'bands' ? uncertaintyBands(request) : runUncertainty(request);
+}